@@ -0,0 +1,16 @@
+"""
+Benchmarks of zipline's hot paths, run with airspeed velocity (asv).
+
+Each benchmark class writes the synthetic bundles it needs once, in
+``setup_cache``, and then times (``time_*``) or measures the peak memory
+(``peakmem_*``) of one operation against them. To compare the current commit
+with master::
+
+    $ asv continuous master HEAD
+
+The results are written as json to ``.asv/results``, one file per machine and
+commit, and can be compared with ``asv compare <commit> <commit>``. To run the
+benchmarks against the working tree without building a new environment::
+
+    $ asv run --python=same --quick
+"""
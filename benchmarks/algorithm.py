@@ -0,0 +1,120 @@
+"""
+Benchmarks of whole backtests.
+
+These run ``TradingAlgorithm`` the same way as ``run_algorithm`` does, but with
+an environment that doesn't download benchmark returns or treasury curves.
+"""
+from zipline.algorithm import TradingAlgorithm
+from zipline.api import (
+    attach_pipeline,
+    date_rules,
+    order_target_percent,
+    pipeline_output,
+    record,
+    schedule_function,
+    time_rules,
+)
+from zipline.pipeline import Pipeline
+from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.factors import AverageDollarVolume, Returns
+from zipline.pipeline.loaders import USEquityPricingLoader
+from zipline.utils.factory import create_simulation_parameters
+
+from .synthetic import SESSIONS_PER_YEAR, read_bundle, write_bundle
+
+NUM_HOLDINGS = 100
+# The number of sessions of minute bars, and of minute simulations.
+NUM_MINUTE_SESSIONS = 21
+
+
+def initialize(context):
+    dollar_volume = AverageDollarVolume(window_length=20)
+    attach_pipeline(
+        Pipeline(
+            columns={'returns': Returns(window_length=5)},
+            screen=dollar_volume.top(NUM_HOLDINGS),
+        ),
+        'universe',
+    )
+    schedule_function(
+        rebalance,
+        date_rules.week_start(),
+        time_rules.market_open(minutes=30),
+    )
+
+
+def before_trading_start(context, data):
+    context.universe = pipeline_output('universe').index
+
+
+def rebalance(context, data):
+    for asset in context.portfolio.positions:
+        if asset not in context.universe:
+            order_target_percent(asset, 0)
+
+    weight = 1.0 / len(context.universe)
+    for asset in context.universe:
+        if data.can_trade(asset):
+            order_target_percent(asset, weight)
+
+
+def handle_data(context, data):
+    record(leverage=context.account.leverage)
+
+
+class RunAlgorithm(object):
+    params = [[1000, 8000], ['daily', 'minute']]
+    param_names = ['num_assets', 'data_frequency']
+    timeout = 3600
+    number = 1
+
+    def setup_cache(self):
+        return {
+            num_assets: write_bundle(
+                'algorithm-%d' % num_assets,
+                num_assets,
+                SESSIONS_PER_YEAR,
+                NUM_MINUTE_SESSIONS,
+            )
+            for num_assets in self.params[0]
+        }
+
+    def setup(self, paths, num_assets, data_frequency):
+        self.bundle = bundle = read_bundle(paths[num_assets])
+        if data_frequency == 'daily':
+            # Leave room for the pipeline's lookback window.
+            start = bundle.sessions[30]
+        else:
+            start = bundle.sessions[-NUM_MINUTE_SESSIONS]
+
+        loader = USEquityPricingLoader(
+            bundle.equity_daily_reader,
+            bundle.adjustment_reader,
+        )
+
+        def get_pipeline_loader(column):
+            if column in USEquityPricing.columns:
+                return loader
+            raise ValueError(
+                "No PipelineLoader registered for column %s." % column
+            )
+
+        self.algo = TradingAlgorithm(
+            initialize=initialize,
+            handle_data=handle_data,
+            before_trading_start=before_trading_start,
+            env=bundle.env,
+            get_pipeline_loader=get_pipeline_loader,
+            sim_params=create_simulation_parameters(
+                start=start,
+                end=bundle.sessions[-1],
+                capital_base=10e6,
+                data_frequency=data_frequency,
+            ),
+        )
+
+    def time_run(self, paths, num_assets, data_frequency):
+        self.algo.run(self.bundle.data_portal, overwrite_sim_params=False)
+
+    def peakmem_run(self, paths, num_assets, data_frequency):
+        self.algo.run(self.bundle.data_portal, overwrite_sim_params=False)
@@ -0,0 +1,63 @@
+"""
+Benchmarks of filling orders in the blotter.
+"""
+from zipline._protocol import BarData
+from zipline.finance.asset_restrictions import NoRestrictions
+from zipline.finance.blotter import Blotter
+from zipline.finance.execution import MarketOrder
+from zipline.utils.calendars import get_calendar
+
+from .synthetic import read_bundle, write_bundle
+
+NUM_SESSIONS = 5
+
+
+class GetTransactions(object):
+    params = [[1000, 8000], ['daily', 'minute']]
+    param_names = ['num_assets', 'data_frequency']
+    timeout = 1800
+    # Filling the orders changes them, so each sample needs new orders.
+    number = 1
+
+    def setup_cache(self):
+        return {
+            num_assets: write_bundle(
+                'blotter-%d' % num_assets,
+                num_assets,
+                NUM_SESSIONS,
+                NUM_SESSIONS,
+            )
+            for num_assets in self.params[0]
+        }
+
+    def setup(self, paths, num_assets, data_frequency):
+        bundle = read_bundle(paths[num_assets])
+        calendar = get_calendar('NYSE')
+        session = bundle.sessions[-1]
+        if data_frequency == 'daily':
+            dt = calendar.open_and_close_for_session(session)[1]
+        else:
+            dt = calendar.minutes_for_session(session)[30]
+
+        self.blotter = Blotter(data_frequency, bundle.env.asset_finder)
+        self.blotter.set_date(dt)
+        # Buy and sell every asset, with more than one order for some of
+        # them.
+        for n, asset in enumerate(bundle.assets):
+            self.blotter.order(asset, 100 if n % 2 else -100, MarketOrder())
+            if not n % 10:
+                self.blotter.order(asset, 50, MarketOrder())
+
+        self.bar_data = BarData(
+            bundle.data_portal,
+            lambda: dt,
+            data_frequency,
+            calendar,
+            NoRestrictions(),
+        )
+
+    def time_get_transactions(self, paths, num_assets, data_frequency):
+        self.blotter.get_transactions(self.bar_data)
+
+    def peakmem_get_transactions(self, paths, num_assets, data_frequency):
+        self.blotter.get_transactions(self.bar_data)
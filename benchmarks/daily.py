@@ -0,0 +1,103 @@
+"""
+Benchmarks of reading daily bars, directly, through the data portal and through
+the pipeline engine.
+"""
+from itertools import product
+
+from zipline.pipeline import Pipeline, SimplePipelineEngine
+from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.factors import (
+    AverageDollarVolume,
+    Returns,
+    SimpleMovingAverage,
+)
+from zipline.pipeline.loaders import USEquityPricingLoader
+from zipline.utils.calendars import get_calendar
+
+from .synthetic import SESSIONS_PER_YEAR, read_bundle, write_bundle
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class Daily(object):
+    params = [[1000, 8000], [1, 10]]
+    param_names = ['num_assets', 'num_years']
+    # Writing the 10 year bundles takes a while.
+    timeout = 1800
+    number = 1
+
+    def setup_cache(self):
+        return {
+            (num_assets, num_years): write_bundle(
+                'daily-%d-%d' % (num_assets, num_years),
+                num_assets,
+                num_years * SESSIONS_PER_YEAR,
+            )
+            for num_assets, num_years in product(*self.params)
+        }
+
+    def setup(self, paths, num_assets, num_years):
+        # Reopen the bundle for each sample so that no caches are shared
+        # between them.
+        self.bundle = read_bundle(paths[num_assets, num_years])
+        self.calendar = get_calendar('NYSE')
+
+    def time_load_raw_arrays(self, paths, num_assets, num_years):
+        sessions = self.bundle.sessions
+        self.bundle.equity_daily_reader.load_raw_arrays(
+            FIELDS,
+            sessions[0],
+            sessions[-1],
+            self.bundle.env.asset_finder.sids,
+        )
+
+    def _history_windows(self):
+        # Step through the last month like a backtest with half a year of
+        # lookback.
+        data_portal = self.bundle.data_portal
+        assets = self.bundle.assets
+        for session in self.bundle.sessions[-21:]:
+            data_portal.get_history_window(
+                assets,
+                self.calendar.open_and_close_for_session(session)[1],
+                SESSIONS_PER_YEAR // 2,
+                '1d',
+                'close',
+            )
+
+    def time_history_window(self, paths, num_assets, num_years):
+        self._history_windows()
+
+    def peakmem_history_window(self, paths, num_assets, num_years):
+        self._history_windows()
+
+    def _run_pipeline(self):
+        engine = SimplePipelineEngine(
+            lambda column: USEquityPricingLoader(
+                self.bundle.equity_daily_reader,
+                self.bundle.adjustment_reader,
+            ),
+            self.calendar.all_sessions,
+            self.bundle.env.asset_finder,
+        )
+        dollar_volume = AverageDollarVolume(window_length=20)
+        pipeline = Pipeline(
+            columns={
+                'returns': Returns(window_length=10),
+                'sma': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=50,
+                ),
+                'dollar_volume': dollar_volume,
+            },
+            screen=dollar_volume.top(500),
+        )
+        sessions = self.bundle.sessions
+        # Leave room for the longest lookback window.
+        engine.run_pipeline(pipeline, sessions[60], sessions[-1])
+
+    def time_run_pipeline(self, paths, num_assets, num_years):
+        self._run_pipeline()
+
+    def peakmem_run_pipeline(self, paths, num_assets, num_years):
+        self._run_pipeline()
@@ -0,0 +1,81 @@
+"""
+Benchmarks of reading minute bars, directly and through the data portal.
+"""
+import numpy as np
+
+from zipline.utils.calendars import get_calendar
+
+from .synthetic import read_bundle, write_bundle
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# A month of minute bars for 8000 assets is already 65 million rows per field.
+NUM_SESSIONS = 21
+
+
+class Minute(object):
+    params = [1000, 8000]
+    param_names = ['num_assets']
+    timeout = 1800
+    number = 1
+
+    def setup_cache(self):
+        return {
+            num_assets: write_bundle(
+                'minute-%d' % num_assets,
+                num_assets,
+                NUM_SESSIONS,
+                NUM_SESSIONS,
+            )
+            for num_assets in self.params
+        }
+
+    def setup(self, paths, num_assets):
+        # Reopen the bundle for each sample so that no caches are shared
+        # between them.
+        self.bundle = read_bundle(paths[num_assets])
+        self.calendar = get_calendar('NYSE')
+        self.minutes = self.calendar.minutes_for_sessions_in_range(
+            self.bundle.sessions[0],
+            self.bundle.sessions[-1],
+        )
+
+        rand = np.random.RandomState(0)
+        self.lookups = list(zip(
+            rand.choice(self.bundle.env.asset_finder.sids, 1000),
+            self.minutes[rand.randint(0, len(self.minutes), 1000)],
+        ))
+
+    def time_get_value(self, paths, num_assets):
+        reader = self.bundle.equity_minute_reader
+        for sid, minute in self.lookups:
+            reader.get_value(sid, minute, 'close')
+
+    def time_load_raw_arrays(self, paths, num_assets):
+        minutes = self.calendar.minutes_for_session(self.bundle.sessions[-1])
+        self.bundle.equity_minute_reader.load_raw_arrays(
+            FIELDS,
+            minutes[0],
+            minutes[-1],
+            self.bundle.env.asset_finder.sids,
+        )
+
+    def _history_windows(self):
+        # Step through the first hour of the last session like a backtest
+        # with a day of lookback.
+        data_portal = self.bundle.data_portal
+        assets = self.bundle.assets
+        for minute in self.minutes[-390:-330]:
+            data_portal.get_history_window(
+                assets,
+                minute,
+                390,
+                '1m',
+                'close',
+            )
+
+    def time_history_window(self, paths, num_assets):
+        self._history_windows()
+
+    def peakmem_history_window(self, paths, num_assets):
+        self._history_windows()
@@ -0,0 +1,219 @@
+"""
+Synthetic bundles for the benchmarks.
+
+The bundles are written with the same writers used by ``zipline ingest``, so
+the benchmarks read the data in the same format as a backtest would.
+"""
+from collections import namedtuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from zipline.assets.synthetic import make_simple_equity_info
+from zipline.data.data_portal import DataPortal
+from zipline.data.minute_bars import BcolzMinuteBarReader
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    BcolzDailyBarWriter,
+    SQLiteAdjustmentReader,
+    SQLiteAdjustmentWriter,
+)
+from zipline.finance.trading import TradingEnvironment
+from zipline.testing.core import write_bcolz_minute_data
+from zipline.utils.calendars import get_calendar
+from zipline.utils.paths import ensure_directory
+
+# The last session of every bundle.
+END_SESSION = pd.Timestamp('2016-12-30', tz='utc')
+SESSIONS_PER_YEAR = 252
+
+TREASURY_DURATIONS = [
+    '1month', '3month', '6month',
+    '1year', '2year', '3year', '5year', '7year', '10year', '20year', '30year',
+]
+
+
+def load_market_data(trading_day, trading_days, bm_symbol):
+    """A ``TradingEnvironment`` load function which doesn't need the network.
+    """
+    return (
+        pd.Series(0.0003, index=trading_days),
+        pd.DataFrame(0.01, index=trading_days, columns=TREASURY_DURATIONS),
+    )
+
+
+def make_bars(sids, index, seed):
+    """Generate a random walk of prices for each asset.
+
+    Parameters
+    ----------
+    sids : iterable[int]
+        The assets to generate bars for.
+    index : pd.DatetimeIndex
+        The sessions or minutes to generate bars for.
+    seed : int
+        The seed of the random walks.
+
+    Yields
+    ------
+    sid, bars : int, pd.DataFrame
+        The bars of each asset, to be passed to a bar writer.
+    """
+    rand = np.random.RandomState(seed)
+    size = len(index)
+    for sid in sids:
+        close = rand.uniform(10, 100) * np.exp(
+            np.cumsum(rand.normal(0, 0.01, size)),
+        )
+        spread = close * rand.uniform(0, 0.01, size)
+        yield sid, pd.DataFrame(
+            {
+                'open': close + rand.uniform(-0.5, 0.5, size) * spread,
+                'high': close + spread,
+                'low': close - spread,
+                'close': close,
+                'volume': rand.randint(100, 100000, size),
+            },
+            index=index,
+        )
+
+
+def make_splits(sids, sessions, seed):
+    """Split every 20th asset in half on a random session.
+    """
+    rand = np.random.RandomState(seed)
+    split_sids = sids[::20]
+    return pd.DataFrame({
+        'sid': split_sids,
+        'ratio': 0.5,
+        'effective_date': sessions[
+            rand.randint(1, len(sessions), len(split_sids))
+        ].asi8 // 10 ** 9,
+    })
+
+
+Bundle = namedtuple('Bundle', [
+    'env',
+    'sessions',
+    'assets',
+    'equity_daily_reader',
+    'equity_minute_reader',
+    'adjustment_reader',
+    'data_portal',
+])
+
+
+def _paths(path):
+    return (
+        os.path.join(path, 'assets.sqlite'),
+        os.path.join(path, 'daily.bcolz'),
+        os.path.join(path, 'minute'),
+        os.path.join(path, 'adjustments.sqlite'),
+    )
+
+
+def write_bundle(path, num_assets, num_sessions, num_minute_sessions=0):
+    """Write a bundle of equities which exist for its whole range.
+
+    Parameters
+    ----------
+    path : str
+        The directory to write the bundle to.
+    num_assets : int
+        The number of equities.
+    num_sessions : int
+        The number of sessions of daily bars, ending on ``END_SESSION``.
+    num_minute_sessions : int, optional
+        The number of sessions of minute bars, ending on ``END_SESSION``. By
+        default, no minute bars are written.
+
+    Returns
+    -------
+    path : str
+        The directory the bundle was written to.
+    """
+    calendar = get_calendar('NYSE')
+    sessions = calendar.sessions_window(END_SESSION, 1 - num_sessions)
+    sids = np.arange(1, num_assets + 1)
+    assets_path, daily_path, minute_path, adjustments_path = _paths(path)
+    ensure_directory(path)
+
+    TradingEnvironment(
+        load=load_market_data,
+        asset_db_path=assets_path,
+    ).write_data(equities=make_simple_equity_info(
+        sids,
+        sessions[0],
+        sessions[-1],
+        symbols=['S%d' % sid for sid in sids],
+    ))
+
+    BcolzDailyBarWriter(
+        daily_path,
+        calendar,
+        sessions[0],
+        sessions[-1],
+    ).write(make_bars(sids, sessions, seed=0))
+
+    with SQLiteAdjustmentWriter(
+        adjustments_path,
+        BcolzDailyBarReader(daily_path),
+        calendar.all_sessions,
+    ) as writer:
+        writer.write(splits=make_splits(sids, sessions, seed=0))
+
+    if num_minute_sessions:
+        minute_sessions = sessions[-num_minute_sessions:]
+        write_bcolz_minute_data(
+            calendar,
+            minute_sessions,
+            minute_path,
+            make_bars(
+                sids,
+                calendar.minutes_for_sessions_in_range(
+                    minute_sessions[0],
+                    minute_sessions[-1],
+                ),
+                seed=1,
+            ),
+        )
+
+    return path
+
+
+def read_bundle(path):
+    """Open a bundle written by ``write_bundle``.
+
+    Returns
+    -------
+    bundle : Bundle
+        The readers of the bundle, and a data portal over them.
+    """
+    calendar = get_calendar('NYSE')
+    assets_path, daily_path, minute_path, adjustments_path = _paths(path)
+
+    env = TradingEnvironment(load=load_market_data, asset_db_path=assets_path)
+    equity_daily_reader = BcolzDailyBarReader(daily_path)
+    if os.path.exists(minute_path):
+        equity_minute_reader = BcolzMinuteBarReader(minute_path)
+    else:
+        equity_minute_reader = None
+    adjustment_reader = SQLiteAdjustmentReader(adjustments_path)
+
+    return Bundle(
+        env=env,
+        sessions=equity_daily_reader.sessions,
+        assets=env.asset_finder.retrieve_all(env.asset_finder.sids),
+        equity_daily_reader=equity_daily_reader,
+        equity_minute_reader=equity_minute_reader,
+        adjustment_reader=adjustment_reader,
+        data_portal=DataPortal(
+            env.asset_finder,
+            calendar,
+            first_trading_day=equity_daily_reader.first_trading_day,
+            equity_daily_reader=equity_daily_reader,
+            equity_minute_reader=equity_minute_reader,
+            adjustment_reader=adjustment_reader,
+        ),
+    )
@@ -100,7 +100,6 @@ ext_modules = [
     window_specialization('label'),
     Extension('zipline.lib.rank', ['zipline/lib/rank.pyx']),
     Extension('zipline.data._equities', ['zipline/data/_equities.pyx']),
-    Extension('zipline.data._adjustments', ['zipline/data/_adjustments.pyx']),
     Extension('zipline._protocol', ['zipline/_protocol.pyx']),
     Extension('zipline.gens.sim_engine', ['zipline/gens/sim_engine.pyx']),
     Extension(
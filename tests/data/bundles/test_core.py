@@ -1,4 +1,5 @@
 import os
+import warnings
 
 from nose_parameterized import parameterized
 import pandas as pd
@@ -12,7 +13,8 @@ from zipline.assets.synthetic import make_simple_equity_info
 from zipline.data.bundles import UnknownBundle, from_bundle_ingest_dirname, \
     ingestions_for_bundle
 from zipline.data.bundles.core import _make_bundle_core, BadClean, \
-    to_bundle_ingest_dirname, asset_db_path
+    to_bundle_ingest_dirname, asset_db_path, daily_equity_path, \
+    minute_equity_path
 from zipline.lib.adjustment import Float64Multiply
 from zipline.pipeline.loaders.synthetic import (
     make_bar_data,
@@ -264,6 +266,394 @@ class BundleCoreTestCase(WithInstanceTmpDir,
             msg='volume',
         )
 
+    @parameterized.expand([
+        ('supported', True),
+        ('full_ingestion_fallback', False),
+    ])
+    def test_ingest_incremental(self, name, supports_incremental):
+        calendar = get_calendar('NYSE')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE, self.END_DATE,
+        )
+        first_end = pd.Timestamp('2014-01-08', tz='utc')
+
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        daily_bar_data = dict(make_bar_data(equities, sessions))
+        minute_bar_data = dict(make_bar_data(equities, minutes))
+        splits = pd.DataFrame.from_records([
+            {
+                'effective_date': str_to_seconds('2014-01-08'),
+                'ratio': 0.5,
+                'sid': 0,
+            },
+            {
+                'effective_date': str_to_seconds('2014-01-09'),
+                'ratio': 0.1,
+                'sid': 1,
+            },
+        ])
+
+        def register(end_session, splits):
+            @self.register(
+                'bundle',
+                calendar_name='NYSE',
+                start_session=self.START_DATE,
+                end_session=end_session,
+                incremental=supports_incremental,
+            )
+            def bundle_ingest(environ,
+                              asset_db_writer,
+                              minute_bar_writer,
+                              daily_bar_writer,
+                              adjustment_writer,
+                              calendar,
+                              start_session,
+                              end_session,
+                              cache,
+                              show_progress,
+                              output_dir):
+                def new_sessions(writer, sid):
+                    # only write the sessions after the existing data
+                    last = writer.last_date_in_output_for_sid(sid)
+                    if pd.isnull(last):
+                        return calendar.sessions_in_range(
+                            start_session,
+                            end_session,
+                        )
+                    return calendar.sessions_in_range(
+                        last + pd.Timedelta(days=1),
+                        end_session,
+                    )
+
+                asset_db_writer.write(equities=equities)
+                daily_bar_writer.write(
+                    (sid, daily_bar_data[sid].loc[
+                        new_sessions(daily_bar_writer, sid)
+                    ])
+                    for sid in sids
+                )
+                for sid in sids:
+                    new = new_sessions(minute_bar_writer, sid)
+                    minute_bar_writer.write_sid(
+                        sid,
+                        minute_bar_data[sid].loc[
+                            calendar.minutes_for_sessions_in_range(
+                                new[0],
+                                new[-1],
+                            )
+                        ],
+                    )
+                adjustment_writer.write(splits=splits)
+
+        register(first_end, splits.iloc[:1])
+        first = pd.Timestamp('2014-01-11', tz='utc')
+        self.ingest('bundle', environ=self.environ, timestamp=first)
+
+        self.unregister('bundle')
+        register(self.END_DATE, splits)
+        second = pd.Timestamp('2014-01-12', tz='utc')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            self.ingest(
+                'bundle',
+                environ=self.environ,
+                timestamp=second,
+                incremental=True,
+            )
+        # bundles which don't support appending get a full ingestion
+        fallbacks = [
+            warning for warning in w
+            if 'does not support incremental' in str(warning.message)
+        ]
+        assert_equal(len(fallbacks), 0 if supports_incremental else 1)
+
+        columns = 'open', 'high', 'low', 'close', 'volume'
+        bundle = self.load('bundle', environ=self.environ)
+
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            self.END_DATE,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(sessions, equities, colname),
+                msg=colname,
+            )
+
+        actual = bundle.equity_minute_bar_reader.load_raw_arrays(
+            columns,
+            minutes[0],
+            minutes[-1],
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(minutes, equities, colname),
+                msg=colname,
+            )
+
+        # the split written by both ingestions is only applied once
+        assert_equal(
+            bundle.adjustment_reader.get_adjustment_ratios(
+                sids,
+                'close',
+                self.START_DATE,
+                self.END_DATE,
+            ).tolist(),
+            [0.5, 0.1, 1.0],
+        )
+
+        # the previous ingestion is unchanged
+        bundle = self.load('bundle', environ=self.environ, timestamp=first)
+        first_sessions = sessions[sessions <= first_end]
+        assert_equal(
+            bundle.equity_daily_bar_reader.last_available_dt,
+            first_end,
+        )
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            first_end,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(first_sessions, equities, colname),
+                msg=colname,
+            )
+        assert_equal(
+            bundle.adjustment_reader.get_adjustment_ratios(
+                sids,
+                'close',
+                self.START_DATE,
+                self.END_DATE,
+            ).tolist(),
+            [0.5, 1.0, 1.0],
+        )
+
+    def test_ingest_deduplicate(self):
+        calendar = get_calendar('NYSE')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE, self.END_DATE,
+        )
+
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+
+        @self.register(
+            'bundle',
+            calendar_name='NYSE',
+            start_session=self.START_DATE,
+            end_session=self.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          calendar,
+                          start_session,
+                          end_session,
+                          cache,
+                          show_progress,
+                          output_dir):
+            asset_db_writer.write(equities=equities)
+            minute_bar_writer.write(make_bar_data(equities, minutes))
+            daily_bar_writer.write(make_bar_data(equities, sessions))
+            adjustment_writer.write()
+
+        first, second = (
+            pd.Timestamp('2014-01-11', tz='utc'),
+            pd.Timestamp('2014-01-12', tz='utc'),
+        )
+        for timestamp in first, second:
+            self.ingest(
+                'bundle',
+                environ=self.environ,
+                timestamp=timestamp,
+                deduplicate=True,
+            )
+
+        # the identical ingestions share all of their bar data
+        first_path, second_path = (
+            minute_equity_path(
+                'bundle',
+                to_bundle_ingest_dirname(timestamp),
+                environ=self.environ,
+            )
+            for timestamp in (first, second)
+        )
+        for dirpath, _, filenames in os.walk(first_path):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                assert_true(os.path.samefile(
+                    path,
+                    os.path.join(
+                        second_path,
+                        os.path.relpath(path, first_path),
+                    ),
+                ))
+
+        self.clean('bundle', keep_last=1, environ=self.environ)
+        bundle = self.load('bundle', environ=self.environ)
+        columns = 'open', 'high', 'low', 'close', 'volume'
+        actual = bundle.equity_minute_bar_reader.load_raw_arrays(
+            columns,
+            minutes[0],
+            minutes[-1],
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(minutes, equities, colname),
+                msg=colname,
+            )
+
+    def test_ingest_deduplicate_daily_append(self):
+        calendar = get_calendar('NYSE')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        first_end = pd.Timestamp('2014-01-08', tz='utc')
+
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        daily_bar_data = dict(make_bar_data(equities, sessions))
+
+        def register(end_session):
+            @self.register(
+                'bundle',
+                calendar_name='NYSE',
+                start_session=self.START_DATE,
+                end_session=end_session,
+                incremental=True,
+            )
+            def bundle_ingest(environ,
+                              asset_db_writer,
+                              minute_bar_writer,
+                              daily_bar_writer,
+                              adjustment_writer,
+                              calendar,
+                              start_session,
+                              end_session,
+                              cache,
+                              show_progress,
+                              output_dir):
+                def new_data(sid):
+                    # only write the sessions after the existing data
+                    data = daily_bar_data[sid].loc[:end_session]
+                    last = daily_bar_writer.last_date_in_output_for_sid(sid)
+                    if pd.isnull(last):
+                        return data
+                    return data.loc[data.index > last]
+
+                asset_db_writer.write(equities=equities)
+                daily_bar_writer.write((sid, new_data(sid)) for sid in sids)
+                adjustment_writer.write()
+
+        timestamps = (
+            pd.Timestamp('2014-01-11', tz='utc'),
+            pd.Timestamp('2014-01-12', tz='utc'),
+            pd.Timestamp('2014-01-13', tz='utc'),
+        )
+        register(first_end)
+        self.ingest(
+            'bundle',
+            environ=self.environ,
+            timestamp=timestamps[0],
+            deduplicate=True,
+        )
+        self.unregister('bundle')
+        register(self.END_DATE)
+        # appends to the daily table of the first ingestion
+        self.ingest(
+            'bundle',
+            environ=self.environ,
+            timestamp=timestamps[1],
+            incremental=True,
+            deduplicate=True,
+        )
+        # writes the same daily data as the appended table
+        self.ingest(
+            'bundle',
+            environ=self.environ,
+            timestamp=timestamps[2],
+            deduplicate=True,
+        )
+
+        def daily_data_files(timestamp):
+            path = daily_equity_path(
+                'bundle',
+                to_bundle_ingest_dirname(timestamp),
+                environ=self.environ,
+            )
+            for dirpath, _, filenames in os.walk(path):
+                for filename in filenames:
+                    yield os.path.relpath(
+                        os.path.join(dirpath, filename),
+                        path,
+                    ), os.path.join(dirpath, filename)
+
+        # the ingestions with the same daily data share all of it
+        appended = dict(daily_data_files(timestamps[1]))
+        written = dict(daily_data_files(timestamps[2]))
+        assert_equal(sorted(appended), sorted(written))
+        for relpath, path in appended.items():
+            assert_true(os.path.samefile(path, written[relpath]), relpath)
+
+        columns = 'open', 'high', 'low', 'close', 'volume'
+
+        # the appended table didn't change the files of the first ingestion
+        bundle = self.load('bundle', environ=self.environ,
+                           timestamp=timestamps[0])
+        first_sessions = sessions[sessions <= first_end]
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            first_end,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(first_sessions, equities, colname),
+                msg=colname,
+            )
+
+        self.clean('bundle', keep_last=1, environ=self.environ)
+        bundle = self.load('bundle', environ=self.environ)
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            self.END_DATE,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(sessions, equities, colname),
+                msg=colname,
+            )
+
     def test_ingest_assets_versions(self):
         versions = (1, 2)
 
@@ -0,0 +1,243 @@
+from nose_parameterized import parameterized
+import pandas as pd
+
+from zipline.assets.synthetic import make_simple_equity_info
+from zipline.data.bundles.core import _make_bundle_core
+from zipline.data.bundles.parallel import ingest_sids
+from zipline.pipeline.loaders.synthetic import (
+    make_bar_data,
+    expected_bar_values_2d,
+)
+from zipline.testing import str_to_seconds
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal, assert_raises
+from zipline.utils.calendars import get_calendar
+
+
+class IngestSidsTestCase(WithInstanceTmpDir, ZiplineTestCase):
+    START_DATE = pd.Timestamp('2014-01-06', tz='utc')
+    END_DATE = pd.Timestamp('2014-01-10', tz='utc')
+
+    def init_instance_fixtures(self):
+        super(IngestSidsTestCase, self).init_instance_fixtures()
+        (self.bundles,
+         self.register,
+         self.unregister,
+         self.ingest,
+         self.load,
+         self.clean) = _make_bundle_core()
+        self.environ = {'ZIPLINE_ROOT': self.instance_tmpdir.path}
+
+    @parameterized.expand([(1,), (2,)])
+    def test_resume(self, processes):
+        calendar = get_calendar('NYSE')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE,
+            self.END_DATE,
+        )
+
+        sids = tuple(range(4))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        daily_bar_data = dict(make_bar_data(equities, sessions))
+        minute_bar_data = dict(make_bar_data(equities, minutes))
+
+        # The sids that fail to load, and the sids loaded by the workers.
+        failing = {2}
+        loaded_path = self.instance_tmpdir.getpath('loaded')
+        open(loaded_path, 'w').close()
+
+        def load_sid(sid):
+            if sid in failing:
+                raise ValueError('failed to load sid %d' % sid)
+            with open(loaded_path, 'a') as f:
+                f.write('%d\n' % sid)
+            return {
+                'daily': daily_bar_data[sid],
+                'minute': minute_bar_data[sid],
+                'splits': pd.DataFrame({
+                    'effective_date': [str_to_seconds('2014-01-08')],
+                    'ratio': [1.0 / (sid + 2)],
+                    'sid': [sid],
+                }),
+            }
+
+        @self.register(
+            'bundle',
+            calendar_name='NYSE',
+            start_session=self.START_DATE,
+            end_session=self.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          calendar,
+                          start_session,
+                          end_session,
+                          cache,
+                          show_progress,
+                          output_dir):
+            asset_db_writer.write(equities=equities)
+            frames = ingest_sids(
+                load_sid,
+                # in a different order than the output
+                reversed(sids),
+                cache,
+                daily_bar_writer=daily_bar_writer,
+                minute_bar_writer=minute_bar_writer,
+                processes=processes,
+            )
+            adjustment_writer.write(splits=frames['splits'])
+
+        with assert_raises(ValueError):
+            self.ingest('bundle', environ=self.environ)
+
+        failing.clear()
+        self.ingest('bundle', environ=self.environ)
+
+        with open(loaded_path) as f:
+            loaded = list(map(int, f.read().split()))
+        assert_equal(set(loaded), set(sids))
+        if processes == 1:
+            # The sids before the failure are not loaded again. In a pool,
+            # sids which were being loaded when the pool was stopped are.
+            assert_equal(loaded, [0, 1, 2, 3])
+
+        bundle = self.load('bundle', environ=self.environ)
+        columns = 'open', 'high', 'low', 'close', 'volume'
+
+        daily_reader = bundle.equity_daily_bar_reader
+        actual = daily_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            self.END_DATE,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(sessions, equities, colname),
+                msg=colname,
+            )
+        # the rows are laid out in sid order
+        first_rows = [
+            daily_reader._table.attrs['first_row'][str(sid)] for sid in sids
+        ]
+        assert_equal(first_rows, sorted(first_rows))
+
+        actual = bundle.equity_minute_bar_reader.load_raw_arrays(
+            columns,
+            minutes[0],
+            minutes[-1],
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(minutes, equities, colname),
+                msg=colname,
+            )
+
+        ratios = bundle.adjustment_reader.get_adjustment_ratios(
+            sids,
+            'close',
+            self.START_DATE,
+            self.END_DATE,
+        )
+        assert_equal(ratios.tolist(), [1.0 / (sid + 2) for sid in sids])
+
+    @parameterized.expand([
+        ('sessions', 1, tuple(range(4))),
+        ('sids', 0, tuple(range(3))),
+    ])
+    def test_discard_stale_checkpoint(self,
+                                      name,
+                                      first_sessions_dropped,
+                                      retry_sids):
+        calendar = get_calendar('NYSE')
+        all_sids = tuple(range(4))
+        equities = make_simple_equity_info(
+            all_sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+
+        failing = {2}
+        loaded = []
+
+        def register(sids, end_session):
+            sessions = calendar.sessions_in_range(self.START_DATE, end_session)
+            daily_bar_data = dict(make_bar_data(equities, sessions))
+
+            def load_sid(sid):
+                if sid in failing:
+                    raise ValueError('failed to load sid %d' % sid)
+                loaded.append(sid)
+                return {'daily': daily_bar_data[sid]}
+
+            @self.register(
+                'bundle',
+                calendar_name='NYSE',
+                start_session=self.START_DATE,
+                end_session=end_session,
+            )
+            def bundle_ingest(environ,
+                              asset_db_writer,
+                              minute_bar_writer,
+                              daily_bar_writer,
+                              adjustment_writer,
+                              calendar,
+                              start_session,
+                              end_session,
+                              cache,
+                              show_progress,
+                              output_dir):
+                asset_db_writer.write(equities=equities.loc[list(sids)])
+                ingest_sids(
+                    load_sid,
+                    sids,
+                    cache,
+                    daily_bar_writer=daily_bar_writer,
+                    processes=1,
+                )
+                adjustment_writer.write()
+
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        register(all_sids, sessions[-1 - first_sessions_dropped])
+        with assert_raises(ValueError):
+            self.ingest('bundle', environ=self.environ)
+        assert_equal(loaded, [0, 1])
+
+        # The retry is for different sessions or sids, so the sids in the
+        # checkpoint are loaded again.
+        self.unregister('bundle')
+        register(retry_sids, self.END_DATE)
+        failing.clear()
+        del loaded[:]
+        self.ingest('bundle', environ=self.environ)
+        assert_equal(loaded, list(retry_sids))
+
+        bundle = self.load('bundle', environ=self.environ)
+        columns = 'open', 'high', 'low', 'close', 'volume'
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            self.END_DATE,
+            retry_sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(
+                    sessions,
+                    equities.loc[list(retry_sids)],
+                    colname,
+                ),
+                msg=colname,
+            )
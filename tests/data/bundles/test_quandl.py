@@ -1,5 +1,7 @@
 from __future__ import division
 
+import os
+
 import numpy as np
 import pandas as pd
 from toolz import merge
@@ -245,3 +247,101 @@ class QuandlBundleTestCase(ZiplineTestCase):
                 expected,
                 msg=column,
             )
+
+    def test_bundle_incremental(self):
+        zipline_root = self.enter_instance_context(tmp_dir()).path
+        environ = {
+            'ZIPLINE_ROOT': zipline_root,
+            'QUANDL_API_KEY': self.api_key,
+        }
+        samples = self.enter_instance_context(tmp_dir()).path
+        metadata_urls = {
+            format_metadata_url(self.api_key, n): test_resource_path(
+                'quandl_samples',
+                'metadata-%d.csv.gz' % n,
+            )
+            for n in (1, 2)
+        }
+
+        # The first ingestion only has the data before one of AAPL's
+        # dividends, so the second one computes its ratio from a close
+        # written by the first.
+        aapl = pd.read_csv(
+            test_resource_path('quandl_samples', 'AAPL.csv.gz'),
+            parse_dates=['Date'],
+        ).sort_values('Date')
+        split_date = aapl.Date.iloc[150]
+
+        first_urls = {}
+        second_urls = {}
+        for symbol in self.symbols:
+            raw = pd.read_csv(
+                test_resource_path('quandl_samples', symbol + '.csv.gz'),
+                parse_dates=['Date'],
+            )
+            before = raw[raw.Date < split_date]
+            after = raw[raw.Date >= split_date]
+            paths = []
+            for name, part in ('before', before), ('after', after):
+                path = os.path.join(samples, '%s-%s.csv' % (symbol, name))
+                part.to_csv(path, index=False)
+                paths.append(path)
+
+            first_urls[format_wiki_url(
+                self.api_key,
+                symbol,
+                self.start_date,
+                self.end_date,
+            )] = paths[0]
+            if before.empty:
+                second_start, second_path = (
+                    self.start_date,
+                    test_resource_path('quandl_samples', symbol + '.csv.gz'),
+                )
+            else:
+                second_start = before.Date.max() + pd.Timedelta(days=1)
+                second_path = paths[1]
+            second_urls[format_wiki_url(
+                self.api_key,
+                symbol,
+                second_start,
+                self.end_date,
+            )] = second_path
+
+        with patch_read_csv(merge(metadata_urls, first_urls), strict=True):
+            ingest(
+                'quandl',
+                environ=environ,
+                timestamp=pd.Timestamp('2015-01-02', tz='utc'),
+            )
+        with patch_read_csv(merge(metadata_urls, second_urls), strict=True):
+            ingest(
+                'quandl',
+                environ=environ,
+                timestamp=pd.Timestamp('2015-01-03', tz='utc'),
+                incremental=True,
+            )
+
+        bundle = load('quandl', environ=environ)
+        sids = 0, 1, 2, 3
+        sessions = self.calendar.all_sessions
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            self.columns,
+            sessions[sessions.get_loc(self.asset_start, 'bfill')],
+            sessions[sessions.get_loc(self.asset_end, 'ffill')],
+            sids,
+        )
+        expected_pricing, expected_adjustments = self._expected_data(
+            bundle.asset_finder,
+        )
+        assert_equal(actual, expected_pricing, array_decimal=2)
+
+        adjustments_for_cols = bundle.adjustment_reader.load_adjustments(
+            self.columns,
+            sessions,
+            pd.Index(sids),
+        )
+        for column, adjustments, expected in zip(self.columns,
+                                                 adjustments_for_cols,
+                                                 expected_adjustments):
+            assert_equal(adjustments, expected, msg=column)
@@ -0,0 +1,79 @@
+import os
+import shutil
+
+from zipline.data.bundles.store import ContentStore
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal, assert_false, assert_true
+
+
+class ContentStoreTestCase(WithInstanceTmpDir, ZiplineTestCase):
+
+    def init_instance_fixtures(self):
+        super(ContentStoreTestCase, self).init_instance_fixtures()
+        self.store = ContentStore(self.instance_tmpdir.getpath('store'))
+
+    def write_tree(self, name, files):
+        for relpath, contents in files.items():
+            path = self.instance_tmpdir.getpath(os.path.join(name, relpath))
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                f.write(contents)
+        return self.instance_tmpdir.getpath(name)
+
+    def read_tree(self, rootdir):
+        out = {}
+        for dirpath, _, filenames in os.walk(rootdir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, 'rb') as f:
+                    out[os.path.relpath(path, rootdir)] = f.read()
+        return out
+
+    def test_add_tree(self):
+        first_files = {
+            os.path.join('1', 'data'): b'unchanged',
+            os.path.join('2', 'data'): b'old',
+        }
+        second_files = {
+            os.path.join('1', 'data'): b'unchanged',
+            os.path.join('2', 'data'): b'new',
+            os.path.join('3', 'data'): b'unchanged',
+        }
+        first = self.write_tree('first', first_files)
+        second = self.write_tree('second', second_files)
+
+        assert_equal(self.store.add_tree(first), 0)
+        assert_equal(self.store.add_tree(second), 2 * len(b'unchanged'))
+        # adding a tree again doesn't read the files which are linked
+        assert_equal(self.store.add_tree(second), 0)
+
+        assert_equal(self.read_tree(first), first_files)
+        assert_equal(self.read_tree(second), second_files)
+
+        unchanged = os.path.join(first, '1', 'data')
+        for path in (os.path.join(second, '1', 'data'),
+                     os.path.join(second, '3', 'data')):
+            assert_true(os.path.samefile(unchanged, path))
+        assert_false(os.path.samefile(
+            os.path.join(first, '2', 'data'),
+            os.path.join(second, '2', 'data'),
+        ))
+        # one file per distinct contents
+        assert_equal(len(self.read_tree(self.store.rootdir)), 3)
+
+    def test_collect_garbage(self):
+        first = self.write_tree('first', {'a': b'old', 'b': b'both'})
+        second = self.write_tree('second', {'a': b'new', 'b': b'both'})
+        self.store.add_tree(first)
+        self.store.add_tree(second)
+
+        assert_equal(self.store.collect_garbage(), 0)
+
+        shutil.rmtree(first)
+        assert_equal(self.store.collect_garbage(), len(b'old'))
+        assert_equal(
+            sorted(self.read_tree(self.store.rootdir).values()),
+            [b'both', b'new'],
+        )
+        assert_equal(self.read_tree(second), {'a': b'new', 'b': b'both'})
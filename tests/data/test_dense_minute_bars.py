@@ -0,0 +1,262 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import timedelta
+import os
+
+from numpy import arange, nan
+from numpy.testing import assert_almost_equal, assert_array_equal
+from pandas import DataFrame, Timestamp
+
+from zipline.data.dense_minute_bars import (
+    DenseMinuteBarReader,
+    DenseMinuteBarWriter,
+)
+from zipline.data.minute_bars import (
+    BcolzMinuteBarReader,
+    BcolzMinuteBarWriter,
+    BcolzMinuteOverlappingData,
+    US_EQUITIES_MINUTES_PER_DAY,
+)
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+
+TEST_CALENDAR_START = Timestamp('2015-11-02', tz='UTC')
+TEST_CALENDAR_STOP = Timestamp('2015-12-31', tz='UTC')
+
+
+class DenseMinuteBarTestCase(WithTradingCalendars,
+                             WithAssetFinder,
+                             WithInstanceTmpDir,
+                             ZiplineTestCase):
+
+    ASSET_FINDER_EQUITY_SIDS = 1, 2, 3
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(DenseMinuteBarTestCase, cls).init_class_fixtures()
+
+        cal = cls.trading_calendar.schedule.loc[
+            TEST_CALENDAR_START:TEST_CALENDAR_STOP
+        ]
+        cls.market_opens = cal.market_open
+        cls.market_closes = cal.market_close
+
+    def init_instance_fixtures(self):
+        super(DenseMinuteBarTestCase, self).init_instance_fixtures()
+
+        self.dest = self.instance_tmpdir.getpath('dense_minute_bars')
+        os.makedirs(self.dest)
+        self.writer = DenseMinuteBarWriter(
+            self.dest,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+        )
+        self.reader = DenseMinuteBarReader(self.dest)
+
+    def make_frames(self, minutes):
+        frames = {}
+        for sid in self.ASSET_FINDER_EQUITY_SIDS:
+            # Each sid only trades on some minutes, and sid 3 only starts
+            # trading partway through.
+            volume = arange(len(minutes)) % (sid + 4) * (sid * 100)
+            volume[:(sid - 1) * 500] = 0
+            close = (arange(len(minutes)) + 10.0) * sid
+            close[volume == 0] = nan
+            frames[sid] = DataFrame(
+                data={
+                    'open': close + 0.5,
+                    'high': close + 1.0,
+                    'low': close - 1.0,
+                    'close': close,
+                    'volume': volume,
+                },
+                index=minutes,
+            )
+        return frames
+
+    def test_matches_bcolz_minute_bars(self):
+        """
+        Reads of the dense format should be identical to reads of the same
+        data written with the BcolzMinuteBarWriter, including windows that
+        span the early close on 2015-11-27.
+        """
+        sessions = self.trading_calendar.sessions_in_range(
+            Timestamp('2015-11-24', tz='UTC'),
+            Timestamp('2015-12-01', tz='UTC'),
+        )
+        minutes = self.trading_calendar.minutes_for_sessions_in_range(
+            sessions[0],
+            sessions[-1],
+        )
+        frames = self.make_frames(minutes)
+
+        bcolz_dest = self.instance_tmpdir.getpath('bcolz_minute_bars')
+        os.makedirs(bcolz_dest)
+        BcolzMinuteBarWriter(
+            bcolz_dest,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+        ).write(sorted(frames.items()))
+        expected_reader = BcolzMinuteBarReader(bcolz_dest)
+
+        self.writer.write(sorted(frames.items()))
+
+        sids = [3, 1, 2]
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        for start, end in [(0, 10),
+                           (5, len(minutes) - 1),
+                           (300, 1000),
+                           (len(minutes) - 50, len(minutes) - 1)]:
+            expected = expected_reader.load_raw_arrays(
+                columns, minutes[start], minutes[end], sids,
+            )
+            result = self.reader.load_raw_arrays(
+                columns, minutes[start], minutes[end], sids,
+            )
+            for expected_array, result_array in zip(expected, result):
+                assert_array_equal(result_array, expected_array)
+
+        for minute in minutes[::37]:
+            for sid in sids:
+                for column in columns:
+                    assert_array_equal(
+                        self.reader.get_value(sid, minute, column),
+                        expected_reader.get_value(sid, minute, column),
+                    )
+                asset = self.asset_finder.retrieve_asset(sid)
+                self.assertEqual(
+                    self.reader.get_last_traded_dt(asset, minute),
+                    expected_reader.get_last_traded_dt(asset, minute),
+                )
+
+    def test_write_in_batches_of_sids(self):
+        minutes = self.trading_calendar.minutes_for_session(
+            Timestamp('2015-11-24', tz='UTC'),
+        )
+        frames = self.make_frames(minutes)
+
+        self.writer.write([(2, frames[2])])
+        self.writer.write([(1, frames[1])])
+
+        result_close, result_volume = self.reader.load_raw_arrays(
+            ['close', 'volume'], minutes[0], minutes[-1], [1, 2],
+        )
+        for i, sid in enumerate([1, 2]):
+            assert_array_equal(result_close[:, i], frames[sid].close.values)
+            assert_array_equal(result_volume[:, i], frames[sid].volume.values)
+
+        with self.assertRaises(BcolzMinuteOverlappingData):
+            self.writer.write([(1, frames[1])])
+
+    def test_write_session(self):
+        session = Timestamp('2015-11-24', tz='UTC')
+        minutes = self.trading_calendar.minutes_for_session(session)
+        frames = self.make_frames(minutes)
+
+        self.writer.write_session(session, sorted(frames.items()))
+
+        for minute in minutes[::41]:
+            for sid, frame in frames.items():
+                assert_almost_equal(
+                    self.reader.get_value(sid, minute, 'close'),
+                    frame.close[minute],
+                )
+
+        with self.assertRaises(ValueError):
+            self.writer.write_session(
+                Timestamp('2015-11-25', tz='UTC'),
+                [(1, frames[1])],
+            )
+
+    def test_missing_sessions_and_sids(self):
+        minute = self.market_opens[Timestamp('2015-11-24', tz='UTC')]
+        self.writer.write([(1, DataFrame(
+            data={
+                'open': [10.0],
+                'high': [20.0],
+                'low': [30.0],
+                'close': [40.0],
+                'volume': [50.0]
+            },
+            index=[minute],
+        ))])
+
+        # Sid 2 was not written for the session, and the next session was
+        # not written at all.
+        self.assertEqual(self.reader.get_value(2, minute, 'volume'), 0)
+        assert_almost_equal(self.reader.get_value(2, minute, 'close'), nan)
+        next_open = self.market_opens[Timestamp('2015-11-25', tz='UTC')]
+        assert_almost_equal(self.reader.get_value(1, next_open, 'close'), nan)
+
+        close, = self.reader.load_raw_arrays(
+            ['close'], minute, next_open, [1, 2],
+        )
+        self.assertEqual(close.shape, (US_EQUITIES_MINUTES_PER_DAY + 1, 2))
+        self.assertEqual(close[0, 0], 40.0)
+        assert_almost_equal(close[1:, 0], nan)
+        assert_almost_equal(close[:, 1], nan)
+
+        asset = self.asset_finder.retrieve_asset(1)
+        self.assertEqual(
+            self.reader.get_last_traded_dt(asset, next_open),
+            minute,
+        )
+
+        session_ix = self.market_opens.index.get_loc(
+            Timestamp('2015-11-24', tz='UTC'),
+        )
+        self.assertEqual(
+            self.reader.table_len(1),
+            (session_ix + 1) * US_EQUITIES_MINUTES_PER_DAY,
+        )
+        self.assertEqual(self.reader.table_len(2), 0)
+
+    def test_early_market_close(self):
+        friday_after_tday = Timestamp('2015-11-27', tz='UTC')
+        friday_after_tday_close = self.market_closes[friday_after_tday]
+
+        before_early_close = friday_after_tday_close - timedelta(minutes=8)
+        after_early_close = friday_after_tday_close + timedelta(minutes=8)
+
+        monday_after_tday = Timestamp('2015-11-30', tz='UTC')
+        minute = self.market_opens[monday_after_tday]
+
+        sid = 1
+        data = DataFrame(
+            data={
+                'open': [10.0, 11.0, nan],
+                'high': [20.0, 21.0, nan],
+                'low': [30.0, 31.0, nan],
+                'close': [40.0, 41.0, nan],
+                'volume': [50, 51, 0]
+            },
+            index=[before_early_close, after_early_close, minute])
+        self.writer.write([(sid, data)])
+
+        self.assertEquals(0, self.reader.get_value(sid, minute, 'volume'))
+
+        asset = self.asset_finder.retrieve_asset(sid)
+        self.assertEquals(
+            self.reader.get_last_traded_dt(asset, minute),
+            before_early_close,
+        )
@@ -1105,3 +1105,70 @@ class BcolzMinuteBarTestCase(WithTradingCalendars,
                           "The last traded dt should be before the early "
                           "close, even when data is written between the early "
                           "close and the next open.")
+
+    def test_session_cache_matches_uncached_reads(self):
+        """
+        Reads through the session cache should be identical to reads straight
+        from the carrays, including windows that span early closes.
+        """
+        sessions = self.trading_calendar.sessions_in_range(
+            Timestamp('2015-11-24', tz='UTC'),
+            Timestamp('2015-12-01', tz='UTC'),
+        )
+        minutes = self.trading_calendar.minutes_for_sessions_in_range(
+            sessions[0],
+            sessions[-1],
+        )
+        sids = [1, 2]
+        for sid in sids:
+            volume = arange(len(minutes)) % 7 * (sid * 100)
+            close = (arange(len(minutes)) + 10.0) * sid
+            close[volume == 0] = nan
+            self.writer.write_sid(sid, DataFrame(
+                data={
+                    'open': close + 0.5,
+                    'high': close + 1.0,
+                    'low': close - 1.0,
+                    'close': close,
+                    'volume': volume,
+                },
+                index=minutes,
+            ))
+
+        plain_reader = BcolzMinuteBarReader(self.dest)
+        cached_reader = BcolzMinuteBarReader(
+            self.dest,
+            # Room for only a few blocks so that eviction is exercised.
+            session_cache_bytes=US_EQUITIES_MINUTES_PER_DAY * 2 * 2 * 4 * 4,
+            sessions_per_cache_block=2,
+        )
+
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        for start, end in [(0, 10),
+                           (5, len(minutes) - 1),
+                           (300, 1000),
+                           (len(minutes) - 50, len(minutes) - 1)]:
+            expected = plain_reader.load_raw_arrays(
+                columns, minutes[start], minutes[end], sids,
+            )
+            result = cached_reader.load_raw_arrays(
+                columns, minutes[start], minutes[end], sids,
+            )
+            for expected_array, result_array in zip(expected, result):
+                assert_array_equal(result_array, expected_array)
+
+        for minute in minutes[::37]:
+            for sid in sids:
+                for column in columns:
+                    assert_array_equal(
+                        cached_reader.get_value(sid, minute, column),
+                        plain_reader.get_value(sid, minute, column),
+                    )
+                asset = self.asset_finder.retrieve_asset(sid)
+                self.assertEqual(
+                    cached_reader.get_last_traded_dt(asset, minute),
+                    plain_reader.get_last_traded_dt(asset, minute),
+                )
+
+        cache = cached_reader._session_cache
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
@@ -29,6 +29,11 @@ from pandas import (
 )
 from pandas.util.testing import assert_index_equal
 
+from zipline.data.memmap_daily_bars import (
+    MemmapDailyBarReader,
+    MemmapDailyBarWriter,
+    convert_bcolz_daily_bars,
+)
 from zipline.data.us_equity_pricing import (
     BcolzDailyBarReader,
     NoDataBeforeDate,
@@ -362,3 +367,62 @@ class BcolzDailyBarNeverReadAllTestCase(BcolzDailyBarTestCase):
     `load_raw_array`.
     """
     BCOLZ_DAILY_BAR_READ_ALL_THRESHOLD = maxsize
+
+
+class MemmapDailyBarTestCase(BcolzDailyBarTestCase):
+    """
+    Run the tests defined in BcolzDailyBarTestCase against a
+    MemmapDailyBarReader reading a conversion of the bcolz data.
+    """
+    @classmethod
+    def init_class_fixtures(cls):
+        super(MemmapDailyBarTestCase, cls).init_class_fixtures()
+        cls.bcolz_equity_daily_bar_reader = MemmapDailyBarReader(
+            convert_bcolz_daily_bars(
+                cls.bcolz_daily_bar_ctable,
+                cls.tmpdir.getpath('daily_equities.memmap'),
+            ),
+        )
+
+    def test_unadjusted_get_value_empty_value(self):
+        # The memory-mapped columns are read-only, so put a writable copy of
+        # the close column in the reader's spot cache.
+        reader = self.bcolz_equity_daily_bar_reader
+        reader._spot_cols['close'] = reader._table['close'].copy()
+        try:
+            super(
+                MemmapDailyBarTestCase,
+                self,
+            ).test_unadjusted_get_value_empty_value()
+        finally:
+            del reader._spot_cols['close']
+
+    def test_writer_matches_conversion(self):
+        writer = MemmapDailyBarWriter(
+            self.tmpdir.getpath('written.memmap'),
+            self.trading_calendar,
+            self.sessions[0],
+            self.sessions[-1],
+        )
+        reader = MemmapDailyBarReader(
+            writer.write(self.make_equity_daily_bar_data()),
+        )
+        expected = self.bcolz_equity_daily_bar_reader
+        columns = list(OHLCV)
+        for actual, result in zip(
+            reader.load_raw_arrays(
+                columns,
+                self.sessions[0],
+                self.sessions[-1],
+                self.assets,
+            ),
+            expected.load_raw_arrays(
+                columns,
+                self.sessions[0],
+                self.sessions[-1],
+                self.assets,
+            ),
+        ):
+            assert_array_equal(actual, result)
+        self.assertEqual(reader.first_trading_day, expected.first_trading_day)
+        assert_index_equal(reader.sessions, expected.sessions)
@@ -21,7 +21,7 @@ import warnings
 from nose_parameterized import parameterized
 import pandas as pd
 from six import iteritems
-from six.moves import range, map
+from six.moves import range, map, zip
 
 import zipline.utils.events
 from zipline.utils.calendars import get_calendar
@@ -459,6 +459,48 @@ class StatelessRulesTests(RuleTestCase):
         with self.assertRaises(TypeError):
             rule_type(3.1)
 
+    def test_compiled_rules(self):
+        # Spans two month starts and the half day after Thanksgiving.
+        sessions = self.cal.sessions_in_range(
+            pd.Timestamp('2014-10-27', tz='UTC'),
+            pd.Timestamp('2014-12-05', tz='UTC'),
+        )
+
+        def rules():
+            def with_cal(rule):
+                rule.cal = self.cal
+                return rule
+
+            return [
+                with_cal(NthTradingDayOfMonth(2)) &
+                with_cal(AfterOpen(minutes=30)),
+                with_cal(NDaysBeforeLastTradingDayOfWeek(1)) &
+                with_cal(BeforeClose(hours=1)) &
+                with_cal(NotHalfDay()),
+                with_cal(NthTradingDayOfWeek(0)) & Always(),
+                Never() & with_cal(AfterOpen(minutes=1)),
+            ]
+
+        expected_rules = rules()
+        compiled_rules = rules()
+        em = EventManager()
+        for rule in compiled_rules:
+            em.add_event(Event(rule))
+        em.compile(sessions, self.cal)
+
+        minutes = self.cal.minutes_for_sessions_in_range(
+            sessions[0],
+            sessions[-1],
+        )
+        for expected, compiled in zip(expected_rules, compiled_rules):
+            self.assertIn('should_trigger', vars(compiled))
+            for minute in minutes:
+                self.assertEqual(
+                    compiled.should_trigger(minute),
+                    expected.should_trigger(minute),
+                    msg='rule %r at %s' % (compiled, minute),
+                )
+
     def test_invalid_offsets(self):
         with self.assertRaises(ValueError):
             NthTradingDayOfWeek(5)
@@ -25,7 +25,7 @@ from nose_parameterized import parameterized
 import pandas as pd
 from pandas.tslib import normalize_date
 
-from zipline.finance.slippage import VolumeShareSlippage
+from zipline.finance.slippage import FixedSlippage, VolumeShareSlippage
 
 from zipline.protocol import DATASOURCE_TYPE, BarData
 from zipline.finance.blotter import Order
@@ -52,7 +52,7 @@ class SlippageTestCase(WithCreateBarData,
     SIM_PARAMS_DATA_FREQUENCY = 'minute'
     SIM_PARAMS_EMISSION_RATE = 'daily'
 
-    ASSET_FINDER_EQUITY_SIDS = (133,)
+    ASSET_FINDER_EQUITY_SIDS = (133, 134, 135)
     ASSET_FINDER_EQUITY_START_DATE = pd.Timestamp('2006-01-05', tz='utc')
     ASSET_FINDER_EQUITY_END_DATE = pd.Timestamp('2006-01-07', tz='utc')
     minutes = pd.DatetimeIndex(
@@ -77,11 +77,143 @@ class SlippageTestCase(WithCreateBarData,
             },
             index=cls.minutes,
         )
+        # thinly traded, with a bar without any volume
+        yield 134, pd.DataFrame(
+            {
+                'open': [10.0, 10.5, 11.0, 11.0, 10.5],
+                'high': [11.5, 11.5, 11.5, 11.5, 11.5],
+                'low': [9.5, 9.5, 9.5, 9.5, 9.5],
+                'close': [10.0, 10.5, 11.0, 11.0, 10.5],
+                'volume': [400, 0, 40, 1000, 100],
+            },
+            index=cls.minutes,
+        )
+        # never traded
+        yield 135, pd.DataFrame(
+            {
+                'open': [5.0] * 5,
+                'high': [5.0] * 5,
+                'low': [5.0] * 5,
+                'close': [5.0] * 5,
+                'volume': [0] * 5,
+            },
+            index=cls.minutes,
+        )
 
     @classmethod
     def init_class_fixtures(cls):
         super(SlippageTestCase, cls).init_class_fixtures()
         cls.ASSET133 = cls.env.asset_finder.retrieve_asset(133)
+        cls.ASSET134 = cls.env.asset_finder.retrieve_asset(134)
+        cls.ASSET135 = cls.env.asset_finder.retrieve_asset(135)
+
+    @parameterized.expand([
+        ('volume_share', VolumeShareSlippage()),
+        ('volume_share_small_limit', VolumeShareSlippage(volume_limit=0.01)),
+        ('fixed', FixedSlippage(spread=0.1)),
+    ])
+    def test_simulate_all_matches_simulate(self, name, slippage_model):
+        # Each asset has several orders, so the k-th orders of the assets are
+        # batched together, and the orders of the thinly traded asset run out
+        # of liquidity before the others do.
+        order_args = [
+            (self.ASSET133, [
+                (30, None),
+                (-20, 3.0),
+                (100, 3.6),
+                (-500, None),
+                (5, None),
+            ]),
+            (self.ASSET134, [
+                (-5, None),
+                (20, 10.8),
+                (3, None),
+                (-1, None),
+            ]),
+            (self.ASSET135, [
+                (10, None),
+                (-10, None),
+            ]),
+        ]
+
+        def make_orders():
+            return [
+                (asset, [
+                    Order(
+                        dt=self.minutes[0],
+                        amount=amount,
+                        filled=0,
+                        sid=asset,
+                        limit=limit,
+                    )
+                    for amount, limit in args
+                ])
+                for asset, args in order_args
+            ]
+
+        def fills(orders_by_asset, simulated):
+            # Identify each order by its asset and its position among the
+            # orders for that asset.
+            locs = {
+                id(order): (asset, i)
+                for asset, orders in orders_by_asset
+                for i, order in enumerate(orders)
+            }
+            return [
+                (locs[id(order)], txn.amount, txn.price)
+                for order, txn in simulated
+            ]
+
+        for minute in self.minutes:
+            bar_data = self.create_bardata(
+                simulation_dt_func=lambda: minute,
+            )
+
+            expected_orders = make_orders()
+            expected = fills(
+                expected_orders,
+                [
+                    fill
+                    for asset, orders in expected_orders
+                    for fill in slippage_model.simulate(
+                        bar_data,
+                        asset,
+                        orders,
+                    )
+                ],
+            )
+
+            orders = make_orders()
+            result = fills(
+                orders,
+                slippage_model.simulate_all(bar_data, orders),
+            )
+            self.assertEqual(result, expected)
+
+    def test_simulate_all_custom_process_order(self):
+        class CustomSlippage(VolumeShareSlippage):
+            def process_order(self, data, order):
+                return 1.0, order.open_amount
+
+        self.assertTrue(VolumeShareSlippage()._can_process_orders())
+        slippage_model = CustomSlippage()
+        self.assertFalse(slippage_model._can_process_orders())
+
+        order = Order(
+            dt=self.minutes[0],
+            amount=100,
+            filled=0,
+            sid=self.ASSET133,
+        )
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.minutes[0],
+        )
+        (_, txn), = slippage_model.simulate_all(
+            bar_data,
+            [(self.ASSET133, [order])],
+        )
+        self.assertEqual(txn.price, 1.0)
+        self.assertEqual(txn.amount, 100)
 
     def test_orders_limit(self):
         slippage_model = VolumeShareSlippage()
@@ -4,6 +4,7 @@ Tests for SimplePipelineEngine
 from __future__ import division
 from collections import OrderedDict
 from itertools import product
+from multiprocessing.pool import ThreadPool
 from operator import add, sub
 
 from nose_parameterized import parameterized
@@ -43,7 +44,10 @@ from zipline.lib.labelarray import LabelArray
 from zipline.pipeline import CustomFactor, Pipeline
 from zipline.pipeline.data import Column, DataSet, USEquityPricing
 from zipline.pipeline.data.testing import TestingDataSet
-from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.pipeline.engine import (
+    SimplePipelineEngine,
+    pipeline_graph_hash,
+)
 from zipline.pipeline.factors import (
     AverageDollarVolume,
     EWMA,
@@ -84,6 +88,7 @@ from zipline.testing.fixtures import (
 from zipline.testing.predicates import assert_equal
 from zipline.utils.memoize import lazyval
 from zipline.utils.numpy_utils import bool_dtype, datetime64ns_dtype
+from zipline.utils.pool import SequentialPool
 
 
 class RollingSumDifference(CustomFactor):
@@ -161,6 +166,31 @@ class RecordingPrecomputedLoader(PrecomputedLoader):
         )
 
 
+class TruncatedRepr(object):
+    """A hashable parameter whose repr doesn't show all of its value.
+    """
+    def __init__(self, values):
+        self.values = tuple(values)
+
+    def __eq__(self, other):
+        return self.values == other.values
+
+    def __hash__(self):
+        return hash(self.values)
+
+    def __repr__(self):
+        return 'TruncatedRepr(%r, ...)' % (self.values[:1],)
+
+
+class WeightedClose(CustomFactor):
+    window_length = 1
+    inputs = [USEquityPricing.close]
+    params = ('weights',)
+
+    def compute(self, today, assets, out, close, weights):
+        out[:] = close[-1] * weights[0]
+
+
 class RollingSumSum(CustomFactor):
     def compute(self, today, assets, out, *inputs):
         assert len(self.inputs) == len(inputs)
@@ -376,6 +406,169 @@ class ConstantInputTestCase(WithConstantInputs, ZiplineTestCase):
             full(shape, -2 * high_factor.window_length, dtype=float),
         )
 
+    def test_run_pipelines_shares_terms(self):
+        loader = RecordingPrecomputedLoader(
+            constants=self.constants,
+            dates=self.dates,
+            sids=self.asset_ids,
+        )
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        dates = self.dates[10:15]
+
+        short_factor = RollingSumDifference(window_length=3)
+        long_factor = RollingSumDifference(window_length=5)
+        pipelines = {
+            'short': Pipeline(
+                columns={'factor': short_factor, 'close': short_factor},
+            ),
+            'long': Pipeline(
+                columns={'factor': long_factor, 'short': short_factor},
+                screen=long_factor < 0,
+            ),
+        }
+
+        results = engine.run_pipelines(pipelines, dates[0], dates[-1])
+        self.assertEqual(set(results), set(pipelines))
+
+        # Each set of columns was loaded only once for both pipelines.
+        self.assertEqual(len(loader.load_calls), len(set(loader.load_calls)))
+
+        for name, pipeline in iteritems(pipelines):
+            assert_frame_equal(
+                results[name],
+                engine.run_pipeline(pipeline, dates[0], dates[-1]),
+            )
+
+    @parameterized.expand([('sequential',), ('threads',)])
+    def test_pool_matches_serial(self, pool_type):
+        if pool_type == 'sequential':
+            pool = SequentialPool()
+        else:
+            pool = ThreadPool(4)
+            self.add_instance_callback(pool.join)
+            self.add_instance_callback(pool.close)
+
+        def run(pool):
+            loader = RecordingPrecomputedLoader(
+                constants=self.constants,
+                dates=self.dates,
+                sids=self.asset_ids,
+            )
+            engine = SimplePipelineEngine(
+                lambda column: loader,
+                self.dates,
+                self.asset_finder,
+                pool=pool,
+            )
+            short_factor = RollingSumDifference(window_length=3)
+            long_factor = RollingSumDifference(window_length=5)
+            high_factor = RollingSumDifference(
+                window_length=3,
+                inputs=[USEquityPricing.open, USEquityPricing.high],
+            )
+            pipeline = Pipeline(
+                columns={
+                    'short': short_factor,
+                    'long': long_factor,
+                    'high': high_factor,
+                    'sum': short_factor + long_factor - high_factor,
+                    'rank': high_factor.rank(),
+                },
+                screen=short_factor < 0,
+            )
+            result = engine.run_pipeline(
+                pipeline, self.dates[10], self.dates[20],
+            )
+            return result, loader.load_calls
+
+        expected, expected_calls = run(None)
+        result, calls = run(pool)
+
+        assert_frame_equal(result, expected)
+        self.assertEqual(len(calls), len(expected_calls))
+        self.assertEqual(set(calls), set(expected_calls))
+
+    def test_pipeline_graph_hash(self):
+        def make_pipeline(window_length):
+            factor = RollingSumDifference(window_length=window_length)
+            return Pipeline(
+                columns={'factor': factor, 'rank': factor.rank()},
+                screen=factor < 0,
+            )
+
+        self.assertEqual(
+            pipeline_graph_hash({'a': make_pipeline(3)}),
+            pipeline_graph_hash({'a': make_pipeline(3)}),
+        )
+        self.assertNotEqual(
+            pipeline_graph_hash({'a': make_pipeline(3)}),
+            pipeline_graph_hash({'a': make_pipeline(5)}),
+        )
+        self.assertNotEqual(
+            pipeline_graph_hash({'a': make_pipeline(3)}),
+            pipeline_graph_hash({'b': make_pipeline(3)}),
+        )
+
+    def test_pipeline_graph_hash_params(self):
+        def graph_hash(weights):
+            return pipeline_graph_hash({
+                'a': Pipeline(columns={'w': WeightedClose(weights=weights)}),
+            })
+
+        # params which only differ after the start of a long tuple
+        first = (1.0,) + (0.0,) * 1000
+        second = (1.0,) + (0.0,) * 999 + (1.0,)
+        self.assertEqual(graph_hash(first), graph_hash(first))
+        self.assertNotEqual(graph_hash(first), graph_hash(second))
+        self.assertEqual(
+            graph_hash(frozenset([1, 2])),
+            graph_hash(frozenset([2, 1])),
+        )
+
+        # Objects whose repr may not identify them aren't hashed.
+        self.assertIsNone(graph_hash(TruncatedRepr(first)))
+        self.assertIsNone(graph_hash(object()))
+
+    def test_result_cache(self):
+        loader = RecordingPrecomputedLoader(
+            constants=self.constants,
+            dates=self.dates,
+            sids=self.asset_ids,
+        )
+        result_cache = {}
+        engine = SimplePipelineEngine(
+            lambda column: loader,
+            self.dates,
+            self.asset_finder,
+            result_cache=result_cache,
+        )
+        factor = RollingSumDifference(window_length=3)
+        pipeline = Pipeline(columns={'factor': factor})
+
+        expected = engine.run_pipeline(
+            pipeline, self.dates[10], self.dates[20],
+        )
+        self.assertEqual(len(result_cache), 1)
+        calls = len(loader.load_calls)
+
+        # An equivalent pipeline is read from the cache without loading any
+        # data.
+        factor = RollingSumDifference(window_length=3)
+        result = engine.run_pipeline(
+            Pipeline(columns={'factor': factor}),
+            self.dates[10],
+            self.dates[20],
+        )
+        assert_frame_equal(result, expected)
+        self.assertEqual(len(loader.load_calls), calls)
+
+        # Different dates are computed again.
+        engine.run_pipeline(pipeline, self.dates[10], self.dates[15])
+        self.assertEqual(len(result_cache), 2)
+        self.assertGreater(len(loader.load_calls), calls)
+
     def test_numeric_factor(self):
         constants = self.constants
         loader = self.loader
@@ -1075,6 +1268,103 @@ class SyntheticBcolzTestCase(WithAdjustmentReader,
 
         assert_frame_equal(expected, result)
 
+    @parameterized.expand([
+        ('one_session', 1, None, None),
+        ('several_sessions', 4, None, None),
+        ('one_chunk', 1000, None, None),
+        ('process_pool', 4, 2, None),
+        # The forked workers don't have the engine's pool threads.
+        ('process_pool_engine_thread_pool', 4, 2, 2),
+        ('engine_thread_pool', 4, None, 2),
+    ])
+    def test_chunked_pipeline(self,
+                              name,
+                              chunksize,
+                              processes,
+                              engine_threads):
+        if engine_threads is None:
+            engine_pool = None
+        else:
+            engine_pool = ThreadPool(engine_threads)
+            self.add_instance_callback(engine_pool.join)
+            self.add_instance_callback(engine_pool.close)
+        engine = SimplePipelineEngine(
+            lambda column: self.pipeline_loader,
+            self.trading_calendar.all_sessions,
+            self.asset_finder,
+            pool=engine_pool,
+        )
+        dates = date_range(
+            self.first_asset_start + self.trading_calendar.day,
+            self.last_asset_end,
+            freq=self.trading_calendar.day,
+        )
+        SMA = SimpleMovingAverage(
+            inputs=(USEquityPricing.close,),
+            window_length=5,
+        )
+        pipeline = Pipeline(
+            columns={
+                'sma': SMA,
+                'drawdown': MaxDrawdown(
+                    inputs=(USEquityPricing.close,),
+                    window_length=3,
+                ),
+                'rank': SMA.rank(),
+            },
+            screen=USEquityPricing.volume.latest > 0,
+        )
+
+        # This also loads the adjustments before any workers are forked.
+        expected = engine.run_pipeline(pipeline, dates[5], dates[-1])
+        result = engine.run_chunked_pipeline(
+            pipeline,
+            dates[5],
+            dates[-1],
+            chunksize,
+            processes=processes,
+        )
+        assert_frame_equal(result, expected)
+
+    def test_chunked_pipeline_engine_pool(self):
+        pool = ThreadPool(2)
+        self.add_instance_callback(pool.join)
+        self.add_instance_callback(pool.close)
+        engine = SimplePipelineEngine(
+            lambda column: self.pipeline_loader,
+            self.trading_calendar.all_sessions,
+            self.asset_finder,
+            pool=pool,
+        )
+        sessions = self.trading_calendar.sessions_in_range(
+            self.first_asset_start,
+            self.last_asset_end,
+        )
+        with self.assertRaises(ValueError):
+            engine.run_chunked_pipeline(
+                Pipeline(columns={'close': USEquityPricing.close.latest}),
+                sessions[1],
+                sessions[-1],
+                chunksize=2,
+                pool=pool,
+            )
+
+    def test_chunked_pipeline_no_sessions(self):
+        engine = SimplePipelineEngine(
+            lambda column: self.pipeline_loader,
+            self.trading_calendar.all_sessions,
+            self.asset_finder,
+        )
+        sessions = self.trading_calendar.all_sessions
+        weekend = date_range(sessions[0], sessions[10]).difference(sessions)
+        with self.assertRaises(ValueError):
+            engine.run_chunked_pipeline(
+                Pipeline(),
+                weekend[0],
+                weekend[0],
+                chunksize=2,
+            )
+
 
 class ParameterizedFactorTestCase(WithTradingEnvironment, ZiplineTestCase):
     sids = ASSET_FINDER_EQUITY_SIDS = Int64Index([1, 2, 3])
@@ -1322,6 +1612,23 @@ class StringColumnTestCase(WithSeededRandomPipelineEngine,
         )
         assert_frame_equal(result.c.unstack(), expected_final_result)
 
+    def test_chunked_pipeline_categoricals(self):
+        col = TestingDataSet.categorical_col
+        pipe = Pipeline(columns={'c': col.latest})
+
+        run_dates = self.trading_days[-10:]
+        start_date, end_date = run_dates[[0, -1]]
+
+        expected = self.run_pipeline(pipe, start_date, end_date)
+        result = self.seeded_random_engine.run_chunked_pipeline(
+            pipe,
+            start_date,
+            end_date,
+            chunksize=3,
+        )
+        assert isinstance(result.c.values, Categorical)
+        assert_frame_equal(result.astype(object), expected.astype(object))
+
 
 class WindowSafetyPropagationTestCase(WithSeededRandomPipelineEngine,
                                       ZiplineTestCase):
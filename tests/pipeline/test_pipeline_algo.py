@@ -1,12 +1,16 @@
 """
 Tests for Algorithms using the Pipeline API.
 """
+from contextlib import closing
 from os.path import (
     dirname,
     join,
     realpath,
 )
 
+from multiprocessing.pool import ThreadPool
+import sqlite3
+
 from nose_parameterized import parameterized
 from numpy import (
     array,
@@ -27,6 +31,7 @@ from pandas import (
     Timestamp,
 )
 from pandas.tseries.tools import normalize_date
+from pandas.util.testing import assert_frame_equal
 from six import iteritems, itervalues
 
 from zipline.algorithm import TradingAlgorithm
@@ -35,6 +40,10 @@ from zipline.api import (
     pipeline_output,
     get_datetime,
 )
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    SQLiteAdjustmentReader,
+)
 from zipline.errors import (
     AttachPipelineAfterInitialize,
     PipelineOutputDuringInitialize,
@@ -331,6 +340,124 @@ class ClosesOnly(WithDataPortal, ZiplineTestCase):
         # Run for a week in the middle of our data.
         algo.run(self.data_portal)
 
+    def test_multiple_pipelines(self):
+        """
+        Assert that several attached pipelines each get their own results
+        when they are computed together.
+        """
+        def initialize(context):
+            p1 = attach_pipeline(Pipeline(), 'first', chunksize=3)
+            p1.add(USEquityPricing.close.latest, 'close')
+
+            p2 = attach_pipeline(Pipeline(), 'second', chunksize=5)
+            p2.add(USEquityPricing.close.latest, 'close')
+            p2.add(USEquityPricing.close.latest, 'other_close')
+
+        def handle_data(context, data):
+            first = pipeline_output('first')
+            second = pipeline_output('second')
+            self.assertEqual(list(first.columns), ['close'])
+            self.assertEqual(
+                sorted(second.columns), ['close', 'other_close'],
+            )
+            date = get_datetime().normalize()
+            for asset in self.assets:
+                exists_today = self.exists(date, asset)
+                existed_yesterday = self.exists(date - self.trading_day, asset)
+                if exists_today and existed_yesterday:
+                    expected = self.expected_close(date, asset)
+                    self.assertEqual(first.loc[asset, 'close'], expected)
+                    self.assertEqual(second.loc[asset, 'close'], expected)
+                    self.assertEqual(
+                        second.loc[asset, 'other_close'], expected,
+                    )
+                else:
+                    self.assertNotIn(asset, first.index)
+                    self.assertNotIn(asset, second.index)
+
+        algo = TradingAlgorithm(
+            initialize=initialize,
+            handle_data=handle_data,
+            data_frequency='daily',
+            get_pipeline_loader=lambda column: self.pipeline_loader,
+            start=self.first_asset_start,
+            end=self.last_asset_end,
+            env=self.env,
+        )
+        algo.run(self.data_portal)
+
+    def test_prefetch_matches_synchronous(self):
+        """
+        Assert that computing chunks in the background produces the same
+        outputs as computing them when they are requested, including when a
+        session the prefetch started on is skipped.
+        """
+        skipped = self.first_asset_start + 3 * self.trading_day
+
+        def run(pool):
+            outputs = {}
+
+            def initialize(context):
+                p = attach_pipeline(Pipeline(), 'test', chunksize=2)
+                p.add(USEquityPricing.close.latest, 'close')
+
+            def handle_data(context, data):
+                date = get_datetime().normalize()
+                if date != skipped:
+                    outputs[date] = pipeline_output('test')
+
+            def make_prefetch_pipeline_loader():
+                loader = DataFrameLoader(
+                    column=USEquityPricing.close,
+                    baseline=self.closes,
+                    adjustments=self.adjustments,
+                )
+                return lambda column: loader
+
+            TradingAlgorithm(
+                initialize=initialize,
+                handle_data=handle_data,
+                data_frequency='daily',
+                get_pipeline_loader=lambda column: self.pipeline_loader,
+                start=self.first_asset_start,
+                end=self.last_asset_end,
+                env=self.env,
+                pipeline_prefetch_pool=pool,
+                make_prefetch_pipeline_loader=(
+                    make_prefetch_pipeline_loader if pool is not None else None
+                ),
+            ).run(self.data_portal)
+            return outputs
+
+        expected = run(None)
+        pool = ThreadPool(1)
+        try:
+            result = run(pool)
+        finally:
+            pool.close()
+            pool.join()
+
+        self.assertEqual(sorted(result), sorted(expected))
+        for date, frame in iteritems(expected):
+            assert_frame_equal(result[date], frame)
+
+    def test_prefetch_requires_loader(self):
+        pool = ThreadPool(1)
+        try:
+            with self.assertRaises(ValueError):
+                TradingAlgorithm(
+                    initialize=lambda context: None,
+                    data_frequency='daily',
+                    get_pipeline_loader=lambda column: self.pipeline_loader,
+                    start=self.first_asset_start,
+                    end=self.last_asset_end,
+                    env=self.env,
+                    pipeline_prefetch_pool=pool,
+                )
+        finally:
+            pool.close()
+            pool.join()
+
 
 class MockDailyBarSpotReader(object):
     """
@@ -487,10 +614,12 @@ class PipelineAlgorithmTestCase(WithBcolzEquityDailyBarReaderFromCSVs,
         return vwaps
 
     @parameterized.expand([
-        (True,),
-        (False,),
+        ('screen', True, False),
+        ('no_screen', False, False),
+        ('screen_prefetch', True, True),
+        ('no_screen_prefetch', False, True),
     ])
-    def test_handle_adjustment(self, set_screen):
+    def test_handle_adjustment(self, name, set_screen, prefetch):
         AAPL, MSFT, BRK_A = assets = self.assets
 
         window_lengths = [1, 2, 5, 10]
@@ -513,7 +642,13 @@ class PipelineAlgorithmTestCase(WithBcolzEquityDailyBarReaderFromCSVs,
             if set_screen:
                 pipeline.set_screen(filter_)
 
-            attach_pipeline(pipeline, 'test')
+            # Use small chunks when prefetching so that most of them are
+            # computed in the background while the simulation runs.
+            attach_pipeline(
+                pipeline,
+                'test',
+                chunksize=5 if prefetch else None,
+            )
 
         def handle_data(context, data):
             today = normalize_date(get_datetime())
@@ -541,6 +676,28 @@ class PipelineAlgorithmTestCase(WithBcolzEquityDailyBarReaderFromCSVs,
         # Do the same checks in before_trading_start
         before_trading_start = handle_data
 
+        if prefetch:
+            # The prefetching worker reads the same bcolz table and
+            # adjustments as the simulation, through its own loader.
+            adjustments_path = self.tmpdir.getpath('prefetch_adjustments.db')
+            with closing(sqlite3.connect(adjustments_path)) as conn:
+                conn.executescript(
+                    '\n'.join(self.adjustment_reader.conn.iterdump()),
+                )
+
+            def make_prefetch_pipeline_loader():
+                loader = USEquityPricingLoader(
+                    BcolzDailyBarReader(self.bcolz_daily_bar_path),
+                    SQLiteAdjustmentReader(adjustments_path),
+                )
+                return lambda column: loader
+
+            pool = ThreadPool(1)
+            self.add_instance_callback(pool.join)
+            self.add_instance_callback(pool.close)
+        else:
+            make_prefetch_pipeline_loader = pool = None
+
         algo = TradingAlgorithm(
             initialize=initialize,
             handle_data=handle_data,
@@ -550,6 +707,8 @@ class PipelineAlgorithmTestCase(WithBcolzEquityDailyBarReaderFromCSVs,
             start=self.dates[max(window_lengths)],
             end=self.dates[-1],
             env=self.env,
+            pipeline_prefetch_pool=pool,
+            make_prefetch_pipeline_loader=make_prefetch_pipeline_loader,
         )
 
         algo.run(
@@ -15,6 +15,8 @@
 """
 Tests for USEquityPricingLoader and related classes.
 """
+from itertools import product
+
 from numpy import (
     arange,
     datetime64,
@@ -30,10 +32,13 @@ from pandas import (
     concat,
     DataFrame,
     Int64Index,
+    Timedelta,
     Timestamp,
 )
 from toolz.curried.operator import getitem
 
+from zipline.data.adjustment_factors import AdjustmentFactors
+from zipline.data.us_equity_pricing import SQLiteAdjustmentReader
 from zipline.lib.adjustment import Float64Multiply
 from zipline.pipeline.loaders.synthetic import (
     NullAdjustmentReader,
@@ -49,6 +54,7 @@ from zipline.pipeline.data import USEquityPricing
 from zipline.testing import (
     seconds_to_timestamp,
     str_to_seconds,
+    tmp_dir,
     MockDailyBarReader,
 )
 from zipline.testing.fixtures import (
@@ -357,7 +363,7 @@ class USEquityPricingLoaderTestCase(WithAdjustmentReader,
                     )
         return price_adjustments, volume_adjustments
 
-    def test_load_adjustments_from_sqlite(self):
+    def test_load_adjustments(self):
         columns = [USEquityPricing.close, USEquityPricing.volume]
         query_days = self.calendar_days_between(
             TEST_QUERY_START,
@@ -395,6 +401,105 @@ class USEquityPricingLoaderTestCase(WithAdjustmentReader,
                 self.assertEqual(adj.last_col, expected.last_col)
                 assert_allclose(adj.value, expected.value)
 
+    def test_adjustment_ratios(self):
+        # sid 100 has no adjustments
+        sids = list(self.assets) + [100]
+        for field in 'close', 'volume':
+            ratios = self.adjustment_reader.get_adjustment_ratios(
+                sids,
+                field,
+                TEST_QUERY_START,
+                TEST_QUERY_STOP,
+            )
+
+            if field == 'volume':
+                tables = [SPLITS]
+            else:
+                tables = [SPLITS, MERGERS, DIVIDENDS_EXPECTED]
+            expected = []
+            for sid in sids:
+                ratio = 1.0
+                for table in tables:
+                    for eff_date_secs, table_ratio, table_sid in \
+                            table.itertuples(index=False):
+                        eff_date = Timestamp(eff_date_secs, unit='s', tz='UTC')
+                        in_range = (
+                            TEST_QUERY_START <= eff_date <= TEST_QUERY_STOP
+                        )
+                        if table_sid == sid and in_range:
+                            ratio *= table_ratio
+                expected.append(1.0 / ratio if field == 'volume' else ratio)
+
+            assert_allclose(ratios, expected)
+
+    def test_adjustments_for_sid(self):
+        expected = SPLITS[SPLITS.sid == 3].sort_values('effective_date')
+        self.assertEqual(
+            self.adjustment_reader.get_adjustments_for_sid('splits', 3),
+            [
+                [Timestamp(eff_date_secs, unit='s', tz='UTC'), ratio]
+                for eff_date_secs, ratio in zip(
+                    expected.effective_date,
+                    expected.ratio,
+                )
+            ],
+        )
+        self.assertEqual(
+            self.adjustment_reader.get_adjustments_for_sid('splits', 100),
+            [],
+        )
+
+    def test_get_splits(self):
+        self.assertEqual(
+            self.adjustment_reader.get_splits(
+                {1, 3},
+                Timestamp('2015-06-10', tz='UTC'),
+            ),
+            [(3, 3.110)],
+        )
+        self.assertEqual(
+            self.adjustment_reader.get_splits(
+                {1},
+                Timestamp('2015-06-10', tz='UTC'),
+            ),
+            [],
+        )
+
+    def test_adjustment_factors(self):
+        sessions = self.trading_calendar.sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        reader = SQLiteAdjustmentReader(self.adjustment_reader.conn)
+        factors = reader.precompute_factors(sessions)
+        self.assertIs(reader.factors, factors)
+
+        with tmp_dir() as path:
+            factors.write(path.path)
+            read_factors = AdjustmentFactors.read(path.path)
+            for name in 'dates', 'sids', 'price_factors', 'volume_factors':
+                assert_array_equal(
+                    getattr(read_factors, name),
+                    getattr(factors, name),
+                )
+
+        # sid 100 has no adjustments
+        sids = list(self.assets) + [100]
+        for field in 'close', 'volume':
+            for start, end in product(sessions, repeat=2):
+                # view the start from the close of the end session
+                end += Timedelta(hours=20)
+                assert_allclose(
+                    reader.get_adjustment_ratios(sids, field, start, end),
+                    self.adjustment_reader.get_adjustment_ratios(
+                        sids,
+                        field,
+                        start,
+                        end,
+                    ),
+                    err_msg='%s %s %s' % (field, start, end),
+                )
+
     def test_read_no_adjustments(self):
         adjustment_reader = NullAdjustmentReader()
         columns = [USEquityPricing.close, USEquityPricing.volume]
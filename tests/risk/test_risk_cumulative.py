@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import empyrical
 import numpy as np
 import pandas as pd
+from nose_parameterized import parameterized
+from six import iteritems
+
 import zipline.finance.risk as risk
 from zipline.utils import factory
 
@@ -144,3 +148,100 @@ class TestRisk(WithTradingEnvironment, ZiplineTestCase):
     def test_representation(self):
         assert all([metric in self.cumulative_metrics.__repr__() for metric in
                    self.cumulative_metrics.METRIC_NAMES])
+
+
+class TestRiskMatchesEmpyrical(WithTradingEnvironment, ZiplineTestCase):
+    """
+    The incremental metrics in RiskMetricsCumulative should agree with the
+    empyrical functions applied to the full returns history.
+    """
+
+    def check_against_empyrical(self, metrics, algo_returns,
+                                benchmark_returns, create_first_day_stats):
+        algo = algo_returns.values[:metrics.latest_dt_loc + 1]
+        bench = benchmark_returns.values[:metrics.latest_dt_loc + 1]
+        if create_first_day_stats and len(algo) == 1:
+            algo = np.append(0.0, algo)
+            bench = np.append(0.0, bench)
+
+        dt_loc = metrics.latest_dt_loc
+        expected_alpha, expected_beta = empyrical.alpha_beta_aligned(
+            algo,
+            bench,
+        )
+        expected_downside_risk = empyrical.downside_risk(algo)
+        expected = {
+            'algorithm_cumulative_returns': empyrical.cum_returns(algo)[-1],
+            'benchmark_cumulative_returns': empyrical.cum_returns(bench)[-1],
+            'algorithm_volatility': empyrical.annual_volatility(algo),
+            'benchmark_volatility': empyrical.annual_volatility(bench),
+            'alpha': expected_alpha,
+            'beta': expected_beta,
+            'sharpe': empyrical.sharpe_ratio(algo),
+            'downside_risk': expected_downside_risk,
+            'sortino': empyrical.sortino_ratio(
+                algo,
+                _downside_risk=expected_downside_risk,
+            ),
+            'information': empyrical.information_ratio(algo, bench),
+        }
+        for name, value in iteritems(expected):
+            np.testing.assert_allclose(
+                getattr(metrics, name)[dt_loc],
+                value,
+                rtol=1e-8,
+                err_msg=name,
+            )
+        np.testing.assert_allclose(
+            metrics.max_drawdown,
+            empyrical.max_drawdown(algo),
+            rtol=1e-8,
+        )
+
+    @parameterized.expand([
+        ('daily', False),
+        ('minute', True),
+    ])
+    def test_matches_empyrical(self, name, create_first_day_stats):
+        sim_params = SimulationParameters(
+            start_session=pd.Timestamp("2006-01-03", tz='UTC'),
+            end_session=pd.Timestamp("2006-12-29", tz='UTC'),
+            trading_calendar=self.trading_calendar,
+        )
+        rand = np.random.RandomState(1337)
+        num_sessions = len(sim_params.sessions)
+        algo_returns = pd.Series(
+            rand.normal(0.001, 0.02, num_sessions),
+            index=sim_params.sessions,
+        )
+        benchmark_returns = pd.Series(
+            rand.normal(0.0005, 0.01, num_sessions),
+            index=sim_params.sessions,
+        )
+        algo_returns.iloc[[10, 40]] = np.nan
+        benchmark_returns.iloc[[20, 40]] = np.nan
+
+        metrics = risk.RiskMetricsCumulative(
+            sim_params,
+            treasury_curves=self.env.treasury_curves,
+            trading_calendar=self.trading_calendar,
+            create_first_day_stats=create_first_day_stats,
+        )
+        for dt in sim_params.sessions:
+            if create_first_day_stats:
+                # With minute emission the current session is updated
+                # several times with its running return.
+                for fraction in (0.25, 0.5):
+                    metrics.update(
+                        dt,
+                        algo_returns[dt] * fraction,
+                        benchmark_returns[dt] * fraction,
+                        0.0,
+                    )
+            metrics.update(dt, algo_returns[dt], benchmark_returns[dt], 0.0)
+            self.check_against_empyrical(
+                metrics,
+                algo_returns,
+                benchmark_returns,
+                create_first_day_stats,
+            )
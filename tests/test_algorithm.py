@@ -33,6 +33,7 @@ import numpy as np
 import pandas as pd
 import pytz
 from pandas.core.common import PerformanceWarning
+from pandas.util.testing import assert_frame_equal
 
 from zipline import run_algorithm
 from zipline import TradingAlgorithm
@@ -74,6 +75,11 @@ from zipline.api import (
 )
 
 from zipline.finance.commission import PerShare
+from zipline.finance.performance import (
+    CallbackPerformanceSink,
+    ChunkedPerformanceSink,
+    InMemoryPerformanceSink,
+)
 from zipline.finance.execution import LimitOrder
 from zipline.finance.order import ORDER_STATUS
 from zipline.finance.trading import SimulationParameters
@@ -83,6 +89,7 @@ from zipline.finance.asset_restrictions import (
     StaticRestrictions,
     RESTRICTION_STATES,
 )
+from zipline.gens.sim_engine import FastForwardMinuteSimulationClock
 from zipline.testing import (
     FakeDataPortal,
     create_daily_df_for_asset,
@@ -1067,6 +1074,82 @@ class TestPositions(WithLogger,
         empty_positions = daily_stats.positions.map(lambda x: len(x) == 0)
         self.assertTrue(empty_positions.all())
 
+    def test_chunked_perf_sink(self):
+        def run(perf_sink=None):
+            algo = EmptyPositionsAlgorithm(self.sids,
+                                           sim_params=self.sim_params,
+                                           env=self.env)
+            return algo.run(self.data_portal, perf_sink=perf_sink)
+
+        expected = run()
+        packets = []
+        with TempDirectory() as tempdir:
+            sink = ChunkedPerformanceSink(tempdir.path, chunksize=3)
+            daily_stats = run(CallbackPerformanceSink(packets.append, sink))
+            transactions = sink.read_table('transactions')
+            positions = sink.read_table('positions')
+
+        self.assertEqual(
+            len([p for p in packets if 'daily_perf' in p]),
+            len(expected),
+        )
+
+        tables = ['positions', 'transactions', 'orders']
+        self.assertFalse(set(tables) & set(daily_stats.columns))
+        assert_frame_equal(
+            daily_stats,
+            expected.drop(tables, axis=1)[daily_stats.columns],
+        )
+
+        self.assertEqual(
+            len(transactions),
+            sum(map(len, expected.transactions)),
+        )
+        self.assertEqual(
+            sorted(transactions.sid),
+            sorted(int(txn['sid'])
+                   for txns in expected.transactions
+                   for txn in txns),
+        )
+        self.assertEqual(
+            set(positions.period_close),
+            {
+                close
+                for close, day_positions in zip(expected.period_close,
+                                                expected.positions)
+                if day_positions
+            },
+        )
+
+    def test_perf_sink_overwritten_fields(self):
+        sink = InMemoryPerformanceSink()
+        closes = self.trading_calendar.all_sessions[:2]
+
+        with make_test_handler(self) as log_catcher:
+            for i, close in enumerate(closes):
+                sink.write({
+                    'daily_perf': {
+                        'period_close': close,
+                        'returns': 0.01,
+                        'recorded_vars': {'returns': i, 'sharpe': -i},
+                    },
+                    'cumulative_risk_metrics': {'sharpe': 1.5},
+                })
+
+        # Each replaced name is only warned about once.
+        self.assertEqual(
+            [r.message for r in log_catcher.records],
+            [
+                "The recorded variable 'returns' replaces the value of the"
+                " same name in the daily stats.",
+                "The cumulative risk metric 'sharpe' replaces the value of"
+                " the same name in the daily stats.",
+            ],
+        )
+        daily_stats = sink.daily_stats()
+        self.assertEqual(daily_stats.returns.tolist(), [0, 1])
+        self.assertEqual(daily_stats.sharpe.tolist(), [1.5, 1.5])
+
 
 class TestBeforeTradingStart(WithDataPortal,
                              WithSimParams,
@@ -2252,15 +2335,22 @@ def order_stuff(context, data):
         )
 
     @parameterized.expand([
-        ('interday_target', [('2006-01-04', 2388.0)]),
-        ('interday_delta', [('2006-01-04', 1000.0)]),
+        ('interday_target', [('2006-01-04', 2388.0)], False),
+        ('interday_delta', [('2006-01-04', 1000.0)], False),
         ('intraday_target', [('2006-01-04 17:00', 2186.0),
-                             ('2006-01-04 18:00', 2806.0)]),
+                             ('2006-01-04 18:00', 2806.0)], False),
         ('intraday_delta', [('2006-01-04 17:00', 500.0),
-                            ('2006-01-04 18:00', 500.0)]),
+                            ('2006-01-04 18:00', 500.0)], False),
+        ('interday_delta_fast_forward', [('2006-01-04', 1000.0)], True),
+        ('intraday_target_fast_forward', [('2006-01-04 17:00', 2186.0),
+                                          ('2006-01-04 18:00', 2806.0)],
+         True),
     ])
-    def test_capital_changes_minute_mode_daily_emission(self, change, values):
-        change_loc, change_type = change.split('_')
+    def test_capital_changes_minute_mode_daily_emission(self,
+                                                        change,
+                                                        values,
+                                                        fast_forward):
+        change_loc, change_type = change.split('_')[:2]
 
         sim_params = factory.create_simulation_parameters(
             start=pd.Timestamp('2006-01-03', tz='UTC'),
@@ -2290,7 +2380,8 @@ def order_stuff(context, data):
             sim_params=sim_params,
             env=self.env,
             data_portal=self.data_portal,
-            capital_changes=capital_changes
+            capital_changes=capital_changes,
+            fast_forward=fast_forward,
         )
 
         gen = algo.get_generator()
@@ -2417,6 +2508,35 @@ def order_stuff(context, data):
                  pd.Timestamp('2006-01-04 18:00', tz='UTC'): 500.0}
             )
 
+    @parameterized.expand([
+        ('no_handle_data', None, True),
+        ('handle_data', handle_data_noop, False),
+    ])
+    def test_fast_forward_clock(self, name, handle_data, expected):
+        sim_params = factory.create_simulation_parameters(
+            start=pd.Timestamp('2006-01-03', tz='UTC'),
+            end=pd.Timestamp('2006-01-05', tz='UTC'),
+            data_frequency='minute',
+            capital_base=1000.0
+        )
+        algo = TradingAlgorithm(
+            initialize=initialize_noop,
+            # run_algorithm passes None when there is no handle_data
+            handle_data=handle_data,
+            sim_params=sim_params,
+            env=self.env,
+            data_portal=self.data_portal,
+            fast_forward=True,
+        )
+        self.assertEqual(algo._handles_every_bar(), not expected)
+
+        # the clock always fast-forwards, but only skips minutes for
+        # algorithms which don't handle every bar
+        self.assertIsInstance(
+            algo._create_clock(),
+            FastForwardMinuteSimulationClock,
+        )
+
     @parameterized.expand([
         ('interday_target', [('2006-01-04', 2388.0)]),
         ('interday_delta', [('2006-01-04', 1000.0)]),
@@ -3489,7 +3609,7 @@ class TestOrderCancelation(WithDataPortal,
         )
 
     def prep_algo(self, cancelation_string, data_frequency="minute",
-                  amount=1000, minute_emission=False):
+                  amount=1000, minute_emission=False, fill_frequency=None):
         code = self.code.format(cancelation_string, amount)
         algo = TradingAlgorithm(
             script=code,
@@ -3500,7 +3620,8 @@ class TestOrderCancelation(WithDataPortal,
                 trading_calendar=self.trading_calendar,
                 data_frequency=data_frequency,
                 emission_rate='minute' if minute_emission else 'daily'
-            )
+            ),
+            fill_frequency=fill_frequency,
         )
 
         return algo
@@ -3609,6 +3730,30 @@ class TestOrderCancelation(WithDataPortal,
 
             self.assertFalse(log_catcher.has_warnings)
 
+    def test_minute_fills_daily(self):
+        algo = self.prep_algo("", "daily", fill_frequency='minute')
+        results = algo.run(self.data_portal)
+
+        # The order is placed at the end of the first day, then filled one
+        # share per minute against the minute bars of the next days.
+        np.testing.assert_array_equal([0, 390, 390],
+                                      list(map(len, results.transactions)))
+
+        minutes = self.trading_calendar.minutes_for_session(
+            self.sim_params.sessions[1],
+        )
+        first_txn = results.transactions[1][0]
+        self.assertEqual(minutes[0], first_txn['dt'])
+        # The close of each minute is its position in the minute data.
+        self.assertEqual(391, first_txn['price'])
+        self.assertEqual(1, first_txn['amount'])
+
+        self.assertEqual(780, results.orders[2][0]['filled'])
+
+    def test_invalid_fill_frequency(self):
+        with self.assertRaises(ValueError):
+            self.prep_algo("", "daily", fill_frequency='hourly')
+
 
 class TestEquityAutoClose(WithTmpDir, WithTradingCalendars, ZiplineTestCase):
     """
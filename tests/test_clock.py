@@ -1,7 +1,9 @@
 from datetime import time
 from unittest import TestCase
+import numpy as np
 import pandas as pd
 from zipline.gens.sim_engine import (
+    FastForwardMinuteSimulationClock,
     MinuteSimulationClock,
     SESSION_START,
     BEFORE_TRADING_START_BAR,
@@ -178,3 +180,66 @@ class TestClock(TestCase):
                 self.sessions[i],
                 all_events[(i * 392): ((i + 1) * 392)]
             )
+
+    def test_fast_forward_every_minute_busy(self):
+        bts_minutes = days_at_time(self.sessions, time(11, 45), "US/Eastern")
+        clock = MinuteSimulationClock(
+            self.sessions,
+            self.opens,
+            self.closes,
+            bts_minutes,
+            False
+        )
+        fast_forward_clock = FastForwardMinuteSimulationClock(
+            self.sessions,
+            self.opens,
+            self.closes,
+            bts_minutes,
+            lambda minute: minute,
+        )
+
+        self.assertEqual(list(fast_forward_clock), list(clock))
+
+    def test_fast_forward(self):
+        minutes = self.nyse_calendar.minutes_for_sessions_in_range(
+            self.sessions[0],
+            self.sessions[-1],
+        )
+        busy_minutes = minutes[[5, 400]].asi8
+
+        def next_busy_minute(minute):
+            idx = busy_minutes.searchsorted(minute)
+            if idx == len(busy_minutes):
+                return np.iinfo(np.int64).max
+            return busy_minutes[idx]
+
+        bts_minutes = days_at_time(self.sessions, time(11, 45), "US/Eastern")
+        clock = FastForwardMinuteSimulationClock(
+            self.sessions,
+            self.opens,
+            self.closes,
+            bts_minutes,
+            next_busy_minute,
+        )
+
+        # Each session emits its busy minutes, before_trading_start and its
+        # last minute.
+        self.assertEqual(
+            list(clock),
+            [
+                (self.sessions[0], SESSION_START),
+                (minutes[5], BAR),
+                (bts_minutes[0], BEFORE_TRADING_START_BAR),
+                (minutes[389], BAR),
+                (minutes[389], SESSION_END),
+                (self.sessions[1], SESSION_START),
+                (minutes[400], BAR),
+                (bts_minutes[1], BEFORE_TRADING_START_BAR),
+                (minutes[779], BAR),
+                (minutes[779], SESSION_END),
+                (self.sessions[2], SESSION_START),
+                (bts_minutes[2], BEFORE_TRADING_START_BAR),
+                (minutes[1169], BAR),
+                (minutes[1169], SESSION_END),
+            ],
+        )
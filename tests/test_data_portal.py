@@ -296,6 +296,41 @@ class DataPortalTestBase(WithDataPortal,
                   for field in expected.keys()]
         assert_almost_equal(array(list(expected.values())), result)
 
+    def test_get_spot_values_minute(self):
+        trading_calendar = self.trading_calendars[Equity]
+        assets = self.asset_finder.retrieve_all([1, 10000])
+        fields = ['open', 'high', 'low', 'close', 'volume', 'price',
+                  'last_traded']
+
+        for session in self.trading_days[:4]:
+            dts = trading_calendar.minutes_for_session(session)
+            for dt in dts[0], dts[1], dts[3], dts[5], dts[100]:
+                result = self.data_portal.get_spot_values(
+                    assets,
+                    fields,
+                    dt,
+                    'minute',
+                )
+                self.assertEqual(len(result), len(fields))
+                for field, values in zip(fields, result):
+                    expected = [
+                        self.data_portal.get_spot_value(
+                            asset,
+                            field,
+                            dt,
+                            'minute',
+                        )
+                        for asset in assets
+                    ]
+                    if field == 'last_traded':
+                        self.assertEqual(list(values), expected)
+                    else:
+                        assert_almost_equal(
+                            array(values, dtype=float),
+                            array(expected, dtype=float),
+                            err_msg="field=%s, dt=%s" % (field, dt),
+                        )
+
     def test_bar_count_for_simple_transforms(self):
         # July 2015
         # Su Mo Tu We Th Fr Sa
@@ -23,6 +23,7 @@ from six import iteritems
 from zipline import TradingAlgorithm
 from zipline._protocol import handle_non_market_minutes, BarData
 from zipline.assets import Asset
+from zipline.data.history_loader import WindowBlockCache
 from zipline.errors import (
     HistoryInInitialize,
     HistoryWindowStartsBeforeData,
@@ -1654,6 +1655,26 @@ class DailyEquityHistoryTestCase(WithHistory, ZiplineTestCase):
         # digits. second value should be 0.96 of its original value
         np.testing.assert_array_equal([1.882, 2.88, 4], window3)
 
+    def test_daily_adjustments_in_multi_asset_window(self):
+        """
+        Each column of a multi-asset window should get only its own asset's
+        adjustments.
+        """
+        assets = [self.SPLIT_ASSET, self.ASSET1, self.DIVIDEND_ASSET,
+                  self.MERGER_ASSET]
+        for day in pd.date_range('2015-01-05', '2015-01-08', tz='UTC'):
+            for field in ['close', 'volume']:
+                window = self.data_portal.get_history_window(
+                    assets, day, 3, '1d', field,
+                )
+                for asset in assets:
+                    np.testing.assert_array_equal(
+                        window[asset].values,
+                        self.data_portal.get_history_window(
+                            [asset], day, 3, '1d', field,
+                        )[asset].values,
+                    )
+
     def test_daily_blended_some_assets_stopped(self):
         # asset1 ends on 2016-01-30
         # asset2 ends on 2016-01-04
@@ -1819,6 +1840,50 @@ class DailyEquityHistoryTestCase(WithHistory, ZiplineTestCase):
         # Window 4 starts on the 11th day of data for ASSET 1.
         assert_window_prices(window_4, 11)
 
+    def test_window_block_cache_bound(self):
+        """
+        The prefetched blocks stay within the loader's bound as the set of
+        assets changes from one history call to the next.
+        """
+        loader = self.data_portal._history_loader
+        assets = [self.ASSET1, self.ASSET2, self.SPLIT_ASSET,
+                  self.DIVIDEND_ASSET, self.MERGER_ASSET]
+        days = self.trading_calendar.sessions_window(
+            pd.Timestamp('2015-06-01', tz='UTC'),
+            20,
+        )
+        universes = [
+            assets[:(i % len(assets)) + 1] for i in range(len(days))
+        ]
+
+        expected = [
+            self.data_portal.get_history_window(
+                universe, day, 4, '1d', 'close',
+            )
+            for universe, day in zip(universes, days)
+        ]
+
+        original_blocks = loader._window_blocks
+        # Room for a few single asset blocks, but not for every universe.
+        loader._window_blocks = blocks = WindowBlockCache(
+            3 * 8 * (4 + loader._prefetch_length),
+        )
+        try:
+            for universe, day, window in zip(universes, days, expected):
+                result = self.data_portal.get_history_window(
+                    universe, day, 4, '1d', 'close',
+                )
+                # A block larger than the bound is only kept on its own.
+                if len(blocks) > 1:
+                    self.assertLessEqual(blocks.nbytes, blocks.max_nbytes)
+                self.assertEqual(
+                    blocks.nbytes,
+                    sum(nbytes for _, nbytes in blocks._blocks.values()),
+                )
+                np.testing.assert_almost_equal(result.values, window.values)
+        finally:
+            loader._window_blocks = original_blocks
+
 
 class NoPrefetchDailyEquityHistoryTestCase(DailyEquityHistoryTestCase):
     DATA_PORTAL_MINUTE_HISTORY_PREFETCH = 0
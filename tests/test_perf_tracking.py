@@ -2085,3 +2085,124 @@ class TestPositionTracker(WithTradingEnvironment,
         # Test gross and net exposures
         self.assertEqual(100 + 150000 + 200, pos_stats.gross_exposure)
         self.assertEqual(100 + 150000 - 200, pos_stats.net_exposure)
+
+    def test_closed_positions_removed_from_stats(self):
+        pt = perf.PositionTracker(self.env.asset_finder, None)
+        dt = pd.Timestamp("2014/01/01 3:00PM")
+        equity, future, other_equity = self.env.asset_finder.retrieve_all(
+            [1, 1032201401, 2],
+        )
+
+        pt.execute_transaction(create_txn(equity, dt, 10.0, 10))
+        pt.execute_transaction(create_txn(future, dt, 100.0, 30))
+        pt.execute_transaction(create_txn(other_equity, dt, 10.0, -20))
+
+        # Closing the first position shouldn't change the multipliers used
+        # for the positions after it.
+        pt.execute_transaction(create_txn(equity, dt, 10.0, -10))
+        self.assertEqual(list(pt.positions), [future, other_equity])
+        self.assertIsNone(pt.positions[equity])
+
+        pos_stats = pt.stats()
+        self.assertEqual(0, pos_stats.long_value)
+        self.assertEqual(150000, pos_stats.long_exposure)
+        self.assertEqual(1, pos_stats.longs_count)
+        self.assertEqual(-200, pos_stats.short_value)
+        self.assertEqual(-200, pos_stats.short_exposure)
+        self.assertEqual(1, pos_stats.shorts_count)
+        self.assertEqual(-200, pos_stats.net_value)
+        self.assertEqual(150000 - 200, pos_stats.net_exposure)
+
+        self.assertEqual(
+            pt.get_positions_list(),
+            [
+                {
+                    'sid': future,
+                    'amount': 30,
+                    'cost_basis': 100.0,
+                    'last_sale_price': 100.0,
+                },
+                {
+                    'sid': other_equity,
+                    'amount': -20,
+                    'cost_basis': 10.0,
+                    'last_sale_price': 10.0,
+                },
+            ],
+        )
+
+    def test_portfolio_positions_built_on_demand(self):
+        pt = perf.PositionTracker(self.env.asset_finder, None)
+        pp = perf.PerformancePeriod(1000.0, self.env.asset_finder, 'daily')
+        pp.position_tracker = pt
+        dt = pd.Timestamp("2014/01/01 3:00PM")
+        equity = self.env.asset_finder.retrieve_asset(1)
+
+        txn = create_txn(equity, dt, 10.0, 10)
+        pt.execute_transaction(txn)
+        pp.handle_execution(txn)
+        pp.calculate_performance()
+
+        # Reading the cash shouldn't build the positions.
+        portfolio = pp.as_portfolio()
+        self.assertEqual(portfolio.cash, 900.0)
+        self.assertNotIn(equity, pt._positions_store)
+
+        position = portfolio.positions[equity]
+        self.assertEqual(position.amount, 10)
+
+        # The positions aren't rebuilt until they change.
+        version = pt.state_version
+        self.assertIs(pp.as_portfolio().positions[equity], position)
+        self.assertEqual(pt.state_version, version)
+
+        pt.update_position(equity, last_sale_price=11.0)
+        self.assertNotEqual(pt.state_version, version)
+        self.assertEqual(
+            pp.as_portfolio().positions[equity].last_sale_price,
+            11.0,
+        )
+
+    def test_period_ledgers(self):
+        pt = perf.PositionTracker(self.env.asset_finder, None)
+        pp = perf.PerformancePeriod(
+            1000.0,
+            self.env.asset_finder,
+            'minute',
+            keep_transactions=True,
+            keep_orders=True,
+        )
+        pp.position_tracker = pt
+        equity = self.env.asset_finder.retrieve_asset(1)
+        dt1 = pd.Timestamp("2014/01/02 3:00PM", tz='UTC')
+        dt2 = dt1 + timedelta(minutes=1)
+
+        filled = Order(dt1, equity, 10)
+        stop = Order(dt1, equity, -5, stop=9.0)
+        pp.record_order(filled)
+        pp.record_order(stop)
+
+        txn = create_transaction(filled, dt2, 10.0, 10)
+        filled.filled += txn.amount
+        filled.dt = dt2
+        pt.execute_transaction(txn)
+        pp.handle_execution(txn)
+        pp.record_order(filled)
+
+        # The stop is reached without the order being recorded again.
+        stop.check_triggers(8.0, dt2)
+        self.assertTrue(stop.stop_reached)
+
+        self.assertEqual(pp.to_dict(dt1)['transactions'], [])
+        self.assertEqual(pp.to_dict(dt2)['transactions'], [txn.to_dict()])
+        self.assertEqual(pp.to_dict(dt2)['orders'], [filled.to_dict()])
+        self.assertEqual(
+            pp.to_dict()['orders'],
+            [stop.to_dict(), filled.to_dict()],
+        )
+
+        transactions = pp.transaction_ledger.to_frame()
+        self.assertEqual(list(transactions.order_id), [filled.id])
+        orders = pp.order_ledger.to_frame()
+        self.assertEqual(list(orders.id), [stop.id, filled.id])
+        self.assertEqual(list(orders.stop_reached), [True, False])
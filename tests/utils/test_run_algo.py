@@ -0,0 +1,271 @@
+"""
+Tests for sweeping an algorithm over many sets of parameters.
+"""
+from functools import partial
+import os
+import tarfile
+
+from click.testing import CliRunner
+from nose_parameterized import parameterized
+import numpy as np
+import pandas as pd
+
+from zipline.__main__ import main
+from zipline.data.bundles import register, unregister
+from zipline.testing import test_resource_path
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTmpDir,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+from zipline.utils.run_algo import _param_grid, _sweep_summary, run_sweep
+
+# Buys ``shares`` shares of AAPL, and records a pipeline output which doesn't
+# depend on the parameters.
+ALGOTEXT = """
+from zipline.api import (
+    attach_pipeline,
+    order_target,
+    pipeline_output,
+    record,
+    symbol,
+)
+from zipline.pipeline import Pipeline
+from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.factors import SimpleMovingAverage
+
+
+def initialize(context):
+    attach_pipeline(
+        Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close],
+                window_length=10,
+            ),
+        }),
+        'test',
+    )
+
+
+def handle_data(context, data):
+    aapl = symbol('AAPL')
+    record(sma=pipeline_output('test')['sma'].get(aapl))
+    order_target(aapl, shares)
+"""
+
+
+class ParamGridTestCase(ZiplineTestCase):
+
+    def test_grid(self):
+        assert_equal(
+            _param_grid(['a=[1, 2]', 'b=range(x)'], {'x': 2}),
+            [
+                {'a': 1, 'b': 0},
+                {'a': 1, 'b': 1},
+                {'a': 2, 'b': 0},
+                {'a': 2, 'b': 1},
+            ],
+        )
+
+    def test_no_params(self):
+        assert_equal(_param_grid([], {}), [{}])
+
+    def test_value_with_equals(self):
+        assert_equal(
+            _param_grid(['a=["b=c"]'], {}),
+            [{'a': 'b=c'}],
+        )
+
+    @parameterized.expand([
+        ('no_equals', 'a', 'should be of the form name=values'),
+        ('not_iterable', 'a=1', "param 'a'"),
+        ('undefined_name', 'a=undefined', "param 'a'"),
+        ('syntax_error', 'a=[1,', "param 'a'"),
+    ])
+    def test_invalid(self, name, param, message):
+        with self.assertRaises(ValueError) as e:
+            _param_grid([param], {})
+        self.assertIn(message, str(e.exception))
+
+
+class SweepSummaryTestCase(ZiplineTestCase):
+
+    def test_summary(self):
+        parameters = [{'a': 1}, {'a': 2, 'b': 3}, {'a': 3}]
+        perfs = [
+            pd.DataFrame({
+                'algorithm_period_return': [0.0, 0.1],
+                'sharpe': [np.nan, 1.5],
+                'max_drawdown': [0.0, -0.2],
+                'portfolio_value': [100.0, 110.0],
+                'other': [1, 2],
+            }),
+            pd.DataFrame({
+                'algorithm_period_return': [-0.5],
+                'sharpe': [-1.0],
+                'max_drawdown': [-0.5],
+                'portfolio_value': [50.0],
+            }),
+            # a run without any sessions
+            pd.DataFrame(),
+        ]
+
+        expected = pd.DataFrame(
+            {
+                'a': [1, 2, 3],
+                'b': [np.nan, 3, np.nan],
+                'algorithm_period_return': [0.1, -0.5, np.nan],
+                'sharpe': [1.5, -1.0, np.nan],
+                'max_drawdown': [-0.2, -0.5, np.nan],
+                'portfolio_value': [110.0, 50.0, np.nan],
+            },
+            columns=[
+                'a',
+                'b',
+                'algorithm_period_return',
+                'sharpe',
+                'max_drawdown',
+                'portfolio_value',
+            ],
+        )
+        assert_equal(
+            _sweep_summary(parameters, perfs).astype(float),
+            expected.astype(float),
+        )
+
+
+class SweepTestCase(WithTmpDir, WithInstanceTmpDir, ZiplineTestCase):
+    START = pd.Timestamp('2014-01-02', tz='utc')
+    END = pd.Timestamp('2014-02-28', tz='utc')
+    SHARES = [10, 20, 30]
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(SweepTestCase, cls).init_class_fixtures()
+
+        register('test', lambda *args: None)
+        cls.add_class_callback(partial(unregister, 'test'))
+
+        with tarfile.open(test_resource_path('example_data.tar.gz')) as tar:
+            tar.extractall(cls.tmpdir.path)
+
+        cls.environ = {
+            'ZIPLINE_ROOT': cls.tmpdir.getpath('example_data/root'),
+        }
+        cls.ingestion = os.listdir(
+            cls.tmpdir.getpath('example_data/root/data/test'),
+        )[0]
+
+    def sweep(self, processes, pipeline_cache_dir):
+        return run_sweep(
+            [{'shares': shares} for shares in self.SHARES],
+            start=self.START,
+            end=self.END,
+            capital_base=1e7,
+            algotext=ALGOTEXT,
+            bundle='test',
+            processes=processes,
+            pipeline_cache_dir=pipeline_cache_dir,
+            environ=self.environ,
+        )
+
+    def cached_files(self, pipeline_cache_dir):
+        """The modification time of each file in the pipeline cache of the
+        test bundle's ingestion.
+        """
+        path = os.path.join(pipeline_cache_dir, 'test', self.ingestion)
+        return {
+            name: os.stat(os.path.join(path, name)).st_mtime
+            for name in os.listdir(path)
+        }
+
+    @parameterized.expand([('in_process', 1), ('forked', 2)])
+    def test_run_sweep(self, name, processes):
+        pipeline_cache_dir = self.instance_tmpdir.getpath('pipeline_cache')
+        perfs = self.sweep(processes, pipeline_cache_dir)
+
+        assert_equal(len(perfs), len(self.SHARES))
+        for shares, perf in zip(self.SHARES, perfs):
+            # each run has its own parameters...
+            final_positions = perf.positions.iloc[-1]
+            assert_equal(
+                [position['amount'] for position in final_positions],
+                [shares],
+            )
+            # ...and the same pipeline output
+            assert_equal(perf.sma, perfs[0].sma)
+        self.assertFalse(perfs[0].sma.isnull().all())
+
+        # The runs share the results of the pipeline, which are cached once
+        # per chunk.
+        cached = self.cached_files(pipeline_cache_dir)
+        self.assertTrue(cached)
+
+        # A later sweep over the same ingestion reads the cached results
+        # instead of computing them again.
+        again = self.sweep(processes, pipeline_cache_dir)
+        assert_equal(self.cached_files(pipeline_cache_dir), cached)
+        for expected, actual in zip(perfs, again):
+            assert_equal(actual.sma, expected.sma)
+            assert_equal(actual.portfolio_value, expected.portfolio_value)
+
+        # The runs don't depend on how many workers there are.
+        if processes != 1:
+            for expected, actual in zip(self.sweep(1, None), perfs):
+                assert_equal(
+                    actual.portfolio_value,
+                    expected.portfolio_value,
+                )
+
+    def test_cli(self):
+        output = self.instance_tmpdir.getpath('summary.pickle')
+        result = CliRunner().invoke(
+            main,
+            [
+                'sweep',
+                '--algotext', ALGOTEXT,
+                '--define', 'base=10',
+                '--param', 'shares=[base, 2 * base]',
+                '--bundle', 'test',
+                '--start', str(self.START.date()),
+                '--end', str(self.END.date()),
+                '--processes', '2',
+                '--output', output,
+            ],
+            env=self.environ,
+        )
+        assert_equal(result.exit_code, 0, msg=result.output)
+
+        summary = pd.read_pickle(output)
+        assert_equal(summary.shares.tolist(), [10, 20])
+        assert_equal(
+            list(summary.columns),
+            [
+                'shares',
+                'algorithm_period_return',
+                'sharpe',
+                'max_drawdown',
+                'portfolio_value',
+            ],
+        )
+        self.assertFalse(summary.portfolio_value.isnull().any())
+
+    @parameterized.expand([
+        ('no_params', [], "at least one '-p' / '--param'"),
+        ('bad_param', ['--param', 'shares'], 'name=values'),
+    ])
+    def test_cli_invalid(self, name, args, message):
+        result = CliRunner().invoke(
+            main,
+            [
+                'sweep',
+                '--algotext', ALGOTEXT,
+                '--bundle', 'test',
+                '--start', str(self.START.date()),
+                '--end', str(self.END.date()),
+            ] + args,
+            env=self.environ,
+        )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn(message, result.output + str(result.exception))
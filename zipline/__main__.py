@@ -9,7 +9,14 @@ from six import text_type
 
 from zipline.data import bundles as bundles_module
 from zipline.utils.cli import Date, Timestamp
-from zipline.utils.run_algo import _run, load_extensions
+from zipline.utils.run_algo import (
+    _eval_defines,
+    _param_grid,
+    _run,
+    _sweep,
+    _sweep_summary,
+    load_extensions,
+)
 
 try:
     __IPYTHON__
@@ -178,6 +185,12 @@ def ipython_only(option):
     default=False,
     help='Print the algorithm to stdout.',
 )
+@click.option(
+    '--fast-forward/--no-fast-forward',
+    default=False,
+    help='Skip the minutes in which nothing can happen to an algorithm'
+    ' without a handle_data.',
+)
 @ipython_only(click.option(
     '--local-namespace/--no-local-namespace',
     is_flag=True,
@@ -197,6 +210,7 @@ def run(ctx,
         end,
         output,
         print_algo,
+        fast_forward,
         local_namespace):
     """Run a backtest for the given algorithm.
     """
@@ -238,6 +252,7 @@ def run(ctx,
         print_algo=print_algo,
         local_namespace=local_namespace,
         environ=os.environ,
+        fast_forward=fast_forward,
     )
 
     if output == '-':
@@ -248,6 +263,169 @@ def run(ctx,
     return perf
 
 
+@main.command()
+@click.option(
+    '-f',
+    '--algofile',
+    default=None,
+    type=click.File('r'),
+    help='The file that contains the algorithm to run.',
+)
+@click.option(
+    '-t',
+    '--algotext',
+    help='The algorithm script to run.',
+)
+@click.option(
+    '-D',
+    '--define',
+    multiple=True,
+    help="Define a name to be bound in the namespace before executing"
+    " the algotext. For example '-Dname=value'. The value may be any python"
+    " expression. These are evaluated in order so they may refer to previously"
+    " defined names.",
+)
+@click.option(
+    '-p',
+    '--param',
+    multiple=True,
+    metavar='NAME=VALUES',
+    help="A name to sweep over. For example '-pwindow=range(10, 50, 10)'. The"
+    " values may be any python expression evaluating to an iterable, and are"
+    " evaluated in the namespace built by the defines. The algorithm is run"
+    " once for every combination of the values of the params, with each value"
+    " bound in the namespace before executing the algotext.",
+)
+@click.option(
+    '--data-frequency',
+    type=click.Choice({'daily', 'minute'}),
+    default='daily',
+    show_default=True,
+    help='The data frequency of the simulations.',
+)
+@click.option(
+    '--capital-base',
+    type=float,
+    default=10e6,
+    show_default=True,
+    help='The starting capital for the simulations.',
+)
+@click.option(
+    '-b',
+    '--bundle',
+    default='quantopian-quandl',
+    metavar='BUNDLE-NAME',
+    show_default=True,
+    help='The data bundle to use for the simulations.',
+)
+@click.option(
+    '--bundle-timestamp',
+    type=Timestamp(),
+    default=pd.Timestamp.utcnow(),
+    show_default=False,
+    help='The date to lookup data on or before.\n'
+    '[default: <current-time>]'
+)
+@click.option(
+    '-s',
+    '--start',
+    type=Date(tz='utc', as_timestamp=True),
+    help='The start date of the simulations.',
+)
+@click.option(
+    '-e',
+    '--end',
+    type=Date(tz='utc', as_timestamp=True),
+    help='The end date of the simulations.',
+)
+@click.option(
+    '-j',
+    '--processes',
+    type=int,
+    default=None,
+    help='The number of worker processes to run the simulations in.\n'
+    '[default: <number of cpus>]',
+)
+@click.option(
+    '--pipeline-cache-dir',
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    help='A directory to cache pipeline results in, which may be reused by'
+    ' later sweeps over the same ingestion of the bundle. By default the'
+    ' results are only shared within this sweep.',
+)
+@click.option(
+    '-o',
+    '--output',
+    default='-',
+    metavar='FILENAME',
+    show_default=True,
+    help="The location to write the summary of the runs. If this is '-' the"
+    " summary will be written to stdout.",
+)
+@click.pass_context
+def sweep(ctx,
+          algofile,
+          algotext,
+          define,
+          param,
+          data_frequency,
+          capital_base,
+          bundle,
+          bundle_timestamp,
+          start,
+          end,
+          processes,
+          pipeline_cache_dir,
+          output):
+    """Run a backtest of the given algorithm for each combination of params.
+    """
+    if start is None or end is None:
+        ctx.fail(
+            "must specify dates with '-s' / '--start' and '-e' / '--end'",
+        )
+
+    if (algotext is not None) == (algofile is not None):
+        ctx.fail(
+            "must specify exactly one of '-f' / '--algofile' or"
+            " '-t' / '--algotext'",
+        )
+
+    if not param:
+        ctx.fail("must specify at least one '-p' / '--param'")
+
+    namespace = _eval_defines(define, {})
+    parameters = _param_grid(param, namespace)
+
+    perfs = _sweep(
+        initialize=None,
+        handle_data=None,
+        before_trading_start=None,
+        analyze=None,
+        algofile=algofile,
+        algotext=algotext,
+        namespace=namespace,
+        parameters=parameters,
+        data_frequency=data_frequency,
+        capital_base=capital_base,
+        bundle=bundle,
+        bundle_timestamp=bundle_timestamp,
+        start=start,
+        end=end,
+        processes=processes,
+        pipeline_cache_dir=pipeline_cache_dir,
+        environ=os.environ,
+    )
+
+    summary = _sweep_summary(parameters, perfs)
+    if output == '-':
+        click.echo(str(summary))
+    else:
+        summary.to_pickle(output)
+
+    return summary
+
+
 def zipline_magic(line, cell=None):
     """The zipline IPython cell magic.
     """
@@ -301,7 +479,28 @@ def zipline_magic(line, cell=None):
     default=True,
     help='Print progress information to the terminal.'
 )
-def ingest(bundle, assets_version, show_progress):
+@click.option(
+    '--adjustment-factors/--no-adjustment-factors',
+    default=False,
+    help='Precompute the cumulative adjustment factors of every asset.',
+)
+@click.option(
+    '--incremental/--no-incremental',
+    default=False,
+    help='Append to the most recent ingestion of the bundle.',
+)
+@click.option(
+    '--deduplicate/--no-deduplicate',
+    default=False,
+    help='Share the storage of the bar data that is identical to the data'
+    ' of other ingestions of the bundle.',
+)
+def ingest(bundle,
+           assets_version,
+           show_progress,
+           adjustment_factors,
+           incremental,
+           deduplicate):
     """Ingest the data for the given bundle.
     """
     bundles_module.ingest(
@@ -310,6 +509,9 @@ def ingest(bundle, assets_version, show_progress):
         pd.Timestamp.utcnow(),
         assets_version,
         show_progress,
+        adjustment_factors,
+        incremental,
+        deduplicate,
     )
 
 
@@ -381,15 +381,17 @@ cdef class BarData:
                 # assume assets is iterable
                 # return a Series indexed by asset
                 if not self._adjust_minutes:
-                    return pd.Series(data={
-                        asset: self.data_portal.get_spot_value(
-                                    asset,
-                                    field,
-                                    self._get_current_minute(),
-                                    self.data_frequency
-                               )
-                        for asset in assets
-                        }, index=assets, name=fields)
+                    assets = list(assets)
+                    return pd.Series(
+                        data=self.data_portal.get_spot_values(
+                            assets,
+                            [field],
+                            self._get_current_minute(),
+                            self.data_frequency
+                        )[0],
+                        index=assets,
+                        name=fields,
+                    )
                 else:
                     return pd.Series(data={
                         asset: self.data_portal.get_adjusted_value(
@@ -407,17 +409,20 @@ cdef class BarData:
                 data = {}
 
                 if not self._adjust_minutes:
-                    for field in fields:
-                        series = pd.Series(data={
-                            asset: self.data_portal.get_spot_value(
-                                        asset,
-                                        field,
-                                        self._get_current_minute(),
-                                        self.data_frequency
-                                   )
-                            for asset in assets
-                            }, index=assets, name=field)
-                        data[field] = series
+                    assets = list(assets)
+                    fields = list(fields)
+                    values = self.data_portal.get_spot_values(
+                        assets,
+                        fields,
+                        self._get_current_minute(),
+                        self.data_frequency
+                    )
+                    for field, field_values in zip(fields, values):
+                        data[field] = pd.Series(
+                            data=field_values,
+                            index=assets,
+                            name=field,
+                        )
                 else:
                     for field in fields:
                         series = pd.Series(data={
@@ -14,6 +14,7 @@
 # limitations under the License.
 from copy import copy
 import operator as op
+import threading
 import warnings
 from datetime import tzinfo, time
 import logbook
@@ -28,6 +29,7 @@ from numbers import Integral
 
 from six import (
     exec_,
+    get_unbound_function,
     iteritems,
     itervalues,
     string_types,
@@ -75,7 +77,10 @@ from zipline.finance.execution import (
     StopLimitOrder,
     StopOrder,
 )
-from zipline.finance.performance import PerformanceTracker
+from zipline.finance.performance import (
+    InMemoryPerformanceSink,
+    PerformanceTracker,
+)
 from zipline.finance.asset_restrictions import Restrictions
 from zipline.finance.slippage import (
     VolumeShareSlippage,
@@ -133,7 +138,10 @@ from zipline.utils.security_list import SecurityList
 import zipline.protocol
 from zipline.sources.requests_csv import PandasRequestsCSV
 
-from zipline.gens.sim_engine import MinuteSimulationClock
+from zipline.gens.sim_engine import (
+    FastForwardMinuteSimulationClock,
+    MinuteSimulationClock,
+)
 from zipline.sources.benchmark_source import BenchmarkSource
 from zipline.zipline_warnings import ZiplineDeprecationWarning
 
@@ -199,6 +207,10 @@ class TradingAlgorithm(object):
         equities_metadata, but will be traded by this TradingAlgorithm.
     get_pipeline_loader : callable[BoundColumn -> PipelineLoader], optional
         The function that maps pipeline columns to their loaders.
+    pipeline_result_cache : MutableMapping, optional
+        A cache for the results of the pipeline engine, which may be shared
+        between algorithms that read the same data. See
+        :class:`zipline.pipeline.engine.SimplePipelineEngine`.
     create_event_context : callable[BarData -> context manager], optional
         A function used to create a context mananger that wraps the
         execution of all events that are scheduled for a bar.
@@ -211,6 +223,25 @@ class TradingAlgorithm(object):
         in the simulation with ``get_environment``. This allows algorithms
         to conditionally execute code based on platform it is running on.
         default: 'zipline'
+    pipeline_prefetch_pool : Pool, optional
+        A pool used to compute the next chunk of pipeline results while the
+        current chunk is being consumed. This object must support
+        ``apply_async``, for example a
+        :class:`multiprocessing.pool.ThreadPool`. This requires
+        ``make_prefetch_pipeline_loader``. By default every chunk is
+        computed synchronously when it is first requested.
+    make_prefetch_pipeline_loader : callable[() -> callable], optional
+        A function which returns a new ``get_pipeline_loader``, whose loaders
+        are not shared with any others. Each worker of
+        ``pipeline_prefetch_pool`` calls this once, in the worker, and
+        computes its chunks with its own engine and loaders, so they are
+        never used concurrently with those of the simulation.
+    fill_frequency : {'daily', 'minute'}, optional
+        The bars to fill orders against. With ``'minute'``, a daily
+        simulation still runs the algorithm on daily bars, but fills the
+        orders of each session against the minute bars of the assets with
+        open orders. This requires minute data for those assets. By default
+        orders are filled against the bars of ``data_frequency``.
     """
 
     def __init__(self, *args, **kwargs):
@@ -252,6 +283,11 @@ class TradingAlgorithm(object):
             identifiers : List
                 Any asset identifiers that are not provided in the
                 equities_metadata, but will be traded by this TradingAlgorithm
+            fast_forward : bool <default: False>
+                In minute simulations with daily emission, skip the minutes
+                in which the algorithm has no open orders and no scheduled
+                functions or capital changes are due. Only applies to
+                algorithms without a handle_data or account controls.
         """
         self.sources = []
 
@@ -312,11 +348,34 @@ class TradingAlgorithm(object):
         self.asset_finder = self.trading_environment.asset_finder
 
         # Initialize Pipeline API data.
-        self.init_engine(kwargs.pop('get_pipeline_loader', None))
+        self._pipeline_result_cache = kwargs.pop('pipeline_result_cache', None)
+        self.init_engine(
+            kwargs.pop('get_pipeline_loader', None),
+            self._pipeline_result_cache,
+        )
         self._pipelines = {}
         # Create an always-expired cache so that we compute the first time data
         # is requested.
         self._pipeline_cache = CachedObject(None, pd.Timestamp(0, tz='UTC'))
+        self._pipeline_prefetch_pool = kwargs.pop(
+            'pipeline_prefetch_pool',
+            None,
+        )
+        self._make_prefetch_pipeline_loader = kwargs.pop(
+            'make_prefetch_pipeline_loader',
+            None,
+        )
+        if ((self._pipeline_prefetch_pool is None) !=
+                (self._make_prefetch_pipeline_loader is None)):
+            raise ValueError(
+                'pipeline_prefetch_pool and make_prefetch_pipeline_loader'
+                ' must be passed together',
+            )
+        # The pipeline engine of each of the prefetch pool's workers.
+        self._prefetch_engines = threading.local()
+        # (start_session, chunksize, async_result) for the chunk being
+        # computed in the background, if any.
+        self._pipeline_prefetch = None
 
         self.blotter = kwargs.pop('blotter', None)
         self.cancel_policy = kwargs.pop('cancel_policy', NeverCancel())
@@ -398,15 +457,30 @@ class TradingAlgorithm(object):
             )
             self._analyze = kwargs.pop('analyze', None)
 
-        self.event_manager.add_event(
-            zipline.utils.events.Event(
-                zipline.utils.events.Always(),
-                # We pass handle_data.__func__ to get the unbound method.
-                # We will explicitly pass the algorithm to bind it again.
-                self.handle_data.__func__,
-            ),
-            prepend=True,
+        if self._handle_data is None:
+            # run_algorithm passes handle_data=None when there isn't one
+            self._handle_data = noop
+        self._has_handle_data = self._handle_data is not noop
+        self._handle_data_event = zipline.utils.events.Event(
+            zipline.utils.events.Always(),
+            # We pass handle_data.__func__ to get the unbound method.
+            # We will explicitly pass the algorithm to bind it again.
+            self.handle_data.__func__,
         )
+        self.event_manager.add_event(self._handle_data_event, prepend=True)
+
+        self._fast_forward = kwargs.pop('fast_forward', False)
+
+        self._fill_frequency = kwargs.pop('fill_frequency', None)
+        if self._fill_frequency not in (None, 'daily', 'minute'):
+            raise ValueError(
+                "fill_frequency must be 'daily' or 'minute', got %r" % (
+                    self._fill_frequency,
+                ),
+            )
+        # (event minutes, busy minutes) of the last call to
+        # _next_busy_minute.
+        self._busy_minutes = None, None
 
         # Alternative way of setting data_frequency for backwards
         # compatibility.
@@ -429,7 +503,7 @@ class TradingAlgorithm(object):
 
         self.restrictions = NoRestrictions()
 
-    def init_engine(self, get_loader):
+    def init_engine(self, get_loader, result_cache=None):
         """
         Construct and store a PipelineEngine from loader.
 
@@ -440,6 +514,7 @@ class TradingAlgorithm(object):
                 get_loader,
                 self.trading_calendar.all_sessions,
                 self.asset_finder,
+                result_cache=result_cache,
             )
         else:
             self.engine = ExplodingPipelineEngine()
@@ -531,6 +606,17 @@ class TradingAlgorithm(object):
             "US/Eastern"
         )
 
+        if (self._fast_forward and
+                self.sim_params.data_frequency == 'minute' and
+                not minutely_emission):
+            return FastForwardMinuteSimulationClock(
+                self.sim_params.sessions,
+                market_opens,
+                market_closes,
+                before_trading_start_minutes,
+                self._next_busy_minute,
+            )
+
         return MinuteSimulationClock(
             self.sim_params.sessions,
             market_opens,
@@ -539,6 +625,59 @@ class TradingAlgorithm(object):
             minute_emission=minutely_emission,
         )
 
+    def _handles_every_bar(self):
+        """Does the algorithm have to run on every bar?
+        """
+        return (
+            self._has_handle_data or
+            bool(self.account_controls) or
+            get_unbound_function(type(self).handle_data) is not
+            get_unbound_function(TradingAlgorithm.handle_data)
+        )
+
+    def _next_busy_minute(self, minute):
+        """The first minute at or after ``minute`` in which something can
+        happen, for the fast-forwarding clock.
+
+        Parameters
+        ----------
+        minute : int
+            The minute of the next bar, in nanoseconds.
+
+        Returns
+        -------
+        busy_minute : int
+            The first minute, in nanoseconds, in which orders may fill or
+            scheduled functions or capital changes are due.
+        """
+        blotter = self.blotter
+        if (blotter.new_orders or
+                any(itervalues(blotter.open_orders)) or
+                self._handles_every_bar()):
+            return minute
+
+        event_minutes = self.event_manager.trigger_minutes(
+            ignore=(self._handle_data_event,),
+        )
+        if event_minutes is None:
+            return minute
+
+        cached_event_minutes, busy_minutes = self._busy_minutes
+        if event_minutes is not cached_event_minutes:
+            busy_minutes = np.union1d(
+                event_minutes,
+                np.array(
+                    [pd.Timestamp(dt).value for dt in self.capital_changes],
+                    dtype=np.int64,
+                ),
+            )
+            self._busy_minutes = event_minutes, busy_minutes
+
+        idx = busy_minutes.searchsorted(minute)
+        if idx == len(busy_minutes):
+            return np.iinfo(np.int64).max
+        return busy_minutes[idx]
+
     def _create_benchmark_source(self):
         return BenchmarkSource(
             benchmark_sid=self.benchmark_sid,
@@ -569,6 +708,13 @@ class TradingAlgorithm(object):
             self.initialize(*self.initialize_args, **self.initialize_kwargs)
             self.initialized = True
 
+        # Precompute when the scheduled functions trigger so that they don't
+        # have to be evaluated against the calendar every minute.
+        self.event_manager.compile(
+            self.sim_params.sessions,
+            self.trading_calendar,
+        )
+
         self.trading_client = AlgorithmSimulator(
             self,
             sim_params,
@@ -576,7 +722,8 @@ class TradingAlgorithm(object):
             self._create_clock(),
             self._create_benchmark_source(),
             self.restrictions,
-            universe_func=self._calculate_universe
+            universe_func=self._calculate_universe,
+            fill_frequency=self._fill_frequency,
         )
 
         return self.trading_client.transform()
@@ -597,11 +744,14 @@ class TradingAlgorithm(object):
         """
         return self._create_generator(self.sim_params)
 
-    def run(self, data=None, overwrite_sim_params=True):
+    def run(self, data=None, overwrite_sim_params=True, perf_sink=None):
         """Run the algorithm.
 
         :Arguments:
             source : DataPortal
+            perf_sink : PerformanceSink, optional
+              Consumes the perf packets as they are produced and builds the
+              daily stats. By default the daily perf is kept in memory.
 
         :Returns:
             daily_stats : pandas.DataFrame
@@ -694,13 +844,18 @@ class TradingAlgorithm(object):
 
         # Create zipline and loop through simulated_trading.
         # Each iteration returns a perf dictionary
+        if perf_sink is None:
+            perf_sink = InMemoryPerformanceSink()
+
         try:
-            perfs = []
             for perf in self.get_generator():
-                perfs.append(perf)
+                perf_sink.write(perf)
+
+            if perf_sink.risk_report is not None:
+                self.risk_report = perf_sink.risk_report
 
             # convert perf dict to pandas dataframe
-            daily_stats = self._create_daily_stats(perfs)
+            daily_stats = perf_sink.daily_stats()
 
             self.analyze(daily_stats)
         finally:
@@ -815,27 +970,14 @@ class TradingAlgorithm(object):
 
     def _create_daily_stats(self, perfs):
         # create daily and cumulative stats dataframe
-        daily_perfs = []
-        # TODO: the loop here could overwrite expected properties
-        # of daily_perf. Could potentially raise or log a
-        # warning.
+        sink = InMemoryPerformanceSink()
         for perf in perfs:
-            if 'daily_perf' in perf:
+            sink.write(perf)
 
-                perf['daily_perf'].update(
-                    perf['daily_perf'].pop('recorded_vars')
-                )
-                perf['daily_perf'].update(perf['cumulative_risk_metrics'])
-                daily_perfs.append(perf['daily_perf'])
-            else:
-                self.risk_report = perf
+        if sink.risk_report is not None:
+            self.risk_report = sink.risk_report
 
-        daily_dts = pd.DatetimeIndex(
-            [p['period_close'] for p in daily_perfs], tz='UTC'
-        )
-        daily_stats = pd.DataFrame(daily_perfs, index=daily_dts)
-
-        return daily_stats
+        return sink.daily_stats()
 
     def calculate_capital_changes(self, dt, emission_rate, is_interday,
                                   portfolio_value_adjustment=0.0):
@@ -2282,12 +2424,16 @@ class TradingAlgorithm(object):
         pipeline : Pipeline
             Returns the pipeline that was attached unchanged.
 
+        Notes
+        -----
+        Any number of pipelines may be attached. They are computed together,
+        so terms shared between them are only computed once, over chunks of
+        the smallest chunksize requested.
+
         See Also
         --------
         :func:`zipline.api.pipeline_output`
         """
-        if self._pipelines:
-            raise NotImplementedError("Multiple pipelines are not supported.")
         if chunksize is None:
             # Make the first chunk smaller to get more immediate results:
             # (one week, then every half year)
@@ -2327,18 +2473,14 @@ class TradingAlgorithm(object):
         :func:`zipline.api.attach_pipeline`
         :meth:`zipline.pipeline.engine.PipelineEngine.run_pipeline`
         """
-        # NOTE: We don't currently support multiple pipelines, but we plan to
-        # in the future.
-        try:
-            p, chunks = self._pipelines[name]
-        except KeyError:
+        if name not in self._pipelines:
             raise NoSuchPipeline(
                 name=name,
                 valid=list(self._pipelines.keys()),
             )
-        return self._pipeline_output(p, chunks)
+        return self._pipeline_output(name)
 
-    def _pipeline_output(self, pipeline, chunks):
+    def _pipeline_output(self, name):
         """
         Internal implementation of `pipeline_output`.
         """
@@ -2369,20 +2511,41 @@ class TradingAlgorithm(object):
             exc_clear()
 
             # 2. Clear the .loc/.iloc caches.
-            clear_dataframe_indexer_caches(
-                self._pipeline_cache._unsafe_get_value()
-            )
+            for frame in itervalues(
+                    self._pipeline_cache._unsafe_get_value() or {}):
+                clear_dataframe_indexer_caches(frame)
 
             # 1. Clear the reference to self._pipeline_cache.
             self._pipeline_cache = None
 
-            # Calculate the next block.
-            data, valid_until = self._run_pipeline(
-                pipeline, today, next(chunks),
-            )
+            pipelines = {
+                pipeline_name: pipeline
+                for pipeline_name, (pipeline, _) in iteritems(self._pipelines)
+            }
+            prefetch, self._pipeline_prefetch = self._pipeline_prefetch, None
+            if prefetch is not None and prefetch[0] == today:
+                data, valid_until = prefetch[2].get()
+            else:
+                if prefetch is None:
+                    chunksize = self._next_pipeline_chunksize()
+                else:
+                    # The algorithm skipped the session the prefetch started
+                    # on. Compute the chunk starting today instead, with the
+                    # chunksize already taken from the schedule for it.
+                    _, chunksize, result = prefetch
+                    result.wait()
+                data, valid_until = self._run_pipelines(
+                    pipelines,
+                    today,
+                    chunksize,
+                )
             self._pipeline_cache = CachedObject(data, valid_until)
 
+            if self._pipeline_prefetch_pool is not None:
+                self._prefetch_pipelines(pipelines, valid_until)
+
         # Now that we have a cached result, try to return the data for today.
+        data = data[name]
         try:
             return data.loc[today]
         except KeyError:
@@ -2390,24 +2553,79 @@ class TradingAlgorithm(object):
             # day.
             return pd.DataFrame(index=[], columns=data.columns)
 
-    def _run_pipeline(self, pipeline, start_session, chunksize):
+    def _next_pipeline_chunksize(self):
+        """
+        Advance the chunk schedule of every attached pipeline and return the
+        number of days to compute for the next chunk.
         """
-        Compute `pipeline`, providing values for at least `start_date`.
+        return min(next(chunks) for _, chunks in itervalues(self._pipelines))
 
-        Produces a DataFrame containing data for days between `start_date` and
-        `end_date`, where `end_date` is defined by:
+    def _prefetch_pipelines(self, pipelines, valid_until):
+        """
+        Start computing the chunk that follows the one ending on
+        `valid_until` in ``self._pipeline_prefetch_pool``.
+
+        The chunk is computed with exactly the arguments the synchronous path
+        would use if the algorithm next asks for pipeline output on the
+        session after `valid_until`, so the results are identical.
+        """
+        if valid_until >= self.sim_params.end_session:
+            return
+
+        sessions = self.trading_calendar.all_sessions
+        start_session = sessions[sessions.get_loc(valid_until) + 1]
+        chunksize = self._next_pipeline_chunksize()
+        self._pipeline_prefetch = (
+            start_session,
+            chunksize,
+            self._pipeline_prefetch_pool.apply_async(
+                self._run_prefetched_pipelines,
+                (pipelines, start_session, chunksize),
+            ),
+        )
+
+    def _run_prefetched_pipelines(self, pipelines, start_session, chunksize):
+        """
+        Compute a chunk in a worker of ``self._pipeline_prefetch_pool``, with
+        the worker's own engine and loaders.
+
+        The loaders are created in the worker the first time it computes a
+        chunk, because loaders like ``USEquityPricingLoader`` hold sqlite
+        connections which can only be used by the thread that opened them.
+        """
+        engine = getattr(self._prefetch_engines, 'engine', None)
+        if engine is None:
+            engine = self._prefetch_engines.engine = SimplePipelineEngine(
+                self._make_prefetch_pipeline_loader(),
+                self.trading_calendar.all_sessions,
+                self.asset_finder,
+                result_cache=self._pipeline_result_cache,
+            )
+        return self._run_pipelines(pipelines, start_session, chunksize, engine)
+
+    def _run_pipelines(self, pipelines, start_session, chunksize, engine=None):
+        """
+        Compute `pipelines`, providing values for at least `start_date`.
+
+        Produces a DataFrame for each pipeline containing data for days between
+        `start_date` and `end_date`, where `end_date` is defined by:
 
             `end_date = min(start_date + chunksize trading days,
                             simulation_end)`
 
+        The pipelines are computed with `engine`, which defaults to
+        ``self.engine``.
+
         Returns
         -------
-        (data, valid_until) : tuple (pd.DataFrame, pd.Timestamp)
+        (data, valid_until) : tuple (dict[str -> pd.DataFrame], pd.Timestamp)
 
         See Also
         --------
-        PipelineEngine.run_pipeline
+        PipelineEngine.run_pipelines
         """
+        if engine is None:
+            engine = self.engine
         sessions = self.trading_calendar.all_sessions
 
         # Load data starting from the previous trading day...
@@ -2425,7 +2643,7 @@ class TradingAlgorithm(object):
         end_session = sessions[end_loc]
 
         return \
-            self.engine.run_pipeline(pipeline, start_session, end_session), \
+            engine.run_pipelines(pipelines, start_session, end_session), \
             end_session
 
     ##################
@@ -0,0 +1,174 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Precomputed cumulative adjustment factors of every asset on every session.
+"""
+import os
+
+import numpy as np
+
+from zipline.utils.paths import ensure_directory
+
+
+def _to_seconds(sessions):
+    return np.asarray(sessions.values).astype('datetime64[s]').view(np.int64)
+
+
+class AdjustmentFactors(object):
+    """
+    The cumulative products of the adjustment ratios of many assets, on every
+    session of a calendar.
+
+    Row ``k`` of a factor matrix holds, for each sid, the product of the
+    ratios effective on or before ``dates[k - 1]``; row 0 is all ones. The
+    product of the ratios effective between two dates is then the quotient of
+    two rows, which can be computed for any number of sids at once.
+
+    Parameters
+    ----------
+    dates : np.ndarray[int64]
+        The sorted sessions and effective dates, in seconds since the epoch.
+    sids : np.ndarray[int64]
+        The sorted sids with at least one adjustment.
+    price_factors : np.ndarray[float64]
+        The ``(len(dates) + 1, len(sids))`` cumulative products of the split,
+        merger and dividend ratios.
+    volume_factors : np.ndarray[float64]
+        The ``(len(dates) + 1, len(sids))`` cumulative products of the
+        inverse split ratios.
+
+    Notes
+    -----
+    Every effective date is one of the ``dates``, so the factors give the
+    same ratios as the adjustments db for any pair of dates. The effective
+    dates written by ``SQLiteAdjustmentWriter`` are normally sessions, in
+    which case there is one row per session.
+    """
+    _fields = ('dates', 'sids', 'price_factors', 'volume_factors')
+
+    def __init__(self, dates, sids, price_factors, volume_factors):
+        self.dates = dates
+        self.sids = sids
+        self.price_factors = price_factors
+        self.volume_factors = volume_factors
+
+    @classmethod
+    def from_index(cls, index, sessions):
+        """Compute the factors of every sid in an adjustments db.
+
+        Parameters
+        ----------
+        index : SQLiteAdjustmentIndex
+            The tables of the adjustments db.
+        sessions : pd.DatetimeIndex
+            The sessions to compute the factors on.
+
+        Returns
+        -------
+        factors : AdjustmentFactors
+            The cumulative factors.
+        """
+        tables = index.splits, index.mergers, index.dividends
+        dates = np.union1d(
+            _to_seconds(sessions),
+            np.concatenate([table.dates for table in tables]),
+        )
+        sids = np.unique(np.concatenate([table.sids for table in tables]))
+
+        shape = len(dates) + 1, len(sids)
+        price_factors = np.ones(shape)
+        volume_factors = np.ones(shape)
+        for table in tables:
+            # An adjustment first applies to the row after its effective
+            # date.
+            rows = dates.searchsorted(table.dates) + 1
+            cols = sids.searchsorted(table.sids)
+            ratios = table.columns['ratio'].astype(np.float64)
+
+            np.multiply.at(price_factors, (rows, cols), ratios)
+            if table is index.splits:
+                np.multiply.at(volume_factors, (rows, cols), 1.0 / ratios)
+
+        np.cumprod(price_factors, axis=0, out=price_factors)
+        np.cumprod(volume_factors, axis=0, out=volume_factors)
+        return cls(dates, sids, price_factors, volume_factors)
+
+    @classmethod
+    def read(cls, rootdir):
+        """Memory-map factors written by :meth:`write`.
+
+        Parameters
+        ----------
+        rootdir : str
+            The directory the factors were written to.
+        """
+        return cls(*(
+            np.load(os.path.join(rootdir, name + '.npy'), mmap_mode='r')
+            for name in cls._fields
+        ))
+
+    def write(self, rootdir):
+        """Write the factors as ``.npy`` files that can be memory-mapped by
+        :meth:`read`.
+
+        Parameters
+        ----------
+        rootdir : str
+            The directory to write the factors to.
+        """
+        ensure_directory(rootdir)
+        for name in self._fields:
+            np.save(os.path.join(rootdir, name + '.npy'), getattr(self, name))
+
+    def cumulative_ratios(self, sids, field, start_date, end_date):
+        """The product of the ratios adjusting ``field`` of each sid between
+        two dates.
+
+        This has the same output as
+        ``SQLiteAdjustmentIndex.cumulative_ratios``.
+
+        Parameters
+        ----------
+        sids : np.ndarray[int64]
+            The sids to look up.
+        field : str
+            The field being adjusted.
+        start_date : int
+            The first date to include, in seconds since the epoch.
+        end_date : int
+            The last date to include, in seconds since the epoch.
+
+        Returns
+        -------
+        ratios : np.ndarray[float64]
+            The cumulative ratio of each sid.
+        """
+        out = np.ones(len(sids))
+        start = self.dates.searchsorted(start_date, 'left')
+        stop = self.dates.searchsorted(end_date, 'right')
+        if start >= stop or not len(self.sids):
+            return out
+
+        locs = self.sids.searchsorted(sids)
+        found = locs < len(self.sids)
+        found[found] = self.sids[locs[found]] == sids[found]
+        locs = locs[found]
+
+        if field == 'volume':
+            factors = self.volume_factors
+        else:
+            factors = self.price_factors
+        out[found] = factors[stop, locs] / factors[start, locs]
+        return out
@@ -0,0 +1,355 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-memory indexes of the tables written by ``SQLiteAdjustmentWriter``.
+"""
+import numpy as np
+from six import iteritems
+from six.moves import zip
+
+from zipline.lib.adjustment import Float64Multiply
+
+
+class AdjustmentTable(object):
+    """
+    The rows of an adjustment table, stored as one sorted array per column.
+
+    Rows are sorted by sid and then by date, so the rows of each sid are
+    contiguous and may be searched by date. A second ordering by date is kept
+    to find the rows on a given date.
+
+    Parameters
+    ----------
+    sids : np.ndarray[int64]
+        The sid of each row.
+    dates : np.ndarray[int64]
+        The date of each row, in seconds since the epoch.
+    **columns : np.ndarray
+        The other columns of the table.
+    """
+    def __init__(self, sids, dates, **columns):
+        order = np.lexsort((dates, sids))
+        self.sids = sids = np.asarray(sids, dtype=np.int64)[order]
+        self.dates = dates = np.asarray(dates, dtype=np.int64)[order]
+        self.columns = {
+            name: np.asarray(column)[order]
+            for name, column in iteritems(columns)
+        }
+
+        # The unique sids, and the offset of the first row of each of them.
+        self._unique_sids, self._offsets = np.unique(sids, return_index=True)
+        self._offsets = np.append(self._offsets, len(sids))
+
+        # Each row is keyed by the position of its sid in ``_unique_sids`` and
+        # its date, so that the rows of many sids can be searched at once.
+        # Dates are stored as an offset from the first date, starting at 1, so
+        # that any query date can be clipped into [0, _span) without
+        # colliding with the key of another sid.
+        if len(dates):
+            self._min_date = dates.min()
+            self._span = dates.max() - self._min_date + 3
+        else:
+            self._min_date = 0
+            self._span = 1
+        groups = np.repeat(
+            np.arange(len(self._unique_sids), dtype=np.int64),
+            np.diff(self._offsets),
+        )
+        self._keys = groups * self._span + (dates - self._min_date + 1)
+
+        self._by_date = np.argsort(dates, kind='mergesort')
+        self._sorted_dates = dates[self._by_date]
+
+    @classmethod
+    def from_sqlite(cls, conn, table_name, date_column, columns):
+        """Load a table from an adjustments db.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            The connection to the adjustments db.
+        table_name : str
+            The name of the table.
+        date_column : str
+            The column to look rows up by.
+        columns : list[str]
+            The other columns to load.
+
+        Returns
+        -------
+        table : AdjustmentTable
+            The rows of the table.
+        """
+        names = ['sid', date_column] + list(columns)
+        rows = conn.execute(
+            'SELECT %s FROM %s' % (', '.join(names), table_name),
+        ).fetchall()
+        if rows:
+            arrays = [np.array(column) for column in zip(*rows)]
+        else:
+            arrays = [np.array([], dtype=np.int64) for _ in names]
+        return cls(
+            arrays[0],
+            arrays[1],
+            **dict(zip(columns, arrays[2:]))
+        )
+
+    def __len__(self):
+        return len(self.sids)
+
+    def sid_slice(self, sid):
+        """The rows of a sid.
+
+        Returns
+        -------
+        rows : slice
+            The rows of ``sid``, in date order.
+        """
+        loc = self._unique_sids.searchsorted(sid)
+        if loc == len(self._unique_sids) or self._unique_sids[loc] != sid:
+            return slice(0, 0)
+        return slice(self._offsets[loc], self._offsets[loc + 1])
+
+    def rows_on_date(self, date):
+        """The rows on a date.
+
+        Returns
+        -------
+        rows : np.ndarray[int64]
+            The rows whose date is ``date``, in sid order.
+        """
+        return self._by_date[
+            self._sorted_dates.searchsorted(date, 'left'):
+            self._sorted_dates.searchsorted(date, 'right')
+        ]
+
+    def bounds(self, sids, start_date, end_date):
+        """The rows of each of ``sids`` between two dates.
+
+        Parameters
+        ----------
+        sids : np.ndarray[int64]
+            The sids to look up.
+        start_date : int
+            The first date to include, in seconds since the epoch.
+        end_date : int
+            The last date to include, in seconds since the epoch.
+
+        Returns
+        -------
+        starts, stops : np.ndarray[int64]
+            The ``[start, stop)`` rows of each sid whose dates are between
+            ``start_date`` and ``end_date``, inclusive.
+        """
+        sids = np.asarray(sids, dtype=np.int64)
+        locs = self._unique_sids.searchsorted(sids)
+        found = locs < len(self._unique_sids)
+        found[found] = self._unique_sids[locs[found]] == sids[found]
+        locs[~found] = 0
+
+        base = locs * self._span
+        starts = self._keys.searchsorted(
+            base + np.clip(start_date - self._min_date + 1, 0, self._span - 1),
+            'left',
+        )
+        stops = self._keys.searchsorted(
+            base + np.clip(end_date - self._min_date + 1, 0, self._span - 1),
+            'right',
+        )
+        stops[~found] = starts[~found]
+        return starts, np.maximum(starts, stops)
+
+    def rows_between(self, sids, start_date, end_date):
+        """The rows of each of ``sids`` between two dates.
+
+        Returns
+        -------
+        locs : np.ndarray[int64]
+            The position in ``sids`` of each row's sid.
+        rows : np.ndarray[int64]
+            The rows, grouped by the order of ``sids`` and then in date order.
+        """
+        starts, stops = self.bounds(sids, start_date, end_date)
+        lengths = stops - starts
+        locs = np.repeat(np.arange(len(starts)), lengths)
+        rows = (
+            np.arange(lengths.sum()) +
+            np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        )
+        return locs, rows
+
+    def cumulative_ratios(self, sids, start_date, end_date, column='ratio'):
+        """The product of the ratios of each of ``sids`` between two dates.
+
+        Parameters
+        ----------
+        sids : np.ndarray[int64]
+            The sids to look up.
+        start_date : int
+            The first date to include, in seconds since the epoch.
+        end_date : int
+            The last date to include, in seconds since the epoch.
+        column : str, optional
+            The column holding the ratios.
+
+        Returns
+        -------
+        ratios : np.ndarray[float64]
+            The product of the ratios of each sid, in date order, or 1.0 if
+            the sid has no rows between the dates.
+        """
+        starts, stops = self.bounds(sids, start_date, end_date)
+        out = np.ones(len(starts))
+        nonempty = starts < stops
+        if nonempty.any():
+            # Pad the ratios so that every stop is a valid index for reduceat.
+            ratios = np.append(self.columns[column].astype(np.float64), 1.0)
+            indices = np.column_stack(
+                [starts[nonempty], stops[nonempty]],
+            ).ravel()
+            out[nonempty] = np.multiply.reduceat(ratios, indices)[::2]
+        return out
+
+
+class SQLiteAdjustmentIndex(object):
+    """
+    The tables of an adjustments db, loaded into memory.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The connection to the adjustments db.
+    """
+    def __init__(self, conn):
+        self.splits = AdjustmentTable.from_sqlite(
+            conn, 'splits', 'effective_date', ['ratio'],
+        )
+        self.mergers = AdjustmentTable.from_sqlite(
+            conn, 'mergers', 'effective_date', ['ratio'],
+        )
+        self.dividends = AdjustmentTable.from_sqlite(
+            conn, 'dividends', 'effective_date', ['ratio'],
+        )
+        self.dividend_payouts = AdjustmentTable.from_sqlite(
+            conn, 'dividend_payouts', 'ex_date', ['amount', 'pay_date'],
+        )
+        self.stock_dividend_payouts = AdjustmentTable.from_sqlite(
+            conn,
+            'stock_dividend_payouts',
+            'ex_date',
+            [
+                'declared_date',
+                'pay_date',
+                'payment_sid',
+                'ratio',
+                'record_date',
+            ],
+        )
+
+    def table(self, table_name):
+        """Look up a table of ratios by name.
+
+        Parameters
+        ----------
+        table_name : {'splits', 'mergers', 'dividends'}
+            The name of the table, in any case.
+        """
+        table_name = table_name.lower()
+        if table_name not in ('splits', 'mergers', 'dividends'):
+            raise ValueError('unknown adjustment table %r' % table_name)
+        return getattr(self, table_name)
+
+    def price_tables(self, field):
+        """The tables of ratios which adjust ``field``.
+
+        Splits adjust every field, mergers and dividends only adjust prices.
+        """
+        if field == 'volume':
+            return [self.splits]
+        return [self.splits, self.mergers, self.dividends]
+
+    def cumulative_ratios(self, sids, field, start_date, end_date):
+        """The product of the ratios adjusting ``field`` of each sid between
+        two dates.
+
+        Parameters
+        ----------
+        sids : np.ndarray[int64]
+            The sids to look up.
+        field : str
+            The field being adjusted. Volumes are adjusted by the inverse of
+            the split ratios, and aren't adjusted by mergers or dividends.
+        start_date : int
+            The first date to include, in seconds since the epoch.
+        end_date : int
+            The last date to include, in seconds since the epoch.
+
+        Returns
+        -------
+        ratios : np.ndarray[float64]
+            The cumulative ratio of each sid.
+        """
+        out = np.ones(len(sids))
+        for table in self.price_tables(field):
+            out *= table.cumulative_ratios(sids, start_date, end_date)
+        if field == 'volume':
+            out = 1.0 / out
+        return out
+
+    def load_adjustments(self, columns, dates, assets):
+        """Load the adjustments for a pipeline window.
+
+        Parameters
+        ----------
+        columns : list[str]
+            The names of the columns to load adjustments for.
+        dates : pd.DatetimeIndex
+            The dates of the window.
+        assets : pd.Int64Index
+            The assets of the window.
+
+        Returns
+        -------
+        adjustments : list[dict[int -> list[Adjustment]]]
+            For each column, a mapping from the row to apply adjustments at
+            to the adjustments to apply.
+        """
+        dates = dates.values.astype('datetime64[s]').view(np.int64)
+        sids = np.asarray(assets, dtype=np.int64)
+        results = [{} for _ in columns]
+
+        for table in self.splits, self.mergers, self.dividends:
+            locs, rows = table.rows_between(sids, dates[0], dates[-1])
+            date_locs = dates.searchsorted(table.dates[rows])
+            ratios = table.columns['ratio'][rows]
+            for asset_ix, date_loc, ratio in zip(locs, date_locs, ratios):
+                asset_ix = int(asset_ix)
+                date_loc = int(date_loc)
+                price_adj = Float64Multiply(
+                    0, date_loc, asset_ix, asset_ix, ratio,
+                )
+                for col_adjustments, column in zip(results, columns):
+                    if column != 'volume':
+                        adj = price_adj
+                    elif table is self.splits:
+                        # volumes are adjusted by the inverse of splits
+                        adj = Float64Multiply(
+                            0, date_loc, asset_ix, asset_ix, 1.0 / ratio,
+                        )
+                    else:
+                        continue
+                    col_adjustments.setdefault(date_loc, []).append(adj)
+
+        return results
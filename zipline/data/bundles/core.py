@@ -1,6 +1,7 @@
 from collections import namedtuple
 import errno
 import os
+import re
 import shutil
 import warnings
 
@@ -15,10 +16,13 @@ from ..us_equity_pricing import (
     SQLiteAdjustmentReader,
     SQLiteAdjustmentWriter,
 )
+from ..memmap_daily_bars import MemmapDailyBarReader
 from ..minute_bars import (
+    BcolzMinuteBarMetadata,
     BcolzMinuteBarReader,
     BcolzMinuteBarWriter,
 )
+from .store import ContentStore
 from zipline.assets import AssetDBWriter, AssetFinder, ASSET_DB_VERSION
 from zipline.assets.asset_db_migrations import downgrade
 from zipline.utils.cache import (
@@ -54,6 +58,13 @@ def daily_equity_path(bundle_name, timestr, environ=None):
     )
 
 
+def daily_equity_memmap_path(bundle_name, timestr, environ=None):
+    return pth.data_path(
+        daily_equity_memmap_relative(bundle_name, timestr, environ),
+        environ=environ,
+    )
+
+
 def adjustment_db_path(bundle_name, timestr, environ=None):
     return pth.data_path(
         adjustment_db_relative(bundle_name, timestr, environ),
@@ -61,6 +72,13 @@ def adjustment_db_path(bundle_name, timestr, environ=None):
     )
 
 
+def adjustment_factors_path(bundle_name, timestr, environ=None):
+    return pth.data_path(
+        adjustment_factors_relative(bundle_name, timestr, environ),
+        environ=environ,
+    )
+
+
 def cache_path(bundle_name, environ=None):
     return pth.data_path(
         cache_relative(bundle_name, environ),
@@ -68,18 +86,37 @@ def cache_path(bundle_name, environ=None):
     )
 
 
+def store_path(bundle_name, environ=None):
+    return pth.data_path(
+        store_relative(bundle_name, environ),
+        environ=environ,
+    )
+
+
 def adjustment_db_relative(bundle_name, timestr, environ=None):
     return bundle_name, timestr, 'adjustments.sqlite'
 
 
+def adjustment_factors_relative(bundle_name, timestr, environ=None):
+    return bundle_name, timestr, 'adjustment_factors'
+
+
 def cache_relative(bundle_name, timestr, environ=None):
     return bundle_name, '.cache'
 
 
+def store_relative(bundle_name, environ=None):
+    return bundle_name, '.store'
+
+
 def daily_equity_relative(bundle_name, timestr, environ=None):
     return bundle_name, timestr, 'daily_equities.bcolz'
 
 
+def daily_equity_memmap_relative(bundle_name, timestr, environ=None):
+    return bundle_name, timestr, 'daily_equities.memmap'
+
+
 def minute_equity_relative(bundle_name, timestr, environ=None):
     return bundle_name, timestr, 'minute_equities.bcolz'
 
@@ -132,6 +169,49 @@ def ingestions_for_bundle(bundle, environ=None):
     )
 
 
+# The data files of a bcolz carray.
+_bcolz_chunk = re.compile(r'__(\d+)\.blp$')
+
+
+def link_bcolz_tree(src, dst):
+    """Copy a directory of bcolz tables, hard-linking the chunks that
+    appending to the tables never changes.
+
+    bcolz only rewrites the last chunk of each carray and its metadata when
+    data is appended, so those are copied and every other chunk is shared
+    with ``src``. Files are copied when they can't be linked, for example
+    across filesystems.
+
+    Parameters
+    ----------
+    src : str
+        The directory to copy.
+    dst : str
+        The new directory, which must not exist.
+    """
+    for dirpath, dirnames, filenames in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(dirpath, src))
+        pth.ensure_directory(target)
+
+        chunks = {}
+        for filename in filenames:
+            match = _bcolz_chunk.match(filename)
+            if match is not None:
+                chunks[filename] = int(match.group(1))
+        last_chunk = max(chunks.values()) if chunks else None
+
+        for filename in filenames:
+            source = os.path.join(dirpath, filename)
+            destination = os.path.join(target, filename)
+            if chunks.get(filename, last_chunk) != last_chunk:
+                try:
+                    os.link(source, destination)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source, destination)
+
+
 RegisteredBundle = namedtuple(
     'RegisteredBundle',
     ['calendar_name',
@@ -139,7 +219,8 @@ RegisteredBundle = namedtuple(
      'end_session',
      'minutes_per_day',
      'ingest',
-     'create_writers']
+     'create_writers',
+     'incremental']
 )
 
 BundleData = namedtuple(
@@ -228,7 +309,8 @@ def _make_bundle_core():
                  start_session=None,
                  end_session=None,
                  minutes_per_day=390,
-                 create_writers=True):
+                 create_writers=True,
+                 incremental=False):
         """Register a data bundle ingest function.
 
         Parameters
@@ -278,6 +360,10 @@ def _make_bundle_core():
             Should the ingest machinery create the writers for the ingest
             function. This can be disabled as an optimization for cases where
             they are not needed, like the ``quantopian-quandl`` bundle.
+        incremental : bool, optional
+            Whether the ingest function supports incremental ingestions,
+            where it only writes the sessions after the existing data of each
+            sid. See :func:`~zipline.data.bundles.ingest`.
 
         Notes
         -----
@@ -310,6 +396,7 @@ def _make_bundle_core():
             minutes_per_day=minutes_per_day,
             ingest=f,
             create_writers=create_writers,
+            incremental=incremental,
         )
         return f
 
@@ -339,7 +426,10 @@ def _make_bundle_core():
                environ=os.environ,
                timestamp=None,
                assets_versions=(),
-               show_progress=False):
+               show_progress=False,
+               adjustment_factors=False,
+               incremental=False,
+               deduplicate=False):
         """Ingest data for a given bundle.
 
         Parameters
@@ -355,6 +445,48 @@ def _make_bundle_core():
             Versions of the assets db to which to downgrade.
         show_progress : bool, optional
             Tell the ingest function to display the progress where possible.
+        adjustment_factors : bool, optional
+            Precompute the cumulative adjustment factors of every asset on
+            every session of the daily bars, which are then used by the
+            adjustment reader returned by ``load``.
+        incremental : bool, optional
+            Start from the most recent ingestion of the bundle instead of
+            from empty writers. See the notes below.
+        deduplicate : bool, optional
+            Add the bar data of the new ingestion to the bundle's content
+            store, which shares the storage of the files that are identical
+            to those of other ingestions. See the notes below. The files of
+            the store which are no longer used are removed by ``clean``.
+
+        Notes
+        -----
+        In an incremental ingestion, the bar data and adjustments of the most
+        recent ingestion are copied into the new one, hard-linking the bcolz
+        chunks which won't change, and the bundle's ingest function only
+        writes what is new:
+
+        - The daily bar writer appends to the existing table, and the minute
+          bar writer appends to the existing sids. Both raise when data does
+          not start after the existing data of a sid, which is given by their
+          ``last_date_in_output_for_sid`` methods.
+        - Adjustments are merged into the existing db, ignoring rows which
+          already exist.
+        - The assets db is written from scratch, as in a full ingestion.
+
+        Bundles opt into this by being registered with ``incremental=True``.
+        A full ingestion is done if the bundle doesn't support incremental
+        ingestions or has no previous ingestion.
+
+        Deduplication works on whole files, so how much is shared depends on
+        the layout of the bar data:
+
+        - The minute bars are stored per sid, and appending only rewrites the
+          last chunk of each carray, so the minute bars of sids and sessions
+          that were already ingested are shared.
+        - The daily bars are one table with the rows of each asset
+          contiguous, so appending rewrites the whole table and moves every
+          row after the first asset's new rows. The daily bars are only
+          shared between ingestions with the same daily data.
         """
         try:
             bundle = bundles[name]
@@ -376,6 +508,21 @@ def _make_bundle_core():
             timestamp = pd.Timestamp.utcnow()
         timestamp = timestamp.tz_convert('utc').tz_localize(None)
 
+        previous = None
+        if incremental and not (bundle.create_writers and
+                                bundle.incremental):
+            warnings.warn(
+                'bundle %r does not support incremental ingestions, doing a'
+                ' full ingestion' % name,
+                stacklevel=2,
+            )
+        elif incremental:
+            try:
+                # this must happen before the new ingestion directory exists
+                previous = most_recent_data(name, timestamp, environ=environ)
+            except ValueError:
+                pass
+
         timestr = to_bundle_ingest_dirname(timestamp)
         cachepath = cache_path(name, environ=environ)
         pth.ensure_directory(pth.data_path([name, timestr], environ=environ))
@@ -385,9 +532,30 @@ def _make_bundle_core():
             # we use `cleanup_on_failure=False` so that we don't purge the
             # cache directory if the load fails in the middle
             if bundle.create_writers:
-                wd = stack.enter_context(working_dir(
-                    pth.data_path([], environ=environ))
-                )
+                if previous is None:
+                    wd = stack.enter_context(working_dir(
+                        pth.data_path([], environ=environ))
+                    )
+                else:
+                    # Stage the ingestion next to the previous one so that
+                    # the unchanged chunks can be hard-linked all the way
+                    # into the new ingestion.
+                    wd = stack.enter_context(working_dir(
+                        pth.data_path([], environ=environ),
+                        prefix='.incremental-',
+                        dir=pth.data_path([name], environ=environ),
+                        link=True,
+                    ))
+                    _copy_previous_ingestion(
+                        previous,
+                        wd,
+                        name,
+                        timestr,
+                        start_session,
+                        bundle.minutes_per_day,
+                        environ,
+                    )
+
                 daily_bars_path = wd.ensure_dir(
                     *daily_equity_relative(
                         name, timestr, environ=environ,
@@ -398,22 +566,38 @@ def _make_bundle_core():
                     calendar,
                     start_session,
                     end_session,
+                    append=previous is not None,
                 )
-                # Do an empty write to ensure that the daily ctables exist
-                # when we create the SQLiteAdjustmentWriter below. The
-                # SQLiteAdjustmentWriter needs to open the daily ctables so
-                # that it can compute the adjustment ratios for the dividends.
-
-                daily_bar_writer.write(())
-                minute_bar_writer = BcolzMinuteBarWriter(
-                    wd.ensure_dir(*minute_equity_relative(
-                        name, timestr, environ=environ)
-                    ),
-                    calendar,
-                    start_session,
-                    end_session,
-                    minutes_per_day=bundle.minutes_per_day,
+                if previous is None:
+                    # Do an empty write to ensure that the daily ctables exist
+                    # when we create the SQLiteAdjustmentWriter below. The
+                    # SQLiteAdjustmentWriter needs to open the daily ctables
+                    # so that it can compute the adjustment ratios for the
+                    # dividends.
+                    daily_bar_writer.write(())
+
+                minute_bars_path = wd.ensure_dir(*minute_equity_relative(
+                    name, timestr, environ=environ)
                 )
+                if previous is None:
+                    minute_bar_writer = BcolzMinuteBarWriter(
+                        minute_bars_path,
+                        calendar,
+                        start_session,
+                        end_session,
+                        minutes_per_day=bundle.minutes_per_day,
+                    )
+                else:
+                    metadata = BcolzMinuteBarMetadata.read(minute_bars_path)
+                    minute_bar_writer = BcolzMinuteBarWriter(
+                        minute_bars_path,
+                        calendar,
+                        start_session,
+                        end_session,
+                        minutes_per_day=bundle.minutes_per_day,
+                        default_ohlc_ratio=metadata.default_ohlc_ratio,
+                        ohlc_ratios_per_sid=metadata.ohlc_ratios_per_sid,
+                    )
                 assets_db_path = wd.getpath(*asset_db_relative(
                     name, timestr, environ=environ,
                 ))
@@ -425,7 +609,7 @@ def _make_bundle_core():
                             name, timestr, environ=environ)),
                         BcolzDailyBarReader(daily_bars_path),
                         calendar.all_sessions,
-                        overwrite=True,
+                        overwrite=previous is None,
                     )
                 )
             else:
@@ -459,6 +643,69 @@ def _make_bundle_core():
                     shutil.copy2(assets_db_path, wf.path)
                     downgrade(wf.path, version)
 
+        if adjustment_factors and bundle.create_writers:
+            # The adjustments db is complete once the writers above are
+            # closed.
+            adjustment_reader = SQLiteAdjustmentReader(
+                adjustment_db_path(name, timestr, environ=environ),
+            )
+            daily_bar_reader = BcolzDailyBarReader(
+                daily_equity_path(name, timestr, environ=environ),
+            )
+            with working_dir(pth.data_path([], environ=environ)) as wd:
+                adjustment_reader.precompute_factors(
+                    daily_bar_reader.sessions,
+                ).write(wd.ensure_dir(*adjustment_factors_relative(
+                    name, timestr, environ=environ,
+                )))
+
+        if deduplicate and bundle.create_writers:
+            store = ContentStore(store_path(name, environ=environ))
+            for path in (daily_equity_path(name, timestr, environ=environ),
+                         minute_equity_path(name, timestr, environ=environ)):
+                store.add_tree(path)
+
+    def _copy_previous_ingestion(previous,
+                                 wd,
+                                 name,
+                                 timestr,
+                                 start_session,
+                                 minutes_per_day,
+                                 environ):
+        """Copy the bars and adjustments of the ingestion at ``previous`` into
+        the working directory of a new ingestion.
+        """
+        def previous_path(relative):
+            return os.path.join(previous, relative[-1])
+
+        minute_relative = minute_equity_relative(name, timestr, environ)
+        metadata = BcolzMinuteBarMetadata.read(previous_path(minute_relative))
+        if (metadata.start_session != start_session or
+                metadata.minutes_per_day != minutes_per_day):
+            raise ValueError(
+                'cannot append to the ingestion at %r, which starts on %s'
+                ' with %d minutes per day, instead of on %s with %d' % (
+                    previous,
+                    metadata.start_session,
+                    metadata.minutes_per_day,
+                    start_session,
+                    minutes_per_day,
+                ),
+            )
+
+        for relative in (minute_relative,
+                         daily_equity_relative(name, timestr, environ)):
+            link_bcolz_tree(previous_path(relative), wd.getpath(*relative))
+
+        adjustments_relative = adjustment_db_relative(name, timestr, environ)
+        pth.ensure_directory(os.path.dirname(
+            wd.getpath(*adjustments_relative),
+        ))
+        shutil.copy2(
+            previous_path(adjustments_relative),
+            wd.getpath(*adjustments_relative),
+        )
+
     def most_recent_data(bundle_name, timestamp, environ=None):
         """Get the path to the most recent data after ``date``for the
         given bundle.
@@ -515,10 +762,29 @@ def _make_bundle_core():
         -------
         bundle_data : BundleData
             The raw data readers for this bundle.
+
+        Notes
+        -----
+        If the daily bars of the ingestion have been converted with
+        :func:`zipline.data.memmap_daily_bars.convert_bcolz_daily_bars` into
+        ``daily_equity_memmap_path(...)``, the memory-mapped copy is read
+        instead of the bcolz table. If the bundle was ingested with
+        ``adjustment_factors=True``, the adjustment reader memory-maps the
+        precomputed factors from ``adjustment_factors_path(...)``.
         """
         if timestamp is None:
             timestamp = pd.Timestamp.utcnow()
         timestr = most_recent_data(name, timestamp, environ=environ)
+        memmap_path = daily_equity_memmap_path(name, timestr, environ=environ)
+        if os.path.isdir(memmap_path):
+            daily_bar_reader = MemmapDailyBarReader(memmap_path)
+        else:
+            daily_bar_reader = BcolzDailyBarReader(
+                daily_equity_path(name, timestr, environ=environ),
+            )
+        factors_path = adjustment_factors_path(name, timestr, environ=environ)
+        if not os.path.isdir(factors_path):
+            factors_path = None
         return BundleData(
             asset_finder=AssetFinder(
                 asset_db_path(name, timestr, environ=environ),
@@ -526,11 +792,10 @@ def _make_bundle_core():
             equity_minute_bar_reader=BcolzMinuteBarReader(
                 minute_equity_path(name, timestr, environ=environ),
             ),
-            equity_daily_bar_reader=BcolzDailyBarReader(
-                daily_equity_path(name, timestr, environ=environ),
-            ),
+            equity_daily_bar_reader=daily_bar_reader,
             adjustment_reader=SQLiteAdjustmentReader(
                 adjustment_db_path(name, timestr, environ=environ),
+                factors=factors_path,
             ),
         )
 
@@ -569,6 +834,11 @@ def _make_bundle_core():
         cleaned : set[str]
             The names of the runs that were removed.
 
+        Notes
+        -----
+        The files of the bundle's content store which are no longer used by
+        any ingestion are removed as well.
+
         Raises
         ------
         BadClean
@@ -614,6 +884,10 @@ def _make_bundle_core():
                 shutil.rmtree(path)
                 cleaned.add(path)
 
+        store = store_path(name, environ=environ)
+        if os.path.isdir(store):
+            ContentStore(store).collect_garbage()
+
         return cleaned
 
     return BundleCore(bundles, register, unregister, ingest, load, clean)
@@ -0,0 +1,340 @@
+"""
+Ingest the data of many sids in a process pool, checkpointing each sid so that
+a failed ingestion can be resumed.
+"""
+from collections import namedtuple
+import errno
+import json
+import os
+import pickle
+import shutil
+
+from bcolz import ctable
+import pandas as pd
+from six import iteritems
+
+from ..us_equity_pricing import to_ctable
+from zipline.utils.cli import maybe_show_progress
+from zipline.utils.paths import ensure_directory
+from zipline.utils.pool import SequentialPool, fork_pool
+
+
+class IngestCheckpoint(object):
+    """The per-sid output of an ingestion.
+
+    Each sid's daily bars are written as a compressed ctable, its minute bars
+    are written with a copy of the bundle's minute bar writer, and any other
+    frames are pickled. A marker file is written once all of the sid's output
+    is complete, so a sid whose worker died part of the way through is
+    redone.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory to write the checkpoint to. This is normally inside of
+        the bundle's cache directory, which is kept when an ingestion fails
+        and deleted when it succeeds.
+    minute_bar_writer : BcolzMinuteBarWriter, optional
+        The writer of the bundle's minute bars. Checkpointed minute bars are
+        written with the same calendar, sessions and ratios.
+    manifest : dict, optional
+        A json serializable description of the ingestion, like its sessions
+        and sids. An existing checkpoint written with a different manifest,
+        for example by an ingestion that failed on an earlier day, is
+        discarded.
+    """
+    MANIFEST_FILENAME = 'manifest.json'
+
+    def __init__(self, rootdir, minute_bar_writer=None, manifest=None):
+        self.rootdir = rootdir
+        self._discard_stale(manifest)
+        for subdir in 'daily', 'frames', 'done':
+            ensure_directory(os.path.join(rootdir, subdir))
+        if minute_bar_writer is not None:
+            minute_bar_writer = minute_bar_writer.with_rootdir(
+                os.path.join(rootdir, 'minute'),
+            )
+        self.minute_bar_writer = minute_bar_writer
+
+    def _discard_stale(self, manifest):
+        """Remove the checkpoint if it wasn't written with ``manifest``, then
+        write ``manifest``.
+        """
+        # Compare the manifests as they are read back from json.
+        manifest = json.loads(json.dumps(manifest, sort_keys=True))
+        path = os.path.join(self.rootdir, self.MANIFEST_FILENAME)
+        try:
+            with open(path) as f:
+                existing = json.load(f)
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                raise
+            existing = None
+        except ValueError:
+            # a partially written manifest
+            existing = None
+
+        if existing is not None and existing == manifest:
+            return
+
+        if os.path.isdir(self.rootdir):
+            shutil.rmtree(self.rootdir)
+        ensure_directory(self.rootdir)
+        with open(path, 'w') as f:
+            json.dump(manifest, f, sort_keys=True)
+
+    def _path(self, kind, sid):
+        return os.path.join(self.rootdir, kind, str(sid))
+
+    def completed(self):
+        """The sids whose output is complete.
+
+        Returns
+        -------
+        sids : set[int]
+        """
+        return set(map(int, os.listdir(os.path.join(self.rootdir, 'done'))))
+
+    def discard(self, sid):
+        """Remove any output of a sid.
+        """
+        try:
+            os.remove(self._path('done', sid))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+        paths = [self._path('daily', sid), self._path('frames', sid)]
+        if self.minute_bar_writer is not None:
+            paths.append(self.minute_bar_writer.sidpath(sid))
+        for path in paths:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    def write(self, sid, data, invalid_data_behavior='warn'):
+        """Write the output of a sid.
+
+        Parameters
+        ----------
+        sid : int
+            The sid.
+        data : dict[str -> pd.DataFrame]
+            The ``'daily'`` bars of the sid, in the format accepted by
+            ``BcolzDailyBarWriter.write``, its ``'minute'`` bars, in the
+            format accepted by ``BcolzMinuteBarWriter.write_sid``, and any
+            other frames. Each entry is optional.
+        invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+            What to do when data is encountered that is outside the range of
+            a uint32.
+        """
+        self.discard(sid)
+        data = dict(data)
+
+        daily = data.pop('daily', None)
+        if daily is not None:
+            to_ctable(daily, invalid_data_behavior).copy(
+                rootdir=self._path('daily', sid),
+                mode='w',
+            ).flush()
+
+        minute = data.pop('minute', None)
+        if minute is not None:
+            if self.minute_bar_writer is None:
+                raise ValueError(
+                    'minute data for sid %d but no minute bar writer' % sid,
+                )
+            self.minute_bar_writer.write_sid(
+                sid,
+                minute,
+                invalid_data_behavior=invalid_data_behavior,
+            )
+
+        with open(self._path('frames', sid), 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # The sid is only complete once the marker exists.
+        open(self._path('done', sid), 'w').close()
+
+    def daily_table(self, sid):
+        """The checkpointed daily bars of a sid, or None if it has none.
+        """
+        path = self._path('daily', sid)
+        if not os.path.isdir(path):
+            return None
+        return ctable(rootdir=path, mode='r')
+
+    def frames(self, sid):
+        """The other frames of a sid.
+
+        Returns
+        -------
+        frames : dict[str -> pd.DataFrame]
+        """
+        with open(self._path('frames', sid), 'rb') as f:
+            return pickle.load(f)
+
+    def copy_minute_bars(self, sid, minute_bar_writer):
+        """Copy the checkpointed minute bars of a sid, if it has any, into the
+        output of ``minute_bar_writer``.
+        """
+        if self.minute_bar_writer is None:
+            return
+        path = self.minute_bar_writer.sidpath(sid)
+        if os.path.isdir(path):
+            shutil.copytree(path, minute_bar_writer.sidpath(sid))
+
+
+_IngestState = namedtuple(
+    '_IngestState',
+    'load_sid checkpoint invalid_data_behavior',
+)
+
+# The state of a worker process, set by ``_init_ingest_worker``.
+_ingest_state = None
+
+
+def _init_ingest_worker(state):
+    global _ingest_state
+    _ingest_state = state
+
+
+def _ingest_sid(sid):
+    state = _ingest_state
+    state.checkpoint.write(
+        sid,
+        state.load_sid(sid),
+        invalid_data_behavior=state.invalid_data_behavior,
+    )
+    return sid
+
+
+def _writer_manifest(writer):
+    if writer is None:
+        return None
+    manifest = {
+        'calendar_name': writer._calendar.name,
+        'start_session': str(writer._start_session),
+        'end_session': str(writer._end_session),
+    }
+    minutes_per_day = getattr(writer, '_minutes_per_day', None)
+    if minutes_per_day is not None:
+        manifest['minutes_per_day'] = minutes_per_day
+    return manifest
+
+
+def ingest_sids(load_sid,
+                sids,
+                cache,
+                daily_bar_writer=None,
+                minute_bar_writer=None,
+                processes=None,
+                show_progress=False,
+                invalid_data_behavior='warn',
+                key=None):
+    """Load, convert and compress the data of many sids in a process pool,
+    then write the bundle's bars.
+
+    Every sid is checkpointed in the bundle's cache directory as soon as it is
+    done. If the ingestion fails, the cache directory is kept, and the next
+    ingestion of the bundle only loads the sids which weren't finished. The
+    checkpoint is only used if the next ingestion has the same calendar,
+    sessions, sids and ``key``.
+
+    The bars are written in sid order once every sid is done, so the output
+    doesn't depend on the order in which the workers finish.
+
+    Parameters
+    ----------
+    load_sid : callable[int -> dict[str -> pd.DataFrame]]
+        The function which loads the data of a sid. It returns a dict with
+        optional ``'daily'`` bars in the format accepted by
+        ``BcolzDailyBarWriter.write``, optional ``'minute'`` bars in the
+        format accepted by ``BcolzMinuteBarWriter.write_sid``, and any other
+        frames, like the sid's splits or dividends. This runs in the worker
+        processes, which are forked from the calling process.
+    sids : iterable[int]
+        The sids to ingest.
+    cache : dataframe_cache
+        The cache passed to the bundle's ingest function.
+    daily_bar_writer : BcolzDailyBarWriter, optional
+        The writer of the daily bars.
+    minute_bar_writer : BcolzMinuteBarWriter, optional
+        The writer of the minute bars.
+    processes : int, optional
+        The number of worker processes. By default this is the number of
+        cpus. If this is 1, the sids are loaded in this process.
+    show_progress : bool, optional
+        Show a progress bar while the sids are loaded.
+    invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+        What to do when data is encountered that is outside the range of
+        a uint32.
+    key : any, optional
+        A json serializable value describing anything else that the output
+        of ``load_sid`` depends on.
+
+    Returns
+    -------
+    frames : dict[str -> pd.DataFrame]
+        The other frames returned by ``load_sid``, each concatenated in sid
+        order.
+    """
+    sids = sorted(set(map(int, sids)))
+    checkpoint = IngestCheckpoint(
+        os.path.join(cache.path, 'ingest-checkpoint'),
+        minute_bar_writer,
+        manifest={
+            'daily': _writer_manifest(daily_bar_writer),
+            'minute': _writer_manifest(minute_bar_writer),
+            'sids': sids,
+            'key': key,
+        },
+    )
+    completed = checkpoint.completed()
+    remaining = [sid for sid in sids if sid not in completed]
+
+    state = _IngestState(load_sid, checkpoint, invalid_data_behavior)
+    if processes == 1:
+        _init_ingest_worker(state)
+        pool = SequentialPool()
+    else:
+        pool = fork_pool(processes, _init_ingest_worker, (state,))
+
+    try:
+        with maybe_show_progress(
+                pool.imap_unordered(_ingest_sid, remaining),
+                show_progress,
+                label='Loading %d of %d sids:' % (len(remaining), len(sids)),
+                length=len(remaining)) as it:
+            for _ in it:
+                pass
+    finally:
+        if processes != 1:
+            pool.terminate()
+            pool.join()
+
+    if daily_bar_writer is not None:
+        daily_bar_writer.write(
+            (
+                (sid, table)
+                for sid, table in (
+                    (sid, checkpoint.daily_table(sid)) for sid in sids
+                )
+                if table is not None
+            ),
+            show_progress=show_progress,
+            invalid_data_behavior=invalid_data_behavior,
+        )
+
+    if minute_bar_writer is not None:
+        for sid in sids:
+            checkpoint.copy_minute_bars(sid, minute_bar_writer)
+
+    frames = {}
+    for sid in sids:
+        for name, frame in iteritems(checkpoint.frames(sid)):
+            frames.setdefault(name, []).append(frame)
+    return {
+        name: pd.concat(parts, ignore_index=True)
+        for name, parts in iteritems(frames)
+    }
@@ -1,6 +1,7 @@
 """
 Module for building a complete daily dataset from Quandl's WIKI dataset.
 """
+from functools import partial
 from io import BytesIO
 from itertools import count
 import tarfile
@@ -10,12 +11,14 @@ from click import progressbar
 from logbook import Logger
 import pandas as pd
 import requests
+from six import iteritems
 from six.moves.urllib.parse import urlencode
 
 from zipline.utils.calendars import register_calendar_alias
 from zipline.utils.cli import maybe_show_progress
 
 from . import core as bundles
+from .parallel import ingest_sids
 
 log = Logger(__name__)
 seconds_per_call = (pd.Timedelta('10 minutes') / 2000).total_seconds()
@@ -232,49 +235,75 @@ def _update_dividends(dividends, asset_id, raw_data):
     dividends.append(df)
 
 
-def gen_symbol_data(api_key,
-                    cache,
-                    symbol_map,
-                    calendar,
-                    start_session,
-                    end_session,
-                    splits,
-                    dividends,
-                    retries):
-    for asset_id, symbol in symbol_map.iteritems():
-        start_time = time()
-        try:
-            # see if we have this data cached.
-            raw_data = cache[symbol]
-            should_sleep = False
-        except KeyError:
-            # we need to fetch the data and then write it to our cache
-            raw_data = cache[symbol] = fetch_single_equity(
-                api_key,
-                symbol,
-                start_date=start_session,
-                end_date=end_session,
-            )
-            should_sleep = True
+def load_symbol_data(api_key,
+                     cache,
+                     symbol_map,
+                     calendar,
+                     start_sessions,
+                     end_session,
+                     retries,
+                     seconds_between_calls,
+                     asset_id):
+    """Load the daily bars, splits and dividends of one asset for
+    :func:`zipline.data.bundles.parallel.ingest_sids`.
+
+    ``start_sessions`` maps each asset to the first date to load, which is
+    after the asset's existing data in an incremental ingestion.
+    """
+    symbol = symbol_map[asset_id]
+    start_session = start_sessions[asset_id]
+    # The cached data depends on the start date, which changes between
+    # incremental ingestions.
+    key = '%s-%s' % (symbol, start_session.strftime('%Y%m%d'))
+    start_time = time()
+    try:
+        # see if we have this data cached.
+        raw_data = cache[key]
+        should_sleep = False
+    except KeyError:
+        # we need to fetch the data and then write it to our cache
+        raw_data = cache[key] = fetch_single_equity(
+            api_key,
+            symbol,
+            start_date=start_session,
+            end_date=end_session,
+            retries=retries,
+        )
+        should_sleep = True
+
+    if should_sleep:
+        remaining = seconds_between_calls - (time() - start_time)
+        if remaining > 0:
+            sleep(remaining)
 
-        _update_splits(splits, asset_id, raw_data)
-        _update_dividends(dividends, asset_id, raw_data)
+    if raw_data.empty:
+        return {}
 
-        sessions = calendar.sessions_in_range(start_session, end_session)
+    splits = []
+    dividends = []
+    _update_splits(splits, asset_id, raw_data)
+    _update_dividends(dividends, asset_id, raw_data)
+
+    # Only write the sessions the asset has data for, so that the next
+    # incremental ingestion continues from the last one.
+    sessions = calendar.sessions_in_range(
+        raw_data.index[0].tz_localize('UTC'),
+        raw_data.index[-1].tz_localize('UTC'),
+    )
 
-        raw_data = raw_data.reindex(
-            sessions.tz_localize(None),
-            copy=False,
-        ).fillna(0.0)
-        yield asset_id, raw_data
+    raw_data = raw_data.reindex(
+        sessions.tz_localize(None),
+        copy=False,
+    ).fillna(0.0)
 
-        if should_sleep:
-            remaining = seconds_per_call - time() - start_time
-            if remaining > 0:
-                sleep(remaining)
+    return {
+        'daily': raw_data,
+        'splits': splits[0],
+        'dividends': dividends[0],
+    }
 
 
-@bundles.register('quandl')
+@bundles.register('quandl', incremental=True)
 def quandl_bundle(environ,
                   asset_db_writer,
                   minute_bar_writer,
@@ -287,8 +316,18 @@ def quandl_bundle(environ,
                   show_progress,
                   output_dir):
     """Build a zipline data bundle from the Quandl WIKI dataset.
+
+    The symbols are loaded by ``QUANDL_INGEST_PROCESSES`` worker processes,
+    1 by default. The downloads are spaced so that all of the workers
+    together stay within Quandl's rate limit. Symbols which were loaded
+    before a failed ingestion are not loaded again.
+
+    In an incremental ingestion, only the data after the existing data of
+    each symbol is downloaded, and symbols whose existing data already
+    reaches the newest available date aren't downloaded at all.
     """
     api_key = environ.get('QUANDL_API_KEY')
+    processes = int(environ.get('QUANDL_INGEST_PROCESSES', 1))
     metadata = fetch_symbol_metadata_frame(
         api_key,
         cache=cache,
@@ -296,28 +335,41 @@ def quandl_bundle(environ,
     )
     symbol_map = metadata.symbol
 
-    # data we will collect in `gen_symbol_data`
-    splits = []
-    dividends = []
+    start_sessions = {}
+    for asset_id, newest in iteritems(metadata.end_date):
+        last = daily_bar_writer.last_date_in_output_for_sid(asset_id)
+        if pd.isnull(last):
+            start_sessions[asset_id] = start_session
+        elif last < pd.Timestamp(newest, tz='UTC'):
+            start_sessions[asset_id] = last + pd.Timedelta(days=1)
 
     asset_db_writer.write(metadata)
-    daily_bar_writer.write(
-        gen_symbol_data(
+    frames = ingest_sids(
+        partial(
+            load_symbol_data,
             api_key,
             cache,
             symbol_map,
             calendar,
-            start_session,
+            start_sessions,
             end_session,
-            splits,
-            dividends,
-            environ.get('QUANDL_DOWNLOAD_ATTEMPTS', 5),
+            int(environ.get('QUANDL_DOWNLOAD_ATTEMPTS', 5)),
+            seconds_per_call * processes,
         ),
+        start_sessions,
+        cache,
+        daily_bar_writer=daily_bar_writer,
+        processes=processes,
         show_progress=show_progress,
+        # the data loaded for each asset depends on its start session
+        key={
+            str(asset_id): str(start)
+            for asset_id, start in iteritems(start_sessions)
+        },
     )
     adjustment_writer.write(
-        splits=pd.concat(splits, ignore_index=True),
-        dividends=pd.concat(dividends, ignore_index=True),
+        splits=frames.get('splits'),
+        dividends=frames.get('dividends'),
     )
 
 
@@ -0,0 +1,147 @@
+"""
+Content-addressed storage of the files of many ingestions of a bundle.
+"""
+import errno
+import hashlib
+import os
+
+from zipline.utils.paths import ensure_directory
+
+
+class ContentStore(object):
+    """A directory of files named by the hash of their contents.
+
+    The files of an ingestion are added to the store by replacing each of
+    them with a hard link to the stored file with the same contents. The
+    per-sid minute bars of a bundle are mostly identical from one ingestion
+    to the next, so most of their files end up sharing the same storage.
+    The daily bars are a single table which is rewritten when it is appended
+    to, so they are only shared by ingestions with the same daily data.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory of the store. This must be on the same filesystem as
+        the files added to the store.
+
+    Notes
+    -----
+    Files in the store are shared between ingestions, so they must never be
+    modified in place once they are added. This holds for the bcolz tables
+    written by an ingestion, which are only opened for reading afterwards.
+    An incremental ingestion copies the last chunk of each minute carray
+    before appending to it, and writes a new daily table.
+    """
+    # The size of the blocks read when hashing a file.
+    _block_size = 1 << 20
+
+    def __init__(self, rootdir):
+        self.rootdir = rootdir
+
+    def _path(self, digest):
+        return os.path.join(self.rootdir, digest[:2], digest[2:])
+
+    @classmethod
+    def _digest(cls, path):
+        hash_ = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(cls._block_size), b''):
+                hash_.update(block)
+        return hash_.hexdigest()
+
+    def _stored_inodes(self):
+        """The ``(st_dev, st_ino)`` of every file in the store.
+        """
+        inodes = set()
+        for dirpath, _, filenames in os.walk(self.rootdir):
+            for filename in filenames:
+                st = os.stat(os.path.join(dirpath, filename))
+                inodes.add((st.st_dev, st.st_ino))
+        return inodes
+
+    def add(self, path):
+        """Add a file to the store.
+
+        Parameters
+        ----------
+        path : str
+            The file to add. If the store already has a file with the same
+            contents, ``path`` is replaced with a link to it.
+
+        Returns
+        -------
+        linked : bool
+            Whether ``path`` was replaced with a link to an existing file.
+        """
+        stored = self._path(self._digest(path))
+        ensure_directory(os.path.dirname(stored))
+        try:
+            os.link(path, stored)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        else:
+            return False
+
+        if os.path.samefile(path, stored):
+            return False
+
+        # Link next to ``path`` and rename over it, so that ``path`` always
+        # exists for any readers.
+        tmp = path + '.store'
+        try:
+            os.remove(tmp)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+        os.link(stored, tmp)
+        os.rename(tmp, path)
+        return True
+
+    def add_tree(self, rootdir):
+        """Add every file in a directory to the store.
+
+        Files which are already links to files in the store, for example the
+        chunks shared with the previous ingestion in an incremental
+        ingestion, are skipped without being read.
+
+        Parameters
+        ----------
+        rootdir : str
+            The directory to add.
+
+        Returns
+        -------
+        nbytes : int
+            The number of bytes of the files which were replaced with links
+            to existing files.
+        """
+        stored = self._stored_inodes()
+        nbytes = 0
+        for dirpath, _, filenames in os.walk(rootdir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) in stored:
+                    continue
+                if self.add(path):
+                    nbytes += st.st_size
+        return nbytes
+
+    def collect_garbage(self):
+        """Remove the files in the store which no ingestion links to.
+
+        Returns
+        -------
+        nbytes : int
+            The number of bytes removed.
+        """
+        nbytes = 0
+        for dirpath, _, filenames in os.walk(self.rootdir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                st = os.stat(path)
+                if st.st_nlink == 1:
+                    os.remove(path)
+                    nbytes += st.st_size
+        return nbytes
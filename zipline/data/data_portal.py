@@ -12,8 +12,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from operator import mul
-
 from logbook import Logger
 
 import numpy as np
@@ -22,7 +20,6 @@ import pandas as pd
 from pandas import isnull
 from pandas.tslib import normalize_date
 from six import iteritems
-from six.moves import reduce
 
 from zipline.assets import Asset, Future, Equity
 from zipline.assets.continuous_futures import ContinuousFuture
@@ -153,11 +150,6 @@ class DataPortal(object):
 
         self._adjustment_reader = adjustment_reader
 
-        # caches of sid -> adjustment list
-        self._splits_dict = {}
-        self._mergers_dict = {}
-        self._dividends_dict = {}
-
         # Cache of sid -> the first trading day of an asset.
         self._asset_start_dates = {}
         self._asset_end_dates = {}
@@ -479,6 +471,165 @@ class DataPortal(object):
             else:
                 return self._get_minute_spot_value(asset, field, dt)
 
+    def get_spot_values(self, assets, fields, dt, data_frequency):
+        """
+        Public API method that returns the spot values of several fields for
+        several assets at the given dt.
+
+        This is equivalent to calling ``get_spot_value`` for each asset and
+        field, but in minute mode the minute bars for every equity and future
+        are read with a single ``load_raw_arrays`` call per field, so the
+        position of ``dt`` and each asset's OHLC ratio are resolved once for
+        the whole cross section instead of once per value.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The assets whose data is desired.
+        fields : list[str]
+            The desired fields of the assets, see ``get_spot_value``.
+        dt : pd.Timestamp
+            The timestamp for the desired values.
+        data_frequency : str
+            The frequency of the data to query; i.e. whether the data is
+            'daily' or 'minute' bars
+
+        Returns
+        -------
+        values : list
+            A list with one entry per field.  Each entry is a sequence with
+            one value per asset, holding the same values that
+            ``get_spot_value`` would return.
+        """
+        # Positions of the assets that can be read in bulk, i.e. equities and
+        # futures that are alive on this session.  Everything else (fetcher
+        # columns, continuous futures, dead assets, daily data) goes through
+        # get_spot_value.
+        batch_positions = []
+        if (data_frequency == 'minute' and
+                self.trading_calendar.is_open_on_minute(dt)):
+            session_label = self.trading_calendar.minute_to_session_label(dt)
+            batch_positions = [
+                i for i, asset in enumerate(assets)
+                if type(asset) in (Equity, Future) and
+                asset.start_date <= dt and
+                session_label <= asset.end_date
+            ]
+
+        if batch_positions:
+            batch_fields = [f for f in fields if f in OHLCVP_FIELDS]
+        else:
+            batch_fields = []
+
+        if batch_fields:
+            batch_assets = [assets[i] for i in batch_positions]
+            raw_fields = sorted(set(
+                'close' if field == 'price' else field
+                for field in batch_fields
+            ))
+            try:
+                raw_arrays = self._get_pricing_reader('minute').\
+                    load_raw_arrays(raw_fields, dt, dt, batch_assets)
+            except (NoDataOnDate, ValueError):
+                # dt is not a market minute for the reader; let the scalar
+                # path decide what to return.
+                batch_fields = []
+            else:
+                raw_values = {
+                    field: array[0]
+                    for field, array in zip(raw_fields, raw_arrays)
+                }
+
+        results = []
+        for field in fields:
+            if field not in batch_fields:
+                results.append([
+                    self.get_spot_value(asset, field, dt, data_frequency)
+                    for asset in assets
+                ])
+                continue
+
+            if field == 'price':
+                values = raw_values['close'].copy()
+                # Assets that did not trade this minute need the forward
+                # filled (and possibly adjusted) last traded price.
+                for i in np.flatnonzero(isnull(values)):
+                    values[i] = self._get_minute_spot_value(
+                        batch_assets[i], 'close', dt, ffill=True,
+                    )
+            elif field == 'volume':
+                values = raw_values['volume'].astype(int64)
+            else:
+                values = raw_values[field]
+
+            if len(batch_positions) == len(assets):
+                results.append(values)
+                continue
+
+            field_values = [None] * len(assets)
+            for i, value in zip(batch_positions, values):
+                field_values[i] = value
+            batch_set = set(batch_positions)
+            for i, asset in enumerate(assets):
+                if i not in batch_set:
+                    field_values[i] = self.get_spot_value(
+                        asset, field, dt, data_frequency,
+                    )
+            results.append(field_values)
+        return results
+
+    def get_session_minute_bars(self, assets, fields, session):
+        """
+        Returns the minute bars of several assets for a whole session.
+
+        Where ``get_spot_values`` reads a single minute, this reads the block
+        of minutes of each asset for the session with a single
+        ``load_raw_arrays`` call.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The assets whose data is desired.
+        fields : list[{'open', 'high', 'low', 'close', 'volume'}]
+            The desired fields of the assets.
+        session : pd.Timestamp
+            The session to read.
+
+        Returns
+        -------
+        minutes : pd.DatetimeIndex
+            The minutes of the session.
+        bars : dict[str -> np.ndarray]
+            For each field, an array with a row per minute and a column per
+            asset, holding the values that ``get_spot_value`` would return.
+            Volumes are 0 and prices are nan in minutes without a trade.
+        """
+        minutes = self.trading_calendar.minutes_for_session(session)
+        bars = {
+            field: np.full(
+                (len(minutes), len(assets)),
+                0.0 if field == 'volume' else np.nan,
+            )
+            for field in fields
+        }
+
+        alive_positions = [
+            i for i, asset in enumerate(assets)
+            if type(asset) in (Equity, Future) and
+            asset.start_date <= session <= asset.end_date
+        ]
+        if alive_positions:
+            arrays = self._get_pricing_reader('minute').load_raw_arrays(
+                fields,
+                minutes[0],
+                minutes[-1],
+                [assets[i] for i in alive_positions],
+            )
+            for field, array in zip(fields, arrays):
+                bars[field][:, alive_positions] = array
+
+        return minutes, bars
+
     def get_adjustments(self, assets, field, dt, perspective_dt):
         """
         Returns a list of adjustments between the dt and perspective_dt for the
@@ -507,43 +658,15 @@ class DataPortal(object):
         if isinstance(assets, Asset):
             assets = [assets]
 
-        adjustment_ratios_per_asset = []
-        split_adj_factor = lambda x: x if field != 'volume' else 1.0 / x
-
-        for asset in assets:
-            adjustments_for_asset = []
-            split_adjustments = self._get_adjustment_list(
-                asset, self._splits_dict, "SPLITS"
-            )
-            for adj_dt, adj in split_adjustments:
-                if dt <= adj_dt <= perspective_dt:
-                    adjustments_for_asset.append(split_adj_factor(adj))
-                elif adj_dt > perspective_dt:
-                    break
-
-            if field != 'volume':
-                merger_adjustments = self._get_adjustment_list(
-                    asset, self._mergers_dict, "MERGERS"
-                )
-                for adj_dt, adj in merger_adjustments:
-                    if dt <= adj_dt <= perspective_dt:
-                        adjustments_for_asset.append(adj)
-                    elif adj_dt > perspective_dt:
-                        break
-
-                dividend_adjustments = self._get_adjustment_list(
-                    asset, self._dividends_dict, "DIVIDENDS",
-                )
-                for adj_dt, adj in dividend_adjustments:
-                    if dt <= adj_dt <= perspective_dt:
-                        adjustments_for_asset.append(adj)
-                    elif adj_dt > perspective_dt:
-                        break
-
-            ratio = reduce(mul, adjustments_for_asset, 1.0)
-            adjustment_ratios_per_asset.append(ratio)
+        if self._adjustment_reader is None:
+            return [1.0] * len(assets)
 
-        return adjustment_ratios_per_asset
+        return self._adjustment_reader.get_adjustment_ratios(
+            assets,
+            field,
+            dt,
+            perspective_dt,
+        ).tolist()
 
     def get_adjusted_value(self, asset, field, dt,
                            perspective_dt,
@@ -596,6 +719,73 @@ class DataPortal(object):
 
         return spot_value
 
+    def get_adjusted_values(self, assets, field, dt, perspective_dt,
+                            data_frequency):
+        """
+        Returns the values of a field of several assets at the given dt with
+        adjustments applied.
+
+        This is equivalent to calling ``get_adjusted_value`` for each asset,
+        but the spot values are read with ``get_spot_values`` and the
+        adjustments of every equity are computed at once.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The assets whose data is desired.
+        field : {'open', 'high', 'low', 'close', 'volume', \
+                 'price', 'last_traded'}
+            The desired field of the assets.
+        dt : pd.Timestamp
+            The timestamp for the desired values.
+        perspective_dt : pd.Timestamp
+            The timestamp from which the data is being viewed back from.
+        data_frequency : str
+            The frequency of the data to query; i.e. whether the data is
+            'daily' or 'minute' bars
+
+        Returns
+        -------
+        values : list
+            The value of ``field`` for each asset, as returned by
+            ``get_adjusted_value``.
+        """
+        # fetcher fields are read as of perspective_dt, see get_adjusted_value
+        is_extra = [
+            self._is_extra_source(asset, field, self._augmented_sources_map)
+            for asset in assets
+        ]
+        values = [None] * len(assets)
+        spot_positions = [i for i, extra in enumerate(is_extra) if not extra]
+        spot_values, = self.get_spot_values(
+            [assets[i] for i in spot_positions],
+            [field],
+            dt,
+            data_frequency,
+        )
+        for i, value in zip(spot_positions, spot_values):
+            values[i] = value
+
+        equities = []
+        for i, asset in enumerate(assets):
+            if is_extra[i]:
+                values[i] = self.get_spot_value(asset, field, perspective_dt,
+                                                data_frequency)
+            if isinstance(asset, Equity):
+                equities.append(i)
+
+        if equities:
+            ratios = self.get_adjustments(
+                [assets[i] for i in equities],
+                field,
+                dt,
+                perspective_dt,
+            )
+            for i, ratio in zip(equities, ratios):
+                values[i] *= ratio
+
+        return values
+
     def _get_minute_spot_value(self, asset, column, dt, ffill=False):
         reader = self._get_pricing_reader('minute')
         try:
@@ -1003,40 +1193,6 @@ class DataPortal(object):
                 return_array[:len(data)] = data
         return return_array
 
-    def _get_adjustment_list(self, asset, adjustments_dict, table_name):
-        """
-        Internal method that returns a list of adjustments for the given sid.
-
-        Parameters
-        ----------
-        asset : Asset
-            The asset for which to return adjustments.
-
-        adjustments_dict: dict
-            A dictionary of sid -> list that is used as a cache.
-
-        table_name: string
-            The table that contains this data in the adjustments db.
-
-        Returns
-        -------
-        adjustments: list
-            A list of [multiplier, pd.Timestamp], earliest first
-
-        """
-        if self._adjustment_reader is None:
-            return []
-
-        sid = int(asset)
-
-        try:
-            adjustments = adjustments_dict[sid]
-        except KeyError:
-            adjustments = adjustments_dict[sid] = self._adjustment_reader.\
-                get_adjustments_for_sid(table_name, sid)
-
-        return adjustments
-
     def _check_is_currently_alive(self, asset, dt):
         sid = int(asset)
 
@@ -1099,17 +1255,7 @@ class DataPortal(object):
         if self._adjustment_reader is None or not sids:
             return {}
 
-        # convert dt to # of seconds since epoch, because that's what we use
-        # in the adjustments db
-        seconds = int(dt.value / 1e9)
-
-        splits = self._adjustment_reader.conn.execute(
-            "SELECT sid, ratio FROM SPLITS WHERE effective_date = ?",
-            (seconds,)).fetchall()
-
-        splits = [split for split in splits if split[0] in sids]
-
-        return splits
+        return self._adjustment_reader.get_splits(sids, dt)
 
     def get_stock_dividends(self, sid, trading_days):
         """
@@ -1136,27 +1282,11 @@ class DataPortal(object):
         if len(trading_days) == 0:
             return []
 
-        start_dt = trading_days[0].value / 1e9
-        end_dt = trading_days[-1].value / 1e9
-
-        dividends = self._adjustment_reader.conn.execute(
-            "SELECT * FROM stock_dividend_payouts WHERE sid = ? AND "
-            "ex_date > ? AND pay_date < ?", (int(sid), start_dt, end_dt,)).\
-            fetchall()
-
-        dividend_info = []
-        for dividend_tuple in dividends:
-            dividend_info.append({
-                "declared_date": dividend_tuple[1],
-                "ex_date": pd.Timestamp(dividend_tuple[2], unit="s"),
-                "pay_date": pd.Timestamp(dividend_tuple[3], unit="s"),
-                "payment_sid": dividend_tuple[4],
-                "ratio": dividend_tuple[5],
-                "record_date": pd.Timestamp(dividend_tuple[6], unit="s"),
-                "sid": dividend_tuple[7]
-            })
-
-        return dividend_info
+        return self._adjustment_reader.get_stock_dividends_for_sid(
+            sid,
+            trading_days[0],
+            trading_days[-1],
+        )
 
     def contains(self, asset, field):
         return field in BASE_FIELDS or \
@@ -0,0 +1,704 @@
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import defaultdict
+import json
+import os
+from os.path import join
+from textwrap import dedent
+
+from lru import LRU
+import bcolz
+import numpy as np
+import pandas as pd
+from six import iteritems
+
+from zipline.data._minute_bar_internal import find_position_of_minute
+from zipline.data.bar_reader import NoDataOnDate
+from zipline.data.minute_bars import (
+    BcolzMinuteBarMetadata,
+    BcolzMinuteBarReader,
+    BcolzMinuteOverlappingData,
+    OHLC_RATIO,
+    _calc_minute_index,
+    convert_cols,
+)
+from zipline.gens.sim_engine import NANOS_IN_MINUTE
+from zipline.utils.cli import maybe_show_progress
+from zipline.utils.memoize import lazyval
+
+
+# The file mapping each sid to the last session written for it.
+LAST_SESSIONS_FILENAME = 'last_sessions.json'
+
+
+def _session_subdir_path(session):
+    """
+    Format the subdir path of a session, grouping the sessions of each year
+    and month together.
+
+    Parameters
+    ----------
+    session : pd.Timestamp
+        The session label.
+
+    Returns
+    -------
+    out : string
+        A path for the session's directory,
+        e.g. 2016-01-19 is formatted as 2016/01/2016-01-19
+    """
+    return join(
+        session.strftime('%Y'),
+        session.strftime('%m'),
+        session.strftime('%Y-%m-%d'),
+    )
+
+
+class DenseMinuteBarWriter(object):
+    """
+    Class capable of writing minute OHLCV data to disk with one bcolz carray
+    per session and field, holding every sid of the session.
+
+    Parameters
+    ----------
+    rootdir : string
+        Path to the root directory into which to write the metadata and
+        session subdirectories.
+    calendar : zipline.utils.calendars.trading_calendar.TradingCalendar
+        The trading calendar on which to base the minute bars.
+    start_session : datetime
+        The first trading session in the data set.
+    end_session : datetime
+        The last trading session in the data set.
+    minutes_per_day : int
+        The number of minutes per each period.
+    default_ohlc_ratio : int, optional
+        The default ratio by which to multiply the pricing data to
+        convert from floats to integers that fit within np.uint32.
+        Default is OHLC_RATIO (1000).
+    ohlc_ratios_per_sid : dict, optional
+        A dict mapping each sid in the output to the ratio by which to
+        multiply the pricing data to convert the floats from floats to
+        an integer to fit within the np.uint32.
+    write_metadata : bool, optional
+        If True, writes the minute bar metadata (on init of the writer).
+        If False, no metadata is written (existing metadata is
+        retained). Default is True.
+
+    Notes
+    -----
+    The metadata is the same ``BcolzMinuteBarMetadata`` written by the
+    ``BcolzMinuteBarWriter``, and values are scaled and positioned the same
+    way: every session has ``minutes_per_day`` rows starting at the market
+    open, and prices are stored as np.uint32 multiplied by the sid's OHLC
+    ratio.
+
+    Instead of a table per sid, each session which has data is a directory,
+    e.g. ``2016/01/2016-01-19``, containing a carray of shape
+    ``(minutes_per_day, len(sids))`` for each field and a ``sid`` carray
+    naming the sid of each column, so a cross-sectional read of any number
+    of sids over a few minutes decompresses one carray per field. The last
+    session written for each sid is kept in ``last_sessions.json``.
+
+    See Also
+    --------
+    zipline.data.dense_minute_bars.DenseMinuteBarReader
+    zipline.data.minute_bars.BcolzMinuteBarWriter
+    """
+    COL_NAMES = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self,
+                 rootdir,
+                 calendar,
+                 start_session,
+                 end_session,
+                 minutes_per_day,
+                 default_ohlc_ratio=OHLC_RATIO,
+                 ohlc_ratios_per_sid=None,
+                 write_metadata=True):
+        self._rootdir = rootdir
+        self._start_session = start_session
+        self._end_session = end_session
+        self._calendar = calendar
+        slicer = (
+            calendar.schedule.index.slice_indexer(start_session, end_session))
+        self._schedule = calendar.schedule[slicer]
+        self._session_labels = self._schedule.index
+        self._minutes_per_day = minutes_per_day
+        self._default_ohlc_ratio = default_ohlc_ratio
+        self._ohlc_ratios_per_sid = ohlc_ratios_per_sid
+
+        self._minute_index = _calc_minute_index(
+            self._schedule.market_open, self._minutes_per_day)
+
+        if write_metadata:
+            metadata = BcolzMinuteBarMetadata(
+                self._default_ohlc_ratio,
+                self._ohlc_ratios_per_sid,
+                self._calendar,
+                self._start_session,
+                self._end_session,
+                self._minutes_per_day,
+            )
+            metadata.write(self._rootdir)
+
+    @property
+    def first_trading_day(self):
+        return self._start_session
+
+    def ohlc_ratio_for_sid(self, sid):
+        if self._ohlc_ratios_per_sid is not None:
+            try:
+                return self._ohlc_ratios_per_sid[sid]
+            except KeyError:
+                pass
+
+        return self._default_ohlc_ratio
+
+    def sessionpath(self, session):
+        """
+        Parameters:
+        -----------
+        session : pd.Timestamp
+            The session label.
+
+        Returns:
+        --------
+        out : string
+            Full path to the directory holding the given session.
+        """
+        return join(self._rootdir, _session_subdir_path(session))
+
+    def write(self, data, show_progress=False, invalid_data_behavior='warn'):
+        """Write a stream of minute data.
+
+        Parameters
+        ----------
+        data : iterable[(int, pd.DataFrame)]
+            The data to write. Each element should be a tuple of sid, data
+            where data has the following format:
+              columns : ('open', 'high', 'low', 'close', 'volume')
+                  open : float64
+                  high : float64
+                  low  : float64
+                  close : float64
+                  volume : float64|int64
+              index : DatetimeIndex of market minutes.
+        show_progress : bool, optional
+            Whether or not to show a progress bar while writing.
+        invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+            What to do when data is encountered that is outside the range of
+            a uint32.
+
+        Notes
+        -----
+        Sessions are only written once all of ``data`` has been read, so
+        all of it is held in memory.  Write in batches of sids, which are
+        merged into the sessions already on disk, to bound memory usage.
+        """
+        # session index -> list of (sid, rows in session, converted cols)
+        by_session = defaultdict(list)
+        minute_values = self._minute_index.values
+        mpd = self._minutes_per_day
+
+        ctx = maybe_show_progress(
+            data,
+            show_progress=show_progress,
+            item_show_func=lambda e: e if e is None else str(e[0]),
+            label="Reading minute equity files:",
+        )
+        with ctx as it:
+            for sid, df in it:
+                if not len(df):
+                    continue
+                positions = np.searchsorted(
+                    minute_values,
+                    df.index.values.astype('datetime64[ns]'),
+                )
+                converted = convert_cols(
+                    {name: df[name].values for name in self.COL_NAMES},
+                    self.ohlc_ratio_for_sid(sid),
+                    sid,
+                    invalid_data_behavior,
+                )
+                session_ixs = positions // mpd
+                # Split the rows of the frame at each session boundary.
+                bounds = np.flatnonzero(np.diff(session_ixs)) + 1
+                starts = np.r_[0, bounds]
+                stops = np.r_[bounds, len(positions)]
+                for start, stop in zip(starts, stops):
+                    by_session[session_ixs[start]].append((
+                        int(sid),
+                        positions[start:stop] % mpd,
+                        [col[start:stop] for col in converted],
+                    ))
+
+        last_sessions = {}
+        for session_ix in sorted(by_session):
+            rows = by_session[session_ix]
+            self._write_session_rows(self._session_labels[session_ix], rows)
+            for sid, _, _ in rows:
+                last_sessions[sid] = session_ix
+        self._record_last_sessions(last_sessions)
+
+    def write_session(self, session, data, invalid_data_behavior='warn'):
+        """
+        Write the minutes of a single session for many sids at once.
+
+        Parameters
+        ----------
+        session : pd.Timestamp
+            The session label.
+        data : iterable[(int, pd.DataFrame)]
+            The data to write, in the same format as ``write``. Every index
+            must be within the given session.
+        invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+            What to do when data is encountered that is outside the range of
+            a uint32.
+        """
+        session_ix = self._session_labels.get_loc(session)
+        session_start = session_ix * self._minutes_per_day
+        minute_values = self._minute_index.values
+        rows = []
+        for sid, df in data:
+            positions = np.searchsorted(
+                minute_values,
+                df.index.values.astype('datetime64[ns]'),
+            ) - session_start
+            if len(positions) and (
+                    positions[0] < 0 or
+                    positions[-1] >= self._minutes_per_day):
+                raise ValueError(
+                    "Data for sid={0} is not within session={1}".format(
+                        sid, session,
+                    ),
+                )
+            rows.append((
+                int(sid),
+                positions,
+                convert_cols(
+                    {name: df[name].values for name in self.COL_NAMES},
+                    self.ohlc_ratio_for_sid(sid),
+                    sid,
+                    invalid_data_behavior,
+                ),
+            ))
+        self._write_session_rows(session, rows)
+        self._record_last_sessions({sid: session_ix for sid, _, _ in rows})
+
+    def _record_last_sessions(self, last_sessions):
+        """
+        Update the last session written for each sid.
+
+        Parameters
+        ----------
+        last_sessions : dict[int -> int]
+            The index of the last session just written for each sid.
+        """
+        if not last_sessions:
+            return
+
+        path = join(self._rootdir, LAST_SESSIONS_FILENAME)
+        if os.path.exists(path):
+            with open(path) as fp:
+                recorded = json.load(fp)
+        else:
+            recorded = {}
+
+        for sid, session_ix in iteritems(last_sessions):
+            session = self._session_labels[session_ix].strftime('%Y-%m-%d')
+            # ISO dates sort chronologically.
+            recorded[str(sid)] = max(recorded.get(str(sid), session), session)
+
+        with open(path, 'w+') as fp:
+            json.dump(recorded, fp)
+
+    def _write_session_rows(self, session, rows):
+        """
+        Write the given rows into the session, merging them with the sids
+        already written for it.
+
+        Parameters
+        ----------
+        session : pd.Timestamp
+            The session label.
+        rows : list[(int, np.array[intp], list[np.array[uint32]])]
+            The sid, the positions of the values within the session, and the
+            converted values of each field.
+        """
+        path = self.sessionpath(session)
+        existing_sids = np.array([], dtype=np.int64)
+        if os.path.exists(path):
+            existing_sids = bcolz.carray(
+                rootdir=join(path, 'sid'),
+                mode='r',
+            )[:].astype(np.int64)
+
+        new_sids = np.unique([sid for sid, _, _ in rows]).astype(np.int64)
+        overlap = np.intersect1d(existing_sids, new_sids)
+        if len(overlap):
+            raise BcolzMinuteOverlappingData(dedent("""
+            Data for session={0} already includes sids={1}""".strip()).format(
+                session.date(), overlap.tolist(),
+            ))
+
+        sids = np.union1d(existing_sids, new_sids)
+        existing_cols = np.searchsorted(sids, existing_sids)
+        shape = (self._minutes_per_day, len(sids))
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        for i, field in enumerate(self.COL_NAMES):
+            values = np.zeros(shape, dtype=np.uint32)
+            if len(existing_sids):
+                values[:, existing_cols] = bcolz.carray(
+                    rootdir=join(path, field),
+                    mode='r',
+                )[:]
+            for sid, positions, cols in rows:
+                values[positions, np.searchsorted(sids, sid)] = cols[i]
+            bcolz.carray(
+                values,
+                rootdir=join(path, field),
+                mode='w',
+            ).flush()
+
+        bcolz.carray(
+            sids.astype(np.uint32),
+            rootdir=join(path, 'sid'),
+            mode='w',
+        ).flush()
+
+
+class DenseMinuteBarReader(BcolzMinuteBarReader):
+    """
+    Reader for data written by DenseMinuteBarWriter.
+
+    Parameters:
+    -----------
+    rootdir : string
+        The root directory containing the metadata and session directories.
+    sid_cache_size : int, optional
+        The number of open carrays to keep per field.
+    session_cache_size : int, optional
+        The number of fully decompressed sessions to keep per field for
+        ``get_value`` and ``get_last_traded_dt``.
+
+    See Also
+    --------
+    zipline.data.dense_minute_bars.DenseMinuteBarWriter
+    """
+    def __init__(self, rootdir, sid_cache_size=1000, session_cache_size=2):
+        super(DenseMinuteBarReader, self).__init__(
+            rootdir,
+            sid_cache_size=sid_cache_size,
+        )
+        self._session_labels = self._schedule.index
+        # The base reader only caches the OHLCV carrays.
+        self._carrays['sid'] = LRU(sid_cache_size)
+        self._session_columns_cache = LRU(sid_cache_size)
+        self._session_values_cache = {
+            field: LRU(session_cache_size)
+            for field in self.FIELDS
+        }
+
+    def _get_session_path(self, session_ix):
+        return join(
+            self._rootdir,
+            _session_subdir_path(self._session_labels[session_ix]),
+        )
+
+    def _open_session_file(self, field, session_ix):
+        """
+        Returns the carray of the given field for the session, or None if no
+        data was written for the session.
+        """
+        try:
+            return self._carrays[field][session_ix]
+        except KeyError:
+            pass
+
+        path = join(self._get_session_path(session_ix), field)
+        if os.path.exists(path):
+            carray = bcolz.carray(rootdir=path, mode='r')
+        else:
+            carray = None
+        self._carrays[field][session_ix] = carray
+        return carray
+
+    def _session_columns(self, session_ix):
+        """
+        Returns a dict mapping each sid written for the session to its
+        column.
+        """
+        try:
+            return self._session_columns_cache[session_ix]
+        except KeyError:
+            pass
+
+        sids = self._open_session_file('sid', session_ix)
+        if sids is None:
+            columns = {}
+        else:
+            columns = {int(sid): i for i, sid in enumerate(sids[:])}
+        self._session_columns_cache[session_ix] = columns
+        return columns
+
+    def _session_values(self, field, session_ix):
+        """
+        Returns the fully decompressed (minutes_per_day, sids) array of the
+        given field for the session.
+        """
+        cache = self._session_values_cache[field]
+        try:
+            return cache[session_ix]
+        except KeyError:
+            pass
+
+        values = cache[session_ix] = \
+            self._open_session_file(field, session_ix)[:]
+        return values
+
+    @lazyval
+    def _last_sessions(self):
+        path = join(self._rootdir, LAST_SESSIONS_FILENAME)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as fp:
+            return {
+                int(sid): session for sid, session in iteritems(json.load(fp))
+            }
+
+    def table_len(self, sid):
+        """Returns the number of positions up to the last written session."""
+        try:
+            session = self._last_sessions[int(sid)]
+        except KeyError:
+            return 0
+        session_ix = self._session_labels.searchsorted(
+            pd.Timestamp(session, tz='UTC'),
+        )
+        return (session_ix + 1) * self._minutes_per_day
+
+    def get_sid_attr(self, sid, name):
+        # Sessions are shared by all sids, so there are no per-sid attrs.
+        return None
+
+    def get_value(self, sid, dt, field):
+        """
+        Retrieve the pricing info for the given sid, dt, and field.
+
+        Parameters:
+        -----------
+        sid : int
+            Asset identifier.
+        dt : datetime-like
+            The datetime at which the trade occurred.
+        field : string
+            The type of pricing data to retrieve.
+            ('open', 'high', 'low', 'close', 'volume')
+
+        Returns:
+        --------
+        out : float|int
+
+        The market data for the given sid, dt, and field coordinates.
+
+        For OHLC:
+            Returns a float if a trade occurred at the given dt.
+            If no trade occurred, a np.nan is returned.
+
+        For volume:
+            Returns the integer value of the volume.
+            (A volume of 0 signifies no trades for the given dt.)
+        """
+        if self._last_get_value_dt_value == dt.value:
+            minute_pos = self._last_get_value_dt_position
+        else:
+            try:
+                minute_pos = self._find_position_of_minute(dt)
+            except ValueError:
+                raise NoDataOnDate()
+
+            self._last_get_value_dt_value = dt.value
+            self._last_get_value_dt_position = minute_pos
+
+        session_ix, row = divmod(minute_pos, self._minutes_per_day)
+        column = self._session_columns(session_ix).get(int(sid))
+        if column is None:
+            value = 0
+        else:
+            value = self._session_values(field, session_ix)[row, column]
+
+        if value == 0:
+            if field == 'volume':
+                return 0
+            else:
+                return np.nan
+
+        if field != 'volume':
+            value *= self._ohlc_ratio_inverse_for_sid(sid)
+        return value
+
+    def _find_last_traded_position(self, asset, dt):
+        sid = int(asset)
+        start_date_minute = asset.start_date.value / NANOS_IN_MINUTE
+        dt_minute = dt.value / NANOS_IN_MINUTE
+
+        try:
+            # if we know of a dt before which this asset has no volume,
+            # don't look before that dt
+            earliest_dt_to_search = self._known_zero_volume_dict[sid]
+        except KeyError:
+            earliest_dt_to_search = start_date_minute
+
+        if dt_minute < earliest_dt_to_search:
+            return -1
+
+        opens = self._market_open_values
+        closes = self._market_close_values
+        mpd = self._minutes_per_day
+
+        end_pos = find_position_of_minute(opens, closes, dt_minute, mpd, True)
+        session_ix, last_row = divmod(end_pos, mpd)
+
+        pos = -1
+        while session_ix >= 0:
+            # Skip any data written after an early close, and anything
+            # before the earliest minute to search.
+            stop = min(last_row, closes[session_ix] - opens[session_ix]) + 1
+            start = max(0, int(earliest_dt_to_search - opens[session_ix]))
+            column = self._session_columns(session_ix).get(sid)
+            if column is not None and start < stop:
+                volumes = self._read_session(
+                    'volume', session_ix, start, stop,
+                )[:, column]
+                traded = np.flatnonzero(volumes)
+                if len(traded):
+                    pos = session_ix * mpd + start + traded[-1]
+                    break
+            if start > 0:
+                break
+            session_ix -= 1
+            last_row = mpd - 1
+
+        if pos == -1:
+            # if we didn't find any volume before this dt, save it to avoid
+            # work in the future.
+            try:
+                self._known_zero_volume_dict[sid] = max(
+                    dt_minute,
+                    self._known_zero_volume_dict[sid]
+                )
+            except KeyError:
+                self._known_zero_volume_dict[sid] = dt_minute
+
+        return pos
+
+    def _read_session(self, field, session_ix, start, stop):
+        """
+        Read rows [start, stop) of the given field for the session, using the
+        decompressed session if it is cached.
+        """
+        try:
+            return self._session_values_cache[field][session_ix][start:stop]
+        except KeyError:
+            return self._open_session_file(field, session_ix)[start:stop]
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        """
+        Parameters
+        ----------
+        fields : list of str
+           'open', 'high', 'low', 'close', or 'volume'
+        start_dt: Timestamp
+           Beginning of the window range.
+        end_dt: Timestamp
+           End of the window range.
+        sids : list of int
+           The asset identifiers in the window.
+
+        Returns
+        -------
+        list of np.ndarray
+            A list with an entry per field of ndarrays with shape
+            (minutes in range, sids) with a dtype of float64, containing the
+            values for the respective field over start and end dt range.
+        """
+        start_idx = self._find_position_of_minute(start_dt)
+        end_idx = self._find_position_of_minute(end_dt)
+        mpd = self._minutes_per_day
+        sids = [int(sid) for sid in sids]
+
+        # For each session in the window, the rows of the window it fills,
+        # the rows to read from it, and which of its columns hold the sids.
+        session_reads = []
+        for session_ix in range(start_idx // mpd, end_idx // mpd + 1):
+            session_start = session_ix * mpd
+            read_start = max(start_idx, session_start) - session_start
+            read_stop = min(end_idx, session_start + mpd - 1) - \
+                session_start + 1
+            out_start = session_start + read_start - start_idx
+            columns = self._session_columns(session_ix)
+            if not columns:
+                continue
+            out_cols = [i for i, sid in enumerate(sids) if sid in columns]
+            session_reads.append((
+                session_ix,
+                read_start,
+                read_stop,
+                np.s_[out_start:out_start + read_stop - read_start],
+                out_cols,
+                [columns[sids[i]] for i in out_cols],
+            ))
+
+        indices_to_exclude = self._exclusion_indices_for_range(
+            start_idx, end_idx)
+        if indices_to_exclude is not None:
+            exclude_rows = np.concatenate([
+                np.arange(excl_start, excl_stop + 1) - start_idx
+                for excl_start, excl_stop in indices_to_exclude
+            ])
+            exclude_rows = exclude_rows[
+                (exclude_rows >= 0) & (exclude_rows <= end_idx - start_idx)
+            ]
+
+        if any(field != 'volume' for field in fields):
+            ohlc_inverses = np.array([
+                self._ohlc_ratio_inverse_for_sid(sid) for sid in sids
+            ])
+
+        results = []
+        shape = (end_idx - start_idx + 1, len(sids))
+        for field in fields:
+            raw = np.zeros(shape, dtype=np.uint32)
+            for (session_ix, read_start, read_stop, out_rows, out_cols,
+                 columns) in session_reads:
+                if out_cols:
+                    raw[out_rows, out_cols] = self._read_session(
+                        field, session_ix, read_start, read_stop,
+                    )[:, columns]
+
+            if indices_to_exclude is not None:
+                raw = np.delete(raw, exclude_rows, axis=0)
+
+            if field != 'volume':
+                out = raw * ohlc_inverses
+                out[raw == 0] = np.nan
+            else:
+                out = raw
+
+            results.append(out)
+        return results
@@ -17,21 +17,20 @@ from abc import (
     abstractmethod,
     abstractproperty,
 )
+from collections import OrderedDict
 
-from numpy import concatenate
-from lru import LRU
 from pandas import isnull
 from pandas.tslib import normalize_date
 from toolz import sliding_window
 
-from six import with_metaclass
+from six import iteritems, with_metaclass
 
 from zipline.assets import Equity
 from zipline.assets.continuous_futures import ContinuousFuture
 from zipline.lib._int64window import AdjustedArrayWindow as Int64Window
 from zipline.lib._float64window import AdjustedArrayWindow as Float64Window
 from zipline.lib.adjustment import Float64Multiply, Float64Add
-from zipline.utils.cache import ExpiringCache
+from zipline.utils.cache import CachedObject, Expired
 from zipline.utils.memoize import lazyval
 from zipline.utils.numpy_utils import float64_dtype
 
@@ -43,6 +42,17 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
 
     def load_adjustments(self, columns, dts, assets):
         """
+        Parameters
+        ----------
+        columns : list[str]
+            The fields for which to load adjustments.
+        dts : iterable of datetime64-like
+            The dts of the window being adjusted.
+        assets : list[Asset or None]
+            The asset of each column of the window. ``None`` entries are
+            skipped, so that a window may hold assets which are adjusted by
+            other readers.
+
         Returns
         -------
         adjustments : list[dict[int -> Adjustment]]
@@ -52,13 +62,20 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
         out = [None] * len(columns)
         for i, column in enumerate(columns):
             adjs = {}
-            for asset in assets:
-                adjs.update(self._get_adjustments_in_range(
-                    asset, dts, column))
+            for col, asset in enumerate(assets):
+                if asset is None:
+                    continue
+                for adj_loc, asset_adjs in iteritems(
+                        self._get_adjustments_in_range(
+                            asset, dts, column, col)):
+                    try:
+                        adjs[adj_loc].extend(asset_adjs)
+                    except KeyError:
+                        adjs[adj_loc] = asset_adjs
             out[i] = adjs
         return out
 
-    def _get_adjustments_in_range(self, asset, dts, field):
+    def _get_adjustments_in_range(self, asset, dts, field, col):
         """
         Get the Float64Multiply objects to pass to an AdjustedArrayWindow.
 
@@ -81,6 +98,8 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
             The dts for which adjustment data is needed.
         field : str
             OHLCV field for which to get the adjustments.
+        col : int
+            The column of the asset in the window.
 
         Returns
         -------
@@ -101,8 +120,8 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
                     adj_loc = end_loc
                     mult = Float64Multiply(0,
                                            end_loc - 1,
-                                           0,
-                                           0,
+                                           col,
+                                           col,
                                            m[1])
                     try:
                         adjs[adj_loc].append(mult)
@@ -117,8 +136,8 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
                     adj_loc = end_loc
                     mult = Float64Multiply(0,
                                            end_loc - 1,
-                                           0,
-                                           0,
+                                           col,
+                                           col,
                                            d[1])
                     try:
                         adjs[adj_loc].append(mult)
@@ -137,8 +156,8 @@ class HistoryCompatibleUSEquityAdjustmentReader(object):
                 adj_loc = end_loc
                 mult = Float64Multiply(0,
                                        end_loc - 1,
-                                       0,
-                                       0,
+                                       col,
+                                       col,
                                        ratio)
                 try:
                     adjs[adj_loc].append(mult)
@@ -167,6 +186,17 @@ class ContinuousFutureAdjustmentReader(object):
 
     def load_adjustments(self, columns, dts, assets):
         """
+        Parameters
+        ----------
+        columns : list[str]
+            The fields for which to load adjustments.
+        dts : iterable of datetime64-like
+            The dts of the window being adjusted.
+        assets : list[Asset or None]
+            The asset of each column of the window. ``None`` entries are
+            skipped, so that a window may hold assets which are adjusted by
+            other readers.
+
         Returns
         -------
         adjustments : list[dict[int -> Adjustment]]
@@ -176,9 +206,16 @@ class ContinuousFutureAdjustmentReader(object):
         out = [None] * len(columns)
         for i, column in enumerate(columns):
             adjs = {}
-            for asset in assets:
-                adjs.update(self._get_adjustments_in_range(
-                    asset, dts, column))
+            for col, asset in enumerate(assets):
+                if asset is None:
+                    continue
+                for adj_loc, asset_adjs in iteritems(
+                        self._get_adjustments_in_range(
+                            asset, dts, column, col)):
+                    try:
+                        adjs[adj_loc].extend(asset_adjs)
+                    except KeyError:
+                        adjs[adj_loc] = asset_adjs
             out[i] = adjs
         return out
 
@@ -186,7 +223,8 @@ class ContinuousFutureAdjustmentReader(object):
                          adjustment_type,
                          front_close,
                          back_close,
-                         end_loc):
+                         end_loc,
+                         col):
         adj_base = back_close - front_close
         if adjustment_type == 'mul':
             adj_value = 1.0 + adj_base / front_close
@@ -196,11 +234,11 @@ class ContinuousFutureAdjustmentReader(object):
             adj_class = Float64Add
         return adj_class(0,
                          end_loc,
-                         0,
-                         0,
+                         col,
+                         col,
                          adj_value)
 
-    def _get_adjustments_in_range(self, cf, dts, field):
+    def _get_adjustments_in_range(self, cf, dts, field, col):
         if field == 'volume' or field == 'sid':
             return {}
         if cf.adjustment is None:
@@ -243,7 +281,8 @@ class ContinuousFutureAdjustmentReader(object):
             adj = self._make_adjustment(cf.adjustment,
                                         front_close,
                                         back_close,
-                                        end_loc)
+                                        end_loc,
+                                        col)
             try:
                 adjs[adj_loc].append(adj)
             except KeyError:
@@ -289,6 +328,90 @@ class SlidingWindow(object):
         return self.current
 
 
+DEFAULT_BLOCK_CACHE_NBYTES = 64 * 1024 * 1024
+
+
+class WindowBlockCache(object):
+    """
+    A least recently used cache of the blocks behind sliding windows, bounded
+    by the total size of the blocks rather than by their number.
+
+    Like :class:`~zipline.utils.cache.ExpiringCache`, a block expires after
+    the last dt that was prefetched for it.
+
+    Parameters
+    ----------
+    max_nbytes : int
+        The most bytes of block data to hold. The most recently set block is
+        always kept, even if it is larger than ``max_nbytes`` on its own.
+    """
+    def __init__(self, max_nbytes):
+        self.max_nbytes = max_nbytes
+        self.nbytes = 0
+        self._blocks = OrderedDict()
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def get(self, key, dt):
+        """Get a cached window, marking it as the most recently used.
+
+        Parameters
+        ----------
+        key : any
+            The key to lookup.
+        dt : datetime
+            The time of the lookup.
+
+        Returns
+        -------
+        window : SlidingWindow
+            The window for ``key``.
+
+        Raises
+        ------
+        KeyError
+            Raised if the key is not in the cache or the window for the key
+            has expired.
+        """
+        cached, nbytes = self._blocks.pop(key)
+        try:
+            window = cached.unwrap(dt)
+        except Expired:
+            self.nbytes -= nbytes
+            raise KeyError(key)
+        self._blocks[key] = cached, nbytes
+        return window
+
+    def set(self, key, window, expiration_dt, nbytes):
+        """Add a window to the cache, evicting the least recently used
+        windows until the cache is within its bound.
+
+        Parameters
+        ----------
+        key : any
+            The key of the window.
+        window : SlidingWindow
+            The window to cache.
+        expiration_dt : datetime
+            The last dt for which the window is valid.
+        nbytes : int
+            The size of the block behind ``window``.
+        """
+        try:
+            _, old_nbytes = self._blocks.pop(key)
+        except KeyError:
+            pass
+        else:
+            self.nbytes -= old_nbytes
+
+        self._blocks[key] = CachedObject(window, expiration_dt), nbytes
+        self.nbytes += nbytes
+        while self.nbytes > self.max_nbytes and len(self._blocks) > 1:
+            _, (_, evicted_nbytes) = self._blocks.popitem(last=False)
+            self.nbytes -= evicted_nbytes
+
+
 class HistoryLoader(with_metaclass(ABCMeta)):
     """
     Loader for sliding history windows, with support for adjustments.
@@ -301,13 +424,16 @@ class HistoryLoader(with_metaclass(ABCMeta)):
         Reader for pricing bars.
     adjustment_reader : SQLiteAdjustmentReader
         Reader for adjustment data.
+    block_cache_nbytes : int, optional
+        The most bytes of prefetched blocks, over all fields and sets of
+        assets, to keep for later history calls.
     """
     FIELDS = ('open', 'high', 'low', 'close', 'volume', 'sid')
 
     def __init__(self, trading_calendar, reader, equity_adjustment_reader,
                  asset_finder,
                  roll_finders=None,
-                 sid_cache_size=1000,
+                 block_cache_nbytes=DEFAULT_BLOCK_CACHE_NBYTES,
                  prefetch_length=0):
         self.trading_calendar = trading_calendar
         self._asset_finder = asset_finder
@@ -324,10 +450,7 @@ class HistoryLoader(with_metaclass(ABCMeta)):
                                                  reader,
                                                  roll_finders,
                                                  self._frequency)
-        self._window_blocks = {
-            field: ExpiringCache(LRU(sid_cache_size))
-            for field in self.FIELDS
-        }
+        self._window_blocks = WindowBlockCache(block_cache_nbytes)
         self._prefetch_length = prefetch_length
 
     @abstractproperty
@@ -345,7 +468,7 @@ class HistoryLoader(with_metaclass(ABCMeta)):
     def _ensure_sliding_windows(self, assets, dts, field,
                                 is_perspective_after):
         """
-        Ensure that there is a Float64Multiply window for each asset that can
+        Ensure that there is a Float64Multiply window for the assets that can
         provide data for the given parameters.
         If the corresponding window for the (assets, len(dts), field) does not
         exist, then create a new one.
@@ -368,16 +491,13 @@ class HistoryLoader(with_metaclass(ABCMeta)):
 
         Returns
         -------
-        out : list of Float64Window with sufficient data so that each asset's
-        window can provide `get` for the index corresponding with the last
-        value in `dts`
+        out : SlidingWindow over a 2D block with a column per asset, with
+        sufficient data so that it can provide `get` for the index
+        corresponding with the last value in `dts`
         """
         end = dts[-1]
         size = len(dts)
-        asset_windows = {}
-        needed_assets = []
-
-        assets = self._asset_finder.retrieve_all(assets)
+        key = (field, tuple(assets), size, is_perspective_after)
 
         try:
             end_ix = self._calendar.searchsorted(end)
@@ -385,78 +505,81 @@ class HistoryLoader(with_metaclass(ABCMeta)):
             raise KeyError("{0} not in calendar [{1}...{2}]".format(
                 end, self._calendar[0], self._calendar[-1]))
 
-        for asset in assets:
-            try:
-                window = self._window_blocks[field].get(
-                    (asset, size, is_perspective_after), end)
-            except KeyError:
-                needed_assets.append(asset)
-            else:
-                if end_ix < window.most_recent_ix:
-                    # Window needs reset. Requested end index occurs before the
-                    # end index from the previous history call for this window.
-                    # Grab new window instead of rewinding adjustments.
-                    needed_assets.append(asset)
-                else:
-                    asset_windows[asset] = window
+        try:
+            window = self._window_blocks.get(key, end)
+        except KeyError:
+            pass
+        else:
+            # If the requested end index occurs before the end index from the
+            # previous history call for this window, grab a new window
+            # instead of rewinding adjustments.
+            if end_ix >= window.most_recent_ix:
+                return window
 
-        if needed_assets:
-            start = dts[0]
+        assets = self._asset_finder.retrieve_all(assets)
 
-            offset = 0
-            try:
-                start_ix = self._calendar.searchsorted(start)
-            except KeyError:
-                raise KeyError("{0} not in calendar [{1}...{2}]".format(
-                    start, self._calendar[0], self._calendar[-1]))
-            cal = self._calendar
-            prefetch_end_ix = min(end_ix + self._prefetch_length, len(cal) - 1)
-            prefetch_end = cal[prefetch_end_ix]
-            prefetch_dts = cal[start_ix:prefetch_end_ix + 1]
-            if is_perspective_after:
-                adj_end_ix = min(prefetch_end_ix + 1, len(cal) - 1)
-                adj_dts = cal[start_ix:adj_end_ix + 1]
-            else:
-                adj_dts = prefetch_dts
-            prefetch_len = len(prefetch_dts)
-            array = self._array(prefetch_dts, needed_assets, field)
-
-            if field == 'sid':
-                window_type = Int64Window
-            else:
-                window_type = Float64Window
-
-            view_kwargs = {}
-            if field == 'volume':
-                array = array.astype(float64_dtype)
-
-            for i, asset in enumerate(needed_assets):
-                adj_reader = None
+        start = dts[0]
+
+        offset = 0
+        try:
+            start_ix = self._calendar.searchsorted(start)
+        except KeyError:
+            raise KeyError("{0} not in calendar [{1}...{2}]".format(
+                start, self._calendar[0], self._calendar[-1]))
+        cal = self._calendar
+        prefetch_end_ix = min(end_ix + self._prefetch_length, len(cal) - 1)
+        prefetch_end = cal[prefetch_end_ix]
+        prefetch_dts = cal[start_ix:prefetch_end_ix + 1]
+        if is_perspective_after:
+            adj_end_ix = min(prefetch_end_ix + 1, len(cal) - 1)
+            adj_dts = cal[start_ix:adj_end_ix + 1]
+        else:
+            adj_dts = prefetch_dts
+        array = self._array(prefetch_dts, assets, field)
+
+        if field == 'sid':
+            window_type = Int64Window
+        else:
+            window_type = Float64Window
+
+        view_kwargs = {}
+        if field == 'volume':
+            array = array.astype(float64_dtype)
+
+        # Each adjustment reader adjusts the columns of the assets of its
+        # type; every other column is masked out with None.
+        adjs = {}
+        for asset_type, adj_reader in iteritems(self._adjustment_readers):
+            type_assets = [
+                asset if type(asset) is asset_type else None
+                for asset in assets
+            ]
+            if all(asset is None for asset in type_assets):
+                continue
+            type_adjs = adj_reader.load_adjustments(
+                [field], adj_dts, type_assets)[0]
+            for adj_loc, loc_adjs in iteritems(type_adjs):
                 try:
-                    adj_reader = self._adjustment_readers[type(asset)]
+                    adjs[adj_loc].extend(loc_adjs)
                 except KeyError:
-                    adj_reader = None
-                if adj_reader is not None:
-                    adjs = adj_reader.load_adjustments(
-                        [field], adj_dts, [asset])[0]
-                else:
-                    adjs = {}
-                window = window_type(
-                    array[:, i].reshape(prefetch_len, 1),
-                    view_kwargs,
-                    adjs,
-                    offset,
-                    size,
-                    int(is_perspective_after)
-                )
-                sliding_window = SlidingWindow(window, size, start_ix, offset)
-                asset_windows[asset] = sliding_window
-                self._window_blocks[field].set(
-                    (asset, size, is_perspective_after),
-                    sliding_window,
-                    prefetch_end)
-
-        return [asset_windows[asset] for asset in assets]
+                    adjs[adj_loc] = loc_adjs
+
+        window = window_type(
+            array,
+            view_kwargs,
+            adjs,
+            offset,
+            size,
+            int(is_perspective_after)
+        )
+        sliding_window = SlidingWindow(window, size, start_ix, offset)
+        self._window_blocks.set(
+            key,
+            sliding_window,
+            prefetch_end,
+            array.nbytes,
+        )
+        return sliding_window
 
     def history(self, assets, dts, field, is_perspective_after):
         """
@@ -539,10 +662,9 @@ class HistoryLoader(with_metaclass(ABCMeta)):
                                              is_perspective_after)
         end_ix = self._calendar.searchsorted(dts[-1])
 
-        return concatenate(
-            [window.get(end_ix) for window in block],
-            axis=1,
-        ).round(3)
+        # The window's output is a view over data that is adjusted in place
+        # as it moves forward, so rounding also provides the copy.
+        return block.get(end_ix).round(3)
 
 
 class DailyHistoryLoader(HistoryLoader):
@@ -0,0 +1,302 @@
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+from bcolz import ctable
+import numpy as np
+from six import iteritems
+
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    BcolzDailyBarWriter,
+    US_EQUITY_PRICING_BCOLZ_COLUMNS,
+)
+from zipline.utils.memoize import lazyval
+
+
+# The number of rows copied at once when converting from a bcolz table.
+_CONVERT_CHUNKSIZE = 1 << 22
+
+
+def _to_builtin(obj):
+    # The attrs of an in-memory ctable may hold numpy scalars.
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError('%r is not JSON serializable' % (obj,))
+
+
+class MemmapDailyBarMetadata(dict):
+    """The attributes of a memory-mapped daily bar directory.
+
+    This holds the same keys as the ``attrs`` of a daily bar ctable written
+    by ``BcolzDailyBarWriter`` (``first_row``, ``last_row``,
+    ``calendar_offset``, ``first_trading_day``, ``calendar_name``,
+    ``start_session_ns`` and ``end_session_ns``) plus the number of rows in
+    each column file.  Like ``bcolz.attrs.attrs``, the raw mapping is
+    available as ``.attrs``.
+    """
+    FORMAT_VERSION = 0
+
+    METADATA_FILENAME = 'metadata.json'
+
+    @classmethod
+    def metadata_path(cls, rootdir):
+        return os.path.join(rootdir, cls.METADATA_FILENAME)
+
+    @classmethod
+    def read(cls, rootdir):
+        with open(cls.metadata_path(rootdir)) as fp:
+            return cls(json.load(fp))
+
+    def write(self, rootdir):
+        with open(self.metadata_path(rootdir), 'w+') as fp:
+            json.dump(self, fp, default=_to_builtin)
+
+    @property
+    def attrs(self):
+        return self
+
+
+class MemmapDailyBarTable(object):
+    """Read-only view of a memory-mapped daily bar directory.
+
+    Columns are exposed as ``np.memmap`` arrays of uint32 with the same
+    layout as the columns of a daily bar ctable, so that every process
+    reading the same directory shares the operating system's page cache.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory written by ``MemmapDailyBarWriter``.
+    """
+    def __init__(self, rootdir):
+        self.rootdir = rootdir
+        self.attrs = MemmapDailyBarMetadata.read(rootdir)
+        self._columns = {}
+
+    def __len__(self):
+        return self.attrs['nrows']
+
+    def __getitem__(self, colname):
+        try:
+            return self._columns[colname]
+        except KeyError:
+            pass
+
+        if colname not in US_EQUITY_PRICING_BCOLZ_COLUMNS:
+            raise KeyError(colname)
+
+        if len(self):
+            column = np.memmap(
+                column_path(self.rootdir, colname),
+                dtype=np.uint32,
+                mode='r',
+                shape=(len(self),),
+            )
+        else:
+            # Empty files cannot be memory-mapped.
+            column = np.array([], dtype=np.uint32)
+        self._columns[colname] = column
+        return column
+
+
+def column_path(rootdir, colname):
+    return os.path.join(rootdir, colname + '.u32')
+
+
+def _write_table(table, rootdir):
+    """Write the columns and attrs of a daily bar ctable as raw uint32 files
+    in ``rootdir``.
+    """
+    if not os.path.isdir(rootdir):
+        os.makedirs(rootdir)
+
+    nrows = len(table)
+    for colname in US_EQUITY_PRICING_BCOLZ_COLUMNS:
+        source = table[colname]
+        path = column_path(rootdir, colname)
+        if not nrows:
+            open(path, 'wb').close()
+            continue
+
+        out = np.memmap(path, dtype=np.uint32, mode='w+', shape=(nrows,))
+        for start in range(0, nrows, _CONVERT_CHUNKSIZE):
+            stop = min(start + _CONVERT_CHUNKSIZE, nrows)
+            out[start:stop] = source[start:stop]
+        out.flush()
+        del out
+
+    metadata = MemmapDailyBarMetadata(
+        (key, value) for key, value in iteritems(table.attrs.attrs)
+    )
+    metadata['version'] = MemmapDailyBarMetadata.FORMAT_VERSION
+    metadata['nrows'] = nrows
+    metadata.write(rootdir)
+    return MemmapDailyBarTable(rootdir)
+
+
+def convert_bcolz_daily_bars(source, rootdir):
+    """Convert a daily bar ctable written by ``BcolzDailyBarWriter`` into the
+    memory-mapped format read by ``MemmapDailyBarReader``.
+
+    Parameters
+    ----------
+    source : bcolz.ctable or str
+        The daily bar ctable, or the path to it.
+    rootdir : str
+        The directory to write the memory-mapped data to.
+
+    Returns
+    -------
+    table : MemmapDailyBarTable
+        The newly-written data.
+    """
+    if not isinstance(source, ctable):
+        source = ctable(rootdir=source, mode='r')
+    return _write_table(source, rootdir)
+
+
+class MemmapDailyBarWriter(object):
+    """
+    Class capable of writing daily OHLCV data to disk as uncompressed,
+    fixed-width column files that can be memory-mapped by
+    ``MemmapDailyBarReader``.
+
+    The rows are laid out exactly like the columns of the ctable written by
+    ``BcolzDailyBarWriter``, and the ``first_row``, ``last_row`` and
+    ``calendar_offset`` metadata have the same meaning.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory in which we should write our output.
+    calendar : zipline.utils.calendar.trading_calendar
+        Calendar to use to compute asset calendar offsets.
+    start_session: pd.Timestamp
+        Midnight UTC session label.
+    end_session: pd.Timestamp
+        Midnight UTC session label.
+
+    See Also
+    --------
+    zipline.data.memmap_daily_bars.MemmapDailyBarReader
+    zipline.data.memmap_daily_bars.convert_bcolz_daily_bars
+    """
+    def __init__(self, rootdir, calendar, start_session, end_session):
+        self._rootdir = rootdir
+        # The bcolz writer validates the sessions and does the row layout;
+        # it builds its table in memory when not given a path.
+        self._bcolz_writer = BcolzDailyBarWriter(
+            None,
+            calendar,
+            start_session,
+            end_session,
+        )
+
+    def write(self,
+              data,
+              assets=None,
+              show_progress=False,
+              invalid_data_behavior='warn'):
+        """
+        Parameters
+        ----------
+        data : iterable[tuple[int, pandas.DataFrame or bcolz.ctable]]
+            The data chunks to write. Each chunk should be a tuple of sid
+            and the data for that asset.
+        assets : set[int], optional
+            The assets that should be in ``data``. If this is provided
+            we will check ``data`` against the assets and provide better
+            progress information.
+        show_progress : bool, optional
+            Whether or not to show a progress bar while writing.
+        invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+            What to do when data is encountered that is outside the range of
+            a uint32.
+
+        Returns
+        -------
+        table : MemmapDailyBarTable
+            The newly-written data.
+        """
+        table = self._bcolz_writer.write(
+            data,
+            assets=assets,
+            show_progress=show_progress,
+            invalid_data_behavior=invalid_data_behavior,
+        )
+        return _write_table(table, self._rootdir)
+
+
+class MemmapDailyBarReader(BcolzDailyBarReader):
+    """
+    Reader for daily bars written by ``MemmapDailyBarWriter`` or
+    ``convert_bcolz_daily_bars``.
+
+    The data is memory-mapped instead of decompressed, so opening a reader is
+    cheap, several processes reading the same data share the page cache, and
+    ``load_raw_arrays`` is a single fancy-indexing operation per column.
+
+    Parameters
+    ----------
+    table : MemmapDailyBarTable or str
+        The memory-mapped data, or the directory containing it.
+
+    See Also
+    --------
+    zipline.data.us_equity_pricing.BcolzDailyBarReader
+    """
+    @lazyval
+    def _table(self):
+        maybe_table_rootdir = self._maybe_table_rootdir
+        if isinstance(maybe_table_rootdir, MemmapDailyBarTable):
+            return maybe_table_rootdir
+        return MemmapDailyBarTable(maybe_table_rootdir)
+
+    def load_raw_arrays(self, columns, start_date, end_date, assets):
+        # Assumes that the given dates are actually in calendar.
+        start_idx = self.sessions.get_loc(start_date)
+        end_idx = self.sessions.get_loc(end_date)
+        first_rows, last_rows, offsets = self._compute_slices(
+            start_idx,
+            end_idx,
+            assets,
+        )
+
+        # rows[i, j] is the row holding day i of the query for asset j.
+        day_offsets = (
+            np.arange(end_idx - start_idx + 1)[:, np.newaxis] - offsets
+        )
+        rows = first_rows + day_offsets
+        missing = (day_offsets < 0) | (rows > last_rows)
+        rows[missing] = 0
+
+        results = []
+        for column_name in columns:
+            column = self._table[column_name]
+            if len(column):
+                outbuf = column[rows]
+                outbuf[missing] = 0
+            else:
+                outbuf = np.zeros(rows.shape, dtype=np.uint32)
+
+            if column_name in {'open', 'high', 'low', 'close'}:
+                where_nan = (outbuf == 0)
+                outbuf_as_float = outbuf.astype(np.float64) * .001
+                outbuf_as_float[where_nan] = np.nan
+                results.append(outbuf_as_float)
+            else:
+                results.append(outbuf)
+        return results
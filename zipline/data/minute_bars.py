@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import OrderedDict
 import json
 import os
 from glob import glob
@@ -39,6 +40,7 @@ from zipline.data.us_equity_pricing import check_uint32_safe
 from zipline.utils.calendars import get_calendar
 from zipline.utils.cli import maybe_show_progress
 from zipline.utils.memoize import lazyval
+from zipline.utils.paths import ensure_directory
 
 
 logger = logbook.Logger('MinuteBars')
@@ -489,6 +491,35 @@ class BcolzMinuteBarWriter(object):
         # sid is not in the dict, fallback to the general ohlc_ratio.
         return self._default_ohlc_ratio
 
+    def with_rootdir(self, rootdir):
+        """Create a writer with the same calendar, sessions and ratios as this
+        one which writes into another directory.
+
+        The sid directories written there can be copied into this writer's
+        ``rootdir`` as they are.
+
+        Parameters
+        ----------
+        rootdir : str
+            The directory for the new writer, which gets its own metadata.
+
+        Returns
+        -------
+        writer : BcolzMinuteBarWriter
+            The new writer.
+        """
+        ensure_directory(rootdir)
+        return type(self)(
+            rootdir,
+            self._calendar,
+            self._start_session,
+            self._end_session,
+            self._minutes_per_day,
+            default_ohlc_ratio=self._default_ohlc_ratio,
+            ohlc_ratios_per_sid=self._ohlc_ratios_per_sid,
+            expectedlen=self._expectedlen,
+        )
+
     def sidpath(self, sid):
         """
         Parameters:
@@ -541,10 +572,9 @@ class BcolzMinuteBarWriter(object):
         # Only create the containing subdir on creation.
         # This is not to be confused with the `.bcolz` directory, but is the
         # directory up one level from the `.bcolz` directories.
-        sid_containing_dirname = os.path.dirname(path)
-        if not os.path.exists(sid_containing_dirname):
-            # Other sids may have already created the containing directory.
-            os.makedirs(sid_containing_dirname)
+        # Other sids, possibly in other processes, may have already created
+        # the containing directory.
+        ensure_directory(os.path.dirname(path))
         initial_array = np.empty(0, np.uint32)
         table = ctable(
             rootdir=path,
@@ -855,6 +885,189 @@ class BcolzMinuteBarWriter(object):
         metadata.write(self._rootdir)
 
 
+class _SessionBlock(object):
+    """
+    Decompressed minute data for one field over one block of sessions,
+    stored as a (minutes, sids) uint32 array whose columns are filled in
+    lazily.
+    """
+    __slots__ = ('data', 'columns')
+
+    def __init__(self, num_minutes, capacity):
+        self.data = np.zeros((num_minutes, capacity), dtype=np.uint32)
+        # Map from sid -> column of ``data``.
+        self.columns = {}
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def ensure_capacity(self, num_columns):
+        capacity = self.data.shape[1]
+        if num_columns <= capacity:
+            return
+        new_capacity = max(num_columns, 2 * capacity)
+        data = np.zeros((self.data.shape[0], new_capacity), dtype=np.uint32)
+        data[:, :capacity] = self.data
+        self.data = data
+
+
+class MinuteBarSessionCache(object):
+    """
+    Memory-bounded cache of decompressed minute bars for
+    ``BcolzMinuteBarReader``.
+
+    Minute positions are grouped into blocks of ``sessions_per_block``
+    sessions.  For each (field, block) the cache holds a contiguous
+    (minutes, sids) uint32 array with a column for every sid that has been
+    requested in that block, so repeated reads within a block are array
+    lookups instead of carray chunk decompressions.  Whole blocks are evicted
+    in least recently used order once the cached arrays exceed ``max_bytes``.
+
+    Parameters
+    ----------
+    reader : BcolzMinuteBarReader
+        The reader whose carrays fill the cache.
+    max_bytes : int
+        The memory budget for the cached arrays.
+    sessions_per_block : int, optional
+        The number of sessions decompressed at once for each sid.
+    """
+    def __init__(self, reader, max_bytes, sessions_per_block=1):
+        if sessions_per_block < 1:
+            raise ValueError(
+                'sessions_per_block must be positive, got %r' %
+                sessions_per_block,
+            )
+        self._reader = reader
+        self.max_bytes = max_bytes
+        self.block_length = sessions_per_block * reader._minutes_per_day
+        self._blocks = OrderedDict()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self):
+        """The number of bytes currently held by the cache.
+        """
+        return self._nbytes
+
+    def clear(self):
+        self._blocks.clear()
+        self._nbytes = 0
+
+    def block_index(self, pos):
+        return pos // self.block_length
+
+    def fits(self, start_pos, end_pos, num_sids):
+        """
+        Whether a read of ``num_sids`` sids between the given minute
+        positions can be served without evicting its own blocks.
+        """
+        num_blocks = (
+            self.block_index(end_pos) - self.block_index(start_pos) + 1
+        )
+        block_bytes = self.block_length * num_sids * 4
+        return num_blocks * block_bytes <= self.max_bytes // 2
+
+    def get_block(self, field, block_idx, sids):
+        """
+        Get the cached array for ``field`` and ``block_idx``, making sure it
+        has a column for each of ``sids``.
+
+        Returns
+        -------
+        data : np.ndarray[uint32]
+            The (minutes, columns) array for the block.  Row 0 corresponds to
+            minute position ``block_idx * block_length``.
+        columns : np.ndarray[intp]
+            The column of ``data`` for each of ``sids``.
+        """
+        key = field, block_idx
+        blocks = self._blocks
+        try:
+            block = blocks.pop(key)
+        except KeyError:
+            block = _SessionBlock(self.block_length, len(sids))
+        else:
+            self._nbytes -= block.nbytes
+        # Reinsert the block as the most recently used entry.
+        blocks[key] = block
+
+        columns = block.columns
+        missing = [sid for sid in sids if sid not in columns]
+        if missing:
+            block.ensure_capacity(len(columns) + len(missing))
+            start_pos = block_idx * self.block_length
+            end_pos = start_pos + self.block_length
+            open_minute_file = self._reader._open_minute_file
+            data = block.data
+            for sid in missing:
+                col = columns[sid] = len(columns)
+                values = open_minute_file(field, sid)[start_pos:end_pos]
+                data[:len(values), col] = values
+
+        self._nbytes += block.nbytes
+        self._evict(keep=key)
+
+        return block.data, np.array([columns[sid] for sid in sids],
+                                    dtype=np.intp)
+
+    def _evict(self, keep):
+        blocks = self._blocks
+        while self._nbytes > self.max_bytes and len(blocks) > 1:
+            key, block = next(iter(blocks.items()))
+            if key == keep:
+                break
+            del blocks[key]
+            self._nbytes -= block.nbytes
+
+    def get_raw_value(self, field, sid, pos):
+        block_idx, row = divmod(pos, self.block_length)
+        data, columns = self.get_block(field, block_idx, (sid,))
+        return data[row, columns[0]]
+
+    def get_raw_window(self, field, start_pos, end_pos, sids):
+        """
+        Read the raw values for ``sids`` at minute positions
+        ``start_pos`` through ``end_pos`` inclusive, as a
+        (minutes, sids) uint32 array.
+        """
+        block_length = self.block_length
+        first_block = self.block_index(start_pos)
+        last_block = self.block_index(end_pos)
+        pieces = []
+        for block_idx in range(first_block, last_block + 1):
+            data, columns = self.get_block(field, block_idx, sids)
+            block_start = block_idx * block_length
+            row_start = max(start_pos - block_start, 0)
+            row_end = min(end_pos - block_start, block_length - 1) + 1
+            pieces.append(data[row_start:row_end, columns])
+        if len(pieces) == 1:
+            return pieces[0]
+        return np.vstack(pieces)
+
+    def find_last_nonzero(self, field, sid, start_pos, end_pos):
+        """
+        Find the last position in ``[start_pos, end_pos]`` at which ``sid``
+        has a non-zero value for ``field``, only looking at the block that
+        contains ``end_pos``.
+
+        Returns
+        -------
+        pos : int or None
+            The position found, or None if the block has no non-zero value in
+            the range, in which case the caller must look further back.
+        """
+        block_idx, row = divmod(end_pos, self.block_length)
+        data, columns = self.get_block(field, block_idx, (sid,))
+        block_start = block_idx * self.block_length
+        first_row = max(start_pos - block_start, 0)
+        nonzero = np.flatnonzero(data[first_row:row + 1, columns[0]])
+        if len(nonzero):
+            return block_start + first_row + nonzero[-1]
+        return None
+
+
 class BcolzMinuteBarReader(MinuteBarReader):
     """
     Reader for data written by BcolzMinuteBarWriter
@@ -864,6 +1077,16 @@ class BcolzMinuteBarReader(MinuteBarReader):
     rootdir : string
         The root directory containing the metadata and asset bcolz
         directories.
+    sid_cache_size : int, optional
+        The number of open carrays to keep per field.
+    session_cache_bytes : int, optional
+        If given, keep decompressed blocks of sessions in a
+        ``MinuteBarSessionCache`` using at most this many bytes, and serve
+        ``get_value``, ``load_raw_arrays`` and ``get_last_traded_dt`` from
+        it.  By default every read goes to the carrays.
+    sessions_per_cache_block : int, optional
+        The number of sessions decompressed at once per sid and field when
+        ``session_cache_bytes`` is given.
 
     See Also
     --------
@@ -871,7 +1094,11 @@ class BcolzMinuteBarReader(MinuteBarReader):
     """
     FIELDS = ('open', 'high', 'low', 'close', 'volume')
 
-    def __init__(self, rootdir, sid_cache_size=1000):
+    def __init__(self,
+                 rootdir,
+                 sid_cache_size=1000,
+                 session_cache_bytes=None,
+                 sessions_per_cache_block=1):
         self._rootdir = rootdir
 
         metadata = self._get_metadata()
@@ -918,6 +1145,15 @@ class BcolzMinuteBarReader(MinuteBarReader):
         # which is the minute epoch of that date.
         self._known_zero_volume_dict = {}
 
+        if session_cache_bytes is not None:
+            self._session_cache = MinuteBarSessionCache(
+                self,
+                session_cache_bytes,
+                sessions_per_cache_block,
+            )
+        else:
+            self._session_cache = None
+
     def _get_metadata(self):
         return BcolzMinuteBarMetadata.read(self._rootdir)
 
@@ -1087,10 +1323,14 @@ class BcolzMinuteBarReader(MinuteBarReader):
             self._last_get_value_dt_value = dt.value
             self._last_get_value_dt_position = minute_pos
 
-        try:
-            value = self._open_minute_file(field, sid)[minute_pos]
-        except IndexError:
-            value = 0
+        if self._session_cache is not None:
+            value = self._session_cache.get_raw_value(field, int(sid),
+                                                      minute_pos)
+        else:
+            try:
+                value = self._open_minute_file(field, sid)[minute_pos]
+            except IndexError:
+                value = 0
         if value == 0:
             if field == 'volume':
                 return 0
@@ -1122,14 +1362,39 @@ class BcolzMinuteBarReader(MinuteBarReader):
         if dt_minute < earliest_dt_to_search:
             return -1
 
-        pos = find_last_traded_position_internal(
-            self._market_open_values,
-            self._market_close_values,
-            dt_minute,
-            earliest_dt_to_search,
-            volumes,
-            self._minutes_per_day,
-        )
+        pos = None
+        if self._session_cache is not None:
+            # Look for the last trade in the cached block containing dt
+            # first; only scan the carray if the block has none.
+            end_pos = find_position_of_minute(
+                self._market_open_values,
+                self._market_close_values,
+                dt_minute,
+                self._minutes_per_day,
+                True,
+            )
+            pos = self._session_cache.find_last_nonzero(
+                'volume', int(asset), 0, end_pos,
+            )
+            if pos is not None:
+                pos_minute = self._pos_to_minute_value(pos)
+                if pos_minute > self._market_close_values[
+                        pos // self._minutes_per_day]:
+                    # Data written after an early close; let the full search
+                    # skip over it.
+                    pos = None
+                elif pos_minute < earliest_dt_to_search:
+                    pos = -1
+
+        if pos is None:
+            pos = find_last_traded_position_internal(
+                self._market_open_values,
+                self._market_close_values,
+                dt_minute,
+                earliest_dt_to_search,
+                volumes,
+                self._minutes_per_day,
+            )
 
         if pos == -1:
             # if we didn't find any volume before this dt, save it to avoid
@@ -1144,13 +1409,15 @@ class BcolzMinuteBarReader(MinuteBarReader):
 
         return pos
 
-    def _pos_to_minute(self, pos):
-        minute_epoch = minute_value(
+    def _pos_to_minute_value(self, pos):
+        return minute_value(
             self._market_open_values,
             pos,
             self._minutes_per_day
         )
 
+    def _pos_to_minute(self, pos):
+        minute_epoch = self._pos_to_minute_value(pos)
         return pd.Timestamp(minute_epoch, tz='UTC', unit="m")
 
     def _find_position_of_minute(self, minute_dt):
@@ -1216,29 +1483,55 @@ class BcolzMinuteBarReader(MinuteBarReader):
 
         shape = num_minutes, len(sids)
 
+        if any(field != 'volume' for field in fields):
+            ohlc_inverses = np.array([
+                self._ohlc_ratio_inverse_for_sid(sid) for sid in sids
+            ])
+
+        session_cache = self._session_cache
+        if session_cache is not None and \
+                session_cache.fits(start_idx, end_idx, len(sids)):
+            sids = [int(sid) for sid in sids]
+        else:
+            session_cache = None
+
         for field in fields:
-            if field != 'volume':
-                out = np.full(shape, np.nan)
+            if session_cache is not None:
+                raw = session_cache.get_raw_window(
+                    field, start_idx, end_idx, sids,
+                )
+                if indices_to_exclude is not None:
+                    rows = np.concatenate([
+                        np.arange(excl_start, excl_stop + 1) - start_idx
+                        for excl_start, excl_stop in indices_to_exclude
+                    ])
+                    rows = rows[(rows >= 0) & (rows < len(raw))]
+                    raw = np.delete(raw, rows, axis=0)
             else:
-                out = np.zeros(shape, dtype=np.uint32)
+                raw = np.zeros(shape, dtype=np.uint32)
+
+                for i, sid in enumerate(sids):
+                    carray = self._open_minute_file(field, sid)
+                    values = carray[start_idx:end_idx + 1]
+                    if indices_to_exclude is not None:
+                        for excl_start, excl_stop in indices_to_exclude[::-1]:
+                            excl_slice = np.s_[
+                                excl_start - start_idx:
+                                excl_stop - start_idx + 1
+                            ]
+                            values = np.delete(values, excl_slice)
+
+                    # slice down to len(values) because we might not have
+                    # written data for all the minutes requested
+                    raw[:len(values), i] = values
 
-            for i, sid in enumerate(sids):
-                carray = self._open_minute_file(field, sid)
-                values = carray[start_idx:end_idx + 1]
-                if indices_to_exclude is not None:
-                    for excl_start, excl_stop in indices_to_exclude[::-1]:
-                        excl_slice = np.s_[
-                            excl_start - start_idx:excl_stop - start_idx + 1]
-                        values = np.delete(values, excl_slice)
-
-                where = values != 0
-                # first slice down to len(where) because we might not have
-                # written data for all the minutes requested
-                if field != 'volume':
-                    out[:len(where), i][where] = (
-                        values[where] * self._ohlc_ratio_inverse_for_sid(sid))
-                else:
-                    out[:len(where), i][where] = values[where]
+            if field != 'volume':
+                # Scale every sid by its own OHLC ratio at once; zeros mean
+                # no trade and are reported as NaN.
+                out = raw * ohlc_inverses
+                out[raw == 0] = np.nan
+            else:
+                out = raw
 
             results.append(out)
         return results
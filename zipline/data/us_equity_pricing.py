@@ -13,7 +13,8 @@
 # limitations under the License.
 from errno import ENOENT
 from functools import partial
-from os import remove
+from os import remove, rename
+from shutil import rmtree
 import sqlite3
 import warnings
 
@@ -39,6 +40,7 @@ from pandas import (
     isnull,
     DataFrame,
     read_csv,
+    Timedelta,
     Timestamp,
     NaT,
     DatetimeIndex
@@ -50,6 +52,8 @@ from six import (
     string_types,
 )
 
+from zipline.data.adjustment_factors import AdjustmentFactors
+from zipline.data.adjustment_index import SQLiteAdjustmentIndex
 from zipline.data.session_bars import SessionBarReader
 from zipline.data.bar_reader import (
     NoDataAfterDate,
@@ -64,11 +68,10 @@ from zipline.utils.input_validation import (
     expect_element,
     verify_indices_all_unique,
 )
-from zipline.utils.sqlite_utils import group_into_chunks, coerce_string_to_conn
+from zipline.utils.sqlite_utils import coerce_string_to_conn
 from zipline.utils.memoize import lazyval
 from zipline.utils.cli import maybe_show_progress
 from ._equities import _compute_row_slices, _read_bcolz_data
-from ._adjustments import load_adjustments_from_sqlite
 
 
 logger = logbook.Logger('UsEquityPricing')
@@ -191,6 +194,10 @@ class BcolzDailyBarWriter(object):
         Midnight UTC session label.
     end_session: pd.Timestamp
         Midnight UTC session label.
+    append : bool, optional
+        If True, ``write`` adds new sessions to the table already at
+        ``filename`` instead of replacing it. The table must have been
+        written with the same calendar and start session.
 
     See Also
     --------
@@ -204,8 +211,16 @@ class BcolzDailyBarWriter(object):
         'volume': float64,
     }
 
-    def __init__(self, filename, calendar, start_session, end_session):
+    def __init__(self,
+                 filename,
+                 calendar,
+                 start_session,
+                 end_session,
+                 append=False):
         self._filename = filename
+        self._append = append
+        # The last day of each sid in the table being appended to.
+        self._last_days = None
 
         if start_session != end_session:
             if not calendar.is_session(start_session):
@@ -229,6 +244,36 @@ class BcolzDailyBarWriter(object):
     def progress_bar_item_show_func(self, value):
         return value if value is None else str(value[0])
 
+    def last_date_in_output_for_sid(self, sid):
+        """
+        Parameters
+        ----------
+        sid : int
+            Asset identifier.
+
+        Returns
+        -------
+        out : pd.Timestamp
+            The last session of the existing data for the given sid, or NaT
+            if the writer isn't appending or the sid has no data.
+        """
+        if not self._append:
+            return NaT
+        if self._last_days is None:
+            table = ctable(rootdir=self._filename, mode='r')
+            last_rows = {
+                int(k): v for k, v in iteritems(table.attrs['last_row'])
+            }
+            days = table['day'][:]
+            self._last_days = {
+                sid: days[last_row] for sid, last_row in iteritems(last_rows)
+            }
+        try:
+            day = self._last_days[int(sid)]
+        except KeyError:
+            return NaT
+        return Timestamp(day, unit='s', tz='UTC')
+
     def write(self,
               data,
               assets=None,
@@ -263,8 +308,102 @@ class BcolzDailyBarWriter(object):
             length=len(assets) if assets is not None else None,
         )
         with ctx as it:
+            if self._append:
+                return self._append_internal(it, assets)
             return self._write_internal(it, assets)
 
+    def _append_internal(self, iterator, assets):
+        """
+        Internal implementation of write when appending.
+
+        The existing table is moved aside and merged with the new data into a
+        new table, keeping the rows of each asset contiguous.
+        """
+        new_tables = {}
+        for asset_id, table in iterator:
+            if assets is not None and asset_id not in assets:
+                raise ValueError('unknown asset id %r' % asset_id)
+            new_tables[int(asset_id)] = table
+
+        old_filename = self._filename + '.old'
+        rename(self._filename, old_filename)
+        self._last_days = None
+        try:
+            old = ctable(rootdir=old_filename, mode='r')
+            if old.attrs['start_session_ns'] != self._start_session.value:
+                raise ValueError(
+                    'cannot append to a table starting on %s with a writer'
+                    ' starting on %s' % (
+                        Timestamp(old.attrs['start_session_ns'], tz='UTC'),
+                        self._start_session,
+                    ),
+                )
+            result = self._write_internal(
+                self._merge_tables(old, new_tables, self._calendar),
+                None,
+            )
+        except BaseException:
+            rmtree(self._filename, ignore_errors=True)
+            rename(old_filename, self._filename)
+            raise
+
+        rmtree(old_filename)
+        return result
+
+    @staticmethod
+    def _merge_tables(old, new_tables, calendar):
+        """Yield the rows of the existing table followed by the new rows for
+        each asset, in sid order.
+
+        The sessions between the existing and the new rows of an asset are
+        filled with zeros, as the rows of each asset are contiguous.
+        """
+        first_row = {int(k): v for k, v in iteritems(old.attrs['first_row'])}
+        last_row = {int(k): v for k, v in iteritems(old.attrs['last_row'])}
+        names = [
+            name for name in US_EQUITY_PRICING_BCOLZ_COLUMNS if name != 'id'
+        ]
+
+        for asset_id in sorted(viewkeys(first_row) | viewkeys(new_tables)):
+            parts = []
+            if asset_id in first_row:
+                parts.append(
+                    old[first_row[asset_id]:last_row[asset_id] + 1],
+                )
+            new = new_tables.get(asset_id)
+            if new is not None and len(new):
+                if parts and new['day'][0] <= parts[0]['day'][-1]:
+                    raise ValueError(
+                        'new data for asset %d starts on %s, which is not'
+                        ' after its existing data' % (
+                            asset_id,
+                            Timestamp(new['day'][0], unit='s', tz='UTC'),
+                        ),
+                    )
+                if parts:
+                    missing = calendar.sessions_in_range(
+                        Timestamp(parts[0]['day'][-1], unit='s', tz='UTC') +
+                        Timedelta(days=1),
+                        Timestamp(new['day'][0], unit='s', tz='UTC') -
+                        Timedelta(days=1),
+                    )
+                    if len(missing):
+                        fill = np.zeros(len(missing), dtype=parts[0].dtype)
+                        fill['day'] = missing.values.astype(
+                            'datetime64[s]',
+                        ).view(np.int64)
+                        parts.append(fill)
+                parts.append(new[:])
+            if not parts:
+                continue
+            yield asset_id, ctable(
+                columns=[
+                    np.concatenate([part[name] for part in parts])
+                    for name in names
+                ],
+                names=names,
+            )
+
     def write_csvs(self,
                    asset_map,
                    show_progress=False,
@@ -1161,70 +1300,92 @@ class SQLiteAdjustmentWriter(object):
                   The ratio of currently held shares in the held sid that
                   should be paid with new shares of the payment_sid.
 
+        Notes
+        -----
+        If the db already holds adjustments, for example when appending to a
+        bundle, the new rows are merged into it and rows which are exact
+        duplicates of existing rows are dropped.
+
         See Also
         --------
         zipline.data.us_equity_pricing.SQLiteAdjustmentReader
         """
+        merging = self.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'splits'"
+        ).fetchone()[0]
+
         self.write_frame('splits', splits)
         self.write_frame('mergers', mergers)
         self.write_dividend_data(dividends, stock_dividends)
+        if merging:
+            self._drop_duplicates()
         self.conn.execute(
-            "CREATE INDEX splits_sids "
+            "CREATE INDEX IF NOT EXISTS splits_sids "
             "ON splits(sid)"
         )
         self.conn.execute(
-            "CREATE INDEX splits_effective_date "
+            "CREATE INDEX IF NOT EXISTS splits_effective_date "
             "ON splits(effective_date)"
         )
         self.conn.execute(
-            "CREATE INDEX mergers_sids "
+            "CREATE INDEX IF NOT EXISTS mergers_sids "
             "ON mergers(sid)"
         )
         self.conn.execute(
-            "CREATE INDEX mergers_effective_date "
+            "CREATE INDEX IF NOT EXISTS mergers_effective_date "
             "ON mergers(effective_date)"
         )
         self.conn.execute(
-            "CREATE INDEX dividends_sid "
+            "CREATE INDEX IF NOT EXISTS dividends_sid "
             "ON dividends(sid)"
         )
         self.conn.execute(
-            "CREATE INDEX dividends_effective_date "
+            "CREATE INDEX IF NOT EXISTS dividends_effective_date "
             "ON dividends(effective_date)"
         )
         self.conn.execute(
-            "CREATE INDEX dividend_payouts_sid "
+            "CREATE INDEX IF NOT EXISTS dividend_payouts_sid "
             "ON dividend_payouts(sid)"
         )
         self.conn.execute(
-            "CREATE INDEX dividends_payouts_ex_date "
+            "CREATE INDEX IF NOT EXISTS dividends_payouts_ex_date "
             "ON dividend_payouts(ex_date)"
         )
         self.conn.execute(
-            "CREATE INDEX stock_dividend_payouts_sid "
+            "CREATE INDEX IF NOT EXISTS stock_dividend_payouts_sid "
             "ON stock_dividend_payouts(sid)"
         )
         self.conn.execute(
-            "CREATE INDEX stock_dividends_payouts_ex_date "
+            "CREATE INDEX IF NOT EXISTS stock_dividends_payouts_ex_date "
             "ON stock_dividend_payouts(ex_date)"
         )
 
+    def _drop_duplicates(self):
+        for tablename, dtypes in (
+                ('splits', SQLITE_ADJUSTMENT_COLUMN_DTYPES),
+                ('mergers', SQLITE_ADJUSTMENT_COLUMN_DTYPES),
+                ('dividends', SQLITE_ADJUSTMENT_COLUMN_DTYPES),
+                ('dividend_payouts', SQLITE_DIVIDEND_PAYOUT_COLUMN_DTYPES),
+                ('stock_dividend_payouts',
+                 SQLITE_STOCK_DIVIDEND_PAYOUT_COLUMN_DTYPES)):
+            # Keep the first copy of each row; the index column written by
+            # pandas differs between writes, so it isn't compared.
+            self.conn.execute(
+                "DELETE FROM {table} WHERE rowid NOT IN "
+                "(SELECT MIN(rowid) FROM {table} GROUP BY {columns})".format(
+                    table=tablename,
+                    columns=', '.join(sorted(dtypes)),
+                )
+            )
+        self.conn.commit()
+
     def close(self):
         self.conn.close()
 
 
-UNPAID_QUERY_TEMPLATE = """
-SELECT sid, amount, pay_date from dividend_payouts
-WHERE ex_date=? AND sid IN ({0})
-"""
-
 Dividend = namedtuple('Dividend', ['asset', 'amount', 'pay_date'])
 
-UNPAID_STOCK_DIVIDEND_QUERY_TEMPLATE = """
-SELECT sid, payment_sid, ratio, pay_date from stock_dividend_payouts
-WHERE ex_date=? AND sid IN ({0})
-"""
-
 StockDividend = namedtuple(
     'StockDividend',
     ['asset', 'payment_asset', 'ratio', 'pay_date'])
@@ -1240,79 +1401,208 @@ class SQLiteAdjustmentReader(object):
     ----------
     conn : str or sqlite3.Connection
         Connection from which to load data.
+    factors : AdjustmentFactors or str, optional
+        Precomputed cumulative adjustment factors of the db, or the directory
+        they were written to. When given, ``get_adjustment_ratios`` is
+        answered from the factors instead of the index.
 
     See Also
     --------
     :class:`zipline.data.us_equity_pricing.SQLiteAdjustmentWriter`
+    :class:`zipline.data.adjustment_factors.AdjustmentFactors`
     """
 
     @preprocess(conn=coerce_string_to_conn)
-    def __init__(self, conn):
+    def __init__(self, conn, factors=None):
         self.conn = conn
+        if isinstance(factors, string_types):
+            factors = AdjustmentFactors.read(factors)
+        self.factors = factors
+
+    @lazyval
+    def index(self):
+        """The tables of the db, loaded into memory the first time they are
+        needed. Every query is answered from the index, so the db may not
+        change while it is read.
+        """
+        return SQLiteAdjustmentIndex(self.conn)
+
+    def precompute_factors(self, sessions):
+        """Compute the cumulative adjustment factors of every asset on
+        ``sessions``, and answer ``get_adjustment_ratios`` from them from now
+        on.
+
+        Parameters
+        ----------
+        sessions : pd.DatetimeIndex
+            The sessions to compute the factors on.
+
+        Returns
+        -------
+        factors : AdjustmentFactors
+            The new factors, which may be written to disk with
+            ``factors.write`` and passed to later readers of the same db.
+        """
+        self.factors = AdjustmentFactors.from_index(self.index, sessions)
+        return self.factors
 
     def load_adjustments(self, columns, dates, assets):
-        return load_adjustments_from_sqlite(
-            self.conn,
-            list(columns),
-            dates,
-            assets,
-        )
+        return self.index.load_adjustments(list(columns), dates, assets)
 
     def get_adjustments_for_sid(self, table_name, sid):
-        t = (sid,)
-        c = self.conn.cursor()
-        adjustments_for_sid = c.execute(
-            "SELECT effective_date, ratio FROM %s WHERE sid = ?" %
-            table_name, t).fetchall()
-        c.close()
+        table = self.index.table(table_name)
+        rows = table.sid_slice(sid)
+        return [
+            [Timestamp(date, unit='s', tz='UTC'), ratio]
+            for date, ratio in zip(
+                table.dates[rows].tolist(),
+                table.columns['ratio'][rows].tolist(),
+            )
+        ]
 
-        return [[Timestamp(adjustment[0], unit='s', tz='UTC'), adjustment[1]]
-                for adjustment in
-                adjustments_for_sid]
+    def get_adjustment_ratios(self, sids, field, start_date, end_date):
+        """Get the cumulative adjustment to apply to a field of many assets.
 
-    def get_dividends_with_ex_date(self, assets, date, asset_finder):
-        seconds = date.value / int(1e9)
-        c = self.conn.cursor()
+        Parameters
+        ----------
+        sids : iterable[int]
+            The assets to look up.
+        field : str
+            The field being adjusted.
+        start_date : pd.Timestamp
+            The first date of the adjustments to include.
+        end_date : pd.Timestamp
+            The last date of the adjustments to include.
 
-        divs = []
-        for chunk in group_into_chunks(assets):
-            query = UNPAID_QUERY_TEMPLATE.format(
-                ",".join(['?' for _ in chunk]))
-            t = (seconds,) + tuple(map(lambda x: int(x), chunk))
+        Returns
+        -------
+        ratios : np.ndarray[float64]
+            The product of the ratios of the adjustments to ``field`` of each
+            asset effective between ``start_date`` and ``end_date``,
+            inclusive.
+        """
+        sids = np.fromiter(map(int, sids), dtype=np.int64)
+        # round the start up and the end down to whole seconds
+        start_date = -(-start_date.value // 10 ** 9)
+        end_date = end_date.value // 10 ** 9
 
-            c.execute(query, t)
+        if self.factors is not None:
+            source = self.factors
+        else:
+            source = self.index
+        return source.cumulative_ratios(sids, field, start_date, end_date)
 
-            rows = c.fetchall()
-            for row in rows:
-                div = Dividend(
-                    asset_finder.retrieve_asset(row[0]),
-                    row[1], Timestamp(row[2], unit='s', tz='UTC'))
-                divs.append(div)
-        c.close()
+    def get_splits(self, sids, date):
+        """Get the splits of some assets which are effective on a date.
 
-        return divs
+        Parameters
+        ----------
+        sids : container[int]
+            The assets to look up.
+        date : pd.Timestamp
+            The date of the splits, at midnight UTC.
 
-    def get_stock_dividends_with_ex_date(self, assets, date, asset_finder):
-        seconds = date.value / int(1e9)
-        c = self.conn.cursor()
+        Returns
+        -------
+        splits : list[(int, float)]
+            The sid and ratio of each split.
+        """
+        table = self.index.splits
+        rows = table.rows_on_date(date.value // 10 ** 9)
+        return [
+            (sid, ratio)
+            for sid, ratio in zip(
+                table.sids[rows].tolist(),
+                table.columns['ratio'][rows].tolist(),
+            )
+            if sid in sids
+        ]
 
-        stock_divs = []
-        for chunk in group_into_chunks(assets):
-            query = UNPAID_STOCK_DIVIDEND_QUERY_TEMPLATE.format(
-                ",".join(['?' for _ in chunk]))
-            t = (seconds,) + tuple(map(lambda x: int(x), chunk))
+    def _payouts_with_ex_date(self, table, assets, date):
+        rows = table.rows_on_date(date.value // 10 ** 9)
+        return rows[np.in1d(
+            table.sids[rows],
+            np.fromiter(map(int, assets), dtype=np.int64),
+        )]
 
-            c.execute(query, t)
+    def get_dividends_with_ex_date(self, assets, date, asset_finder):
+        table = self.index.dividend_payouts
+        rows = self._payouts_with_ex_date(table, assets, date)
+        return [
+            Dividend(
+                asset_finder.retrieve_asset(sid),
+                amount,
+                Timestamp(pay_date, unit='s', tz='UTC'),
+            )
+            for sid, amount, pay_date in zip(
+                table.sids[rows].tolist(),
+                table.columns['amount'][rows].tolist(),
+                table.columns['pay_date'][rows].tolist(),
+            )
+        ]
 
-            rows = c.fetchall()
+    def get_stock_dividends_with_ex_date(self, assets, date, asset_finder):
+        table = self.index.stock_dividend_payouts
+        rows = self._payouts_with_ex_date(table, assets, date)
+        return [
+            StockDividend(
+                asset_finder.retrieve_asset(sid),
+                asset_finder.retrieve_asset(payment_sid),
+                ratio,
+                Timestamp(pay_date, unit='s', tz='UTC'),
+            )
+            for sid, payment_sid, ratio, pay_date in zip(
+                table.sids[rows].tolist(),
+                table.columns['payment_sid'][rows].tolist(),
+                table.columns['ratio'][rows].tolist(),
+                table.columns['pay_date'][rows].tolist(),
+            )
+        ]
+
+    def get_stock_dividends_for_sid(self, sid, start_date, end_date):
+        """Get the stock dividends of an asset which go ex after
+        ``start_date`` and are paid before ``end_date``.
 
-            for row in rows:
-                stock_div = StockDividend(
-                    asset_finder.retrieve_asset(row[0]),    # asset
-                    asset_finder.retrieve_asset(row[1]),    # payment_asset
-                    row[2],
-                    Timestamp(row[3], unit='s', tz='UTC'))
-                stock_divs.append(stock_div)
-        c.close()
+        Parameters
+        ----------
+        sid : int
+            The asset to look up.
+        start_date : pd.Timestamp
+            The stock dividends must have an ex_date after this date.
+        end_date : pd.Timestamp
+            The stock dividends must have a pay_date before this date.
 
-        return stock_divs
+        Returns
+        -------
+        stock_dividends : list[dict]
+            The fields of each stock dividend. The declared_date is in seconds
+            since the epoch, the other dates are tz-naive timestamps.
+        """
+        table = self.index.stock_dividend_payouts
+        columns = table.columns
+        rows = np.arange(len(table))[table.sid_slice(int(sid))]
+        rows = rows[
+            (table.dates[rows] * 10 ** 9 > start_date.value) &
+            (columns['pay_date'][rows] * 10 ** 9 < end_date.value)
+        ]
+        return [
+            {
+                'declared_date': declared_date,
+                'ex_date': Timestamp(ex_date, unit='s'),
+                'pay_date': Timestamp(pay_date, unit='s'),
+                'payment_sid': payment_sid,
+                'ratio': ratio,
+                'record_date': Timestamp(record_date, unit='s'),
+                'sid': sid,
+            }
+            for (sid, declared_date, ex_date, pay_date, payment_sid, ratio,
+                 record_date) in zip(
+                table.sids[rows].tolist(),
+                columns['declared_date'][rows].tolist(),
+                table.dates[rows].tolist(),
+                columns['pay_date'][rows].tolist(),
+                columns['payment_sid'][rows].tolist(),
+                columns['ratio'][rows].tolist(),
+                columns['record_date'][rows].tolist(),
+            )
+        ]
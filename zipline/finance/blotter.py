@@ -19,7 +19,7 @@ from copy import copy
 from six import iteritems
 
 from zipline.finance.order import Order
-from zipline.finance.slippage import VolumeShareSlippage
+from zipline.finance.slippage import SlippageModel, VolumeShareSlippage
 from zipline.finance.commission import PerShare
 from zipline.finance.cancel_policy import NeverCancel
 
@@ -303,30 +303,48 @@ class Blotter(object):
             assets = self.asset_finder.retrieve_all(self.open_orders)
             asset_dict = {asset.sid: asset for asset in assets}
 
-            for sid, asset_orders in iteritems(self.open_orders):
-                asset = asset_dict[sid]
+            orders_by_asset = [
+                (asset_dict[sid], asset_orders)
+                for sid, asset_orders in iteritems(self.open_orders)
+            ]
+
+            if isinstance(self.slippage_func, SlippageModel):
+                # Let the model fill every asset at once.
+                fills = self.slippage_func.simulate_all(
+                    bar_data,
+                    orders_by_asset,
+                )
+            else:
+                fills = (
+                    fill
+                    for asset, asset_orders in orders_by_asset
+                    for fill in self.slippage_func(
+                        bar_data,
+                        asset,
+                        asset_orders,
+                    )
+                )
 
-                for order, txn in \
-                        self.slippage_func(bar_data, asset, asset_orders):
-                    additional_commission = \
-                        self.commission.calculate(order, txn)
+            for order, txn in fills:
+                additional_commission = \
+                    self.commission.calculate(order, txn)
 
-                    if additional_commission > 0:
-                        commissions.append({
-                            "sid": order.sid,
-                            "order": order,
-                            "cost": additional_commission
-                        })
+                if additional_commission > 0:
+                    commissions.append({
+                        "sid": order.sid,
+                        "order": order,
+                        "cost": additional_commission
+                    })
 
-                    order.filled += txn.amount
-                    order.commission += additional_commission
+                order.filled += txn.amount
+                order.commission += additional_commission
 
-                    order.dt = txn.dt
+                order.dt = txn.dt
 
-                    transactions.append(txn)
+                transactions.append(txn)
 
-                    if not order.open:
-                        closed_orders.append(order)
+                if not order.open:
+                    closed_orders.append(order)
 
         return transactions, commissions, closed_orders
 
@@ -17,8 +17,18 @@ from . tracker import PerformanceTracker
 from . period import PerformancePeriod
 from . position import Position
 from . position_tracker import PositionTracker
+from . sink import (
+    CallbackPerformanceSink,
+    ChunkedPerformanceSink,
+    InMemoryPerformanceSink,
+    PerformanceSink,
+)
 
 __all__ = [
+    'CallbackPerformanceSink',
+    'ChunkedPerformanceSink',
+    'InMemoryPerformanceSink',
+    'PerformanceSink',
     'PerformanceTracker',
     'PerformancePeriod',
     'Position',
@@ -0,0 +1,235 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Append-only ledgers of the transactions and order updates of a performance
+period.
+"""
+import numpy as np
+import pandas as pd
+from six import iteritems
+from six.moves import range, zip
+
+
+class Ledger(object):
+    """
+    An append-only table stored as one list per column.
+
+    Rows are grouped by the dt they were appended for. Each dt maps to the
+    contiguous ``[start, stop)`` runs of its rows, so the rows of a dt can be
+    read without scanning the table. Rows are normally appended in dt order,
+    so most dts have a single run.
+    """
+    columns = ()
+
+    def __init__(self):
+        self._columns = [[] for _ in self.columns]
+        self._runs = {}
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def _append(self, dt, values):
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        row = self._len
+        self._len += 1
+
+        runs = self._runs.setdefault(dt, [])
+        if runs and runs[-1][1] == row:
+            runs[-1][1] = row + 1
+        else:
+            runs.append([row, row + 1])
+        return row
+
+    def _rows(self, dt=None):
+        if dt is None:
+            return range(self._len)
+        return [
+            row
+            for start, stop in self._runs.get(dt, ())
+            for row in range(start, stop)
+        ]
+
+    def _record(self, row):
+        return {
+            name: column[row]
+            for name, column in zip(self.columns, self._columns)
+        }
+
+    def to_frame(self):
+        """Export the ledger.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            A frame with a column for each of ``columns`` and a row for each
+            record.
+        """
+        return pd.DataFrame(
+            dict(zip(self.columns, self._columns)),
+            columns=self.columns,
+        )
+
+
+class TransactionLedger(Ledger):
+    """
+    The transactions executed during a performance period.
+    """
+    columns = 'sid', 'amount', 'dt', 'price', 'order_id', 'commission'
+
+    def append(self, txn):
+        self._append(
+            txn.dt,
+            (txn.sid, txn.amount, txn.dt, txn.price, txn.order_id,
+             txn.commission),
+        )
+
+    def to_dicts(self, dt=None):
+        """The transactions as dicts, like ``Transaction.to_dict``.
+
+        Parameters
+        ----------
+        dt : datetime, optional
+            Only return the transactions executed at ``dt``.
+        """
+        return [self._record(row) for row in self._rows(dt)]
+
+
+class OrderLedger(Ledger):
+    """
+    The updates to the orders placed or modified during a performance period.
+
+    A row is appended each time an order is recorded, holding the state of the
+    order at the time. Only the last update of an order in each dt, and in the
+    period as a whole, is reported. Orders which were still open when they
+    were last recorded may change later without being recorded again, e.g.
+    when a stop is reached, so their last row is refreshed from the order
+    before it is read.
+    """
+    columns = (
+        'id',
+        'dt',
+        'reason',
+        'created',
+        'sid',
+        'amount',
+        'filled',
+        'commission',
+        'status',
+        'stop',
+        'limit',
+        'stop_reached',
+        'limit_reached',
+        'broker_order_id',
+    )
+
+    def __init__(self):
+        super(OrderLedger, self).__init__()
+        # Whether each row is the last update of its order in the period, and
+        # in the dt it was recorded for.
+        self._last_in_period = []
+        self._last_in_dt = []
+        # order id -> (dt, row) of the order's last update
+        self._last_rows = {}
+        # order id -> (row, order) for orders which were open when last
+        # recorded
+        self._open = {}
+
+    def _values(self, order):
+        return (
+            order.id,
+            order.dt,
+            order.reason,
+            order.created,
+            order.sid,
+            order.amount,
+            order.filled,
+            order.commission,
+            order.status,
+            order.stop,
+            order.limit,
+            order.stop_reached,
+            order.limit_reached,
+            order.broker_order_id,
+        )
+
+    def append(self, order):
+        dt = order.dt
+        try:
+            last_dt, last_row = self._last_rows[order.id]
+        except KeyError:
+            pass
+        else:
+            self._last_in_period[last_row] = False
+            if last_dt == dt:
+                self._last_in_dt[last_row] = False
+
+        row = self._append(dt, self._values(order))
+        self._last_in_period.append(True)
+        self._last_in_dt.append(True)
+        self._last_rows[order.id] = dt, row
+
+        if order.open:
+            self._open[order.id] = row, order
+        else:
+            self._open.pop(order.id, None)
+
+    def _refresh_open_orders(self):
+        columns = self._columns
+        closed = []
+        for order_id, (row, order) in iteritems(self._open):
+            for column, value in zip(columns, self._values(order)):
+                column[row] = value
+            if not order.open:
+                closed.append(order_id)
+
+        # Closed orders don't change, so they never need to be refreshed
+        # again.
+        for order_id in closed:
+            del self._open[order_id]
+
+    def _record(self, row):
+        record = super(OrderLedger, self)._record(row)
+        if record['broker_order_id'] is None:
+            del record['broker_order_id']
+        return record
+
+    def to_dicts(self, dt=None):
+        """The last update of each order as a dict, like ``Order.to_dict``.
+
+        Parameters
+        ----------
+        dt : datetime, optional
+            Only return the orders which were updated at ``dt``.
+        """
+        self._refresh_open_orders()
+        last = self._last_in_period if dt is None else self._last_in_dt
+        return [self._record(row) for row in self._rows(dt) if last[row]]
+
+    def to_frame(self):
+        """Export the last update of each order.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            A frame with a column for each of ``columns`` and a row for each
+            order.
+        """
+        self._refresh_open_orders()
+        frame = super(OrderLedger, self).to_frame()
+        return frame.iloc[
+            np.flatnonzero(self._last_in_period)
+        ].reset_index(drop=True)
@@ -78,15 +78,10 @@ import numpy as np
 from collections import namedtuple
 from zipline.assets import Future
 
-try:
-    # optional cython based OrderedDict
-    from cyordereddict import OrderedDict
-except ImportError:
-    from collections import OrderedDict
-
-from six import itervalues, iteritems
+from six import iteritems
 
 import zipline.protocol as zp
+from .ledger import OrderLedger, TransactionLedger
 
 log = logbook.Logger('Performance')
 TRADE_TYPE = zp.DATASOURCE_TYPE.TRADE
@@ -151,6 +146,10 @@ class PerformancePeriod(object):
         self.asset_finder = asset_finder
         self.data_frequency = data_frequency
 
+        # Incremented whenever the cash or the starting values of the period
+        # change, so that cached views of the period can tell they are stale.
+        self.state_version = 0
+
         # Start and end of the entire period
         self.period_open = period_open
         self.period_close = period_close
@@ -204,9 +203,8 @@ class PerformancePeriod(object):
         # The cumulative capital change occurred within the period
         self._total_intraperiod_capital_change = 0.0
 
-        self.processed_transactions = {}
-        self.orders_by_modified = {}
-        self.orders_by_id = OrderedDict()
+        self.transaction_ledger = TransactionLedger()
+        self.order_ledger = OrderLedger()
 
     @property
     def position_tracker(self):
@@ -221,11 +219,13 @@ class PerformancePeriod(object):
         self.calculate_performance()
 
     def adjust_period_starting_capital(self, capital_change):
+        self.state_version += 1
         self.ending_cash += capital_change
         self.starting_cash += capital_change
 
     def rollover(self):
         # We are starting a new period
+        self.state_version += 1
         self.initialize(starting_cash=self.ending_cash,
                         starting_value=self.ending_value,
                         starting_exposure=self.ending_exposure)
@@ -257,6 +257,7 @@ class PerformancePeriod(object):
 
     def set_current_subperiod_starting_values(self, capital_change):
         # Apply the capital change to the ending cash
+        self.state_version += 1
         self.ending_cash += capital_change
 
         # Increment the total capital change occurred within the period
@@ -282,9 +283,11 @@ class PerformancePeriod(object):
         self.adjust_cash(-cost)
 
     def adjust_cash(self, amount):
+        self.state_version += 1
         self.cash_flow += amount
 
     def adjust_field(self, field, value):
+        self.state_version += 1
         setattr(self, field, value)
 
     def _get_payout_total(self, positions):
@@ -345,21 +348,10 @@ class PerformancePeriod(object):
 
     def record_order(self, order):
         if self.keep_orders:
-            try:
-                dt_orders = self.orders_by_modified[order.dt]
-                if order.id in dt_orders:
-                    del dt_orders[order.id]
-            except KeyError:
-                self.orders_by_modified[order.dt] = dt_orders = OrderedDict()
-            dt_orders[order.id] = order
-            # to preserve the order of the orders by modified date
-            # we delete and add back. (ordered dictionary is sorted by
-            # first insertion date).
-            if order.id in self.orders_by_id:
-                del self.orders_by_id[order.id]
-            self.orders_by_id[order.id] = order
+            self.order_ledger.append(order)
 
     def handle_execution(self, txn):
+        self.state_version += 1
         self.cash_flow += self._calculate_execution_cash_flow(txn)
 
         asset = self.asset_finder.retrieve_asset(txn.sid)
@@ -380,10 +372,7 @@ class PerformancePeriod(object):
                 self._payout_last_sale_prices[asset] = txn.price
 
         if self.keep_transactions:
-            try:
-                self.processed_transactions[txn.dt].append(txn)
-            except KeyError:
-                self.processed_transactions[txn.dt] = [txn]
+            self.transaction_ledger.append(txn)
 
     def _calculate_execution_cash_flow(self, txn):
         """
@@ -461,31 +450,12 @@ class PerformancePeriod(object):
 
         # we want the key to be absent, not just empty
         if self.keep_transactions:
-            if dt:
-                # Only include transactions for given dt
-                try:
-                    transactions = [x.to_dict()
-                                    for x in self.processed_transactions[dt]]
-                except KeyError:
-                    transactions = []
-            else:
-                transactions = \
-                    [y.to_dict()
-                     for x in itervalues(self.processed_transactions)
-                     for y in x]
-            rval['transactions'] = transactions
+            # If dt is given, only include transactions for the dt.
+            rval['transactions'] = self.transaction_ledger.to_dicts(dt)
 
         if self.keep_orders:
-            if dt:
-                # only include orders modified as of the given dt.
-                try:
-                    orders = [x.to_dict()
-                              for x in itervalues(self.orders_by_modified[dt])]
-                except KeyError:
-                    orders = []
-            else:
-                orders = [x.to_dict() for x in itervalues(self.orders_by_id)]
-            rval['orders'] = orders
+            # If dt is given, only include orders modified as of the dt.
+            rval['orders'] = self.order_ledger.to_dicts(dt)
 
         return rval
 
@@ -511,7 +481,9 @@ class PerformancePeriod(object):
         portfolio.returns = self.returns
         portfolio.cash = self.ending_cash
         portfolio.start_date = self.period_open
-        portfolio.positions = self.position_tracker.get_positions()
+        # Building the positions is the expensive part of the portfolio, so
+        # only do it if the algorithm reads them.
+        portfolio.defer_positions(self.position_tracker.get_positions)
         portfolio.positions_value = self.ending_value
         portfolio.positions_exposure = self.ending_exposure
         return portfolio
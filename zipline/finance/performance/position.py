@@ -36,6 +36,9 @@ from math import copysign
 from collections import OrderedDict
 import numpy as np
 import logbook
+from six import viewkeys
+from six.moves import zip
+from toolz import identity
 
 log = logbook.Logger('Performance')
 
@@ -196,3 +199,256 @@ last_sale_price: {last_sale_price}"
 class positiondict(OrderedDict):
     def __missing__(self, key):
         return None
+
+
+def _stored_field(name, convert):
+    """
+    Make a property for a field of a :class:`StoredPosition` which is kept in
+    the ``name`` array of its :class:`PositionStore`.
+    """
+    def fget(self):
+        store = self._store
+        return convert(getattr(store, name)[store._index[self.sid]])
+
+    def fset(self, value):
+        store = self._store
+        getattr(store, name)[store._index[self.sid]] = value
+        store.version += 1
+
+    return property(fget, fset)
+
+
+class StoredPosition(Position):
+    """
+    A :class:`Position` whose state is a row of a :class:`PositionStore`.
+
+    Reading or writing an attribute reads or writes the row, so all of the
+    ``Position`` methods work on the stored position.
+    """
+    def __init__(self, store, sid):
+        self._store = store
+        self.sid = sid
+
+    amount = _stored_field('_amounts', int)
+    cost_basis = _stored_field('_cost_bases', float)
+    last_sale_price = _stored_field('_last_sale_prices', float)
+    last_sale_date = _stored_field('_last_sale_dates', identity)
+
+
+class PositionStore(object):
+    """
+    A mapping from sid to position which stores the positions as parallel
+    arrays, one row per position, in the order the positions were added.
+
+    Calculations over all of the positions, like marking them to market or
+    computing their exposures, can be done with array operations on
+    ``amounts``, ``cost_bases``, ``last_sale_prices`` and the multipliers.
+    Looking up a sid returns a :class:`StoredPosition` view of its row. Like
+    :class:`positiondict`, looking up a sid that isn't held returns None.
+
+    ``version`` is incremented whenever a position is added, removed or
+    changed, so views of the positions can tell when they are stale. Code
+    that writes to the arrays directly must call :meth:`mark_modified`.
+
+    Parameters
+    ----------
+    get_multipliers : callable[sid -> (float, float)]
+        A function returning the value and exposure multipliers of an asset.
+        It is called when a position in the asset is added.
+    """
+    def __init__(self, get_multipliers):
+        self._get_multipliers = get_multipliers
+        # sid -> row
+        self._index = {}
+        self._len = 0
+        self._allocate(16)
+        self.version = 0
+
+    def mark_modified(self):
+        """Record that the positions were changed through the arrays.
+        """
+        self.version += 1
+
+    def _allocate(self, capacity):
+        def grow(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            new[:self._len] = old[:self._len]
+            return new
+
+        if self._len:
+            self._sids = grow(self._sids, object)
+            self._amounts = grow(self._amounts, np.int64)
+            self._cost_bases = grow(self._cost_bases, np.float64)
+            self._last_sale_prices = grow(self._last_sale_prices, np.float64)
+            self._last_sale_dates = grow(self._last_sale_dates, object)
+            self._value_multipliers = grow(
+                self._value_multipliers,
+                np.float64,
+            )
+            self._exposure_multipliers = grow(
+                self._exposure_multipliers,
+                np.float64,
+            )
+        else:
+            self._sids = np.empty(capacity, dtype=object)
+            self._amounts = np.zeros(capacity, dtype=np.int64)
+            self._cost_bases = np.zeros(capacity, dtype=np.float64)
+            self._last_sale_prices = np.zeros(capacity, dtype=np.float64)
+            self._last_sale_dates = np.empty(capacity, dtype=object)
+            self._value_multipliers = np.zeros(capacity, dtype=np.float64)
+            self._exposure_multipliers = np.zeros(capacity, dtype=np.float64)
+
+    @property
+    def sids(self):
+        return self._sids[:self._len]
+
+    @property
+    def amounts(self):
+        return self._amounts[:self._len]
+
+    @property
+    def cost_bases(self):
+        return self._cost_bases[:self._len]
+
+    @property
+    def last_sale_prices(self):
+        return self._last_sale_prices[:self._len]
+
+    @property
+    def last_sale_dates(self):
+        return self._last_sale_dates[:self._len]
+
+    @property
+    def value_multipliers(self):
+        return self._value_multipliers[:self._len]
+
+    @property
+    def exposure_multipliers(self):
+        return self._exposure_multipliers[:self._len]
+
+    def rows(self, sids):
+        """
+        Get the rows of the positions in ``sids``.
+
+        Raises
+        ------
+        KeyError
+            Raised when one of ``sids`` isn't held.
+        """
+        index = self._index
+        return np.array([index[sid] for sid in sids], dtype=np.int64)
+
+    def add(self, sid):
+        """
+        Get the position in ``sid``, adding an empty position if it isn't
+        held.
+        """
+        if sid not in self._index:
+            value_multiplier, exposure_multiplier = self._get_multipliers(sid)
+            row = self._len
+            if row == len(self._sids):
+                self._allocate(2 * row)
+
+            self._sids[row] = sid
+            self._amounts[row] = 0
+            self._cost_bases[row] = 0.0
+            self._last_sale_prices[row] = 0.0
+            self._last_sale_dates[row] = None
+            self._value_multipliers[row] = value_multiplier
+            self._exposure_multipliers[row] = exposure_multiplier
+            self._index[sid] = row
+            self._len += 1
+            self.version += 1
+
+        return StoredPosition(self, sid)
+
+    def __getitem__(self, sid):
+        if sid not in self._index:
+            return None
+        return StoredPosition(self, sid)
+
+    def __setitem__(self, sid, position):
+        stored = self.add(sid)
+        stored.amount = position.amount
+        stored.cost_basis = position.cost_basis
+        stored.last_sale_price = position.last_sale_price
+        stored.last_sale_date = position.last_sale_date
+
+    def __delitem__(self, sid):
+        row = self._index.pop(sid)
+        end = self._len
+        # Shift the following rows up to keep the rows in insertion order.
+        for array in (self._sids,
+                      self._amounts,
+                      self._cost_bases,
+                      self._last_sale_prices,
+                      self._last_sale_dates,
+                      self._value_multipliers,
+                      self._exposure_multipliers):
+            array[row:end - 1] = array[row + 1:end]
+        self._sids[end - 1] = None
+        self._last_sale_dates[end - 1] = None
+        self._len -= 1
+        self.version += 1
+
+        index = self._index
+        for moved_row, moved_sid in enumerate(self.sids[row:], row):
+            index[moved_sid] = moved_row
+
+    def __contains__(self, sid):
+        return sid in self._index
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return iter(self.sids.tolist())
+
+    def get(self, sid, default=None):
+        position = self[sid]
+        return default if position is None else position
+
+    def update(self, positions):
+        for sid, position in positions.items():
+            self[sid] = position
+
+    def keys(self):
+        return self.sids.tolist()
+
+    def values(self):
+        return [StoredPosition(self, sid) for sid in self.sids]
+
+    def items(self):
+        return [(sid, StoredPosition(self, sid)) for sid in self.sids]
+
+    iterkeys = __iter__
+
+    def viewkeys(self):
+        return viewkeys(self._index)
+
+    def itervalues(self):
+        return iter(self.values())
+
+    def iteritems(self):
+        return iter(self.items())
+
+    def to_dicts(self):
+        """
+        Get a list of dicts, in the format of :meth:`Position.to_dict`, for
+        every position with a non-zero amount.
+        """
+        return [
+            {
+                'sid': sid,
+                'amount': int(amount),
+                'cost_basis': float(cost_basis),
+                'last_sale_price': float(last_sale_price),
+            }
+            for sid, amount, cost_basis, last_sale_price in zip(
+                self.sids,
+                self.amounts,
+                self.cost_bases,
+                self.last_sale_prices,
+            )
+            if amount != 0
+        ]
@@ -19,22 +19,14 @@ import logbook
 import numpy as np
 from collections import namedtuple
 from math import isnan
-from zipline.finance.performance.position import Position
+from zipline.finance.performance.position import PositionStore
 from zipline.finance.transaction import Transaction
 
-try:
-    # optional cython based OrderedDict
-    from cyordereddict import OrderedDict
-except ImportError:
-    from collections import OrderedDict
-from six import iteritems, itervalues
+from six.moves import zip
 
 import zipline.protocol as zp
-from zipline.assets import (
-    Equity, Future
-)
+from zipline.assets import Future
 from zipline.errors import PositionTrackerMissingAssetFinder
-from . position import positiondict
 
 log = logbook.Logger('Performance')
 
@@ -55,58 +47,42 @@ PositionStats = namedtuple('PositionStats',
 def calc_position_values(amounts,
                          last_sale_prices,
                          value_multipliers):
-    iter_amount_price_multiplier = zip(
-        amounts,
-        last_sale_prices,
-        itervalues(value_multipliers),
-    )
-    return [
-        price * amount * multiplier for
-        price, amount, multiplier in iter_amount_price_multiplier
-    ]
+    return last_sale_prices * amounts * value_multipliers
 
 
 def calc_net(values):
     # Returns 0.0 if there are no values.
-    return sum(values, np.float64())
+    return values.sum(dtype=np.float64)
 
 
 def calc_position_exposures(amounts,
                             last_sale_prices,
                             exposure_multipliers):
-    iter_amount_price_multiplier = zip(
-        amounts,
-        last_sale_prices,
-        itervalues(exposure_multipliers),
-    )
-    return [
-        price * amount * multiplier for
-        price, amount, multiplier in iter_amount_price_multiplier
-    ]
+    return last_sale_prices * amounts * exposure_multipliers
 
 
 def calc_long_value(position_values):
-    return sum(i for i in position_values if i > 0)
+    return position_values[position_values > 0].sum()
 
 
 def calc_short_value(position_values):
-    return sum(i for i in position_values if i < 0)
+    return position_values[position_values < 0].sum()
 
 
 def calc_long_exposure(position_exposures):
-    return sum(i for i in position_exposures if i > 0)
+    return position_exposures[position_exposures > 0].sum()
 
 
 def calc_short_exposure(position_exposures):
-    return sum(i for i in position_exposures if i < 0)
+    return position_exposures[position_exposures < 0].sum()
 
 
 def calc_longs_count(position_exposures):
-    return sum(1 for i in position_exposures if i > 0)
+    return int(np.count_nonzero(position_exposures > 0))
 
 
 def calc_shorts_count(position_exposures):
-    return sum(1 for i in position_exposures if i < 0)
+    return int(np.count_nonzero(position_exposures < 0))
 
 
 def calc_gross_exposure(long_exposure, short_exposure):
@@ -122,17 +98,25 @@ class PositionTracker(object):
     def __init__(self, asset_finder, data_frequency):
         self.asset_finder = asset_finder
 
-        # sid => position object
-        self.positions = positiondict()
-        # Arrays for quick calculations of positions value
-        self._position_value_multipliers = OrderedDict()
-        self._position_exposure_multipliers = OrderedDict()
+        # sid => position, stored as parallel arrays for quick calculations
+        # over all positions.
+        self.positions = PositionStore(self._get_multipliers)
+        self._position_value_multipliers = {}
+        self._position_exposure_multipliers = {}
         self._unpaid_dividends = {}
         self._unpaid_stock_dividends = {}
         self._positions_store = zp.Positions()
+        # The version of ``positions`` that ``_positions_store`` reflects.
+        self._positions_store_version = None
 
         self.data_frequency = data_frequency
 
+    @property
+    def state_version(self):
+        """A number which changes whenever the positions change.
+        """
+        return self.positions.version
+
     def _update_asset(self, sid):
         try:
             self._position_value_multipliers[sid]
@@ -144,30 +128,30 @@ class PositionTracker(object):
 
             # Collect the value multipliers from applicable sids
             asset = self.asset_finder.retrieve_asset(sid)
-            if isinstance(asset, Equity):
-                self._position_value_multipliers[sid] = 1
-                self._position_exposure_multipliers[sid] = 1
             if isinstance(asset, Future):
                 self._position_value_multipliers[sid] = 0
                 self._position_exposure_multipliers[sid] = asset.multiplier
+            else:
+                self._position_value_multipliers[sid] = 1
+                self._position_exposure_multipliers[sid] = 1
+
+    def _get_multipliers(self, sid):
+        self._update_asset(sid)
+        return (
+            self._position_value_multipliers[sid],
+            self._position_exposure_multipliers[sid],
+        )
 
     def update_positions(self, positions):
         # update positions in batch
         self.positions.update(positions)
-        for sid, pos in iteritems(positions):
-            self._update_asset(sid)
 
     def update_position(self, sid, amount=None, last_sale_price=None,
                         last_sale_date=None, cost_basis=None):
-        if sid not in self.positions:
-            position = Position(sid)
-            self.positions[sid] = position
-        else:
-            position = self.positions[sid]
+        position = self.positions.add(sid)
 
         if amount is not None:
             position.amount = amount
-            self._update_asset(sid=sid)
         if last_sale_price is not None:
             position.last_sale_price = last_sale_price
         if last_sale_date is not None:
@@ -180,12 +164,7 @@ class PositionTracker(object):
         # ----------------
         sid = txn.sid
 
-        if sid not in self.positions:
-            position = Position(sid)
-            self.positions[sid] = position
-        else:
-            position = self.positions[sid]
-
+        position = self.positions.add(sid)
         position.update(txn)
 
         if position.amount == 0:
@@ -200,8 +179,6 @@ class PositionTracker(object):
             except KeyError:
                 pass
 
-        self._update_asset(sid)
-
     def handle_commission(self, sid, cost):
         # Adjust the cost basis of the stock if we own it
         if sid in self.positions:
@@ -221,17 +198,49 @@ class PositionTracker(object):
         int: The leftover cash from fractional sahres after modifying each
             position.
         """
+        positions = self.positions
+        splits = [(sid, ratio) for sid, ratio in splits if sid in positions]
+        if not splits:
+            return 0
+
+        rows = positions.rows(sid for sid, _ in splits)
+        ratios = np.array([float(ratio) for _, ratio in splits])
+
+        # adjust the # of shares by the ratio
+        # (if we had 100 shares, and the ratio is 3,
+        #  we now have 33 shares)
+        # (old_share_count / ratio = new_share_count)
+        # (old_price * ratio = new_price)
+        raw_share_counts = positions.amounts[rows] / ratios
+        full_share_counts = np.floor(raw_share_counts)
+        fractional_share_counts = raw_share_counts - full_share_counts
+
+        # adjust the cost basis to the nearest cent, e.g., 60.0
+        new_cost_bases = [
+            round(cost_basis * ratio, 2)
+            for cost_basis, ratio in zip(
+                positions.cost_bases[rows].tolist(),
+                ratios.tolist(),
+            )
+        ]
+        positions.cost_bases[rows] = new_cost_bases
+        positions.amounts[rows] = full_share_counts
+        positions.mark_modified()
+
+        # The leftover cash from the fractional shares is converted into
+        # cash, rounded to the nearest cent.
         total_leftover_cash = 0
-
-        for split in splits:
-            sid = split[0]
-            if sid in self.positions:
-                # Make the position object handle the split. It returns the
-                # leftover cash from a fractional share, if there is any.
-                position = self.positions[sid]
-                leftover_cash = position.handle_split(sid, split[1])
-                self._update_asset(split[0])
-                total_leftover_cash += leftover_cash
+        for (sid, _), fractional_share_count, new_cost_basis in zip(
+                splits,
+                fractional_share_counts,
+                new_cost_bases):
+            return_cash = round(
+                float(fractional_share_count * new_cost_basis),
+                2,
+            )
+            log.info("after split: " + str(positions[sid]))
+            log.info("returning cash: " + str(return_cash))
+            total_leftover_cash += return_cash
 
         return total_leftover_cash
 
@@ -248,19 +257,38 @@ class PositionTracker(object):
         stock_dividends: iterable of (asset, payment_asset, ratio, pay_date)
             namedtuples.
         """
-        for dividend in dividends:
-            # Store the earned dividends so that they can be paid on the
-            # dividends' pay_dates.
-            div_owed = self.positions[dividend.asset].earn_dividend(dividend)
+        positions = self.positions
+
+        # Store the earned dividends so that they can be paid on the
+        # dividends' pay_dates.
+        dividends = list(dividends)
+        amounts_owed = positions.amounts[
+            positions.rows(dividend.asset for dividend in dividends)
+        ] * np.array([dividend.amount for dividend in dividends])
+        for dividend, amount_owed in zip(dividends, amounts_owed):
+            div_owed = {'amount': amount_owed}
             try:
                 self._unpaid_dividends[dividend.pay_date].append(div_owed)
             except KeyError:
                 self._unpaid_dividends[dividend.pay_date] = [div_owed]
 
-        for stock_dividend in stock_dividends:
-            div_owed = \
-                self.positions[stock_dividend.asset].earn_stock_dividend(
-                    stock_dividend)
+        stock_dividends = list(stock_dividends)
+        share_counts_owed = np.floor(
+            positions.amounts[
+                positions.rows(
+                    stock_dividend.asset for stock_dividend in stock_dividends
+                )
+            ] * np.array([
+                float(stock_dividend.ratio)
+                for stock_dividend in stock_dividends
+            ]),
+        )
+        for stock_dividend, share_count in zip(stock_dividends,
+                                               share_counts_owed):
+            div_owed = {
+                'payment_asset': stock_dividend.payment_asset,
+                'share_count': share_count,
+            }
             try:
                 self._unpaid_stock_dividends[stock_dividend.pay_date].\
                     append(div_owed)
@@ -296,18 +324,10 @@ class PositionTracker(object):
             stock_payments = []
 
         for stock_payment in stock_payments:
-            payment_asset = stock_payment['payment_asset']
-            share_count = stock_payment['share_count']
             # note we create a Position for stock dividend if we don't
             # already own the asset
-            if payment_asset in self.positions:
-                position = self.positions[payment_asset]
-            else:
-                position = self.positions[payment_asset] = \
-                    Position(payment_asset)
-
-            position.amount += share_count
-            self._update_asset(payment_asset)
+            position = self.positions.add(stock_payment['payment_asset'])
+            position.amount += stock_payment['share_count']
 
         return net_cash_payment
 
@@ -336,10 +356,19 @@ class PositionTracker(object):
     def get_positions(self):
 
         positions = self._positions_store
-
-        for sid, pos in iteritems(self.positions):
-
-            if pos.amount == 0:
+        store = self.positions
+        if store.version == self._positions_store_version:
+            # Nothing has changed since the last snapshot.
+            return positions
+
+        for sid, amount, cost_basis, last_sale_price, last_sale_date in zip(
+                store.sids,
+                store.amounts,
+                store.cost_bases,
+                store.last_sale_prices,
+                store.last_sale_dates):
+
+            if amount == 0:
                 # Clear out the position if it has become empty since the last
                 # time get_positions was called.  Catching the KeyError is
                 # faster than checking `if sid in positions`, and this can be
@@ -351,64 +380,67 @@ class PositionTracker(object):
                 continue
 
             position = zp.Position(sid)
-            position.amount = pos.amount
-            position.cost_basis = pos.cost_basis
-            position.last_sale_price = pos.last_sale_price
-            position.last_sale_date = pos.last_sale_date
+            position.amount = int(amount)
+            position.cost_basis = float(cost_basis)
+            position.last_sale_price = float(last_sale_price)
+            position.last_sale_date = last_sale_date
 
             # Adds the new position if we didn't have one before, or overwrite
             # one we have currently
             positions[sid] = position
 
+        self._positions_store_version = store.version
         return positions
 
     def get_positions_list(self):
-        positions = []
-        for sid, pos in iteritems(self.positions):
-            if pos.amount != 0:
-                positions.append(pos.to_dict())
-        return positions
+        return self.positions.to_dicts()
 
     def sync_last_sale_prices(self, dt, handle_non_market_minutes,
                               data_portal):
-        if not handle_non_market_minutes:
-            for asset, position in iteritems(self.positions):
-                last_sale_price = data_portal.get_spot_value(
-                    asset, 'price', dt, self.data_frequency
-                )
+        store = self.positions
+        if not len(store):
+            return
 
-                if not np.isnan(last_sale_price):
-                    position.last_sale_price = last_sale_price
+        if not handle_non_market_minutes:
+            last_sale_prices, = data_portal.get_spot_values(
+                store.sids.tolist(),
+                ['price'],
+                dt,
+                self.data_frequency,
+            )
         else:
-            for asset, position in iteritems(self.positions):
-                last_sale_price = data_portal.get_adjusted_value(
-                    asset,
-                    'price',
-                    data_portal.trading_calendar.previous_minute(dt),
-                    dt,
-                    self.data_frequency
-                )
-
-                if not np.isnan(last_sale_price):
-                    position.last_sale_price = last_sale_price
+            previous_minute = data_portal.trading_calendar.previous_minute(dt)
+            last_sale_prices = data_portal.get_adjusted_values(
+                store.sids.tolist(),
+                'price',
+                previous_minute,
+                dt,
+                self.data_frequency,
+            )
+
+        last_sale_prices = np.asarray(last_sale_prices, dtype=np.float64)
+        changed = ~np.isnan(last_sale_prices) & (
+            last_sale_prices != store.last_sale_prices
+        )
+        if changed.any():
+            store.last_sale_prices[changed] = last_sale_prices[changed]
+            store.mark_modified()
 
     def stats(self):
-        amounts = []
-        last_sale_prices = []
-        for pos in itervalues(self.positions):
-            amounts.append(pos.amount)
-            last_sale_prices.append(pos.last_sale_price)
+        store = self.positions
+        amounts = store.amounts
+        last_sale_prices = store.last_sale_prices
 
         position_values = calc_position_values(
             amounts,
             last_sale_prices,
-            self._position_value_multipliers
+            store.value_multipliers,
         )
 
         position_exposures = calc_position_exposures(
             amounts,
             last_sale_prices,
-            self._position_exposure_multipliers
+            store.exposure_multipliers,
         )
 
         long_value = calc_long_value(position_values)
@@ -0,0 +1,282 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Sinks consume the perf packets of a simulation as they are produced and build
+the ``daily_stats`` frame returned by ``TradingAlgorithm.run``.
+"""
+from abc import ABCMeta, abstractmethod
+import operator as op
+import os
+
+import logbook
+import pandas as pd
+from six import iteritems, with_metaclass
+from six.moves import range
+
+from zipline.utils.paths import ensure_directory
+
+log = logbook.Logger('Performance')
+
+
+def _daily_perfs_to_frame(daily_perfs):
+    return pd.DataFrame(
+        daily_perfs,
+        index=pd.DatetimeIndex(
+            [p['period_close'] for p in daily_perfs],
+            tz='UTC',
+        ),
+    )
+
+
+class PerformanceSink(with_metaclass(ABCMeta)):
+    """
+    Abstract interface for consuming the perf packets of a simulation.
+    """
+    def __init__(self):
+        self._risk_report = None
+        self._overwritten = set()
+
+    @property
+    def risk_report(self):
+        """The last packet which wasn't a daily perf packet. At the end of a
+        simulation this is the risk report.
+        """
+        return self._risk_report
+
+    def write(self, packet):
+        """Consume a perf packet.
+
+        Daily packets are flattened into a single dict holding the daily perf,
+        the recorded variables and the cumulative risk metrics, which is passed
+        to ``write_daily_perf``. A recorded variable replaces a daily perf
+        field of the same name, and a risk metric replaces either; a warning
+        is logged the first time each name is replaced.
+
+        Parameters
+        ----------
+        packet : dict
+            A packet produced by ``TradingAlgorithm.get_generator``.
+        """
+        if 'daily_perf' in packet:
+            daily_perf = packet['daily_perf']
+            self._merge(
+                daily_perf,
+                daily_perf.pop('recorded_vars'),
+                'recorded variable',
+            )
+            self._merge(
+                daily_perf,
+                packet['cumulative_risk_metrics'],
+                'cumulative risk metric',
+            )
+            self.write_daily_perf(daily_perf)
+        else:
+            self._risk_report = packet
+
+    def _merge(self, daily_perf, values, kind):
+        for name in sorted(set(values).intersection(daily_perf)):
+            if name not in self._overwritten:
+                self._overwritten.add(name)
+                log.warn(
+                    'The {kind} {name!r} replaces the value of the same name'
+                    ' in the daily stats.',
+                    kind=kind,
+                    name=name,
+                )
+        daily_perf.update(values)
+
+    @abstractmethod
+    def write_daily_perf(self, daily_perf):
+        """Consume the flattened perf of a single session.
+
+        Parameters
+        ----------
+        daily_perf : dict
+            The daily perf, recorded variables and cumulative risk metrics.
+        """
+        raise NotImplementedError('write_daily_perf')
+
+    @abstractmethod
+    def daily_stats(self):
+        """Build the daily stats of the simulation.
+
+        Returns
+        -------
+        daily_stats : pd.DataFrame
+            A frame with one row per session, indexed by the session's close.
+        """
+        raise NotImplementedError('daily_stats')
+
+
+class InMemoryPerformanceSink(PerformanceSink):
+    """
+    Keep the daily perf of every session in memory.
+
+    This is the default sink. Minute packets are not kept.
+    """
+    def __init__(self):
+        super(InMemoryPerformanceSink, self).__init__()
+        self._daily_perfs = []
+
+    def write_daily_perf(self, daily_perf):
+        self._daily_perfs.append(daily_perf)
+
+    def daily_stats(self):
+        return _daily_perfs_to_frame(self._daily_perfs)
+
+
+class CallbackPerformanceSink(PerformanceSink):
+    """
+    Call a function with every perf packet, including minute packets, before
+    writing it to another sink.
+
+    Parameters
+    ----------
+    callback : callable[dict -> any]
+        The function to call with each packet.
+    sink : PerformanceSink, optional
+        The sink to write the packets to. By default, an
+        :class:`InMemoryPerformanceSink`.
+    """
+    def __init__(self, callback, sink=None):
+        super(CallbackPerformanceSink, self).__init__()
+        self._callback = callback
+        if sink is None:
+            sink = InMemoryPerformanceSink()
+        self._sink = sink
+
+    @property
+    def risk_report(self):
+        return self._sink.risk_report
+
+    def write(self, packet):
+        self._callback(packet)
+        self._sink.write(packet)
+
+    def write_daily_perf(self, daily_perf):
+        self._sink.write_daily_perf(daily_perf)
+
+    def daily_stats(self):
+        return self._sink.daily_stats()
+
+
+class ChunkedPerformanceSink(PerformanceSink):
+    """
+    Write the daily perf to disk in chunks of sessions.
+
+    The positions, transactions and orders of each session are split out of
+    the daily perf into their own tables, with one row per position,
+    transaction or order, a ``period_close`` column holding the close of the
+    session, and the asset stored as an integer ``sid``. Each table is written
+    as a sequence of pickled frames under ``rootdir/<table>``, so at most
+    ``chunksize`` sessions are held in memory while the simulation runs.
+
+    The ``daily_stats`` frame only holds the scalar fields of the daily perf;
+    use :meth:`read_table` to load the other tables.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory to write the tables to.
+    chunksize : int, optional
+        The number of sessions to buffer before writing them.
+    """
+    tables = 'positions', 'transactions', 'orders'
+
+    def __init__(self, rootdir, chunksize=252):
+        super(ChunkedPerformanceSink, self).__init__()
+        if chunksize < 1:
+            raise ValueError(
+                'chunksize must be at least 1, got %r' % chunksize,
+            )
+        self._rootdir = rootdir
+        self._chunksize = chunksize
+        self._buffered_sessions = 0
+        self._buffers = {name: [] for name in ('daily_perf',) + self.tables}
+        self._chunk_counts = {name: 0 for name in self._buffers}
+        for name in self._buffers:
+            ensure_directory(self._table_dir(name))
+
+    def _table_dir(self, name):
+        return os.path.join(self._rootdir, name)
+
+    def write_daily_perf(self, daily_perf):
+        period_close = daily_perf['period_close']
+        buffers = self._buffers
+        for name in self.tables:
+            rows = buffers[name]
+            for row in daily_perf.pop(name, ()):
+                row = dict(row, period_close=period_close)
+                row['sid'] = op.index(row['sid'])
+                rows.append(row)
+        buffers['daily_perf'].append(daily_perf)
+
+        self._buffered_sessions += 1
+        if self._buffered_sessions >= self._chunksize:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered sessions to disk.
+        """
+        for name, rows in iteritems(self._buffers):
+            if not rows:
+                continue
+            if name == 'daily_perf':
+                frame = _daily_perfs_to_frame(rows)
+            else:
+                frame = pd.DataFrame(rows)
+            frame.to_pickle(os.path.join(
+                self._table_dir(name),
+                '%06d.pickle' % self._chunk_counts[name],
+            ))
+            self._chunk_counts[name] += 1
+            del rows[:]
+        self._buffered_sessions = 0
+
+    def read_table(self, name):
+        """Load a table written by this sink.
+
+        Parameters
+        ----------
+        name : {'daily_perf', 'positions', 'transactions', 'orders'}
+            The table to load.
+
+        Returns
+        -------
+        table : pd.DataFrame
+            The rows of every session written so far.
+        """
+        if name not in self._buffers:
+            raise ValueError(
+                'unknown table %r, must be one of %s' % (
+                    name,
+                    sorted(self._buffers),
+                ),
+            )
+        self.flush()
+
+        table_dir = self._table_dir(name)
+        chunks = [
+            pd.read_pickle(os.path.join(table_dir, '%06d.pickle' % n))
+            for n in range(self._chunk_counts[name])
+        ]
+        if not chunks:
+            return pd.DataFrame()
+        if name == 'daily_perf':
+            return pd.concat(chunks)
+        return pd.concat(chunks, ignore_index=True)
+
+    def daily_stats(self):
+        return self.read_table('daily_perf')
@@ -169,6 +169,10 @@ class PerformanceTracker(object):
 
         self.account_needs_update = True
         self._account = None
+        # The state of the tracker when performance was last calculated and
+        # when the account was last built.
+        self._performance_version = None
+        self._account_version = None
 
     def __repr__(self):
         return "%s(%r)" % (
@@ -188,9 +192,21 @@ class PerformanceTracker(object):
             self.saved_dt = date
             self.todays_performance.period_close = self.saved_dt
 
+    @property
+    def state_version(self):
+        """A value which changes whenever a transaction, commission, price
+        update, capital change, split or dividend changes the state of the
+        tracker.
+        """
+        return (
+            self.cumulative_performance.state_version,
+            self.todays_performance.state_version,
+            self.position_tracker.state_version,
+        )
+
     def get_portfolio(self, performance_needs_update):
         if performance_needs_update:
-            self.update_performance()
+            self._maybe_update_performance()
             self.account_needs_update = True
         return self.cumulative_performance.as_portfolio()
 
@@ -198,17 +214,27 @@ class PerformanceTracker(object):
         # calculate performance as of last trade
         self.cumulative_performance.calculate_performance()
         self.todays_performance.calculate_performance()
+        self._performance_version = self.state_version
+
+    def _maybe_update_performance(self):
+        # Performance only needs to be recalculated if something changed
+        # since it was last calculated.
+        if self._performance_version != self.state_version:
+            self.update_performance()
 
     def get_account(self, performance_needs_update):
         if performance_needs_update:
-            self.update_performance()
+            self._maybe_update_performance()
             self.account_needs_update = True
         if self.account_needs_update:
             self._update_account()
         return self._account
 
     def _update_account(self):
-        self._account = self.cumulative_performance.as_account()
+        version = self.state_version, self._performance_version
+        if self._account is None or version != self._account_version:
+            self._account = self.cumulative_performance.as_account()
+            self._account_version = version
         self.account_needs_update = False
 
     def to_dict(self, emission_type=None):
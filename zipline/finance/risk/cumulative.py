@@ -27,16 +27,7 @@ from . risk import (
     choose_treasury
 )
 
-from empyrical import (
-    alpha_beta_aligned,
-    annual_volatility,
-    cum_returns,
-    downside_risk,
-    information_ratio,
-    max_drawdown,
-    sharpe_ratio,
-    sortino_ratio,
-)
+from empyrical.stats import APPROX_BDAYS_PER_YEAR
 
 log = logbook.Logger('Risk Cumulative')
 
@@ -45,11 +36,220 @@ choose_treasury = functools.partial(choose_treasury, lambda *args: '10year',
                                     compound=False)
 
 
+class _RunningRiskState(object):
+    """
+    Constant-size summary of a stream of (algorithm, benchmark) returns.
+
+    Holds Welford-style running means and second moments for the algorithm
+    returns, the benchmark returns, their covariance and the active returns,
+    together with the running downside second moment, the compounded log
+    return and the running peak/drawdown of the cumulative returns.  Each
+    ``push`` is O(1), and every metric matches the corresponding empyrical
+    function applied to the full history of pushed values, including its
+    NaN handling.
+    """
+    __slots__ = (
+        'length',
+        'algo_last_nan',
+        'bench_last_nan',
+        'algo_count',
+        'algo_mean',
+        'algo_m2',
+        'algo_log_cum',
+        'bench_count',
+        'bench_mean',
+        'bench_m2',
+        'bench_log_cum',
+        'joint_count',
+        'joint_algo_mean',
+        'joint_bench_mean',
+        'joint_bench_m2',
+        'joint_comoment',
+        'active_count',
+        'active_mean',
+        'active_m2',
+        'downside_count',
+        'downside_sum_squares',
+        'peak',
+        'max_drawdown',
+    )
+
+    def __init__(self):
+        self.length = 0
+        self.algo_last_nan = False
+        self.bench_last_nan = False
+        self.algo_count = 0
+        self.algo_mean = 0.0
+        self.algo_m2 = 0.0
+        self.algo_log_cum = 0.0
+        self.bench_count = 0
+        self.bench_mean = 0.0
+        self.bench_m2 = 0.0
+        self.bench_log_cum = 0.0
+        self.joint_count = 0
+        self.joint_algo_mean = 0.0
+        self.joint_bench_mean = 0.0
+        self.joint_bench_m2 = 0.0
+        self.joint_comoment = 0.0
+        self.active_count = 0
+        self.active_mean = 0.0
+        self.active_m2 = 0.0
+        self.downside_count = 0
+        self.downside_sum_squares = 0.0
+        self.peak = -np.inf
+        self.max_drawdown = np.nan
+
+    def copy(self):
+        new = _RunningRiskState.__new__(_RunningRiskState)
+        for attr in self.__slots__:
+            setattr(new, attr, getattr(self, attr))
+        return new
+
+    def push(self, algo, bench):
+        # ``empyrical.cum_returns`` treats a leading NaN as a zero return and
+        # reports NaN for the cumulative return on any later NaN.
+        first = self.length == 0
+        self.length += 1
+        algo_valid = not np.isnan(algo)
+        bench_valid = not np.isnan(bench)
+        self.algo_last_nan = not (algo_valid or first)
+        self.bench_last_nan = not (bench_valid or first)
+
+        if algo_valid:
+            self.algo_count += 1
+            delta = algo - self.algo_mean
+            self.algo_mean += delta / self.algo_count
+            self.algo_m2 += delta * (algo - self.algo_mean)
+            self.algo_log_cum += np.log1p(algo)
+
+            self.downside_count += 1
+            if algo < 0:
+                self.downside_sum_squares += algo * algo
+
+        if bench_valid:
+            self.bench_count += 1
+            delta = bench - self.bench_mean
+            self.bench_mean += delta / self.bench_count
+            self.bench_m2 += delta * (bench - self.bench_mean)
+            self.bench_log_cum += np.log1p(bench)
+
+        if algo_valid and bench_valid:
+            self.joint_count += 1
+            algo_delta = algo - self.joint_algo_mean
+            bench_delta = bench - self.joint_bench_mean
+            self.joint_algo_mean += algo_delta / self.joint_count
+            self.joint_bench_mean += bench_delta / self.joint_count
+            self.joint_bench_m2 += bench_delta * (
+                bench - self.joint_bench_mean
+            )
+            self.joint_comoment += algo_delta * (
+                bench - self.joint_bench_mean
+            )
+
+            active = algo - bench
+            self.active_count += 1
+            delta = active - self.active_mean
+            self.active_mean += delta / self.active_count
+            self.active_m2 += delta * (active - self.active_mean)
+
+        if self.algo_last_nan:
+            # NaN cumulative returns are ignored by ``max_drawdown``.
+            return
+
+        cumulative = 100 * np.exp(self.algo_log_cum)
+        if cumulative > self.peak:
+            self.peak = cumulative
+        drawdown = (cumulative - self.peak) / self.peak
+        if drawdown < self.max_drawdown or np.isnan(self.max_drawdown):
+            self.max_drawdown = drawdown
+
+    @property
+    def algorithm_cumulative_return(self):
+        if self.algo_last_nan:
+            return np.nan
+        return np.expm1(self.algo_log_cum)
+
+    @property
+    def benchmark_cumulative_return(self):
+        if self.bench_last_nan:
+            return np.nan
+        return np.expm1(self.bench_log_cum)
+
+    @staticmethod
+    def _annual_volatility(length, count, m2):
+        if length < 2 or count < 2:
+            return np.nan
+        return np.sqrt(m2 / (count - 1) * APPROX_BDAYS_PER_YEAR)
+
+    def algorithm_volatility(self, length):
+        return self._annual_volatility(length, self.algo_count, self.algo_m2)
+
+    def benchmark_volatility(self, length):
+        return self._annual_volatility(
+            length,
+            self.bench_count,
+            self.bench_m2,
+        )
+
+    def alpha_beta(self, length):
+        if length < 2 or self.joint_count < 2:
+            return np.nan, np.nan
+        bench_var = self.joint_bench_m2 / self.joint_count
+        if np.absolute(bench_var) < 1.0e-30:
+            return np.nan, np.nan
+        beta = (self.joint_comoment / self.joint_count) / bench_var
+        alpha = (
+            self.joint_algo_mean - beta * self.joint_bench_mean
+        ) * APPROX_BDAYS_PER_YEAR
+        return alpha, beta
+
+    def sharpe(self, length):
+        if length < 2 or self.algo_count < 2:
+            return np.nan
+        std = np.sqrt(self.algo_m2 / (self.algo_count - 1))
+        if std == 0:
+            return np.nan
+        return self.algo_mean / std * np.sqrt(APPROX_BDAYS_PER_YEAR)
+
+    def downside_risk(self, length):
+        if length < 1 or self.downside_count == 0:
+            return np.nan
+        return np.sqrt(
+            self.downside_sum_squares / self.downside_count *
+            APPROX_BDAYS_PER_YEAR
+        )
+
+    def sortino(self, length, downside_risk):
+        if length < 2:
+            return np.nan
+        mean = self.algo_mean if self.algo_count else np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(mean, downside_risk) * APPROX_BDAYS_PER_YEAR
+
+    def information(self, length):
+        if length < 2:
+            return np.nan
+        if self.active_count < 2:
+            return 0.0
+        tracking_error = np.sqrt(self.active_m2 / (self.active_count - 1))
+        if tracking_error == 0:
+            return np.nan
+        return self.active_mean / tracking_error
+
+
 class RiskMetricsCumulative(object):
     """
     :Usage:
         Instantiate RiskMetricsCumulative once.
         Call update() method on each dt to update the metrics.
+
+    Each call to update() takes constant time: the metrics are maintained
+    incrementally from running moments instead of being recomputed from the
+    whole returns history.  They agree with the corresponding empyrical
+    functions evaluated on the full history up to floating point rounding
+    (a relative tolerance of 1e-8).  The one exception is a history with
+    exactly zero variance, for which empyrical reports rounding noise and the
+    ratios here are NaN.
     """
 
     METRIC_NAMES = (
@@ -142,6 +342,40 @@ class RiskMetricsCumulative(object):
 
         self.num_trading_days = 0
 
+        # Running summary of every session before ``_pending_loc``.  The
+        # session at ``_pending_loc`` may still be updated (once per minute
+        # with minute emission), so it is only folded into the committed
+        # state once a later session is seen.
+        self._committed_state = _RunningRiskState()
+        self._pending_loc = None
+
+    def _risk_state(self, dt_loc, algorithm_returns, benchmark_returns):
+        """
+        Return a ``_RunningRiskState`` covering every session up to and
+        including ``dt_loc``, in constant time.
+        """
+        pending_loc = self._pending_loc
+        if pending_loc is None:
+            if dt_loc > 0:
+                # Sessions before the first update are NaN in the returns
+                # history, which only matters for the drawdown.
+                self._committed_state.push(np.nan, np.nan)
+        elif dt_loc != pending_loc:
+            self._committed_state.push(
+                self.algorithm_returns_cont[pending_loc],
+                self.benchmark_returns_cont[pending_loc],
+            )
+            if dt_loc > pending_loc + 1:
+                self._committed_state.push(np.nan, np.nan)
+        self._pending_loc = dt_loc
+
+        state = self._committed_state.copy()
+        if self.create_first_day_stats and dt_loc == 0:
+            # Mirror the zero return prepended to the first day's returns.
+            state.push(0.0, 0.0)
+        state.push(algorithm_returns, benchmark_returns)
+        return state
+
     def update(self, dt, algorithm_returns, benchmark_returns, leverage):
         # Keep track of latest dt for use in to_dict and other methods
         # that report current state.
@@ -158,9 +392,10 @@ class RiskMetricsCumulative(object):
             if len(self.algorithm_returns) == 1:
                 self.algorithm_returns = np.append(0.0, self.algorithm_returns)
 
-        self.algorithm_cumulative_returns[dt_loc] = cum_returns(
-            self.algorithm_returns
-        )[-1]
+        state = self._risk_state(dt_loc, algorithm_returns, benchmark_returns)
+
+        self.algorithm_cumulative_returns[dt_loc] = \
+            state.algorithm_cumulative_return
 
         algo_cumulative_returns_to_date = \
             self.algorithm_cumulative_returns[:dt_loc + 1]
@@ -189,9 +424,8 @@ class RiskMetricsCumulative(object):
             if len(self.benchmark_returns) == 1:
                 self.benchmark_returns = np.append(0.0, self.benchmark_returns)
 
-        self.benchmark_cumulative_returns[dt_loc] = cum_returns(
-            self.benchmark_returns
-        )[-1]
+        self.benchmark_cumulative_returns[dt_loc] = \
+            state.benchmark_cumulative_return
 
         benchmark_cumulative_returns_to_date = \
             self.benchmark_cumulative_returns[:dt_loc + 1]
@@ -231,11 +465,11 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             raise Exception(message)
 
         self.update_current_max()
-        self.benchmark_volatility[dt_loc] = annual_volatility(
-            self.benchmark_returns
+        self.benchmark_volatility[dt_loc] = state.benchmark_volatility(
+            len(self.benchmark_returns)
         )
-        self.algorithm_volatility[dt_loc] = annual_volatility(
-            self.algorithm_returns
+        self.algorithm_volatility[dt_loc] = state.algorithm_volatility(
+            len(self.algorithm_returns)
         )
 
         # caching the treasury rates for the minutely case is a
@@ -256,27 +490,16 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             self.algorithm_cumulative_returns[dt_loc] -
             self.treasury_period_return)
 
-        self.alpha[dt_loc], self.beta[dt_loc] = alpha_beta_aligned(
-            self.algorithm_returns,
-            self.benchmark_returns,
-        )
-        self.sharpe[dt_loc] = sharpe_ratio(
-            self.algorithm_returns,
-        )
-        self.downside_risk[dt_loc] = downside_risk(
-            self.algorithm_returns
-        )
-        self.sortino[dt_loc] = sortino_ratio(
-            self.algorithm_returns,
-            _downside_risk=self.downside_risk[dt_loc]
-        )
-        self.information[dt_loc] = information_ratio(
-            self.algorithm_returns,
-            self.benchmark_returns,
-        )
-        self.max_drawdown = max_drawdown(
-            self.algorithm_returns
+        num_returns = len(self.algorithm_returns)
+        self.alpha[dt_loc], self.beta[dt_loc] = state.alpha_beta(num_returns)
+        self.sharpe[dt_loc] = state.sharpe(num_returns)
+        self.downside_risk[dt_loc] = state.downside_risk(num_returns)
+        self.sortino[dt_loc] = state.sortino(
+            num_returns,
+            self.downside_risk[dt_loc],
         )
+        self.information[dt_loc] = state.information(num_returns)
+        self.max_drawdown = state.max_drawdown
         self.max_drawdowns[dt_loc] = self.max_drawdown
         self.max_leverage = self.calculate_max_leverage()
         self.max_leverages[dt_loc] = self.max_leverage
@@ -18,6 +18,16 @@ import abc
 import math
 from six import with_metaclass
 
+from numpy import (
+    array,
+    copysign,
+    float64,
+    isnan,
+    minimum,
+    nan,
+    where,
+    zeros,
+)
 from pandas import isnull
 
 from zipline.finance.transaction import create_transaction
@@ -119,6 +129,139 @@ class SlippageModel(with_metaclass(abc.ABCMeta)):
     def __call__(self, bar_data, asset, current_orders):
         return self.simulate(bar_data, asset, current_orders)
 
+    def process_orders(self, prices, volumes, volumes_for_bar, orders):
+        """Vectorized version of ``process_order``.
+
+        Models that implement this method are filled by ``simulate_all``
+        with array operations across assets. It is only used when it is
+        defined by the same class as ``process_order``, so subclasses that
+        override ``process_order`` are still filled one order at a time.
+
+        Parameters
+        ----------
+        prices : np.ndarray[float64]
+            The close price of each order's asset.
+        volumes : np.ndarray[float64]
+            The volume of each order's asset.
+        volumes_for_bar : np.ndarray[float64]
+            The number of shares of each order's asset already filled in this
+            bar.
+        orders : list[Order]
+            The orders to simulate, each for a different asset.
+
+        Returns
+        -------
+        execution_prices : np.ndarray[float64]
+            The price to execute each order at, or nan if the order should
+            not be filled in this bar.
+        execution_volumes : np.ndarray[float64]
+            The number of shares of each order that could be filled.
+        liquidity_exceeded : np.ndarray[bool]
+            Whether the asset of each order can't fill any more orders in this
+            bar. This is the vectorized version of raising
+            ``LiquidityExceeded``.
+        """
+        raise NotImplementedError('process_orders')
+
+    def _can_process_orders(self):
+        """Should ``simulate_all`` use ``process_orders``?
+        """
+        def defining_class(name):
+            for cls in type(self).__mro__:
+                if name in vars(cls):
+                    return cls
+
+        definer = defining_class('process_order')
+        return (
+            definer is not None and
+            definer is defining_class('process_orders') and
+            defining_class('simulate') is SlippageModel
+        )
+
+    def simulate_all(self, data, orders_by_asset):
+        """Simulate the open orders of many assets in the current bar.
+
+        Parameters
+        ----------
+        data : BarData
+            The data for the given bar.
+        orders_by_asset : list[(Asset, list[Order])]
+            The open orders of each asset.
+
+        Returns
+        -------
+        fills : iterable[(Order, Transaction)]
+            The orders that were filled, with their transactions, in the same
+            order as calling ``simulate`` for each asset in turn.
+        """
+        if not self._can_process_orders():
+            return (
+                fill
+                for asset, orders in orders_by_asset
+                for fill in self.simulate(data, asset, orders)
+            )
+        return self._simulate_all_vectorized(data, orders_by_asset)
+
+    def _simulate_all_vectorized(self, data, orders_by_asset):
+        if not orders_by_asset:
+            return []
+
+        assets = [asset for asset, _ in orders_by_asset]
+        order_lists = [list(orders) for _, orders in orders_by_asset]
+        current = data.current(assets, ['volume', 'close'])
+        volumes = current['volume'].values.astype(float64)
+        prices = current['close'].values.astype(float64)
+        dt = data.current_dt
+
+        # Assets with no volume or no price in this bar can't be filled.
+        active = (volumes != 0) & ~isnan(prices)
+        volumes_for_bar = zeros(len(assets), dtype=float64)
+
+        # Orders for the same asset compete for the bar's volume and must be
+        # processed in sequence, so the k-th order of every asset is processed
+        # at once.
+        fills = []
+        for k in range(max(map(len, order_lists))):
+            locs = []
+            orders = []
+            for loc, asset_orders in enumerate(order_lists):
+                if not active[loc] or len(asset_orders) <= k:
+                    continue
+                order = asset_orders[k]
+                if order.open_amount == 0:
+                    continue
+                order.check_triggers(prices[loc], dt)
+                if not order.triggered:
+                    continue
+                locs.append(loc)
+                orders.append(order)
+
+            if not orders:
+                continue
+
+            locs = array(locs)
+            execution_prices, execution_volumes, exceeded = \
+                self.process_orders(
+                    prices[locs],
+                    volumes[locs],
+                    volumes_for_bar[locs],
+                    orders,
+                )
+            active[locs[exceeded]] = False
+
+            for i in (~exceeded & ~isnan(execution_prices)).nonzero()[0]:
+                txn = create_transaction(
+                    orders[i],
+                    dt,
+                    execution_prices[i],
+                    execution_volumes[i],
+                )
+                volumes_for_bar[locs[i]] += abs(txn.amount)
+                fills.append((locs[i], k, orders[i], txn))
+
+        fills.sort(key=lambda fill: fill[:2])
+        return [(order, txn) for _, _, order, txn in fills]
+
 
 class VolumeShareSlippage(SlippageModel):
     """Model slippage as a function of the volume of shares traded.
@@ -200,6 +343,42 @@ class VolumeShareSlippage(SlippageModel):
             math.copysign(cur_volume, order.direction)
         )
 
+    def process_orders(self, prices, volumes, volumes_for_bar, orders):
+        directions = array([order.direction for order in orders])
+        open_amounts = array([order.open_amount for order in orders])
+        limits = array(
+            [order.limit or nan for order in orders],
+            dtype=float64,
+        )
+
+        max_volumes = self.volume_limit * volumes
+        remaining_volumes = max_volumes - volumes_for_bar
+        exceeded = ~(remaining_volumes >= 1)
+
+        cur_volumes = minimum(
+            where(exceeded, 0, remaining_volumes),
+            abs(open_amounts),
+        ).astype(int)
+
+        total_volumes = volumes_for_bar + cur_volumes
+        volume_shares = minimum(total_volumes / volumes, self.volume_limit)
+        impacted_prices = prices + volume_shares ** 2 \
+            * copysign(self.price_impact, directions) \
+            * prices
+
+        # Don't fill orders whose impacted price is worse than their limit.
+        worse_than_limit = (
+            ((directions > 0) & (impacted_prices > limits)) |
+            ((directions < 0) & (impacted_prices < limits))
+        )
+        impacted_prices[(cur_volumes < 1) | worse_than_limit] = nan
+
+        return (
+            impacted_prices,
+            copysign(cur_volumes, directions),
+            exceeded,
+        )
+
 
 class FixedSlippage(SlippageModel):
     """Model slippage as a fixed spread.
@@ -220,3 +399,11 @@ class FixedSlippage(SlippageModel):
             price + (self.spread / 2.0 * order.direction),
             order.amount
         )
+
+    def process_orders(self, prices, volumes, volumes_for_bar, orders):
+        directions = array([order.direction for order in orders])
+        return (
+            prices + (self.spread / 2.0 * directions),
+            array([order.amount for order in orders], dtype=float64),
+            zeros(len(orders), dtype=bool),
+        )
@@ -115,3 +115,77 @@ cdef class MinuteSimulationClock:
             yield minute, BAR
             if minute_emission:
                 yield minute, MINUTE_END
+
+
+cdef class FastForwardMinuteSimulationClock(MinuteSimulationClock):
+    """
+    A minute clock which skips the minutes in which nothing can happen.
+
+    Before each bar, ``next_busy_minute`` is called with the minute of the
+    bar, in nanoseconds, and returns the first minute at or after it which
+    needs a bar. The bars in between are skipped. Because the clock is a
+    generator, ``next_busy_minute`` sees the state left by the previous bar.
+
+    The before_trading_start bar and the last bar of each session are always
+    emitted. Minute emission is not supported, because every minute needs a
+    perf packet.
+    """
+    cdef object next_busy_minute
+
+    def __init__(self,
+                 sessions,
+                 market_opens,
+                 market_closes,
+                 before_trading_start_minutes,
+                 next_busy_minute):
+        MinuteSimulationClock.__init__(
+            self,
+            sessions,
+            market_opens,
+            market_closes,
+            before_trading_start_minutes,
+            minute_emission=False,
+        )
+        self.next_busy_minute = next_busy_minute
+
+    def __iter__(self):
+        next_busy_minute = self.next_busy_minute
+
+        for idx, session_nano in enumerate(self.sessions_nanos):
+            yield pd.Timestamp(session_nano, tz='UTC'), SESSION_START
+
+            bts_minute = pd.Timestamp(self.bts_nanos[idx], tz='UTC')
+            regular_minutes = self.minutes_by_session[session_nano]
+            minutes_nanos = regular_minutes.asi8
+            last_idx = len(regular_minutes) - 1
+
+            # If before_trading_start is after the last close this is past
+            # the last minute, so it is never emitted.
+            bts_idx = regular_minutes.searchsorted(bts_minute)
+
+            minute_idx = 0
+            while True:
+                if minute_idx == bts_idx:
+                    yield bts_minute, BEFORE_TRADING_START_BAR
+
+                if minute_idx < last_idx:
+                    busy_idx = min(
+                        minutes_nanos.searchsorted(
+                            next_busy_minute(minutes_nanos[minute_idx]),
+                        ),
+                        last_idx,
+                    )
+                    if minute_idx < bts_idx <= busy_idx:
+                        # Stop at before_trading_start, which may place
+                        # orders that need the bars after it.
+                        minute_idx = bts_idx
+                        continue
+                    minute_idx = busy_idx
+
+                yield regular_minutes[minute_idx], BAR
+
+                if minute_idx == last_idx:
+                    break
+                minute_idx += 1
+
+            yield regular_minutes[-1], SESSION_END
@@ -14,10 +14,14 @@
 # limitations under the License.
 from contextlib2 import ExitStack
 from logbook import Logger, Processor
+import numpy as np
+import pandas as pd
 from pandas.tslib import normalize_date
+from zipline.assets import Asset
+from zipline.finance.slippage import SlippageModel
 from zipline.protocol import BarData
 from zipline.utils.api_support import ZiplineAPI
-from six import viewkeys
+from six import iteritems, string_types, viewkeys
 
 from zipline.gens.sim_engine import (
     BAR,
@@ -38,7 +42,7 @@ class AlgorithmSimulator(object):
     }
 
     def __init__(self, algo, sim_params, data_portal, clock, benchmark_source,
-                 restrictions, universe_func):
+                 restrictions, universe_func, fill_frequency=None):
 
         # ==============
         # Simulation
@@ -62,6 +66,24 @@ class AlgorithmSimulator(object):
         # fetcher data, and some API methods like `data.can_trade`.
         self.current_data = self._create_bar_data(universe_func)
 
+        # In daily simulations, orders can be filled against the minute bars
+        # of the session instead of its daily bar.
+        self.minute_fills = (
+            fill_frequency == 'minute' and
+            self.sim_params.data_frequency == 'daily'
+        )
+        if self.minute_fills:
+            self.fill_data = MinuteFillBarData(
+                BarData(
+                    data_portal=self.data_portal,
+                    simulation_dt_func=self.get_fill_dt,
+                    data_frequency='minute',
+                    trading_calendar=self.algo.trading_calendar,
+                    restrictions=self.restrictions,
+                    universe_func=universe_func
+                ),
+            )
+
         # We don't have a datetime for the current snapshot until we
         # receive a message.
         self.simulation_dt = None
@@ -84,6 +106,9 @@ class AlgorithmSimulator(object):
     def get_simulation_dt(self):
         return self.simulation_dt
 
+    def get_fill_dt(self):
+        return self.fill_data.current_dt
+
     def _create_bar_data(self, universe_func):
         return BarData(
             data_portal=self.data_portal,
@@ -116,8 +141,12 @@ class AlgorithmSimulator(object):
 
             # handle any transactions and commissions coming out new orders
             # placed in the last bar
-            new_transactions, new_commissions, closed_orders = \
-                blotter.get_transactions(current_data)
+            if self.minute_fills:
+                new_transactions, new_commissions, closed_orders = \
+                    self._get_minute_fill_transactions(dt_to_use)
+            else:
+                new_transactions, new_commissions, closed_orders = \
+                    blotter.get_transactions(current_data)
 
             blotter.prune_orders(closed_orders)
 
@@ -245,6 +274,66 @@ class AlgorithmSimulator(object):
         risk_message = algo.perf_tracker.handle_simulation_end()
         yield risk_message
 
+    def _get_minute_fill_transactions(self, dt):
+        """
+        Fill the open orders against the minute bars of the session of ``dt``.
+
+        Only the minute bars of the assets with open orders are read, once
+        for the whole session. Orders are filled minute by minute, in the
+        same way as in a minute simulation.
+
+        Returns
+        -------
+        transactions, commissions, closed_orders : list
+            The results of ``Blotter.get_transactions`` for every minute of
+            the session.
+        """
+        algo = self.algo
+        blotter = algo.blotter
+
+        sids = [
+            sid for sid, orders in iteritems(blotter.open_orders) if orders
+        ]
+        if not sids:
+            return [], [], []
+
+        assets = algo.asset_finder.retrieve_all(sids)
+        session = algo.trading_calendar.minute_to_session_label(dt)
+        minutes, bars = self.data_portal.get_session_minute_bars(
+            assets,
+            MinuteFillBarData.FIELDS,
+            session,
+        )
+
+        slippage = blotter.slippage_func
+        if (isinstance(slippage, SlippageModel) and
+                type(slippage).simulate is SlippageModel.simulate):
+            # The model skips the assets with no volume, so only the minutes
+            # in which an asset with open orders traded can fill anything.
+            minute_locs = np.flatnonzero((bars['volume'] > 0).any(axis=1))
+        else:
+            minute_locs = range(len(minutes))
+
+        fill_data = self.fill_data
+        fill_data.load_session(assets, minutes, bars)
+
+        transactions = []
+        commissions = []
+        closed_orders = []
+        for minute_loc in minute_locs:
+            if not blotter.open_orders:
+                break
+            fill_data.set_minute(minute_loc)
+            minute_transactions, minute_commissions, minute_closed_orders = \
+                blotter.get_transactions(fill_data)
+            blotter.prune_orders(minute_closed_orders)
+
+            transactions.extend(minute_transactions)
+            commissions.extend(minute_commissions)
+            closed_orders.extend(minute_closed_orders)
+
+        return transactions, commissions, closed_orders
+
     def _cleanup_expired_assets(self, dt, position_assets):
         """
         Clear out any assets that have expired before starting a new sim day.
@@ -303,3 +392,97 @@ class AlgorithmSimulator(object):
 
         minute_message['minute_perf']['recorded_vars'] = rvars
         return minute_message
+
+
+class MinuteFillBarData(object):
+    """
+    The ``data`` used to fill orders against the minute bars of a session in
+    a daily simulation.
+
+    ``current`` reads the preloaded minute bars of the assets with open
+    orders. Everything else is delegated to a minute ``BarData`` whose
+    simulation dt is the minute being filled.
+
+    Parameters
+    ----------
+    bar_data : BarData
+        The minute data to delegate to.
+    """
+    FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, bar_data):
+        self._bar_data = bar_data
+        self._asset_locs = {}
+        self._minutes = pd.DatetimeIndex([], tz='UTC')
+        self._bars = {}
+        self._minute_loc = 0
+        self.current_dt = None
+
+    def load_session(self, assets, minutes, bars):
+        """Set the minute bars of the session being filled.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The assets of the columns of ``bars``.
+        minutes : pd.DatetimeIndex
+            The minutes of the rows of ``bars``.
+        bars : dict[str -> np.ndarray]
+            The minute bars of each field.
+        """
+        self._asset_locs = {asset: i for i, asset in enumerate(assets)}
+        self._minutes = minutes
+        self._bars = bars
+        self.set_minute(0)
+
+    def set_minute(self, minute_loc):
+        """Move to a minute of the session.
+        """
+        self._minute_loc = minute_loc
+        self.current_dt = self._minutes[minute_loc]
+
+    def _value(self, asset, field):
+        return self._bars[field][self._minute_loc, self._asset_locs[asset]]
+
+    def _is_loaded(self, assets, fields):
+        return (
+            all(field in self._bars for field in fields) and
+            all(asset in self._asset_locs for asset in assets)
+        )
+
+    def current(self, assets, fields):
+        multiple_assets = not isinstance(assets, Asset)
+        multiple_fields = not isinstance(fields, string_types)
+        asset_list = list(assets) if multiple_assets else [assets]
+        field_list = list(fields) if multiple_fields else [fields]
+
+        if not self._is_loaded(asset_list, field_list):
+            return self._bar_data.current(assets, fields)
+
+        if not multiple_assets:
+            if not multiple_fields:
+                return self._value(assets, fields)
+            return pd.Series(
+                data={field: self._value(assets, field) for field in fields},
+                index=field_list,
+                name=assets.symbol,
+            )
+
+        if not multiple_fields:
+            return pd.Series(
+                data=[self._value(asset, fields) for asset in asset_list],
+                index=asset_list,
+                name=fields,
+            )
+
+        return pd.DataFrame({
+            field: pd.Series(
+                data=[self._value(asset, field) for asset in asset_list],
+                index=asset_list,
+                name=field,
+            )
+            for field in field_list
+        })
+
+    def __getattr__(self, name):
+        return getattr(self._bar_data, name)
@@ -5,17 +5,27 @@ from abc import (
     ABCMeta,
     abstractmethod,
 )
+from collections import namedtuple
+from datetime import date, timedelta
+from hashlib import sha1
+from numbers import Number
+import sys
 from uuid import uuid4
 
 from six import (
+    binary_type,
     iteritems,
+    reraise,
+    string_types,
     with_metaclass,
 )
-from numpy import array
-from pandas import DataFrame, MultiIndex
-from toolz import groupby, juxt
+from six.moves.queue import Queue
+from numpy import array, dtype as np_dtype, generic as np_generic
+from pandas import DataFrame, MultiIndex, concat
+from toolz import concat as concat_iters, groupby, juxt, unique
 from toolz.curried.operator import getitem
 
+from zipline.assets import Asset
 from zipline.lib.adjusted_array import ensure_adjusted_array, ensure_ndarray
 from zipline.errors import NoFurtherDataError
 from zipline.utils.numpy_utils import (
@@ -24,8 +34,11 @@ from zipline.utils.numpy_utils import (
     repeat_last_axis,
 )
 from zipline.utils.pandas_utils import explode
+from zipline.utils.pool import SequentialPool, fork_pool
+from zipline.utils.sentinel import sentinel
 
-from .term import AssetExists, InputDates, LoadableTerm
+from .graph import ExecutionPlan
+from .term import AssetExists, InputDates, LoadableTerm, Term
 
 
 class PipelineEngine(with_metaclass(ABCMeta)):
@@ -62,6 +75,29 @@ class PipelineEngine(with_metaclass(ABCMeta)):
         """
         raise NotImplementedError("run_pipeline")
 
+    @abstractmethod
+    def run_pipelines(self, pipelines, start_date, end_date):
+        """
+        Compute values for several pipelines between `start_date` and
+        `end_date`.
+
+        Parameters
+        ----------
+        pipelines : dict[str -> zipline.pipeline.Pipeline]
+            The pipelines to run, by name.
+        start_date : pd.Timestamp
+            Start date of the computed matrices.
+        end_date : pd.Timestamp
+            End date of the computed matrices.
+
+        Returns
+        -------
+        results : dict[str -> pd.DataFrame]
+            A frame of computed results for each pipeline, in the format
+            returned by ``run_pipeline``.
+        """
+        raise NotImplementedError("run_pipelines")
+
 
 class NoEngineRegistered(Exception):
     """
@@ -80,6 +116,12 @@ class ExplodingPipelineEngine(PipelineEngine):
             "resources were registered."
         )
 
+    def run_pipelines(self, pipelines, start_date, end_date):
+        raise NoEngineRegistered(
+            "Attempted to run a pipeline but no pipeline "
+            "resources were registered."
+        )
+
 
 def default_populate_initial_workspace(initial_workspace,
                                        root_mask_term,
@@ -114,6 +156,177 @@ def default_populate_initial_workspace(initial_workspace,
     return initial_workspace
 
 
+class _UnhashableTerm(Exception):
+    pass
+
+
+# Types whose repr is exact and the same in every process.
+_repr_types = (
+    type(None),
+    bool,
+    Number,
+    string_types,
+    binary_type,
+    np_generic,
+    date,
+    timedelta,
+)
+
+
+def _stable_repr(obj, term_identities, term_reprs):
+    """
+    A representation of part of a term's identity which is the same in every
+    process.
+    """
+    if isinstance(obj, Term):
+        try:
+            return term_reprs[obj]
+        except KeyError:
+            pass
+        try:
+            identity = term_identities[id(obj)]
+        except KeyError:
+            raise _UnhashableTerm(obj)
+        term_reprs[obj] = out = sha1(
+            _stable_repr(identity, term_identities, term_reprs).encode('utf-8')
+        ).hexdigest()
+        return out
+    if isinstance(obj, (tuple, list)):
+        return '(%s)' % ', '.join(
+            _stable_repr(elem, term_identities, term_reprs) for elem in obj
+        )
+    if isinstance(obj, (frozenset, set)):
+        return '{%s}' % ', '.join(sorted(
+            _stable_repr(elem, term_identities, term_reprs) for elem in obj
+        ))
+    if isinstance(obj, np_dtype):
+        return 'dtype(%r)' % obj.str
+    if isinstance(obj, Asset):
+        return '%s(%d)' % (type(obj).__name__, obj.sid)
+    if isinstance(obj, type) or callable(obj):
+        name = getattr(obj, '__qualname__', getattr(obj, '__name__', None))
+        module = getattr(obj, '__module__', None)
+        if name is None or module is None:
+            raise _UnhashableTerm(obj)
+        return '%s.%s' % (module, name)
+    if isinstance(obj, _repr_types):
+        return repr(obj)
+    if sentinel._cache.get(getattr(obj, '__name__', None)) is obj:
+        return repr(obj)
+
+    # The repr of anything else may be truncated, like the repr of a large
+    # array, or hold the object's address, which changes between processes.
+    raise _UnhashableTerm(obj)
+
+
+def pipeline_graph_hash(pipelines):
+    """
+    Hash the terms of some pipelines.
+
+    The hash is built from the identity of each term, i.e. its type,
+    parameters and inputs, so equivalent pipelines built in different
+    processes have the same hash. Terms are identified by the module and name
+    of their class, so two different classes with the same name in the same
+    module, e.g. from a script that is run twice, can't be told apart.
+
+    Parameters
+    ----------
+    pipelines : dict[str -> zipline.pipeline.Pipeline]
+        The pipelines to hash, by name.
+
+    Returns
+    -------
+    hash : str or None
+        The hex digest of the graph, or None if a term's identity includes an
+        object without a stable repr.
+    """
+    term_identities = {
+        id(term): identity
+        for identity, term in list(Term._term_cache.items())
+    }
+    term_reprs = {}
+    parts = []
+    try:
+        for name in sorted(pipelines, key=repr):
+            pipeline = pipelines[name]
+            parts.append('%r: screen=%s' % (
+                name,
+                _stable_repr(pipeline.screen, term_identities, term_reprs),
+            ))
+            for column_name in sorted(pipeline.columns):
+                parts.append('%r.%r=%s' % (
+                    name,
+                    column_name,
+                    _stable_repr(
+                        pipeline.columns[column_name],
+                        term_identities,
+                        term_reprs,
+                    ),
+                ))
+    except _UnhashableTerm:
+        return None
+    return sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _concat_chunks(frames):
+    """
+    Concatenate the results of running a pipeline over consecutive date
+    ranges.
+
+    Categorical columns of each frame are given the union of the categories
+    of all the frames, so that they stay categorical once concatenated.
+    """
+    nonempty = [frame for frame in frames if len(frame)]
+    if not nonempty:
+        return frames[0]
+
+    categorical = [
+        name for name, dtype in iteritems(nonempty[0].dtypes)
+        if dtype.name == 'category'
+    ]
+    if categorical:
+        categories = {
+            name: list(unique(concat_iters(
+                frame[name].cat.categories for frame in nonempty
+            )))
+            for name in categorical
+        }
+        nonempty = [
+            frame.assign(**{
+                name: frame[name].cat.set_categories(categories[name])
+                for name in categorical
+            })
+            for frame in nonempty
+        ]
+
+    return concat(nonempty)
+
+
+_ChunkState = namedtuple('_ChunkState', 'engine pipeline')
+
+# The state of a running chunked pipeline. This is set before the workers are
+# forked so that they inherit the engine and its loaders instead of having
+# them pickled. The engine has no pool, as the threads of a parent's
+# ThreadPool don't exist in a forked worker.
+_chunk_state = None
+
+
+def _init_chunk_worker():
+    """Reopen the asset db connections inherited from the parent.
+
+    The pooled connections of a sqlalchemy engine may not be used on both
+    sides of a fork.
+    """
+    engine = getattr(_chunk_state.engine._finder, 'engine', None)
+    if engine is not None:
+        engine.dispose()
+
+
+def _run_chunk(start_date, end_date):
+    state = _chunk_state
+    return state.engine.run_pipeline(state.pipeline, start_date, end_date)
+
+
 class SimplePipelineEngine(object):
     """
     PipelineEngine class that computes each term independently.
@@ -134,10 +347,25 @@ class SimplePipelineEngine(object):
         computing a pipeline. See
         :func:`zipline.pipeline.engine.default_populate_initial_workspace`
         for more info.
+    pool : Pool, optional
+        A pool used to compute terms that don't depend on each other
+        concurrently, for example a :class:`multiprocessing.pool.ThreadPool`
+        with the desired number of workers. This object must support
+        ``apply_async`` with a ``callback``. The pipeline loaders must be
+        safe to use from the pool's workers. By default, terms are computed
+        one at a time in the calling thread.
+    result_cache : MutableMapping[str -> dict[str -> pd.DataFrame]], optional
+        A mapping to store the results of ``run_pipelines`` in, keyed by the
+        hash of the pipelines and the dates they were computed for, for
+        example a :class:`zipline.utils.cache.dataframe_cache`. The keys don't
+        include the data that was read, so a cache may only be shared between
+        engines that read the same data. Pipelines whose hash can't be
+        computed aren't cached. By default results aren't cached.
 
     See Also
     --------
     :func:`zipline.pipeline.engine.default_populate_initial_workspace`
+    :class:`zipline.utils.pool.SequentialPool`
     """
     __slots__ = (
         '_get_loader',
@@ -146,6 +374,8 @@ class SimplePipelineEngine(object):
         '_root_mask_term',
         '_root_mask_dates_term',
         '_populate_initial_workspace',
+        '_pool',
+        '_result_cache',
         '__weakref__',
     )
 
@@ -153,7 +383,9 @@ class SimplePipelineEngine(object):
                  get_loader,
                  calendar,
                  asset_finder,
-                 populate_initial_workspace=None):
+                 populate_initial_workspace=None,
+                 pool=None,
+                 result_cache=None):
         self._get_loader = get_loader
         self._calendar = calendar
         self._finder = asset_finder
@@ -164,6 +396,8 @@ class SimplePipelineEngine(object):
         self._populate_initial_workspace = (
             populate_initial_workspace or default_populate_initial_workspace
         )
+        self._pool = pool
+        self._result_cache = result_cache
 
     def run_pipeline(self, pipeline, start_date, end_date):
         """
@@ -208,6 +442,65 @@ class SimplePipelineEngine(object):
         Step 2 is performed in ``SimplePipelineEngine.compute_chunk``.
         Steps 3, 4, and 5 are performed in ``SimplePiplineEngine._to_narrow``.
 
+        See Also
+        --------
+        PipelineEngine.run_pipeline
+        """
+        return self.run_pipelines(
+            {None: pipeline},
+            start_date,
+            end_date,
+        )[None]
+
+    def run_chunked_pipeline(self,
+                             pipeline,
+                             start_date,
+                             end_date,
+                             chunksize,
+                             pool=None,
+                             processes=None):
+        """
+        Compute a pipeline in chunks of at most `chunksize` sessions.
+
+        Each chunk is computed with ``run_pipeline``, which loads the lookback
+        window needed by every term before the start of the chunk, so the
+        result is the same as computing the whole range at once. Only one
+        chunk's workspace needs to be in memory per worker.
+
+        Parameters
+        ----------
+        pipeline : zipline.pipeline.Pipeline
+            The pipeline to run.
+        start_date : pd.Timestamp
+            Start date of the computed matrix.
+        end_date : pd.Timestamp
+            End date of the computed matrix.
+        chunksize : int
+            The maximum number of sessions to compute in each chunk.
+        pool : Pool, optional
+            The pool to compute the chunks with, for example a
+            :class:`multiprocessing.pool.ThreadPool`. This object must support
+            ``apply_async``. This may not be passed with ``processes``, and
+            may not be the engine's own pool. By default, chunks are computed
+            one after another in the calling thread.
+        processes : int, optional
+            The number of worker processes to compute the chunks with. The
+            workers are forked, so they inherit this engine's loaders and
+            ``pipeline`` instead of having them pickled. The workers compute
+            their terms one at a time, without the engine's pool. Each worker
+            reopens the connections of the asset finder; any other database
+            connection used by the loaders must not be used on both sides of
+            the fork. For example, the adjustment reader of a
+            ``USEquityPricingLoader`` only uses its connection until its
+            ``index`` has been loaded, which can be done before calling this.
+
+        Returns
+        -------
+        result : pd.DataFrame
+            The concatenated results of each chunk, in the format returned by
+            ``run_pipeline``. The categories of a categorical column are the
+            union of the categories seen in each chunk.
+
         See Also
         --------
         PipelineEngine.run_pipeline
@@ -217,15 +510,136 @@ class SimplePipelineEngine(object):
                 "start_date must be before or equal to end_date \n"
                 "start_date=%s, end_date=%s" % (start_date, end_date)
             )
+        if chunksize < 1:
+            raise ValueError("chunksize must be positive, got %s" % chunksize)
+        if pool is not None and processes is not None:
+            raise ValueError("pool and processes are mutually exclusive")
+        if pool is not None and pool is self._pool:
+            # Each chunk would wait on terms submitted to the pool its own
+            # worker is blocking.
+            raise ValueError(
+                "the chunks can't be computed with the engine's own pool",
+            )
 
-        screen_name = uuid4().hex
-        graph = pipeline.to_execution_plan(
-            screen_name,
-            self._root_mask_term,
-            self._calendar,
-            start_date,
-            end_date,
+        start_idx, end_idx = self._calendar.slice_locs(start_date, end_date)
+        sessions = self._calendar[start_idx:end_idx]
+        if not len(sessions):
+            raise ValueError(
+                "no sessions between start_date and end_date \n"
+                "start_date=%s, end_date=%s" % (start_date, end_date)
+            )
+        chunks = [
+            (chunk[0], chunk[-1])
+            for chunk in (
+                sessions[i:i + chunksize]
+                for i in range(0, len(sessions), chunksize)
+            )
+        ]
+
+        if processes is None:
+            if pool is None:
+                pool = SequentialPool()
+            results = [
+                pool.apply_async(self.run_pipeline, (pipeline,) + chunk)
+                for chunk in chunks
+            ]
+            return _concat_chunks([result.get() for result in results])
+
+        global _chunk_state
+        _chunk_state = _ChunkState(
+            SimplePipelineEngine(
+                self._get_loader,
+                self._calendar,
+                self._finder,
+                self._populate_initial_workspace,
+                result_cache=self._result_cache,
+            ),
+            pipeline,
         )
+        try:
+            pool = fork_pool(processes, _init_chunk_worker)
+            try:
+                results = [
+                    pool.apply_async(_run_chunk, chunk) for chunk in chunks
+                ]
+                return _concat_chunks([result.get() for result in results])
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            _chunk_state = None
+
+    def run_pipelines(self, pipelines, start_date, end_date):
+        """
+        Compute several pipelines at once.
+
+        The terms of all the pipelines are compiled into a single execution
+        plan, so any term shared between pipelines (for example a dataset
+        column or a common factor) is loaded and computed once.
+
+        Parameters
+        ----------
+        pipelines : dict[str -> zipline.pipeline.Pipeline]
+            The pipelines to run, by name.
+        start_date : pd.Timestamp
+            Start date of the computed matrices.
+        end_date : pd.Timestamp
+            End date of the computed matrices.
+
+        Returns
+        -------
+        results : dict[str -> pd.DataFrame]
+            The result of ``run_pipeline`` for each pipeline in
+            ``pipelines``.
+
+        See Also
+        --------
+        PipelineEngine.run_pipelines
+        """
+        if end_date < start_date:
+            raise ValueError(
+                "start_date must be before or equal to end_date \n"
+                "start_date=%s, end_date=%s" % (start_date, end_date)
+            )
+
+        cache_key = self._result_cache_key(pipelines, start_date, end_date)
+        if cache_key is not None:
+            try:
+                return self._result_cache[cache_key]
+            except KeyError:
+                pass
+
+        results = self._run_pipelines(pipelines, start_date, end_date)
+        if cache_key is not None:
+            self._result_cache[cache_key] = results
+        return results
+
+    def _result_cache_key(self, pipelines, start_date, end_date):
+        if self._result_cache is None:
+            return None
+
+        graph_hash = pipeline_graph_hash(pipelines)
+        if graph_hash is None:
+            return None
+        return sha1(
+            ('%s %s %s' % (graph_hash, start_date, end_date)).encode('utf-8'),
+        ).hexdigest()
+
+    def _run_pipelines(self, pipelines, start_date, end_date):
+        # Key every output by (pipeline name, column name) so that columns
+        # with the same name in different pipelines don't collide.
+        terms = {}
+        screen_names = {}
+        for name, pipeline in iteritems(pipelines):
+            screen_names[name] = screen_name = uuid4().hex
+            screen = pipeline.screen
+            if screen is None:
+                screen = self._root_mask_term
+            terms[name, screen_name] = screen
+            for column_name, term in iteritems(pipeline.columns):
+                terms[name, column_name] = term
+
+        graph = ExecutionPlan(terms, self._calendar, start_date, end_date)
         extra_rows = graph.extra_rows[self._root_mask_term]
         root_mask = self._compute_root_mask(start_date, end_date, extra_rows)
         dates, assets, root_mask_values = explode(root_mask)
@@ -248,13 +662,20 @@ class SimplePipelineEngine(object):
             initial_workspace,
         )
 
-        return self._to_narrow(
-            graph.outputs,
-            results,
-            results.pop(screen_name),
-            dates[extra_rows:],
-            assets,
-        )
+        out = {}
+        for name, pipeline in iteritems(pipelines):
+            columns = pipeline.columns
+            out[name] = self._to_narrow(
+                columns,
+                {
+                    column_name: results.pop((name, column_name))
+                    for column_name in columns
+                },
+                results.pop((name, screen_names[name])),
+                dates[extra_rows:],
+                assets,
+            )
+        return out
 
     def _compute_root_mask(self, start_date, end_date, extra_rows):
         """
@@ -389,50 +810,42 @@ class SimplePipelineEngine(object):
         loader_groups = groupby(loader_group_key, graph.loadable_terms)
 
         refcounts = graph.initial_refcounts(workspace)
+        execution_order = graph.execution_order(refcounts)
 
-        for term in graph.execution_order(refcounts):
-            # `term` may have been supplied in `initial_workspace`, and in the
-            # future we may pre-compute loadable terms coming from the same
-            # dataset.  In either case, we will already have an entry for this
-            # term, which we shouldn't re-compute.
-            if term in workspace:
-                continue
-
-            # Asset labels are always the same, but date labels vary by how
-            # many extra rows are needed.
-            mask, mask_dates = graph.mask_and_dates_for_term(
-                term,
-                self._root_mask_term,
-                workspace,
+        if self._pool is not None:
+            self._compute_in_pool(
+                graph,
+                execution_order,
+                refcounts,
                 dates,
+                assets,
+                workspace,
+                lambda term: loader_groups[loader_group_key(term)],
             )
-
-            if isinstance(term, LoadableTerm):
-                to_load = sorted(
-                    loader_groups[loader_group_key(term)],
-                    key=lambda t: t.dataset
-                )
-                loader = get_loader(term)
-                loaded = loader.load_adjusted_array(
-                    to_load, mask_dates, assets, mask,
-                )
-                workspace.update(loaded)
-            else:
-                workspace[term] = term._compute(
-                    self._inputs_for_term(term, workspace, graph),
-                    mask_dates,
+        else:
+            for term in execution_order:
+                # `term` may have been supplied in `initial_workspace`, and in
+                # the future we may pre-compute loadable terms coming from the
+                # same dataset.  In either case, we will already have an entry
+                # for this term, which we shouldn't re-compute.
+                if term in workspace:
+                    continue
+
+                workspace.update(self._compute_term(
+                    graph,
+                    term,
+                    dates,
                     assets,
-                    mask,
-                )
-                if term.ndim == 2:
-                    assert workspace[term].shape == mask.shape
-                else:
-                    assert workspace[term].shape == (mask.shape[0], 1)
+                    workspace,
+                    loader_groups[loader_group_key(term)],
+                ))
 
-                # Decref dependencies of ``term``, and clear any terms whose
-                # refcounts hit 0.
-                for garbage_term in graph.decref_dependencies(term, refcounts):
-                    del workspace[garbage_term]
+                if not isinstance(term, LoadableTerm):
+                    # Decref dependencies of ``term``, and clear any terms
+                    # whose refcounts hit 0.
+                    for garbage_term in graph.decref_dependencies(
+                            term, refcounts):
+                        del workspace[garbage_term]
 
         out = {}
         graph_extra_rows = graph.extra_rows
@@ -441,6 +854,128 @@ class SimplePipelineEngine(object):
             out[name] = workspace[term][graph_extra_rows[term]:]
         return out
 
+    def _compute_term(self,
+                      graph,
+                      term,
+                      dates,
+                      assets,
+                      workspace,
+                      loader_group):
+        """
+        Compute ``term`` from the entries already in ``workspace``.
+
+        Returns
+        -------
+        new_entries : dict[Term -> array-like]
+            The computed workspace entries. Loading a term loads every term in
+            ``loader_group``, so there is one entry per term in the group.
+        """
+        # Asset labels are always the same, but date labels vary by how
+        # many extra rows are needed.
+        mask, mask_dates = graph.mask_and_dates_for_term(
+            term,
+            self._root_mask_term,
+            workspace,
+            dates,
+        )
+
+        if isinstance(term, LoadableTerm):
+            to_load = sorted(loader_group, key=lambda t: t.dataset)
+            loader = self.get_loader(term)
+            return loader.load_adjusted_array(
+                to_load, mask_dates, assets, mask,
+            )
+
+        result = term._compute(
+            self._inputs_for_term(term, workspace, graph),
+            mask_dates,
+            assets,
+            mask,
+        )
+        if term.ndim == 2:
+            assert result.shape == mask.shape
+        else:
+            assert result.shape == (mask.shape[0], 1)
+        return {term: result}
+
+    def _compute_in_pool(self,
+                         graph,
+                         execution_order,
+                         refcounts,
+                         dates,
+                         assets,
+                         workspace,
+                         get_loader_group):
+        """
+        Compute the terms in ``execution_order`` with ``self._pool``, updating
+        ``workspace`` in place.
+
+        Every term whose dependencies are all in the workspace is submitted
+        to the pool. The workspace and the refcounts are only modified in the
+        calling thread, as results arrive, so garbage collection of entries
+        happens exactly as in the serial case: an entry is only removed once
+        every term depending on it has finished. This also makes it safe for
+        workers to read their inputs out of the workspace.
+        """
+        # Skip terms that were supplied in the initial workspace.
+        pending = [term for term in execution_order if term not in workspace]
+        started = set()
+        finished = Queue()
+        running = 0
+
+        def compute(term, loader_group):
+            try:
+                result = self._compute_term(
+                    graph,
+                    term,
+                    dates,
+                    assets,
+                    workspace,
+                    loader_group,
+                )
+            except Exception:
+                return term, None, sys.exc_info()
+            return term, result, None
+
+        while True:
+            for term in pending:
+                if term in started or term in workspace:
+                    continue
+                # Edges are tuple of (from, to).
+                if any(dependency not in workspace
+                       for dependency, _ in graph.graph.in_edges([term])):
+                    continue
+
+                if isinstance(term, LoadableTerm):
+                    loader_group = get_loader_group(term)
+                    # The rest of the group is loaded along with ``term``.
+                    started.update(loader_group)
+                else:
+                    loader_group = None
+                    started.add(term)
+
+                self._pool.apply_async(
+                    compute,
+                    (term, loader_group),
+                    callback=finished.put,
+                )
+                running += 1
+
+            if not running:
+                break
+
+            term, result, exc_info = finished.get()
+            running -= 1
+            if exc_info is not None:
+                reraise(*exc_info)
+
+            workspace.update(result)
+            if not isinstance(term, LoadableTerm):
+                # Decref dependencies of ``term``, and clear any terms whose
+                # refcounts hit 0.
+                for garbage_term in graph.decref_dependencies(term, refcounts):
+                    del workspace[garbage_term]
+
     def _to_narrow(self, terms, data, mask, dates, assets):
         """
         Convert raw computed pipeline results into a DataFrame for public APIs.
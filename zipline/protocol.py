@@ -107,7 +107,7 @@ def _deprecated_getitem_method(name, attrs):
         """
         warn(msg.format(name=name, attr=key), DeprecationWarning, stacklevel=2)
         if key in attrs:
-            return self.__dict__[key]
+            return getattr(self, key)
         raise KeyError(key)
 
     return __getitem__
@@ -148,7 +148,35 @@ class Portfolio(object):
         self.positions_value = 0.0
 
     def __repr__(self):
-        return "Portfolio({0})".format(self.__dict__)
+        fields = {
+            k: v for k, v in self.__dict__.items() if not k.startswith('_')
+        }
+        fields['positions'] = self.positions
+        return "Portfolio({0})".format(fields)
+
+    @property
+    def positions(self):
+        load_positions = self._load_positions
+        if load_positions is not None:
+            self._load_positions = None
+            self._positions = load_positions()
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions):
+        self._load_positions = None
+        self._positions = positions
+
+    def defer_positions(self, load_positions):
+        """Compute ``positions`` the next time it is accessed.
+
+        Parameters
+        ----------
+        load_positions : callable[() -> Positions]
+            A function returning the positions. It is only called if the
+            positions are read before they are deferred or set again.
+        """
+        self._load_positions = load_positions
 
     # If you are adding new attributes, don't update this set. This method
     # is deprecated to normal attribute access so we don't want to encourage
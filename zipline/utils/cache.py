@@ -317,8 +317,12 @@ class working_dir(object):
     ----------
     final_path : str
         The location to move the file when committing.
+    link : bool, optional
+        Hard-link the files into ``final_path`` instead of copying them. The
+        temporary directory must be on the same filesystem as ``final_path``,
+        for example by passing ``dir``.
     *args, **kwargs
-        Forwarded to tmp_dir.
+        Forwarded to :func:`tempfile.mkdtemp`.
 
     Notes
     -----
@@ -327,7 +331,8 @@ class working_dir(object):
     meaning it has as strong of guarantees as :func:`dir_util.copy_tree`.
     """
     def __init__(self, final_path, *args, **kwargs):
-        self.path = mkdtemp()
+        self._link = kwargs.pop('link', False)
+        self.path = mkdtemp(*args, **kwargs)
         self._final_path = final_path
 
     def ensure_dir(self, *path_parts):
@@ -355,7 +360,11 @@ class working_dir(object):
     def _commit(self):
         """Sync the temporary directory to the final path.
         """
-        dir_util.copy_tree(self.path, self._final_path)
+        dir_util.copy_tree(
+            self.path,
+            self._final_path,
+            link='hard' if self._link else None,
+        )
 
     def __enter__(self):
         return self
@@ -195,16 +195,87 @@ class EventManager(object):
             if create_context is not None else
             lambda *_: nop_context
         )
+        self._schedule = None
+        self._trigger_minutes = {}
 
     def add_event(self, event, prepend=False):
         """
         Adds an event to the manager.
         """
+        if self._schedule is not None:
+            event.rule.compile(*self._schedule)
+        self._trigger_minutes.clear()
+
         if prepend:
             self._events.insert(0, event)
         else:
             self._events.append(event)
 
+    def compile(self, sessions, calendar):
+        """
+        Precompute when the rules of the events trigger in ``sessions``.
+
+        Events added after this is called are compiled when they are added.
+
+        Parameters
+        ----------
+        sessions : pd.DatetimeIndex
+            The sessions of the simulation.
+        calendar : TradingCalendar
+            The calendar of the simulation.
+        """
+        schedule = calendar.schedule.loc[sessions]
+        self._schedule = (
+            sessions,
+            schedule.market_open.values.astype(np.int64),
+            schedule.market_close.values.astype(np.int64),
+            calendar,
+        )
+        for event in self._events:
+            event.rule.compile(*self._schedule)
+        self._trigger_minutes.clear()
+
+    def trigger_minutes(self, ignore=()):
+        """
+        The minutes at which the events may trigger in the compiled sessions.
+
+        Parameters
+        ----------
+        ignore : iterable[Event], optional
+            Events to leave out.
+
+        Returns
+        -------
+        minutes : np.ndarray[int64] or None
+            The sorted minutes, in nanoseconds, or None if any event may
+            trigger at minutes which aren't known ahead of time.
+        """
+        ignore = tuple(ignore)
+        key = tuple(map(id, ignore))
+        try:
+            return self._trigger_minutes[key]
+        except KeyError:
+            pass
+
+        event_minutes = []
+        for event in self._events:
+            if any(event is ignored for ignored in ignore):
+                continue
+            minutes = event.rule.compiled_trigger_minutes()
+            if minutes is None:
+                event_minutes = None
+                break
+            event_minutes.append(minutes)
+
+        if event_minutes is not None:
+            event_minutes = np.unique(
+                np.concatenate(event_minutes)
+                if event_minutes else
+                np.array([], dtype=np.int64)
+            )
+        self._trigger_minutes[key] = event_minutes
+        return event_minutes
+
     def handle_data(self, context, data, dt):
         with self._create_context(data):
             for event in self._events:
@@ -242,6 +313,41 @@ class EventRule(six.with_metaclass(ABCMeta)):
         """
         raise NotImplementedError('should_trigger')
 
+    def compile(self, sessions, opens, closes, calendar):
+        """
+        Precompute when this rule triggers in ``sessions``, if possible.
+
+        Parameters
+        ----------
+        sessions : pd.DatetimeIndex
+            The sessions of the simulation.
+        opens : np.ndarray[int64]
+            The open of each session, in nanoseconds.
+        closes : np.ndarray[int64]
+            The close of each session, in nanoseconds.
+        calendar : TradingCalendar
+            The calendar of the simulation.
+
+        Returns
+        -------
+        compiled : bool
+            Whether the rule was compiled.
+        """
+        return False
+
+    def compiled_trigger_minutes(self):
+        """
+        The minutes at which this rule may trigger in the sessions it was
+        compiled for.
+
+        Returns
+        -------
+        minutes : np.ndarray[int64] or None
+            The sorted minutes, in nanoseconds, or None if the rule wasn't
+            compiled or may trigger at any minute.
+        """
+        return None
+
 
 class StatelessRule(EventRule):
     """
@@ -258,6 +364,149 @@ class StatelessRule(EventRule):
         return ComposedRule(self, rule, ComposedRule.lazy_and)
     __and__ = and_
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        """
+        Compute when this rule triggers in ``sessions``.
+
+        Parameters
+        ----------
+        sessions : pd.DatetimeIndex
+            The sessions to compute the schedule for.
+        opens : np.ndarray[int64]
+            The open of each session, in nanoseconds.
+        closes : np.ndarray[int64]
+            The close of each session, in nanoseconds.
+        calendar : TradingCalendar
+            The calendar of ``sessions``.
+
+        Returns
+        -------
+        schedule : (np.ndarray[bool], np.ndarray[int64] or None) or None
+            Whether the rule triggers on each session, and the minutes at
+            which it triggers, in nanoseconds. A minute schedule of None
+            means that the rule triggers on every minute of the sessions it
+            triggers on. None is returned if the schedule can't be computed,
+            e.g. because the rule uses a different calendar.
+        """
+        return None
+
+    def compile(self, sessions, opens, closes, calendar):
+        # Drop any previously compiled should_trigger.
+        vars(self).pop('should_trigger', None)
+
+        trigger_schedule = self.trigger_schedule(
+            sessions,
+            opens,
+            closes,
+            calendar,
+        )
+        if trigger_schedule is None:
+            return False
+
+        self.should_trigger = _CompiledShouldTrigger(
+            self.should_trigger,
+            opens,
+            closes,
+            *trigger_schedule
+        )
+        return True
+
+    def compiled_trigger_minutes(self):
+        compiled = vars(self).get('should_trigger')
+        if not isinstance(compiled, _CompiledShouldTrigger):
+            return None
+        return compiled.trigger_minutes
+
+
+def _and_schedules(first, second):
+    if first is None or second is None:
+        return None
+
+    first_sessions, first_minutes = first
+    second_sessions, second_minutes = second
+    if first_minutes is None:
+        minutes = second_minutes
+    elif second_minutes is None:
+        minutes = first_minutes
+    else:
+        minutes = np.intersect1d(first_minutes, second_minutes)
+    return first_sessions & second_sessions, minutes
+
+
+def _minutes_in_sessions(minutes, opens, closes):
+    # Rules only trigger in the session that they were computed for, so drop
+    # minutes which fall outside of their session.
+    return minutes[(opens <= minutes) & (minutes <= closes)]
+
+
+class _CompiledShouldTrigger(object):
+    """
+    A ``should_trigger`` which looks up a precomputed trigger schedule.
+
+    The clock only ever moves forward, so the bounds of the current session
+    are cached and only recomputed when ``dt`` moves past them. Minutes in
+    sessions where the rule doesn't trigger are rejected without any lookups,
+    and other minutes are looked up in a set of the trigger minutes.
+    Datetimes which aren't market minutes of the compiled sessions fall back
+    to the rule's original ``should_trigger``.
+    """
+    def __init__(self,
+                 should_trigger,
+                 opens,
+                 closes,
+                 trigger_sessions,
+                 trigger_minutes):
+        self._should_trigger = should_trigger
+        self._opens = opens
+        self._closes = closes
+        self._trigger_sessions = trigger_sessions
+        self._trigger_minutes = (
+            None
+            if trigger_minutes is None else
+            frozenset(trigger_minutes.tolist())
+        )
+
+        if trigger_minutes is None:
+            # The rule triggers on every minute of its sessions.
+            self.trigger_minutes = (
+                None
+                if trigger_sessions.any() else
+                np.array([], dtype=np.int64)
+            )
+        else:
+            minutes = np.unique(trigger_minutes)
+            self.trigger_minutes = minutes[
+                trigger_sessions[closes.searchsorted(minutes)]
+            ]
+
+        # Start with an empty session so that the first call looks up its
+        # session.
+        self._session_open = 1
+        self._session_close = 0
+        self._triggers_in_session = False
+
+    def _find_session(self, value):
+        idx = self._closes.searchsorted(value)
+        if idx == len(self._closes) or value < self._opens[idx]:
+            return False
+
+        self._session_open = self._opens[idx]
+        self._session_close = self._closes[idx]
+        self._triggers_in_session = self._trigger_sessions[idx]
+        return True
+
+    def __call__(self, dt):
+        value = dt.value
+        if not (self._session_open <= value <= self._session_close or
+                self._find_session(value)):
+            return self._should_trigger(dt)
+
+        if not self._triggers_in_session:
+            return False
+
+        trigger_minutes = self._trigger_minutes
+        return trigger_minutes is None or value in trigger_minutes
+
 
 class ComposedRule(StatelessRule):
     """
@@ -291,6 +540,24 @@ class ComposedRule(StatelessRule):
             dt
         )
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if self.composer is not ComposedRule.lazy_and:
+            return None
+        return _and_schedules(
+            self.first.trigger_schedule(sessions, opens, closes, calendar),
+            self.second.trigger_schedule(sessions, opens, closes, calendar),
+        )
+
+    def compile(self, sessions, opens, closes, calendar):
+        if super(ComposedRule, self).compile(sessions, opens, closes,
+                                             calendar):
+            return True
+
+        # Compile whichever of the rules we are composing can be compiled.
+        self.first.compile(sessions, opens, closes, calendar)
+        self.second.compile(sessions, opens, closes, calendar)
+        return False
+
     @staticmethod
     def lazy_and(first_should_trigger, second_should_trigger, dt):
         """
@@ -312,6 +579,13 @@ class Always(StatelessRule):
         return True
     should_trigger = always_trigger
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        return np.ones(len(sessions), dtype=bool), None
+
+    def compile(self, sessions, opens, closes, calendar):
+        # This is already as cheap as it gets.
+        return False
+
 
 class Never(StatelessRule):
     """
@@ -325,6 +599,13 @@ class Never(StatelessRule):
         return False
     should_trigger = never_trigger
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        return np.zeros(len(sessions), dtype=bool), None
+
+    def compile(self, sessions, opens, closes, calendar):
+        # This is already as cheap as it gets.
+        return False
+
 
 class AfterOpen(StatelessRule):
     """
@@ -373,6 +654,16 @@ class AfterOpen(StatelessRule):
 
         return dt == self._period_end
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if getattr(self, 'cal', None) is not calendar:
+            return None
+
+        minutes = opens + (pd.Timedelta(self.offset - self._one_minute).value)
+        return (
+            np.ones(len(sessions), dtype=bool),
+            _minutes_in_sessions(minutes, opens, closes),
+        )
+
 
 class BeforeClose(StatelessRule):
     """
@@ -420,6 +711,16 @@ class BeforeClose(StatelessRule):
 
         return self._period_start == dt
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if getattr(self, 'cal', None) is not calendar:
+            return None
+
+        minutes = closes - pd.Timedelta(self.offset).value
+        return (
+            np.ones(len(sessions), dtype=bool),
+            _minutes_in_sessions(minutes, opens, closes),
+        )
+
 
 class NotHalfDay(StatelessRule):
     """
@@ -429,6 +730,11 @@ class NotHalfDay(StatelessRule):
         return self.cal.minute_to_session_label(dt) \
             not in self.cal.early_closes
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if getattr(self, 'cal', None) is not calendar:
+            return None
+        return ~sessions.isin(self.cal.early_closes), None
+
 
 class TradingDayOfWeekRule(six.with_metaclass(ABCMeta, StatelessRule)):
     @preprocess(n=lossless_float_to_int('TradingDayOfWeekRule'))
@@ -443,6 +749,14 @@ class TradingDayOfWeekRule(six.with_metaclass(ABCMeta, StatelessRule)):
         val = self.cal.minute_to_session_label(dt, direction="none").value
         return val in self.execution_period_values
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if getattr(self, 'cal', None) is not calendar:
+            return None
+        return (
+            np.in1d(sessions.asi8, list(self.execution_period_values)),
+            None,
+        )
+
     @lazyval
     def execution_period_values(self):
         # calculate the list of periods that match the given criteria
@@ -488,6 +802,14 @@ class TradingDayOfMonthRule(six.with_metaclass(ABCMeta, StatelessRule)):
         value = self.cal.minute_to_session_label(dt, direction="none").value
         return value in self.execution_period_values
 
+    def trigger_schedule(self, sessions, opens, closes, calendar):
+        if getattr(self, 'cal', None) is not calendar:
+            return None
+        return (
+            np.in1d(sessions.asi8, list(self.execution_period_values)),
+            None,
+        )
+
     @lazyval
     def execution_period_values(self):
         # calculate the list of periods that match the given criteria
@@ -530,6 +852,9 @@ class StatefulRule(EventRule):
     def __init__(self, rule=None):
         self.rule = rule or Always()
 
+    def compile(self, sessions, opens, closes, calendar):
+        return self.rule.compile(sessions, opens, closes, calendar)
+
     def new_should_trigger(self, callable_):
         """
         Replace the should trigger implementation for the current rule.
@@ -560,6 +885,10 @@ class OncePerDay(StatefulRule):
             self.triggered = True
             return True
 
+    def compiled_trigger_minutes(self):
+        # This only ever triggers when the inner rule does.
+        return self.rule.compiled_trigger_minutes()
+
 
 # Factory API
 
@@ -1,3 +1,5 @@
+import multiprocessing
+
 from six.moves import map as imap
 from toolz import compose, identity
 
@@ -134,3 +136,32 @@ class SequentialPool(object):
             f(*args, **kwargs)
         """
         return f(*args, **kwargs or {})
+
+
+def fork_pool(processes=None, initializer=None, initargs=()):
+    """Create a :class:`multiprocessing.Pool` whose workers are forked.
+
+    Forked workers inherit the state of the calling process, like open data
+    readers, instead of having it pickled and sent to them.
+
+    Parameters
+    ----------
+    processes : int, optional
+        The number of worker processes. By default this is the number of
+        cpus.
+    initializer : callable, optional
+        Called in each worker when it starts.
+    initargs : tuple, optional
+        The arguments to ``initializer``.
+
+    Returns
+    -------
+    pool : multiprocessing.Pool
+        The pool.
+    """
+    try:
+        get_context = multiprocessing.get_context
+    except AttributeError:
+        # python 2 always forks on posix
+        return multiprocessing.Pool(processes, initializer, initargs)
+    return get_context('fork').Pool(processes, initializer, initargs)
@@ -1,10 +1,15 @@
+from collections import namedtuple
+from itertools import product
+import multiprocessing
 import os
 import re
 from runpy import run_path
+import sqlite3
 import sys
 import warnings
 
 import click
+from contextlib2 import ExitStack
 try:
     from pygments import highlight
     from pygments.lexers import PythonLexer
@@ -12,6 +17,7 @@ try:
     PYGMENTS = True
 except:
     PYGMENTS = False
+import pandas as pd
 from toolz import valfilter, concatv
 
 from zipline.algorithm import TradingAlgorithm
@@ -20,9 +26,11 @@ from zipline.data.data_portal import DataPortal
 from zipline.finance.trading import TradingEnvironment
 from zipline.pipeline.data import USEquityPricing
 from zipline.pipeline.loaders import USEquityPricingLoader
+from zipline.utils.cache import dataframe_cache
 from zipline.utils.calendars import get_calendar
 from zipline.utils.factory import create_simulation_parameters
 import zipline.utils.paths as pth
+from zipline.utils.pool import fork_pool
 
 
 class _RunAlgoError(click.ClickException, ValueError):
@@ -46,6 +54,84 @@ class _RunAlgoError(click.ClickException, ValueError):
         return self.pyfunc_msg
 
 
+def _load_bundle(bundle, environ, bundle_timestamp):
+    """Load a bundle and build the objects needed to run algorithms on it.
+
+    Returns
+    -------
+    env : TradingEnvironment
+        The trading environment of the bundle's assets.
+    data_portal : DataPortal
+        The data portal reading the bundle.
+    get_pipeline_loader : callable[BoundColumn -> PipelineLoader]
+        The pipeline loaders for the bundle.
+    adjustment_reader : SQLiteAdjustmentReader
+        The adjustment reader of the bundle.
+    """
+    bundle_data = load(
+        bundle,
+        environ,
+        bundle_timestamp,
+    )
+
+    prefix, connstr = re.split(
+        r'sqlite:///',
+        str(bundle_data.asset_finder.engine.url),
+        maxsplit=1,
+    )
+    if prefix:
+        raise ValueError(
+            "invalid url %r, must begin with 'sqlite:///'" %
+            str(bundle_data.asset_finder.engine.url),
+        )
+    env = TradingEnvironment(asset_db_path=connstr)
+    first_trading_day =\
+        bundle_data.equity_minute_bar_reader.first_trading_day
+    data = DataPortal(
+        env.asset_finder, get_calendar("NYSE"),
+        first_trading_day=first_trading_day,
+        equity_minute_reader=bundle_data.equity_minute_bar_reader,
+        equity_daily_reader=bundle_data.equity_daily_bar_reader,
+        adjustment_reader=bundle_data.adjustment_reader,
+    )
+
+    pipeline_loader = USEquityPricingLoader(
+        bundle_data.equity_daily_bar_reader,
+        bundle_data.adjustment_reader,
+    )
+
+    def choose_loader(column):
+        if column in USEquityPricing.columns:
+            return pipeline_loader
+        raise ValueError(
+            "No PipelineLoader registered for column %s." % column
+        )
+
+    return env, data, choose_loader, bundle_data.adjustment_reader
+
+
+def _eval_defines(defines, namespace):
+    """Evaluate ``name=value`` definitions into ``namespace``.
+    """
+    for assign in defines:
+        try:
+            name, value = assign.split('=', 2)
+        except ValueError:
+            raise ValueError(
+                'invalid define %r, should be of the form name=value' %
+                assign,
+            )
+        try:
+            # evaluate in the same namespace so names may refer to
+            # eachother
+            namespace[name] = eval(value, namespace)
+        except Exception as e:
+            raise ValueError(
+                'failed to execute definition for name %r: %s' % (name, e),
+            )
+    return namespace
+
+
 def _run(handle_data,
          initialize,
          before_trading_start,
@@ -63,7 +149,8 @@ def _run(handle_data,
          output,
          print_algo,
          local_namespace,
-         environ):
+         environ,
+         fast_forward=False):
     """Run a backtest for the given algorithm.
 
     This is shared between the cli and :func:`zipline.run_algo`.
@@ -75,22 +162,7 @@ def _run(handle_data,
         else:
             namespace = {}
 
-        for assign in defines:
-            try:
-                name, value = assign.split('=', 2)
-            except ValueError:
-                raise ValueError(
-                    'invalid define %r, should be of the form name=value' %
-                    assign,
-                )
-            try:
-                # evaluate in the same namespace so names may refer to
-                # eachother
-                namespace[name] = eval(value, namespace)
-            except Exception as e:
-                raise ValueError(
-                    'failed to execute definition for name %r: %s' % (name, e),
-                )
+        _eval_defines(defines, namespace)
     elif defines:
         raise _RunAlgoError(
             'cannot pass define without `algotext`',
@@ -113,44 +185,11 @@ def _run(handle_data,
             click.echo(algotext)
 
     if bundle is not None:
-        bundle_data = load(
+        env, data, choose_loader, _ = _load_bundle(
             bundle,
             environ,
             bundle_timestamp,
         )
-
-        prefix, connstr = re.split(
-            r'sqlite:///',
-            str(bundle_data.asset_finder.engine.url),
-            maxsplit=1,
-        )
-        if prefix:
-            raise ValueError(
-                "invalid url %r, must begin with 'sqlite:///'" %
-                str(bundle_data.asset_finder.engine.url),
-            )
-        env = TradingEnvironment(asset_db_path=connstr)
-        first_trading_day =\
-            bundle_data.equity_minute_bar_reader.first_trading_day
-        data = DataPortal(
-            env.asset_finder, get_calendar("NYSE"),
-            first_trading_day=first_trading_day,
-            equity_minute_reader=bundle_data.equity_minute_bar_reader,
-            equity_daily_reader=bundle_data.equity_daily_bar_reader,
-            adjustment_reader=bundle_data.adjustment_reader,
-        )
-
-        pipeline_loader = USEquityPricingLoader(
-            bundle_data.equity_daily_bar_reader,
-            bundle_data.adjustment_reader,
-        )
-
-        def choose_loader(column):
-            if column in USEquityPricing.columns:
-                return pipeline_loader
-            raise ValueError(
-                "No PipelineLoader registered for column %s." % column
-            )
     else:
         env = None
         choose_loader = None
@@ -166,6 +205,7 @@ def _run(handle_data,
             capital_base=capital_base,
             data_frequency=data_frequency,
         ),
+        fast_forward=fast_forward,
         **{
             'initialize': initialize,
             'handle_data': handle_data,
@@ -255,7 +295,8 @@ def run_algorithm(start,
                   default_extension=True,
                   extensions=(),
                   strict_extensions=True,
-                  environ=os.environ):
+                  environ=os.environ,
+                  fast_forward=False):
     """Run a trading algorithm.
 
     Parameters
@@ -309,6 +350,10 @@ def run_algorithm(start,
     environ : mapping[str -> str], optional
         The os environment to use. Many extensions use this to get parameters.
         This defaults to ``os.environ``.
+    fast_forward : bool, optional
+        In minute simulations, skip the minutes in which nothing can happen
+        to the algorithm. This only applies to algorithms without a
+        ``handle_data``. See :class:`zipline.algorithm.TradingAlgorithm`.
 
     Returns
     -------
@@ -359,4 +404,383 @@ def run_algorithm(start,
         print_algo=False,
         local_namespace=False,
         environ=environ,
+        fast_forward=fast_forward,
+    )
+
+
+def _param_grid(params, namespace):
+    """Expand ``name=values`` sweep parameters into every combination of
+    their values.
+
+    Parameters
+    ----------
+    params : iterable[str]
+        The parameters, where ``values`` is a python expression evaluating to
+        an iterable of the values to try.
+    namespace : dict
+        The namespace to evaluate the expressions in.
+
+    Returns
+    -------
+    parameters : list[dict[str -> any]]
+        The value of each parameter for each run.
+    """
+    names = []
+    values = []
+    for assign in params:
+        try:
+            name, expr = assign.split('=', 1)
+        except ValueError:
+            raise ValueError(
+                'invalid param %r, should be of the form name=values' % assign,
+            )
+        try:
+            values.append(list(eval(expr, dict(namespace))))
+        except Exception as e:
+            raise ValueError(
+                'failed to evaluate the values of param %r: %s' % (name, e),
+            )
+        names.append(name)
+
+    return [dict(zip(names, combination)) for combination in product(*values)]
+
+
+def _sweep_summary(parameters, perfs):
+    """Summarize the results of a sweep, with one row per run.
+
+    Parameters
+    ----------
+    parameters : list[dict[str -> any]]
+        The parameters of each run.
+    perfs : list[pd.DataFrame]
+        The performance of each run.
+
+    Returns
+    -------
+    summary : pd.DataFrame
+        The parameters and the final returns, sharpe, max drawdown and
+        portfolio value of each run.
+    """
+    fields = [
+        'algorithm_period_return',
+        'sharpe',
+        'max_drawdown',
+        'portfolio_value',
+    ]
+    rows = []
+    for params, perf in zip(parameters, perfs):
+        row = dict(params)
+        if len(perf):
+            last = perf.iloc[-1]
+            row.update((field, last.get(field)) for field in fields)
+        rows.append(row)
+
+    names = []
+    for params in parameters:
+        names.extend(name for name in params if name not in names)
+    return pd.DataFrame(rows, columns=names + fields)
+
+
+def _pipeline_cache_path(pipeline_cache_dir, bundle, asset_finder):
+    """The directory in ``pipeline_cache_dir`` of the cached pipeline results
+    of the loaded ingestion of ``bundle``.
+
+    The keys of the cache don't include the data the pipelines were computed
+    from, so each ingestion of each bundle gets its own directory.
+    """
+    # The asset db is in the ingestion's directory.
+    ingestion = os.path.basename(
+        os.path.dirname(asset_finder.engine.url.database),
+    )
+    return os.path.join(pipeline_cache_dir, bundle, ingestion)
+
+
+def _sqlite_path(conn):
+    """The path of the main database of a sqlite connection, or None if it is
+    in memory.
+    """
+    for _, name, path in conn.execute('PRAGMA database_list'):
+        if name == 'main':
+            return path or None
+    return None
+
+
+_SweepState = namedtuple('_SweepState', [
+    'run',
+    'parameters',
+    'asset_engine',
+    'adjustment_reader',
+    'adjustment_db_path',
+])
+
+# The state of the running sweep. This is set before the workers are forked so
+# that they inherit it instead of having it pickled.
+_sweep_state = None
+
+
+def _init_sweep_worker():
+    """Reopen the database connections inherited from the sweep's parent.
+
+    Neither sqlite connections nor the pooled connections of a sqlalchemy
+    engine may be used on both sides of a fork.
+    """
+    state = _sweep_state
+    state.asset_engine.dispose()
+    if state.adjustment_db_path is not None:
+        state.adjustment_reader.conn = sqlite3.connect(
+            state.adjustment_db_path,
+        )
+
+
+def _run_sweep_task(n):
+    state = _sweep_state
+    return state.run(state.parameters[n])
+
+
+def _sweep(handle_data,
+           initialize,
+           before_trading_start,
+           analyze,
+           algofile,
+           algotext,
+           namespace,
+           parameters,
+           data_frequency,
+           capital_base,
+           bundle,
+           bundle_timestamp,
+           start,
+           end,
+           processes,
+           pipeline_cache_dir,
+           environ):
+    """Run a backtest of the given algorithm for each set of parameters.
+
+    The bundle is loaded once, and the workers are forked from this process
+    after it has been loaded, so they share its readers. The results of
+    pipelines are cached by the hash of the pipelines and their dates, so
+    runs with the same pipeline only compute it once.
+
+    This is shared between the cli and
+    :func:`zipline.utils.run_algo.run_sweep`.
+    """
+    global _sweep_state
+
+    if algofile is not None:
+        algotext = algofile.read()
+    algo_filename = getattr(algofile, 'name', '<algorithm>')
+    parameters = [dict(params) for params in parameters]
+
+    env, data, choose_loader, adjustment_reader = _load_bundle(
+        bundle,
+        environ,
+        bundle_timestamp,
+    )
+    # Warm the asset cache so the workers inherit it instead of each of them
+    # reading every asset.
+    env.asset_finder.retrieve_all(env.asset_finder.sids)
+
+    lock = multiprocessing.Lock()
+    with ExitStack() as stack:
+        if pipeline_cache_dir is None:
+            # use a temporary directory which is deleted after the sweep
+            result_cache = stack.enter_context(
+                dataframe_cache(lock=lock, serialization='pickle'),
+            )
+        else:
+            result_cache = dataframe_cache(
+                _pipeline_cache_path(
+                    pipeline_cache_dir,
+                    bundle,
+                    env.asset_finder,
+                ),
+                lock=lock,
+                clean_on_failure=False,
+                serialization='pickle',
+            )
+
+        def run(params):
+            if algotext is not None:
+                algo_kwargs = {
+                    'namespace': dict(namespace, **params),
+                    'algo_filename': algo_filename,
+                    'script': algotext,
+                }
+            else:
+                algo_kwargs = dict(
+                    params,
+                    initialize=initialize,
+                    handle_data=handle_data,
+                    before_trading_start=before_trading_start,
+                    analyze=analyze,
+                )
+            return TradingAlgorithm(
+                capital_base=capital_base,
+                env=env,
+                get_pipeline_loader=choose_loader,
+                pipeline_result_cache=result_cache,
+                sim_params=create_simulation_parameters(
+                    start=start,
+                    end=end,
+                    capital_base=capital_base,
+                    data_frequency=data_frequency,
+                ),
+                **algo_kwargs
+            ).run(
+                data,
+                overwrite_sim_params=False,
+            )
+
+        if processes == 1 or len(parameters) <= 1:
+            return [run(params) for params in parameters]
+
+        _sweep_state = _SweepState(
+            run=run,
+            parameters=parameters,
+            asset_engine=env.asset_finder.engine,
+            adjustment_reader=adjustment_reader,
+            adjustment_db_path=_sqlite_path(adjustment_reader.conn),
+        )
+        try:
+            pool = fork_pool(processes, _init_sweep_worker)
+            try:
+                return pool.map(_run_sweep_task, range(len(parameters)))
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            _sweep_state = None
+
+
+def run_sweep(parameters,
+              start,
+              end,
+              capital_base,
+              initialize=None,
+              handle_data=None,
+              before_trading_start=None,
+              analyze=None,
+              algotext=None,
+              namespace=None,
+              data_frequency='daily',
+              bundle='quantopian-quandl',
+              bundle_timestamp=None,
+              processes=None,
+              pipeline_cache_dir=None,
+              default_extension=True,
+              extensions=(),
+              strict_extensions=True,
+              environ=os.environ):
+    """Run a trading algorithm once for each of a sequence of parameters.
+
+    The runs are spread across a pool of worker processes which are forked
+    after the bundle has been loaded, so they share its readers. The results
+    of pipelines are shared between the runs, so a pipeline which doesn't
+    depend on the parameters is only computed once.
+
+    Parameters
+    ----------
+    parameters : iterable[dict[str -> any]]
+        The parameters of each run. If ``algotext`` is given, the parameters
+        are bound in the namespace the script is executed in. Otherwise they
+        are passed to :class:`~zipline.algorithm.TradingAlgorithm` as keyword
+        arguments, which are forwarded to ``initialize``.
+    start : datetime
+        The start date of the backtests.
+    end : datetime
+        The end date of the backtests.
+    capital_base : float
+        The starting capital for the backtests.
+    initialize : callable[context -> None], optional
+        The initialize function to use for the algorithm.
+    handle_data : callable[(context, BarData) -> None], optional
+        The handle_data function to use for the algorithm.
+    before_trading_start : callable[(context, BarData) -> None], optional
+        The before_trading_start function for the algorithm.
+    analyze : callable[(context, pd.DataFrame) -> None], optional
+        The analyze function to use for the algorithm.
+    algotext : str, optional
+        The algorithm script to run. This argument is mutually exclusive with
+        ``initialize``, ``handle_data``, ``before_trading_start`` and
+        ``analyze``.
+    namespace : dict, optional
+        The names to bind before executing ``algotext``, shared by every run.
+    data_frequency : {'daily', 'minute'}, optional
+        The data frequency to run the algorithm at.
+    bundle : str, optional
+        The name of the data bundle to use to load the data to run the
+        backtests with. This defaults to 'quantopian-quandl'.
+    bundle_timestamp : datetime, optional
+        The datetime to lookup the bundle data for. This defaults to the
+        current time.
+    processes : int, optional
+        The number of worker processes to use. This defaults to the number of
+        cpus. If this is 1, the runs are executed in this process. Workers are
+        forked, so more than one process is only supported on platforms which
+        can fork.
+    pipeline_cache_dir : str, optional
+        A directory to cache the results of pipelines in, which may be reused
+        by later sweeps. The results are kept in a subdirectory for each
+        bundle and ingestion, so they aren't reused after the bundle is
+        ingested again. By default, a temporary directory is used and deleted
+        after the sweep.
+    default_extension : bool, optional
+        Should the default zipline extension be loaded. This is found at
+        ``$ZIPLINE_ROOT/extension.py``
+    extensions : iterable[str], optional
+        The names of any other extensions to load. Each element may either be
+        a dotted module path like ``a.b.c`` or a path to a python file ending
+        in ``.py`` like ``a/b/c.py``.
+    strict_extensions : bool, optional
+        Should the run fail if any extensions fail to load. If this is false,
+        a warning will be raised instead.
+    environ : mapping[str -> str], optional
+        The os environment to use. Many extensions use this to get parameters.
+        This defaults to ``os.environ``.
+
+    Returns
+    -------
+    perfs : list[pd.DataFrame]
+        The daily performance of each run, in the order of ``parameters``.
+
+    See Also
+    --------
+    zipline.utils.run_algo.run_algorithm
+    """
+    load_extensions(default_extension, extensions, strict_extensions, environ)
+
+    if algotext is not None:
+        functions = valfilter(lambda f: f is not None, {
+            'initialize': initialize,
+            'handle_data': handle_data,
+            'before_trading_start': before_trading_start,
+            'analyze': analyze,
+        })
+        if functions:
+            raise ValueError(
+                'cannot pass %s with `algotext`' % ', '.join(
+                    '`%s`' % name for name in sorted(functions)
+                ),
+            )
+    elif initialize is None:
+        raise ValueError('must pass one of `initialize` or `algotext`')
+
+    return _sweep(
+        handle_data=handle_data,
+        initialize=initialize,
+        before_trading_start=before_trading_start,
+        analyze=analyze,
+        algofile=None,
+        algotext=algotext,
+        namespace=namespace or {},
+        parameters=parameters,
+        data_frequency=data_frequency,
+        capital_base=capital_base,
+        bundle=bundle,
+        bundle_timestamp=bundle_timestamp,
+        start=start,
+        end=end,
+        processes=processes,
+        pipeline_cache_dir=pipeline_cache_dir,
+        environ=environ,
     )